@@ -36,8 +36,18 @@ Key metrics:
     (high Spearman despite low Jaccard).
 
 Results are saved to: scripts/scoring_results.txt
+
+Batch mode (--batch) skips the per-vector report: it evaluates every
+(vector × model pair), optionally for all ideal vectors of given sizes
+(--dimensions 3 4), on worker processes and writes one CSV table
+(scoring_batch_results.csv) followed by the summary and recommendations.
 """
 
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
 import numpy as np
 
 from application.services.algorithms.math_utils import (
@@ -56,6 +66,7 @@ from application.services.pair_generation.generic_rank_strategy import (
     SCORING_WEIGHTED_CC,
     _compute_pair_scores,
 )
+from application.services.parallel import map_chunksize, resolve_workers
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -64,6 +75,7 @@ from application.services.pair_generation.generic_rank_strategy import (
 K = 10  # Number of pairs selected for surveys (matches production)
 SPEARMAN_THRESHOLD = 0.95
 JACCARD_THRESHOLD = 0.8
+DEGENERATE_MIN_PAIRS = 20  # Fewer valid pairs are too few for a comparison
 
 SCORING_METHODS = [
     ("max_min", SCORING_MAX_MIN, 0.0),
@@ -75,12 +87,31 @@ METHOD_NAMES = [name for name, _, _ in SCORING_METHODS]
 
 ROW_FMT = "  {vec:<22} {valid:>8} {jacc:>10} {spear:>10}   {verdict}"
 
+TEST_VECTORS = [
+    (50, 25, 25),
+    (60, 20, 20),
+    (70, 15, 15),
+    (50, 30, 20),
+    (25, 25, 25, 25),
+    (40, 30, 20, 10),
+    (20, 20, 20, 20, 20),
+]
+
+MODEL_PAIRS = [
+    (L1UtilityModel, L2UtilityModel, "L1 vs L2", 0),
+    (L1UtilityModel, LeontiefUtilityModel, "L1 vs Leontief", 10),
+    (L2UtilityModel, LeontiefUtilityModel, "L2 vs Leontief", 10),
+    (KLUtilityModel, L1UtilityModel, "KL vs L1", 10),
+    (KLUtilityModel, L2UtilityModel, "KL vs L2", 10),
+    (LeontiefUtilityModel, KLUtilityModel, "Leontief vs KL", 10),
+]
+
 # ---------------------------------------------------------------------------
 # Core computation — shared across all three formulas
 # ---------------------------------------------------------------------------
 
 
-def _compute_valid_pairs(
+def _compute_valid_pair_arrays(
     user_vector: tuple,
     grid_step: int,
     min_component: int,
@@ -88,16 +119,17 @@ def _compute_valid_pairs(
     utility_model_b_class,
 ):
     """
-    Find all valid discriminating pairs and compute their scores under all
-    three formulas in a single pass.
+    Rank the pool once and find all valid discriminating pairs, scored under
+    all three formulas.
 
     A pair (i, j) is "valid" when the two utility models disagree about which
     vector is better — model A prefers one, model B prefers the other.
 
     Returns:
         pool: list of budget vectors (tuples)
-        pairs: list of dicts, each with keys:
-            idx_a, idx_b, gain_a, gain_b, max_min, weighted_cc, harmonic_mean
+        arrays: dict of equal-length numpy arrays with keys
+            idx_a, idx_b, gain_a, gain_b and one score array per method
+            (None when there are no valid pairs)
     """
     model_a = utility_model_a_class()
     model_b = utility_model_b_class()
@@ -112,11 +144,12 @@ def _compute_valid_pairs(
     )
     n_pool = len(pool)
     if n_pool < 2:
-        return pool, []
+        return pool, None
 
     # Compute utility scores and normalized ranks (ordinal)
-    scores_a = np.array([model_a.calculate(user_vector, v) for v in pool])
-    scores_b = np.array([model_b.calculate(user_vector, v) for v in pool])
+    pool_matrix = np.asarray(pool, dtype=float)
+    scores_a = model_a.calculate_batch(user_vector, pool_matrix)
+    scores_b = model_b.calculate_batch(user_vector, pool_matrix)
 
     raw_ranks_a = rankdata(scores_a)
     raw_ranks_b = rankdata(scores_b)
@@ -153,32 +186,52 @@ def _compute_valid_pairs(
             all_gain_b.append(-gb[idx])
 
     if not all_gain_a:
-        return pool, []
+        return pool, None
 
-    final_idx_a = np.concatenate(all_idx_a)
-    final_idx_b = np.concatenate(all_idx_b)
-    final_gain_a = np.concatenate(all_gain_a)
-    final_gain_b = np.concatenate(all_gain_b)
+    arrays = {
+        "idx_a": np.concatenate(all_idx_a),
+        "idx_b": np.concatenate(all_idx_b),
+        "gain_a": np.concatenate(all_gain_a),
+        "gain_b": np.concatenate(all_gain_b),
+    }
 
-    # Score under all three formulas
-    scores = {}
+    # Score under all three formulas, sharing the ranked pool
     for name, method, lam in SCORING_METHODS:
-        scores[name] = _compute_pair_scores(final_gain_a, final_gain_b, method, lam)
-
-    pairs = []
-    for k in range(len(final_idx_a)):
-        pairs.append(
-            {
-                "idx_a": int(final_idx_a[k]),
-                "idx_b": int(final_idx_b[k]),
-                "gain_a": float(final_gain_a[k]),
-                "gain_b": float(final_gain_b[k]),
-                "max_min": float(scores["max_min"][k]),
-                "weighted_cc": float(scores["weighted_cc"][k]),
-                "harmonic_mean": float(scores["harmonic_mean"][k]),
-            }
+        arrays[name] = _compute_pair_scores(
+            arrays["gain_a"], arrays["gain_b"], method, lam
         )
 
+    return pool, arrays
+
+
+def _compute_valid_pairs(
+    user_vector: tuple,
+    grid_step: int,
+    min_component: int,
+    utility_model_a_class,
+    utility_model_b_class,
+):
+    """
+    Find all valid discriminating pairs and compute their scores under all
+    three formulas in a single pass.
+
+    Returns:
+        pool: list of budget vectors (tuples)
+        pairs: list of dicts, each with keys:
+            idx_a, idx_b, gain_a, gain_b, max_min, weighted_cc, harmonic_mean
+    """
+    pool, arrays = _compute_valid_pair_arrays(
+        user_vector,
+        grid_step,
+        min_component,
+        utility_model_a_class,
+        utility_model_b_class,
+    )
+    if arrays is None:
+        return pool, []
+
+    columns = {key: values.tolist() for key, values in arrays.items()}
+    pairs = [dict(zip(columns, row)) for row in zip(*columns.values())]
     return pool, pairs
 
 
@@ -202,6 +255,16 @@ def _jaccard(set_a: set, set_b: set) -> float:
     return len(set_a & set_b) / len(set_a | set_b)
 
 
+def _verdict(min_jaccard: float, min_spearman: float) -> str:
+    if min_jaccard >= JACCARD_THRESHOLD and min_spearman >= SPEARMAN_THRESHOLD:
+        return "✓ AGREEMENT"
+    if min_jaccard >= JACCARD_THRESHOLD:
+        return "~ PARTIAL"
+    if min_spearman >= SPEARMAN_THRESHOLD:
+        return "△ TIEBREAK"  # Low Jaccard but high Spearman = tiebreaking artifact
+    return "✗ DIVERGENCE"
+
+
 # ---------------------------------------------------------------------------
 # Single comparison
 # ---------------------------------------------------------------------------
@@ -222,7 +285,7 @@ def run_comparison(user_vector, model_a_class, model_b_class, label, min_compone
     n_valid = len(pairs)
 
     # --- Early exit: degenerate ---
-    if n_valid < 20:
+    if n_valid < DEGENERATE_MIN_PAIRS:
         verdict = "⚠ DEGENERATE"
         print(f"  {str(user_vector):<22}  pairs: {n_valid:<8}  → {verdict}")
         if n_valid == 0:
@@ -269,15 +332,7 @@ def run_comparison(user_vector, model_a_class, model_b_class, label, min_compone
     )
     min_spearman = min(s_m_w, s_m_h, s_w_h)
 
-    # --- Verdict ---
-    if min_jaccard >= JACCARD_THRESHOLD and min_spearman >= SPEARMAN_THRESHOLD:
-        verdict = "✓ AGREEMENT"
-    elif min_jaccard >= JACCARD_THRESHOLD:
-        verdict = "~ PARTIAL"
-    elif min_spearman >= SPEARMAN_THRESHOLD:
-        verdict = "△ TIEBREAK"  # Low Jaccard but high Spearman = tiebreaking artifact
-    else:
-        verdict = "✗ DIVERGENCE"
+    verdict = _verdict(min_jaccard, min_spearman)
 
     # --- Compact output line ---
     print(
@@ -350,6 +405,123 @@ def run_comparison(user_vector, model_a_class, model_b_class, label, min_compone
     }
 
 
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+BATCH_COLUMNS = [
+    "label",
+    "vector",
+    "min_component",
+    "n_valid",
+    *(f"jaccard_{a}_{b}" for a, b in combinations(METHOD_NAMES, 2)),
+    *(f"spearman_{a}_{b}" for a, b in combinations(METHOD_NAMES, 2)),
+    *(f"top_score_{name}" for name in METHOD_NAMES),
+    "min_jaccard",
+    "min_spearman",
+    "verdict",
+]
+
+
+def evaluate_case(task: tuple) -> dict:
+    """
+    Worker: compare all scoring methods for one (vector × model pair).
+
+    The pool is ranked and the valid pairs are found once, then shared by
+    every scoring method. Top-k selection keeps the pool order among equal
+    scores, like run_comparison.
+
+    Args:
+        task: (user_vector, model_a_class, model_b_class, label, min_component)
+
+    Returns:
+        dict: One row of the batch result table (see BATCH_COLUMNS).
+    """
+    user_vector, model_a_class, model_b_class, label, min_component = task
+    _, arrays = _compute_valid_pair_arrays(
+        user_vector,
+        grid_step=5,
+        min_component=min_component,
+        utility_model_a_class=model_a_class,
+        utility_model_b_class=model_b_class,
+    )
+    n_valid = 0 if arrays is None else len(arrays["idx_a"])
+    row = dict.fromkeys(BATCH_COLUMNS)
+    row.update(
+        label=label,
+        vector=str(user_vector),
+        min_component=min_component,
+        n_valid=n_valid,
+    )
+    if n_valid < DEGENERATE_MIN_PAIRS:
+        row["verdict"] = "⚠ DEGENERATE"
+        return row
+
+    top_k_sets = {}
+    for name in METHOD_NAMES:
+        top = np.argsort(-arrays[name], kind="stable")[:K]
+        top_pairs = zip(arrays["idx_a"][top].tolist(), arrays["idx_b"][top].tolist())
+        top_k_sets[name] = {frozenset(pair) for pair in top_pairs}
+        row[f"top_score_{name}"] = float(arrays[name][top[0]])
+
+    for a, b in combinations(METHOD_NAMES, 2):
+        row[f"jaccard_{a}_{b}"] = _jaccard(top_k_sets[a], top_k_sets[b])
+        row[f"spearman_{a}_{b}"] = _spearman_rho(arrays[a], arrays[b])
+
+    row["min_jaccard"] = min(
+        row[f"jaccard_{a}_{b}"] for a, b in combinations(METHOD_NAMES, 2)
+    )
+    row["min_spearman"] = min(
+        row[f"spearman_{a}_{b}"] for a, b in combinations(METHOD_NAMES, 2)
+    )
+    row["verdict"] = _verdict(row["min_jaccard"], row["min_spearman"])
+    return row
+
+
+def run_batch(
+    vectors: list,
+    model_pairs: list,
+    output_path: str,
+    workers: int = None,
+) -> list:
+    """
+    Compare the scoring methods for every vector and model pair, in parallel,
+    and write one consolidated CSV table.
+
+    Args:
+        vectors: User vectors (any mix of dimensions).
+        model_pairs: (model_a_class, model_b_class, label, min_component) tuples.
+        output_path: Where to write the CSV table.
+        workers: Worker processes (defaults to the CPU count; 1 runs in-process).
+
+    Returns:
+        list: The table rows, ordered by model pair, then vector.
+    """
+    tasks = [
+        (tuple(vector), model_a, model_b, label, min_component)
+        for model_a, model_b, label, min_component in model_pairs
+        for vector in vectors
+    ]
+
+    workers = resolve_workers(workers)
+    if workers == 1:
+        rows = list(map(evaluate_case, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = map_chunksize(len(tasks), workers)
+            rows = list(executor.map(evaluate_case, tasks, chunksize=chunksize))
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=BATCH_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return rows
+
+
 # ---------------------------------------------------------------------------
 # Summary and recommendations
 # ---------------------------------------------------------------------------
@@ -452,10 +624,45 @@ def print_summary(all_results):
 
 
 if __name__ == "__main__":
+    import argparse
     import io
-    import os
     import sys
 
+    from application.services.precomputed_pairs import enumerate_ideal_vectors
+
+    parser = argparse.ArgumentParser(description="Compare pair-scoring strategies")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Evaluate all vectors and model pairs on worker processes and "
+        "write one CSV table instead of the detailed report.",
+    )
+    parser.add_argument(
+        "--dimensions",
+        nargs="+",
+        type=int,
+        help="Batch mode: use every ideal vector of these sizes "
+        "instead of the built-in test vectors.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Batch worker processes."
+    )
+    parser.add_argument(
+        "--output",
+        default=os.path.join(os.path.dirname(__file__), "scoring_batch_results.csv"),
+        help="Batch mode: path of the CSV table.",
+    )
+    args = parser.parse_args()
+
+    if args.batch:
+        vectors = TEST_VECTORS
+        if args.dimensions:
+            vectors = [v for d in args.dimensions for v in enumerate_ideal_vectors(d)]
+        rows = run_batch(vectors, MODEL_PAIRS, args.output, workers=args.workers)
+        print_summary(rows)
+        print(f"Results saved to: {args.output}")
+        sys.exit(0)
+
     # Tee stdout: print to terminal AND capture for file output
     output_buffer = io.StringIO()
 
@@ -473,28 +680,9 @@ if __name__ == "__main__":
 
     sys.stdout = Tee(sys.__stdout__, output_buffer)
 
-    test_vectors = [
-        (50, 25, 25),
-        (60, 20, 20),
-        (70, 15, 15),
-        (50, 30, 20),
-        (25, 25, 25, 25),
-        (40, 30, 20, 10),
-        (20, 20, 20, 20, 20),
-    ]
-
-    model_pairs = [
-        (L1UtilityModel, L2UtilityModel, "L1 vs L2", 0),
-        (L1UtilityModel, LeontiefUtilityModel, "L1 vs Leontief", 10),
-        (L2UtilityModel, LeontiefUtilityModel, "L2 vs Leontief", 10),
-        (KLUtilityModel, L1UtilityModel, "KL vs L1", 10),
-        (KLUtilityModel, L2UtilityModel, "KL vs L2", 10),
-        (LeontiefUtilityModel, KLUtilityModel, "Leontief vs KL", 10),
-    ]
-
     all_results = []
 
-    for model_a, model_b, label, min_comp in model_pairs:
+    for model_a, model_b, label, min_comp in MODEL_PAIRS:
         print(f"\n{'=' * 100}")
         print(f"  {label}  (min_component={min_comp})")
         print(f"{'=' * 100}")
@@ -509,7 +697,7 @@ if __name__ == "__main__":
         )
         print(f"  {'-' * 85}")
 
-        for vec in test_vectors:
+        for vec in TEST_VECTORS:
             result = run_comparison(vec, model_a, model_b, label, min_comp)
             all_results.append(result)
 
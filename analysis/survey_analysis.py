@@ -1,15 +1,35 @@
 import logging
+import os
+import shutil
 
 import pandas as pd
 
 from analysis.utils import (
-    calculate_optimization_stats,
+    append_dataframe_to_csv,
+    calculate_optimization_stats_frame,
+    flatten_survey_responses,
     get_all_completed_survey_responses,
+    replace_csv,
     save_dataframe_to_csv,
+    write_columnar,
 )
+from analysis.utils.columnar_utils import COLUMNAR_SUBDIR, columnar_dataset_path
+from analysis.utils.report_utils import read_watermark, write_watermark
 
 logger = logging.getLogger(__name__)
 
+RESPONSES_CSV = "data/all_completed_survey_responses.csv"
+OPTIMIZATION_STATS_CSV = "data/survey_optimization_stats.csv"
+SUMMARY_CSV = "data/summarize_stats_by_survey.csv"
+
+# Incremental refreshes re-read this many response ids below the watermark:
+# submissions commit in their own transactions, so a response can become
+# visible after one with a larger id
+WATERMARK_OVERLAP = 1000
+
+# Also write the columnar datasets (data/columnar/) read by load_data(fmt=...)
+COLUMNAR_EXPORT = os.getenv("ANALYSIS_COLUMNAR_EXPORT", "false").lower() == "true"
+
 
 def generate_survey_optimization_stats(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -22,7 +42,7 @@ def generate_survey_optimization_stats(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame with survey response IDs and optimization statistics.
     """
     logger.info(f"Generating optimization stats for {len(df)} survey responses")
-    stats = df.apply(calculate_optimization_stats, axis=1)
+    stats = calculate_optimization_stats_frame(df)
 
     result_df = pd.concat([df[["survey_id", "user_id"]], stats], axis=1)
     logger.info(f"Optimization stats generated. Result shape: {result_df.shape}")
@@ -30,39 +50,62 @@ def generate_survey_optimization_stats(df: pd.DataFrame) -> pd.DataFrame:
     return result_df
 
 
-def summarize_stats_by_survey(df: pd.DataFrame) -> pd.DataFrame:
+# Per-survey counts computed by aggregate_stats_by_survey
+ADDITIVE_SUMMARY_COLUMNS = [
+    "total_survey_responses",
+    "total_answers",
+    "sum_optimized",
+    "ratio_optimized",
+    "sum_count",
+    "ratio_count",
+    "equal_count",
+]
+
+
+def aggregate_stats_by_survey(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Summarize statistics by survey_id.
+    Count answers and results per survey_id (the additive part of the summary).
 
     Args:
         df (pd.DataFrame): DataFrame containing survey results.
 
     Returns:
-        pd.DataFrame: Summarized statistics by survey_id.
+        pd.DataFrame: survey_id and ADDITIVE_SUMMARY_COLUMNS, one row per survey.
     """
+    results = df["result"]
     grouped = (
-        df.groupby("survey_id")
+        df.assign(
+            sum_count=results.eq("sum").astype(int),
+            ratio_count=results.eq("ratio").astype(int),
+            equal_count=results.eq("equal").astype(int),
+        )
+        .groupby("survey_id")
         .agg(
-            {
-                "user_id": "nunique",
-                "num_of_answers": "sum",
-                "sum_optimized": "sum",
-                "ratio_optimized": "sum",
-                "result": lambda x: x.value_counts().to_dict(),
-            }
+            total_survey_responses=("user_id", "nunique"),
+            total_answers=("num_of_answers", "sum"),
+            sum_optimized=("sum_optimized", "sum"),
+            ratio_optimized=("ratio_optimized", "sum"),
+            sum_count=("sum_count", "sum"),
+            ratio_count=("ratio_count", "sum"),
+            equal_count=("equal_count", "sum"),
         )
         .reset_index()
     )
 
-    # Rename columns for clarity
-    grouped.columns = [
-        "survey_id",
-        "total_survey_responses",
-        "total_answers",
-        "sum_optimized",
-        "ratio_optimized",
-        "result_counts",
-    ]
+    return grouped[["survey_id"] + ADDITIVE_SUMMARY_COLUMNS]
+
+
+def finalize_survey_summary(grouped: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add percentages and the "Total" row to per-survey counts.
+
+    Args:
+        grouped (pd.DataFrame): Output of aggregate_stats_by_survey.
+
+    Returns:
+        pd.DataFrame: Summarized statistics by survey_id.
+    """
+    grouped = grouped.copy()
 
     # Calculate percentages
     grouped["sum_optimized_percentage"] = (
@@ -72,11 +115,6 @@ def summarize_stats_by_survey(df: pd.DataFrame) -> pd.DataFrame:
         grouped["ratio_optimized"] / grouped["total_answers"]
     ) * 100
 
-    # Extract individual result counts
-    grouped["sum_count"] = grouped["result_counts"].apply(lambda x: x.get("sum", 0))
-    grouped["ratio_count"] = grouped["result_counts"].apply(lambda x: x.get("ratio", 0))
-    grouped["equal_count"] = grouped["result_counts"].apply(lambda x: x.get("equal", 0))
-
     # Calculate result percentages
     total_results = (
         grouped["sum_count"] + grouped["ratio_count"] + grouped["equal_count"]
@@ -85,8 +123,24 @@ def summarize_stats_by_survey(df: pd.DataFrame) -> pd.DataFrame:
     grouped["ratio_percentage"] = (grouped["ratio_count"] / total_results) * 100
     grouped["equal_percentage"] = (grouped["equal_count"] / total_results) * 100
 
-    # Drop the intermediate 'result_counts' column
-    grouped = grouped.drop("result_counts", axis=1)
+    # Restore the historical column order
+    grouped = grouped[
+        [
+            "survey_id",
+            "total_survey_responses",
+            "total_answers",
+            "sum_optimized",
+            "ratio_optimized",
+            "sum_optimized_percentage",
+            "ratio_optimized_percentage",
+            "sum_count",
+            "ratio_count",
+            "equal_count",
+            "sum_percentage",
+            "ratio_percentage",
+            "equal_percentage",
+        ]
+    ]
 
     # Create a summary row
     summary = pd.DataFrame(
@@ -127,7 +181,64 @@ def summarize_stats_by_survey(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
+def summarize_stats_by_survey(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize statistics by survey_id.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing survey results.
+
+    Returns:
+        pd.DataFrame: Summarized statistics by survey_id.
+    """
+    return finalize_survey_summary(aggregate_stats_by_survey(df))
+
+
+def write_columnar_exports(
+    responses_df: pd.DataFrame,
+    stats_df: pd.DataFrame,
+    summary_df: pd.DataFrame,
+    append: bool = False,
+    directory: str = "data",
+) -> None:
+    """
+    Write the analysis results as columnar datasets. With `append`, the
+    pairs and optimization stats of new responses are added as new parts;
+    the summary is small and always rewritten.
+
+    The datasets are a secondary copy of the CSVs, so errors are logged
+    rather than raised; a failed export removes the datasets so readers
+    never see a partial one, and the next full analysis recreates them.
+
+    Args:
+        responses_df (pd.DataFrame): Processed survey responses.
+        stats_df (pd.DataFrame): Their optimization stats.
+        summary_df (pd.DataFrame): The full per-survey summary.
+        append (bool): Add to the existing datasets instead of replacing them.
+        directory (str): The data directory.
+    """
+    pairs_path = columnar_dataset_path(directory, "pairs")
+    if append and not os.path.isdir(pairs_path):
+        logger.warning(
+            "No columnar datasets to append to; run a full analysis to create them"
+        )
+        return
+
+    try:
+        write_columnar(
+            flatten_survey_responses(responses_df), pairs_path, append=append
+        )
+        write_columnar(
+            stats_df, columnar_dataset_path(directory, "optimization"), append=append
+        )
+        write_columnar(summary_df, columnar_dataset_path(directory, "summary"))
+    except Exception as e:
+        logger.error(f"Columnar export failed, removing the datasets: {e}")
+        shutil.rmtree(os.path.join(directory, COLUMNAR_SUBDIR), ignore_errors=True)
+
+
 def main() -> None:
+    """Rebuild all analysis CSVs from every completed response."""
     logger.info("Starting survey analysis process")
     try:
         from app import create_app
@@ -136,31 +247,123 @@ def main() -> None:
 
         # Retrieve and process survey responses and save
         all_completed_survey_responses_df = get_all_completed_survey_responses(app)
+        if all_completed_survey_responses_df.empty:
+            # Nothing to write; record that so refreshes stop rebuilding
+            logger.warning("No completed survey responses to analyze")
+            write_watermark(0)
+            return
 
-        save_dataframe_to_csv(
-            all_completed_survey_responses_df, "data/all_completed_survey_responses.csv"
-        )
+        save_dataframe_to_csv(all_completed_survey_responses_df, RESPONSES_CSV)
 
         # Generate and save optimization stats
         survey_optimization_stats_df = generate_survey_optimization_stats(
             all_completed_survey_responses_df
         )
-        save_dataframe_to_csv(
-            survey_optimization_stats_df, "data/survey_optimization_stats.csv"
-        )
+        save_dataframe_to_csv(survey_optimization_stats_df, OPTIMIZATION_STATS_CSV)
 
         # Summarize and save stats by survey
         summarize_stats_by_survey_df = summarize_stats_by_survey(
             survey_optimization_stats_df
         )
-        save_dataframe_to_csv(
-            summarize_stats_by_survey_df, "data/summarize_stats_by_survey.csv"
+        save_dataframe_to_csv(summarize_stats_by_survey_df, SUMMARY_CSV)
+
+        # Later refreshes only need responses after this one
+        write_watermark(
+            int(all_completed_survey_responses_df["survey_response_id"].max())
         )
 
+        if COLUMNAR_EXPORT:
+            write_columnar_exports(
+                all_completed_survey_responses_df,
+                survey_optimization_stats_df,
+                summarize_stats_by_survey_df,
+            )
+
         logger.info("Survey analysis completed successfully")
     except Exception as e:
         logger.error(f"Error in main execution: {e}", exc_info=True)
 
 
+def update_incremental(app=None) -> int:
+    """
+    Bring the analysis CSVs up to date with responses newer than the
+    watermark: append their rows and optimization stats and rebuild the
+    per-survey summary from the stats, without re-reading older responses.
+
+    The step is idempotent. Responses already in the responses CSV are
+    skipped, stats rows beyond the responses CSV (left by an interrupted
+    run) are dropped, every file is replaced atomically, and the responses
+    CSV and the watermark are written last. Responses up to
+    WATERMARK_OVERLAP ids below the watermark are re-read so late commits
+    are not missed. Falls back to a full rebuild (main) when there is no
+    watermark yet or the CSVs are inconsistent.
+
+    Args:
+        app: Optional Flask app instance. If None, uses current_app.
+
+    Returns:
+        int: Number of new survey responses processed.
+    """
+    watermark = read_watermark()
+    if watermark is None:
+        logger.info("No analysis watermark found, running full analysis")
+        main()
+        return 0
+
+    fetched_df = get_all_completed_survey_responses(
+        app, after_response_id=max(0, watermark - WATERMARK_OVERLAP)
+    )
+    if fetched_df.empty:
+        logger.info(f"No responses after {watermark}, analysis is up to date")
+        return 0
+
+    known_ids = pd.read_csv(RESPONSES_CSV, usecols=["survey_response_id"])[
+        "survey_response_id"
+    ]
+    new_responses_df = fetched_df[
+        ~fetched_df["survey_response_id"].isin(known_ids)
+    ].reset_index(drop=True)
+    latest_response_id = max(watermark, int(fetched_df["survey_response_id"].max()))
+    if new_responses_df.empty:
+        logger.info(f"No new responses after {watermark}, analysis is up to date")
+        if latest_response_id > watermark:
+            write_watermark(latest_response_id)
+        return 0
+
+    # Stats rows line up with response rows; extra rows are from a run that
+    # stopped before appending its responses
+    stats_df = pd.read_csv(OPTIMIZATION_STATS_CSV)
+    if len(stats_df) < len(known_ids):
+        logger.warning("Optimization stats are missing rows, running full analysis")
+        main()
+        return len(new_responses_df)
+
+    new_stats_df = generate_survey_optimization_stats(new_responses_df)
+    stats_df = pd.concat(
+        [stats_df.iloc[: len(known_ids)], new_stats_df], ignore_index=True
+    )
+    summary_df = summarize_stats_by_survey(stats_df)
+
+    replace_csv(stats_df, OPTIMIZATION_STATS_CSV)
+    replace_csv(summary_df, SUMMARY_CSV)
+    append_dataframe_to_csv(new_responses_df, RESPONSES_CSV)
+    write_watermark(latest_response_id)
+
+    if COLUMNAR_EXPORT:
+        write_columnar_exports(new_responses_df, new_stats_df, summary_df, append=True)
+
+    logger.info(
+        f"Added {len(new_responses_df)} responses after {watermark} to the analysis"
+    )
+    return len(new_responses_df)
+
+
 if __name__ == "__main__":
-    main()
+    import sys
+
+    if "--incremental" in sys.argv[1:]:
+        from app import create_app
+
+        update_incremental(create_app())
+    else:
+        main()
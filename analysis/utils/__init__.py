@@ -1,13 +1,24 @@
 from .analysis_utils import (
     calculate_optimization_stats,
+    calculate_optimization_stats_frame,
+    explode_comparisons,
     get_all_completed_survey_responses,
     get_latest_csv_files,
     is_sum_optimized,
     load_data,
     process_survey_responses,
+    sum_optimized_mask,
+)
+from .columnar_utils import (
+    flatten_survey_responses,
+    load_columnar,
+    read_columns,
+    write_columnar,
 )
 from .file_utils import (
+    append_dataframe_to_csv,
     ensure_directory_exists,
+    replace_csv,
     save_dataframe_to_csv,
 )
 from .visualization_utils import (
@@ -20,9 +31,18 @@ from .visualization_utils import (
 
 __all__ = [
     "calculate_optimization_stats",
+    "calculate_optimization_stats_frame",
+    "explode_comparisons",
+    "sum_optimized_mask",
     "is_sum_optimized",
     "process_survey_responses",
+    "append_dataframe_to_csv",
     "ensure_directory_exists",
+    "flatten_survey_responses",
+    "load_columnar",
+    "read_columns",
+    "write_columnar",
+    "replace_csv",
     "save_dataframe_to_csv",
     "visualize_overall_majority_choice_distribution",
     "visualize_per_survey_answer_percentages",
@@ -1,10 +1,16 @@
 import json
 import logging
 import os
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from analysis.utils.columnar_utils import (
+    COLUMNAR_DATASETS,
+    columnar_dataset_path,
+    load_columnar,
+)
 from application.services.pair_generation.optimization_metrics_vector import (
     OptimizationMetricsStrategy,
 )
@@ -57,17 +63,43 @@ def get_latest_csv_files(directory: str = "data") -> Dict[str, str]:
         return {}
 
 
-def load_data(directory: str = "data") -> Dict[str, pd.DataFrame]:
+def load_data(
+    directory: str = "data",
+    fmt: str = "csv",
+    columns: Optional[Dict[str, List[str]]] = None,
+    survey_ids: Optional[List] = None,
+    mmap: bool = True,
+) -> Dict[str, pd.DataFrame]:
     """
-    Load data from CSV files into pandas DataFrames.
+    Load the analysis exports into pandas DataFrames.
 
     Args:
-        directory (str): The directory containing the CSV files.
+        directory (str): The data directory.
+        fmt (str): "csv" for the CSV exports, or "columnar" for the columnar
+            datasets (see columnar_utils; "pairs" replaces "responses").
+        columns (Optional[Dict[str, List[str]]]): Columns to read per dataset
+            key; datasets not listed are read in full.
+        survey_ids (Optional[List]): Only keep rows of these surveys.
+        mmap (bool): Memory-map columnar files instead of reading them.
 
     Returns:
         Dict[str, pd.DataFrame]: A dictionary of loaded DataFrames.
     """
+    columns = columns or {}
     try:
+        if fmt == "columnar":
+            return {
+                key: load_columnar(
+                    columnar_dataset_path(directory, key),
+                    columns=columns.get(key),
+                    survey_ids=survey_ids,
+                    mmap=mmap,
+                )
+                for key in COLUMNAR_DATASETS
+            }
+        if fmt != "csv":
+            raise ValueError(f"Unknown data format: {fmt}")
+
         files = get_latest_csv_files(directory)
         if not files:
             logger.error("No CSV files found to load")
@@ -77,7 +109,12 @@ def load_data(directory: str = "data") -> Dict[str, pd.DataFrame]:
         for key, filename in files.items():
             try:
                 file_path = os.path.join(directory, filename)
-                data[key] = pd.read_csv(file_path)
+                data[key] = pd.read_csv(file_path, usecols=columns.get(key))
+                if survey_ids is not None:
+                    wanted = {str(survey_id) for survey_id in survey_ids}
+                    data[key] = data[key][
+                        data[key]["survey_id"].astype(str).isin(wanted)
+                    ].reset_index(drop=True)
                 logger.debug(
                     f"Successfully loaded {filename} with {len(data[key])} rows"
                 )
@@ -130,6 +167,16 @@ def is_sum_optimized(
     return optimal_choice == user_choice
 
 
+def _parse_json_vectors(values: List) -> List[list]:
+    """
+    Decode a column of JSON-encoded vectors with a single json.loads call
+    (values that are already decoded are passed through).
+    """
+    if all(isinstance(value, str) for value in values):
+        return json.loads(f"[{','.join(values)}]")
+    return [json.loads(v) if isinstance(v, str) else v for v in values]
+
+
 def process_survey_responses(raw_results: List[Dict]) -> List[Dict]:
     """
     Processes raw survey response data into a structured format.
@@ -143,7 +190,13 @@ def process_survey_responses(raw_results: List[Dict]) -> List[Dict]:
     processed_results = []
     current_response = {}
 
-    for row in raw_results:
+    optimal_allocations = _parse_json_vectors(
+        [row["optimal_allocation"] for row in raw_results]
+    )
+    options_1 = _parse_json_vectors([row["option_1"] for row in raw_results])
+    options_2 = _parse_json_vectors([row["option_2"] for row in raw_results])
+
+    for i, row in enumerate(raw_results):
         if (
             not current_response
             or current_response["survey_response_id"] != row["survey_response_id"]
@@ -154,7 +207,7 @@ def process_survey_responses(raw_results: List[Dict]) -> List[Dict]:
                 "survey_response_id": row["survey_response_id"],
                 "user_id": row["user_id"],
                 "survey_id": row["survey_id"],
-                "optimal_allocation": json.loads(row["optimal_allocation"]),
+                "optimal_allocation": optimal_allocations[i],
                 "completed": row["completed"],
                 "response_created_at": row["response_created_at"],
                 "user_comment": row["user_comment"],
@@ -163,8 +216,8 @@ def process_survey_responses(raw_results: List[Dict]) -> List[Dict]:
         current_response["comparisons"].append(
             {
                 "pair_number": row["pair_number"],
-                "option_1": json.loads(row["option_1"]),
-                "option_2": json.loads(row["option_2"]),
+                "option_1": options_1[i],
+                "option_2": options_2[i],
                 "user_choice": row["user_choice"],
             }
         )
@@ -176,6 +229,103 @@ def process_survey_responses(raw_results: List[Dict]) -> List[Dict]:
     return processed_results
 
 
+def explode_comparisons(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build a pair-level frame from processed survey responses.
+
+    Args:
+        df (pd.DataFrame): Responses with `optimal_allocation` and `comparisons`.
+
+    Returns:
+        pd.DataFrame: One row per comparison with `response_index` (position
+        of the response in df), `user_choice`, and the `optimal_allocation`,
+        `option_1` and `option_2` vectors.
+    """
+    counts = df["comparisons"].map(len).to_numpy(dtype=np.int64)
+    response_index = np.repeat(np.arange(len(df)), counts)
+    comparisons = [c for response in df["comparisons"] for c in response]
+
+    return pd.DataFrame(
+        {
+            "response_index": response_index,
+            "user_choice": [c["user_choice"] for c in comparisons],
+            "optimal_allocation": df["optimal_allocation"].to_numpy()[response_index],
+            "option_1": [c["option_1"] for c in comparisons],
+            "option_2": [c["option_2"] for c in comparisons],
+        }
+    )
+
+
+def sum_optimized_mask(pairs: pd.DataFrame) -> np.ndarray:
+    """
+    Vectorized is_sum_optimized over a pair-level frame.
+
+    Pairs are grouped by vector length (surveys differ in their number of
+    subjects) and each group is evaluated as a matrix.
+
+    Args:
+        pairs (pd.DataFrame): Output of explode_comparisons.
+
+    Returns:
+        np.ndarray: Boolean array, True where the choice optimized the sum.
+
+    Raises:
+        ValueError: If a user_choice is not 1 or 2.
+    """
+    choices = pairs["user_choice"].to_numpy()
+    if not np.isin(choices, (1, 2)).all():
+        raise ValueError("user_choice must be either 1 or 2")
+
+    mask = np.zeros(len(pairs), dtype=bool)
+    lengths = pairs["optimal_allocation"].map(len).to_numpy()
+    for length in np.unique(lengths):
+        rows = np.flatnonzero(lengths == length)
+        optimal, option_1, option_2 = (
+            np.array(pairs[column].iloc[rows].tolist()).reshape(len(rows), length)
+            for column in ("optimal_allocation", "option_1", "option_2")
+        )
+        sum_diff_1 = np.abs(optimal - option_1).sum(axis=1)
+        sum_diff_2 = np.abs(optimal - option_2).sum(axis=1)
+        optimal_choice = np.where(sum_diff_1 < sum_diff_2, 1, 2)
+        mask[rows] = optimal_choice == choices[rows]
+    return mask
+
+
+def calculate_optimization_stats_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized calculate_optimization_stats for all responses at once.
+
+    Args:
+        df (pd.DataFrame): Processed survey responses.
+
+    Returns:
+        pd.DataFrame: num_of_answers, sum_optimized, ratio_optimized and
+        result per response, indexed like df.
+    """
+    pairs = explode_comparisons(df)
+    num_of_answers = np.bincount(pairs["response_index"], minlength=len(df))
+    sum_optimized = np.bincount(
+        pairs["response_index"], weights=sum_optimized_mask(pairs), minlength=len(df)
+    ).astype(np.int64)
+    ratio_optimized = num_of_answers - sum_optimized
+
+    result = np.select(
+        [sum_optimized > ratio_optimized, sum_optimized < ratio_optimized],
+        ["sum", "ratio"],
+        default="equal",
+    )
+
+    return pd.DataFrame(
+        {
+            "num_of_answers": num_of_answers,
+            "sum_optimized": sum_optimized,
+            "ratio_optimized": ratio_optimized,
+            "result": result,
+        },
+        index=df.index,
+    )
+
+
 def calculate_optimization_stats(row: pd.Series) -> pd.Series:
     """
     Calculate optimization statistics for a single survey response.
@@ -217,12 +367,15 @@ def calculate_optimization_stats(row: pd.Series) -> pd.Series:
     )
 
 
-def get_all_completed_survey_responses(app=None) -> pd.DataFrame:
+def get_all_completed_survey_responses(
+    app=None, after_response_id: Optional[int] = None
+) -> pd.DataFrame:
     """
     Retrieves and processes all completed survey responses.
 
     Args:
         app: Optional Flask app instance. If None, uses current_app.
+        after_response_id: Only include responses with a larger ID.
 
     Returns:
         pd.DataFrame: A DataFrame containing processed survey response data.
@@ -233,7 +386,7 @@ def get_all_completed_survey_responses(app=None) -> pd.DataFrame:
         # Use provided app or current_app
         ctx = app.app_context() if app else current_app.app_context()
         with ctx:
-            raw_results = retrieve_completed_survey_responses()
+            raw_results = retrieve_completed_survey_responses(after_response_id)
 
         processed_results = process_survey_responses(raw_results)
         df = pd.DataFrame(processed_results)
@@ -0,0 +1,377 @@
+"""
+Columnar storage for analysis exports.
+
+A dataset is a directory of parts (row groups), each holding one `.npy` file
+per column plus a `_meta.json` manifest. Budget vectors are stored as native
+integer matrices (one row per record) instead of JSON strings; when surveys
+have different numbers of subjects, shorter vectors are zero-padded and each
+row's vector length is stored alongside. Rows are grouped by survey_id and
+the manifest records each survey's row ranges. Readers therefore load only
+the requested columns and surveys, and can memory-map the files instead of
+reading them.
+
+Appending writes a new part, so incremental refreshes never rewrite history.
+Only numpy is required (no Parquet/Arrow dependency).
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+META_FILENAME = "_meta.json"
+FORMAT_VERSION = 1
+
+# Columnar datasets written by the survey analysis, relative to the data
+# directory; "pairs" holds one row per comparison pair
+COLUMNAR_SUBDIR = "columnar"
+COLUMNAR_DATASETS = {
+    "pairs": "comparison_pairs",
+    "summary": "summarize_stats_by_survey",
+    "optimization": "survey_optimization_stats",
+}
+
+# Suffix of the per-row vector lengths of a padded vector column
+LENGTH_SUFFIX = "_length"
+
+_INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _narrow_int(values: np.ndarray) -> np.ndarray:
+    """Cast integer data to the smallest signed dtype that holds it."""
+    if values.size == 0:
+        return values.astype(np.int8)
+    low, high = values.min(), values.max()
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+def _encode_column(
+    name: str, series: pd.Series
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Convert a DataFrame column to a fixed-width numpy array.
+
+    Returns:
+        The array, and for vector columns of varying length the length of
+        each row's vector (the matrix is zero-padded to the longest one).
+
+    Raises:
+        ValueError: If the column holds nested data or missing vectors.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.to_numpy(dtype="datetime64[ns]"), None
+    if pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=bool), None
+    if pd.api.types.is_integer_dtype(series):
+        return _narrow_int(series.to_numpy()), None
+    if pd.api.types.is_float_dtype(series):
+        return series.to_numpy(dtype=np.float64), None
+
+    values = series.tolist()
+    present = [v for v in values if v is not None and not _is_nan(v)]
+    if present and all(isinstance(v, (list, tuple, np.ndarray)) for v in present):
+        if len(present) != len(values):
+            raise ValueError(f"Column '{name}' has missing vectors")
+        lengths = np.array([len(v) for v in values])
+        width = int(lengths.max())
+        if (lengths != width).any():
+            values = [list(v) + [0] * (width - len(v)) for v in values]
+        else:
+            lengths = None
+        matrix = np.asarray(values)
+        if matrix.dtype == object:
+            raise ValueError(f"Column '{name}' holds nested data; flatten it first")
+        if lengths is not None:
+            lengths = _narrow_int(lengths)
+        if np.issubdtype(matrix.dtype, np.integer):
+            return _narrow_int(matrix), lengths
+        return matrix.astype(np.float64), lengths
+    if present and all(isinstance(v, (datetime, date)) for v in present):
+        return pd.to_datetime(series).to_numpy(dtype="datetime64[ns]"), None
+    if any(isinstance(v, (dict, list, tuple)) for v in present):
+        raise ValueError(f"Column '{name}' holds nested data; flatten it first")
+    values = ["" if v is None or _is_nan(v) else str(v) for v in values]
+    return np.asarray(values), None
+
+
+def _pad_vectors(
+    chunks: List[np.ndarray], lengths: List[Optional[np.ndarray]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Zero-pad vector chunks to a common width and concatenate them with
+    their per-row lengths (chunks without stored lengths are full width)."""
+    width = max(chunk.shape[1] for chunk in chunks)
+    padded = [np.pad(chunk, ((0, 0), (0, width - chunk.shape[1]))) for chunk in chunks]
+    row_lengths = [
+        np.full(len(chunk), chunk.shape[1]) if length is None else length
+        for chunk, length in zip(chunks, lengths)
+    ]
+    return np.concatenate(padded), _narrow_int(np.concatenate(row_lengths))
+
+
+def _is_nan(value) -> bool:
+    return isinstance(value, float) and value != value
+
+
+def _survey_ranges(survey_ids: pd.Series) -> Dict[str, List[List[int]]]:
+    """Row ranges [start, stop) of each survey_id, keyed by str(survey_id)."""
+    ranges: Dict[str, List[List[int]]] = {}
+    values = survey_ids.astype(str).tolist()
+    start = 0
+    for i in range(1, len(values) + 1):
+        if i == len(values) or values[i] != values[start]:
+            ranges.setdefault(values[start], []).append([start, i])
+            start = i
+    return ranges
+
+
+def _part_dirs(path: str) -> List[str]:
+    if not os.path.isdir(path):
+        return []
+    return sorted(
+        os.path.join(path, name)
+        for name in os.listdir(path)
+        if name.startswith("part-")
+        and os.path.exists(os.path.join(path, name, META_FILENAME))
+    )
+
+
+def columnar_dataset_path(directory: str, key: str) -> str:
+    """Path of one of the COLUMNAR_DATASETS under a data directory."""
+    return os.path.join(directory, COLUMNAR_SUBDIR, COLUMNAR_DATASETS[key])
+
+
+def write_columnar(df: pd.DataFrame, path: str, append: bool = False) -> str:
+    """
+    Write a DataFrame as a columnar dataset (or as a new part of one).
+
+    Rows are stably sorted by survey_id when that column is integer, so each
+    survey occupies one contiguous range per part.
+
+    Args:
+        df: The DataFrame to store. Vector columns must hold lists of
+            numbers (of any length); nested structures are rejected.
+        path: Dataset directory.
+        append: Add a part instead of replacing the dataset.
+
+    Returns:
+        str: Directory of the written part.
+
+    Raises:
+        ValueError: If a column cannot be stored in fixed-width form.
+    """
+    if "survey_id" in df.columns and pd.api.types.is_integer_dtype(df["survey_id"]):
+        df = df.sort_values("survey_id", kind="stable")
+    df = df.reset_index(drop=True)
+
+    encoded = {name: _encode_column(name, df[name]) for name in df.columns}
+    arrays = {name: array for name, (array, _) in encoded.items()}
+    lengths = {
+        name: length for name, (_, length) in encoded.items() if length is not None
+    }
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "rows": len(df),
+        "columns": {
+            name: {
+                "dtype": array.dtype.str,
+                "shape": list(array.shape[1:]),
+                "padded": name in lengths,
+            }
+            for name, array in arrays.items()
+        },
+        "surveys": _survey_ranges(df["survey_id"]) if "survey_id" in df else None,
+    }
+
+    existing = _part_dirs(path) if append else []
+    os.makedirs(path, exist_ok=True)
+    part_name = f"part-{len(existing):05d}"
+
+    # Build the part next to its final location and move it in at once
+    tmp_dir = tempfile.mkdtemp(dir=path, prefix=".tmp-")
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), array, allow_pickle=False)
+        for name, length in lengths.items():
+            np.save(
+                os.path.join(tmp_dir, f"{name}{LENGTH_SUFFIX}.npy"),
+                length,
+                allow_pickle=False,
+            )
+        with open(os.path.join(tmp_dir, META_FILENAME), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        if not append:
+            for old_part in _part_dirs(path):
+                shutil.rmtree(old_part)
+        part_dir = os.path.join(path, part_name)
+        os.replace(tmp_dir, part_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    logger.info(f"Wrote {len(df)} rows to {part_dir}")
+    return part_dir
+
+
+def read_columns(
+    path: str,
+    columns: Optional[Iterable[str]] = None,
+    survey_ids: Optional[Iterable] = None,
+    mmap: bool = True,
+) -> Dict[str, np.ndarray]:
+    """
+    Read selected columns and surveys of a columnar dataset as numpy arrays.
+
+    With `mmap` the files are memory-mapped; a selection covering one
+    contiguous range of a single-part dataset is returned without copying.
+
+    Vector columns whose rows differ in length (within a part or across
+    parts) are returned zero-padded to the longest vector, together with the
+    length of each row's vector under "<column>_length".
+
+    Args:
+        path: Dataset directory.
+        columns: Columns to read (default: all).
+        survey_ids: Only read rows of these surveys (default: all rows).
+        mmap: Memory-map the column files instead of loading them.
+
+    Returns:
+        Dict[str, np.ndarray]: Column name to array; vector columns are 2-D,
+            padded vector columns come with a "<column>_length" array.
+
+    Raises:
+        FileNotFoundError: If the dataset does not exist.
+        ValueError: If a requested column does not exist, or surveys are
+            requested from a dataset without a survey_id column.
+    """
+    parts = _part_dirs(path)
+    if not parts:
+        raise FileNotFoundError(f"No columnar dataset at {path}")
+    wanted_surveys = None if survey_ids is None else {str(s) for s in survey_ids}
+
+    pieces: Dict[str, List[np.ndarray]] = {}
+    piece_lengths: Dict[str, List[Optional[np.ndarray]]] = {}
+    for part in parts:
+        with open(os.path.join(part, META_FILENAME), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        names = list(columns) if columns is not None else list(meta["columns"])
+        unknown = [name for name in names if name not in meta["columns"]]
+        if unknown:
+            raise ValueError(f"Unknown columns in {path}: {unknown}")
+
+        if wanted_surveys is None:
+            ranges = [[0, meta["rows"]]]
+        elif meta["surveys"] is None:
+            raise ValueError(f"{path} has no survey_id column to filter on")
+        else:
+            ranges = sorted(
+                row_range
+                for survey_id, survey_ranges in meta["surveys"].items()
+                if survey_id in wanted_surveys
+                for row_range in survey_ranges
+            )
+
+        for name in names:
+            array = np.load(
+                os.path.join(part, f"{name}.npy"),
+                mmap_mode="r" if mmap else None,
+                allow_pickle=False,
+            )
+            selected = [array[start:stop] for start, stop in ranges] or [array[:0]]
+            pieces.setdefault(name, []).extend(selected)
+
+            if meta["columns"][name].get("padded"):
+                length = np.load(
+                    os.path.join(part, f"{name}{LENGTH_SUFFIX}.npy"),
+                    allow_pickle=False,
+                )
+                selected_lengths = [length[start:stop] for start, stop in ranges]
+                selected_lengths = selected_lengths or [length[:0]]
+            else:
+                selected_lengths = [None] * len(selected)
+            piece_lengths.setdefault(name, []).extend(selected_lengths)
+
+    result: Dict[str, np.ndarray] = {}
+    for name, chunks in pieces.items():
+        lengths = piece_lengths[name]
+        ragged = chunks[0].ndim > 1 and (
+            any(length is not None for length in lengths)
+            or len({chunk.shape[1] for chunk in chunks}) > 1
+        )
+        if ragged:
+            result[name], result[f"{name}{LENGTH_SUFFIX}"] = _pad_vectors(
+                chunks, lengths
+            )
+        else:
+            result[name] = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+    return result
+
+
+def load_columnar(
+    path: str,
+    columns: Optional[Iterable[str]] = None,
+    survey_ids: Optional[Iterable] = None,
+    mmap: bool = True,
+) -> pd.DataFrame:
+    """
+    Read a columnar dataset into a DataFrame (see read_columns for arguments).
+
+    Vector columns become lists per row (padding removed), as in DataFrames
+    built from database rows; use read_columns to keep them as matrices.
+    """
+    arrays = read_columns(path, columns, survey_ids, mmap)
+    data = {}
+    for name, array in arrays.items():
+        if name.endswith(LENGTH_SUFFIX) and name[: -len(LENGTH_SUFFIX)] in arrays:
+            continue
+        if array.ndim == 1:
+            data[name] = array
+        elif f"{name}{LENGTH_SUFFIX}" in arrays:
+            lengths = arrays[f"{name}{LENGTH_SUFFIX}"]
+            data[name] = [row[:n].tolist() for row, n in zip(array, lengths)]
+        else:
+            data[name] = array.tolist()
+    return pd.DataFrame(data)
+
+
+def flatten_survey_responses(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per comparison pair from a DataFrame of processed survey
+    responses (as built by get_all_completed_survey_responses), with the
+    ideal budget and both options as vector columns.
+
+    Args:
+        df: Responses with a `comparisons` list column.
+
+    Returns:
+        pd.DataFrame: Pair-level rows ready for write_columnar.
+    """
+    rows = [
+        {
+            "survey_response_id": response["survey_response_id"],
+            "user_id": response["user_id"],
+            "survey_id": response["survey_id"],
+            "response_created_at": response.get("response_created_at"),
+            "pair_number": comparison["pair_number"],
+            "user_choice": comparison["user_choice"],
+            "optimal_allocation": response["optimal_allocation"],
+            "option_1": comparison["option_1"],
+            "option_2": comparison["option_2"],
+        }
+        for response in df.to_dict("records")
+        for comparison in response["comparisons"]
+    ]
+    return pd.DataFrame(rows)
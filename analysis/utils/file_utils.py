@@ -1,5 +1,6 @@
 import logging
 import os
+import shutil
 
 import pandas as pd
 
@@ -43,3 +44,61 @@ def save_dataframe_to_csv(df: pd.DataFrame, csv_filename: str) -> None:
     except Exception as e:
         logger.error(f"Error occurred while saving DataFrame to CSV: {e}")
         raise
+
+
+def append_dataframe_to_csv(df: pd.DataFrame, csv_filename: str) -> None:
+    """
+    Append the rows of a DataFrame to an existing CSV file, in the file's
+    column order. Creates the file (with a header) if it does not exist.
+
+    Args:
+        df: A pandas DataFrame with the rows to append.
+        csv_filename: The filename (including path) of the CSV file.
+
+    Raises:
+        ValueError: If the DataFrame lacks columns present in the file.
+    """
+    if not os.path.exists(csv_filename):
+        save_dataframe_to_csv(df, csv_filename)
+        return
+
+    columns = pd.read_csv(csv_filename, nrows=0).columns
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        logger.error(f"Cannot append to {csv_filename}, missing columns: {missing}")
+        raise ValueError(f"DataFrame is missing columns: {missing}")
+
+    # Append to a copy and swap it in, so an interrupted append leaves the
+    # original file untouched instead of ending in a partial row
+    logger.info(f"Appending {len(df)} rows to {csv_filename}")
+    tmp_filename = f"{csv_filename}.tmp"
+    try:
+        shutil.copyfile(csv_filename, tmp_filename)
+        df[list(columns)].to_csv(tmp_filename, mode="a", header=False, index=False)
+        os.replace(tmp_filename, csv_filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+
+def replace_csv(df: pd.DataFrame, csv_filename: str) -> None:
+    """
+    Save a DataFrame to a CSV file by writing a temporary file and renaming
+    it over the target, so readers see either the old or the new file.
+
+    Args:
+        df: A pandas DataFrame to be saved.
+        csv_filename: The filename (including path) where the CSV will be saved.
+
+    Raises:
+        ValueError: If the DataFrame is empty.
+    """
+    tmp_filename = f"{csv_filename}.tmp"
+    try:
+        save_dataframe_to_csv(df, tmp_filename)
+        os.replace(tmp_filename, csv_filename)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
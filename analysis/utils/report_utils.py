@@ -1,7 +1,10 @@
+import json
 import logging
 import os
+from datetime import datetime
+from typing import Optional
 
-from database.queries import get_latest_survey_timestamp
+from database.queries import get_latest_completed_response_id
 
 logger = logging.getLogger(__name__)
 
@@ -11,33 +14,79 @@ CSV_PATHS = [
     "data/summarize_stats_by_survey.csv",
 ]
 
+# Highest survey_response_id already reflected in the CSVs
+ANALYSIS_STATE_PATH = "data/analysis_state.json"
+
+
+def read_watermark() -> Optional[int]:
+    """Return the analysis high-water mark, or None if none is recorded."""
+    try:
+        with open(ANALYSIS_STATE_PATH, encoding="utf-8") as f:
+            return int(json.load(f)["last_response_id"])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable analysis state {ANALYSIS_STATE_PATH}: {e}")
+        return None
+
+
+def write_watermark(last_response_id: int) -> None:
+    """Record that the CSVs include every response up to `last_response_id`."""
+    directory = os.path.dirname(ANALYSIS_STATE_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{ANALYSIS_STATE_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "last_response_id": last_response_id,
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            },
+            f,
+        )
+    os.replace(tmp_path, ANALYSIS_STATE_PATH)
+    logger.debug(f"Analysis watermark set to response {last_response_id}")
+
+
 def ensure_fresh_csvs() -> bool:
     """
     Ensure CSV files are up to date with the database.
-    Returns True if CSVs were regenerated.
+
+    Compares the recorded watermark with the newest completed response and,
+    if there are newer responses, processes only those. Missing CSVs or a
+    missing watermark trigger a full rebuild.
+
+    Returns True if CSVs were updated.
     """
-    latest_survey_time = get_latest_survey_timestamp()
+    latest_response_id = get_latest_completed_response_id()
+    watermark = read_watermark()
 
-    # Check if CSVs need updating
-    if not all(os.path.exists(p) for p in CSV_PATHS):
-        csv_update_needed = True
-    else:
-        csv_times = [os.path.getmtime(p) for p in CSV_PATHS]
-        csv_update_needed = any(csv_time < latest_survey_time for csv_time in csv_times)
+    csvs_exist = all(os.path.exists(p) for p in CSV_PATHS)
+    # Watermark 0 records an analysis of zero responses, which writes no CSVs
+    if (
+        watermark is not None
+        and latest_response_id <= watermark
+        and (csvs_exist or watermark == 0)
+    ):
+        return False
 
-    if csv_update_needed:
-        try:
+    full_rebuild = watermark is None or not csvs_exist
+
+    try:
+        if full_rebuild:
             from analysis.survey_analysis import main as analysis_main
 
             analysis_main()
             logger.info("CSV files regenerated successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Error regenerating CSV files: {e}")
-            raise
-
-    return False
+        else:
+            from analysis.survey_analysis import update_incremental
 
+            added = update_incremental()
+            logger.info(f"CSV files updated with {added} new responses")
+        return True
+    except Exception as e:
+        logger.error(f"Error regenerating CSV files: {e}")
+        raise
 
 
 def build_html_table(
@@ -1,23 +1,31 @@
 """
-Consolidated Validation Suite for OptimizationMetricsRankStrategy.
+Consolidated Validation Suite for the registered rank strategies.
 
-This script audits the pair generation strategy.
+This script audits a GenericRankStrategy's pair generation (by default
+l1_vs_leontief_rank_comparison).
 
 Modes:
 1. 'single':      Checks Normalization Impact (Rank vs Min-Max).
-                  Uses a 'Steel Man' Brute Force optimizer for Min-Max to find 
-                  the best possible pairs ignoring standard thresholds.
-                  
-2. 'logic_check': Checks Selection Logic Impact (Sum-Score vs Min-Score).
-                  Operates on Rank Data to isolate the scoring logic variable.
+                  Compares the strategy's pairs with those of a 'Steel Man'
+                  Brute Force optimizer on Min-Max scaled utility scores.
 
-3. 'global':      Checks Robustness across all 228 valid user vectors.
+2. 'logic_check': Checks Selection Logic Impact (the strategy's scoring vs
+                  Min-Score). Operates on the strategy's rank data to isolate
+                  the scoring logic variable.
+
+3. 'global':      Checks Robustness of any registered GenericRankStrategy
+                  across every valid user vector of a 3-D, 4-D or 5-D grid
+                  (228 vectors in 3-D). Runs on a process pool and streams
+                  results to a JSON Lines file, so interrupted runs resume.
 """
 
 import argparse
+import json
 import logging
 import sys
+import time
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -26,14 +34,18 @@ import numpy as np
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from application.services.pair_generation.optimization_metrics_rank import (
-    OptimizationMetricsRankStrategy,
-    rankdata,
+from application.exceptions import UnsuitableForStrategyError
+from application.services.algorithms.math_utils import get_simplex_matrix
+from application.services.pair_generation import StrategyRegistry
+from application.services.pair_generation.generic_rank_strategy import (
+    GenericRankStrategy,
 )
+from application.services.parallel import map_chunksize, resolve_workers
 
 plt.switch_backend("Agg")
 
 OUTPUT_DIR = Path(__file__).resolve().parent.parent / "analysis_output"
+DEFAULT_STRATEGY = "l1_vs_leontief_rank_comparison"
 logger = logging.getLogger("validation")
 
 
@@ -43,7 +55,7 @@ def _parse_args() -> argparse.Namespace:
         "--mode",
         choices=["single", "global", "logic_check"],
         default="single",
-        help="Analysis mode: 'single' (Norm check), 'logic_check' (Sum vs Min), 'global' (Robustness).",
+        help="Analysis mode: 'single' (Norm check), 'logic_check' (Strategy vs Min), 'global' (Robustness).",
     )
     parser.add_argument(
         "--user-vector",
@@ -52,6 +64,29 @@ def _parse_args() -> argparse.Namespace:
         default=[50, 30, 20],
         help="User vector for single/logic mode (integers summing to 100)",
     )
+    parser.add_argument(
+        "--strategy",
+        default=DEFAULT_STRATEGY,
+        help="Registered rank strategy to validate.",
+    )
+    parser.add_argument(
+        "--dimensions",
+        type=int,
+        default=3,
+        help="Number of budget subjects for global mode.",
+    )
+    parser.add_argument(
+        "--step", type=int, default=5, help="User vector grid step (global mode)."
+    )
+    parser.add_argument(
+        "--num-pairs", type=int, default=10, help="Pairs per user vector."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for global mode (default: CPU count).",
+    )
     return parser.parse_args()
 
 
@@ -208,66 +243,89 @@ def _compute_average_sum(pairs: list[dict]) -> Optional[float]:
     return total_sum / len(pairs)
 
 
+def _rank_space(strategy_name: str, user_vector: tuple, num_pairs: int) -> tuple:
+    """
+    The strategy's pairs for one user vector, located in the pool it used.
+
+    The pool is the strategy's simplex grid at the floor (min_component) it
+    ended up using, so the ranks are exactly those its pairs were chosen on.
+
+    Returns:
+        tuple: (vector_pool, scores_a, scores_b, ranks_a, ranks_b, pairs) where
+        scores and ranks are per pool row (higher is better) and pairs are
+        (a_idx, b_idx) with a_idx the vector better on utility model A.
+
+    Raises:
+        ValueError: If the strategy is not rank-based.
+        UnsuitableForStrategyError: If the strategy finds no pairs.
+    """
+    strategy = StrategyRegistry.get_strategy(strategy_name)
+    if not isinstance(strategy, GenericRankStrategy):
+        raise ValueError(f"Strategy '{strategy_name}' is not rank-based")
+
+    pairs = strategy.generate_pairs(user_vector, num_pairs, len(user_vector))
+    vector_pool = get_simplex_matrix(
+        num_variables=len(user_vector),
+        side_length=100,
+        step=strategy.grid_step,
+        min_value=pairs[0]["__metadata__"]["relaxed_min_component"],
+    )
+    scores_a = strategy.utility_model_a.calculate_batch(user_vector, vector_pool)
+    scores_b = strategy.utility_model_b.calculate_batch(user_vector, vector_pool)
+    ranks_a, ranks_b = strategy._compute_ranks(scores_a, scores_b)
+
+    pool_index = {tuple(row): idx for idx, row in enumerate(vector_pool.tolist())}
+    pair_indices = []
+    for pair in pairs:
+        vector_a, vector_b = (
+            value for key, value in pair.items() if key != "__metadata__"
+        )
+        pair_indices.append((pool_index[tuple(vector_a)], pool_index[tuple(vector_b)]))
+
+    return vector_pool, scores_a, scores_b, ranks_a, ranks_b, pair_indices
+
+
 # ============================================================================
 # MODE 1: SINGLE USER ANALYSIS (Norm Check)
 # ============================================================================
 
 
-def analyze_single_user(user_vector: tuple) -> None:
+def analyze_single_user(
+    user_vector: tuple, strategy_name: str = DEFAULT_STRATEGY, num_pairs: int = 10
+) -> None:
     """Generate pairs for one user and compare Normalization methods."""
-    strategy = OptimizationMetricsRankStrategy()
-    vector_size = len(user_vector)
-
-    logger.info(f" Analyzing User Vector: {user_vector}")
+    logger.info(f" Analyzing User Vector: {user_vector} ({strategy_name})")
 
     try:
-        # 1. Generate ONE common pool
-        vector_pool = list(
-            strategy.generate_vector_pool(strategy.POOL_SIZE, vector_size)
-        )
-
-        # 2. Calculate Raw Metrics
-        l1_distances = np.array(
-            [strategy._calculate_l1_distance(user_vector, v) for v in vector_pool]
-        )
-        leontief_ratios = np.array(
-            [strategy._calculate_leontief_ratio(user_vector, v) for v in vector_pool]
+        # 1. The strategy's pairs, pool and rank normalization
+        vector_pool, scores_a, scores_b, ranks_a, ranks_b, rank_pairs = _rank_space(
+            strategy_name, user_vector, num_pairs
         )
-
-        # --- METHOD A: RANK NORMALIZATION (Standard) ---
-        l1_ranks = (len(l1_distances) - rankdata(l1_distances) + 1) / len(l1_distances)
-        leontief_ranks = rankdata(leontief_ratios) / len(l1_distances)
-
-        rank_pairs_meta = strategy._find_complementary_pairs(
-            vector_pool, l1_ranks, leontief_ranks, strategy.TARGET_PAIRS
-        )
-        logger.info(f"\n ✅ [Rank Strategy] Found {len(rank_pairs_meta)} pairs")
+        logger.info(f"\n ✅ [Rank Strategy] Found {len(rank_pairs)} pairs")
 
         # Log details for Rank pairs
         logger.info("    --- Rank Selected Pairs ---")
-        for i, (idx_a, idx_b, _, _, _) in enumerate(rank_pairs_meta):
+        for i, (idx_a, idx_b) in enumerate(rank_pairs):
             logger.info(
-                f"    Pair {i+1}: L1 Rank {l1_ranks[idx_a]:.3f} vs {l1_ranks[idx_b]:.3f}"
+                f"    Pair {i+1}: A Rank {ranks_a[idx_a]:.3f} vs {ranks_a[idx_b]:.3f}"
             )
 
-        # --- METHOD B: MIN-MAX NORMALIZATION (Brute Force) ---
-        l1_mm = normalize_minmax(l1_distances, invert=True)
-        leo_mm = normalize_minmax(leontief_ratios, invert=False)
+        # 2. MIN-MAX NORMALIZATION (Brute Force) of the same utility scores
+        mm_a = normalize_minmax(scores_a)
+        mm_b = normalize_minmax(scores_b)
 
-        mm_pairs_meta = _find_best_pairs_brute_force(
-            l1_mm, leo_mm, strategy.TARGET_PAIRS
-        )
+        mm_pairs_meta = _find_best_pairs_brute_force(mm_a, mm_b, num_pairs)
         logger.info(f"\n ✅ [Min-Max Strategy] Found {len(mm_pairs_meta)} pairs")
 
         # Visualization
         _compare_normalization_plots(
             user_vector,
             vector_pool,
-            l1_ranks,
-            leontief_ranks,
-            rank_pairs_meta,
-            l1_mm,
-            leo_mm,
+            ranks_a,
+            ranks_b,
+            rank_pairs,
+            mm_a,
+            mm_b,
             mm_pairs_meta,
         )
 
@@ -296,7 +354,7 @@ def _compare_normalization_plots(
     ax1.scatter(rank_l1, rank_leo, c="gray", s=5, alpha=0.1, label="Pool")
 
     # Rank Selections (Red)
-    for idx_a, idx_b, _, _, _ in rank_pairs:
+    for idx_a, idx_b, *_ in rank_pairs:
         ax1.plot(
             [rank_l1[idx_a], rank_l1[idx_b]],
             [rank_leo[idx_a], rank_leo[idx_b]],
@@ -315,7 +373,7 @@ def _compare_normalization_plots(
 
     # Min-Max Selections projected (Blue Dashed)
     mm_label_added = False
-    for idx_a, idx_b, _, _, _ in mm_pairs:
+    for idx_a, idx_b, *_ in mm_pairs:
         if tuple(sorted((idx_a, idx_b))) in set_rank.intersection(set_mm):
             continue
         label = "Min-Max Selected" if not mm_label_added else ""
@@ -342,7 +400,7 @@ def _compare_normalization_plots(
     ax2.scatter(mm_l1, mm_leo, c="gray", s=5, alpha=0.1, label="Pool")
 
     # Min-Max Selections (Blue)
-    for idx_a, idx_b, _, _, _ in mm_pairs:
+    for idx_a, idx_b, *_ in mm_pairs:
         ax2.plot(
             [mm_l1[idx_a], mm_l1[idx_b]],
             [mm_leo[idx_a], mm_leo[idx_b]],
@@ -361,7 +419,7 @@ def _compare_normalization_plots(
 
     # Rank Selections projected (Red Dashed)
     rank_label_added = False
-    for idx_a, idx_b, _, _, _ in rank_pairs:
+    for idx_a, idx_b, *_ in rank_pairs:
         if tuple(sorted((idx_a, idx_b))) in set_rank.intersection(set_mm):
             continue
         label = "Rank Selected" if not rank_label_added else ""
@@ -385,7 +443,8 @@ def _compare_normalization_plots(
     ax2.set_ylabel("Leontief Min-Max Score")
 
     fig.suptitle(
-        f"Normalization Impact: {user_vector} | Overlap: {overlap}/10", fontsize=16
+        f"Normalization Impact: {user_vector} | Overlap: {overlap}/{len(rank_pairs)}",
+        fontsize=16,
     )
     plt.tight_layout()
     plt.savefig(OUTPUT_DIR / "selection_logic_comparison.png", dpi=150)
@@ -393,31 +452,25 @@ def _compare_normalization_plots(
 
 
 # ============================================================================
-# MODE 2: LOGIC CHECK (Sum vs Min on Rank Data)
+# MODE 2: LOGIC CHECK (Strategy vs Min on Rank Data)
 # ============================================================================
 
 
-def analyze_logic_comparison(user_vector: tuple) -> None:
-    """Compares 'Sum Score' vs 'Min Score' strategies on Rank Data."""
-    strategy = OptimizationMetricsRankStrategy()
-    logger.info(f" Analyzing Logic (Sum vs Min) for: {user_vector}")
+def analyze_logic_comparison(
+    user_vector: tuple, strategy_name: str = DEFAULT_STRATEGY, num_pairs: int = 10
+) -> None:
+    """Compares the strategy's pair scoring vs 'Min Score' on its Rank Data."""
+    logger.info(f" Analyzing Logic (Strategy vs Min) for: {user_vector}")
 
     # 1. Setup Data
-    pool = list(strategy.generate_vector_pool(strategy.POOL_SIZE, 3))
-    l1_raw = np.array([strategy._calculate_l1_distance(user_vector, v) for v in pool])
-    leo_raw = np.array(
-        [strategy._calculate_leontief_ratio(user_vector, v) for v in pool]
+    pool_matrix, _, _, l1_ranks, leo_ranks, rank_pairs = _rank_space(
+        strategy_name, user_vector, num_pairs
     )
+    pool = [tuple(row) for row in pool_matrix.tolist()]
 
-    l1_ranks = (len(l1_raw) - rankdata(l1_raw) + 1) / len(l1_raw)
-    leo_ranks = rankdata(leo_raw) / len(l1_raw)
-
-    # 2. Strategy A: CURRENT (Sum + Ratio Filter)
-    # Using the class method to ensure exact reproduction of production logic
-    pairs_sum_meta = strategy._find_complementary_pairs(pool, l1_ranks, leo_ranks, 10)
+    # 2. Strategy A: CURRENT (the strategy's own pairs)
     pairs_sum = []
-    for p in pairs_sum_meta:
-        idx_a, idx_b = p[0], p[1]
+    for idx_a, idx_b in rank_pairs:
         gain_l1 = l1_ranks[idx_a] - l1_ranks[idx_b]
         gain_leo = leo_ranks[idx_b] - leo_ranks[idx_a]
         pairs_sum.append(
@@ -429,7 +482,7 @@ def analyze_logic_comparison(user_vector: tuple) -> None:
         )
 
     # 3. Strategy B: Alternative (Max Min, No Filter)
-    pairs_min = _find_pairs_max_min(l1_ranks, leo_ranks, 10)
+    pairs_min = _find_pairs_max_min(l1_ranks, leo_ranks, num_pairs)
 
     # 4. Analysis
     set_sum = set(tuple(sorted(p["indices"])) for p in pairs_sum)
@@ -444,14 +497,14 @@ def analyze_logic_comparison(user_vector: tuple) -> None:
     ]
     overlap_pairs = [p for p in pairs_sum if tuple(sorted(p["indices"])) in set_min]
 
-    logger.info(f" 📊 Logic Overlap: {overlap}/10 pairs")
+    logger.info(f" 📊 Logic Overlap: {overlap}/{len(pairs_sum)} pairs")
 
     # 5. Plot
     OUTPUT_DIR.mkdir(exist_ok=True)
     fig, ax = plt.subplots(figsize=(10, 10))
     ax.scatter(l1_ranks, leo_ranks, c="gray", s=1, alpha=0.1)
 
-    # Plot Sum Strategy (Red)
+    # Plot the strategy's pairs (Red)
     for p in pairs_sum:
         a, b = p["indices"]
         ax.plot(
@@ -460,7 +513,7 @@ def analyze_logic_comparison(user_vector: tuple) -> None:
             c="red",
             alpha=0.6,
             linewidth=2,
-            label="Current (Sum)",
+            label="Current (Strategy)",
         )
         ax.scatter(
             [l1_ranks[a], l1_ranks[b]], [leo_ranks[a], leo_ranks[b]], c="red", s=30
@@ -490,7 +543,7 @@ def analyze_logic_comparison(user_vector: tuple) -> None:
     by_label = dict(zip(labels, handles))
     ax.legend(by_label.values(), by_label.keys())
 
-    ax.set_title(f"Logic Check: Sum vs Min | Overlap: {overlap}/10")
+    ax.set_title(f"Logic Check: Strategy vs Min | Overlap: {overlap}/{len(pairs_sum)}")
     ax.set_xlabel("L1 Rank")
     ax.set_ylabel("Leo Rank")
     ax.plot([0, 1], [0, 1], "k--", alpha=0.1)
@@ -501,7 +554,7 @@ def analyze_logic_comparison(user_vector: tuple) -> None:
 
     # Log details
     if sum_exclusive_pairs or min_exclusive_pairs:
-        logger.info("\n--- EXCLUSIVE TO SUM (Current) ---")
+        logger.info("\n--- EXCLUSIVE TO STRATEGY (Current) ---")
         for p in sum_exclusive_pairs:
             idx_a, idx_b = p["indices"]
             g1, g2 = p["gains"]
@@ -523,8 +576,8 @@ def analyze_logic_comparison(user_vector: tuple) -> None:
 
     logger.info("\n--- AVERAGE SUM BY GROUP ---")
     group_definitions = [
-        ("Current Strategy (Sum total)", pairs_sum),
-        ("Tested Strategy (Min total)", pairs_min),
+        ("Current Strategy", pairs_sum),
+        ("Tested Strategy (Min)", pairs_min),
         ("Overlap (Both strategies)", overlap_pairs),
         ("Exclusive Current", sum_exclusive_pairs),
         ("Exclusive Tested", min_exclusive_pairs),
@@ -543,68 +596,200 @@ def analyze_logic_comparison(user_vector: tuple) -> None:
 # ============================================================================
 
 
-def generate_all_valid_user_vectors() -> list[tuple]:
-    valid_vectors = []
-    step = 5
-    for x in range(0, 105, step):
-        for y in range(0, 105 - x, step):
-            z = 100 - x - y
-            vector = (x, y, z)
-            if sum(1 for v in vector if v > 0) >= 2:
-                valid_vectors.append(vector)
-    return valid_vectors
+def generate_all_valid_user_vectors(dimensions: int = 3, step: int = 5) -> list[tuple]:
+    """All grid vectors summing to 100 with at least two positive components."""
+    matrix = get_simplex_matrix(num_variables=dimensions, side_length=100, step=step)
+    matrix = matrix[(matrix > 0).sum(axis=1) >= 2]
+    return [tuple(row) for row in matrix.tolist()]
 
 
-def analyze_global_robustness():
-    """Runs simulation across all valid user vectors."""
-    strategy = OptimizationMetricsRankStrategy()
-    strategy.POOL_SIZE = 5151
-
-    all_vectors = generate_all_valid_user_vectors()
-    logger.info(f" Generated {len(all_vectors)} valid user vectors.")
-    pool_list = list(strategy.generate_vector_pool(strategy.POOL_SIZE, 3))
-
-    total_pairs_generated = 0
-    level_distribution = Counter()
+def _robustness_output_path(
+    strategy_name: str, dimensions: int, step: int, num_pairs: int
+) -> Path:
+    return (
+        OUTPUT_DIR
+        / f"robustness_{strategy_name}_{dimensions}d_step{step}_n{num_pairs}.jsonl"
+    )
 
-    for i, user_vec in enumerate(all_vectors):
-        if i % 20 == 0:
-            print(f" Processing vector {i}/{len(all_vectors)}...", end="\r")
 
-        l1_dists = np.array(
-            [strategy._calculate_l1_distance(user_vec, v) for v in pool_list]
+def _evaluate_user_vector(task: tuple) -> dict:
+    """Worker: generate pairs for one user vector and summarize the result."""
+    strategy_name, user_vector, num_pairs = task
+    strategy = StrategyRegistry.get_strategy(strategy_name)
+    record = {"vector": list(user_vector)}
+    start = time.perf_counter()
+    try:
+        pairs = strategy.generate_pairs(user_vector, num_pairs, len(user_vector))
+    except (UnsuitableForStrategyError, ValueError) as e:
+        record.update(status="unsuitable", error=str(e), pairs=0)
+    else:
+        scores = [pair["__metadata__"]["score"] for pair in pairs]
+        record.update(
+            status="ok",
+            pairs=len(pairs),
+            min_score=min(scores, default=None),
+            mean_score=round(sum(scores) / len(scores), 4) if scores else None,
+            relaxed_min_component=pairs[0]["__metadata__"].get("relaxed_min_component"),
         )
-        leo_ratios = np.array(
-            [strategy._calculate_leontief_ratio(user_vec, v) for v in pool_list]
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def _read_robustness_records(path: Path) -> list[dict]:
+    """Records already written to a sweep file (a truncated last line is dropped)."""
+    if not path.exists():
+        return []
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return records
+
+
+def run_robustness_sweep(
+    strategy_name: str,
+    dimensions: int = 3,
+    step: int = 5,
+    num_pairs: int = 10,
+    workers: Optional[int] = None,
+    output_path: Optional[Path] = None,
+    vectors: Optional[list[tuple]] = None,
+) -> list[dict]:
+    """
+    Generate pairs for every valid user vector of a grid, in parallel.
+
+    One JSON line per user vector is appended to `output_path` as soon as it
+    is computed, so an interrupted sweep resumes where it stopped when run
+    again with the same arguments.
+
+    Args:
+        strategy_name: Registered GenericRankStrategy to validate.
+        dimensions: Number of budget subjects (3, 4, 5, ...).
+        step: Grid step of the user vectors.
+        num_pairs: Pairs to generate per user vector.
+        workers: Worker processes (defaults to the CPU count; 1 runs in-process).
+        output_path: Results file (defaults to one per sweep in OUTPUT_DIR).
+        vectors: Optional subset of user vectors.
+
+    Returns:
+        list[dict]: The records of all user vectors, including resumed ones.
+
+    Raises:
+        ValueError: If the strategy is not rank-based.
+    """
+    strategy = StrategyRegistry.get_strategy(strategy_name)
+    if not isinstance(strategy, GenericRankStrategy):
+        raise ValueError(f"Strategy '{strategy_name}' is not rank-based")
+
+    if vectors is None:
+        vectors = generate_all_valid_user_vectors(dimensions, step)
+    if output_path is None:
+        output_path = _robustness_output_path(
+            strategy_name, dimensions, step, num_pairs
         )
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    records = _read_robustness_records(output_path)
+    done = {tuple(record["vector"]) for record in records}
+    tasks = [
+        (strategy_name, tuple(vector), num_pairs)
+        for vector in vectors
+        if tuple(vector) not in done
+    ]
+    logger.info(
+        f" {len(vectors)} user vectors, {len(vectors) - len(tasks)} already done, "
+        f"results in {output_path}"
+    )
 
-        n = len(pool_list)
-        l1_ranks = (n - rankdata(l1_dists) + 1) / n
-        leo_ranks = rankdata(leo_ratios) / n
-
-        pairs = strategy._find_complementary_pairs(
-            pool_list, l1_ranks, leo_ranks, strategy.TARGET_PAIRS
-        )
+    # Rewrite the valid records so a truncated last line is dropped
+    with open(output_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
 
-        for _, _, level, _, _ in pairs:
-            level_distribution[level] += 1
-            total_pairs_generated += 1
+    workers = resolve_workers(workers)
+    if workers == 1:
+        executor = None
+        outputs = map(_evaluate_user_vector, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunksize = map_chunksize(len(tasks), workers)
+        outputs = executor.map(_evaluate_user_vector, tasks, chunksize=chunksize)
 
-    print("\n Simulation complete.")
-    _plot_global_stats(level_distribution, total_pairs_generated, len(all_vectors))
+    try:
+        with open(output_path, "a", encoding="utf-8") as f:
+            for i, record in enumerate(outputs, start=1):
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                records.append(record)
+                if i % 100 == 0:
+                    logger.info(f" Processed {i}/{len(tasks)} user vectors...")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return records
+
+
+def summarize_robustness(records: list[dict]) -> dict:
+    """Aggregate sweep records: failures, floor relaxation and pair scores."""
+    ok = [record for record in records if record["status"] == "ok"]
+    min_scores = np.array([record["min_score"] for record in ok], dtype=float)
+    return {
+        "vectors": len(records),
+        "ok": len(ok),
+        "unsuitable": len(records) - len(ok),
+        "floor_distribution": Counter(record["relaxed_min_component"] for record in ok),
+        "min_score_p05": float(np.percentile(min_scores, 5)) if ok else None,
+        "min_score_median": float(np.median(min_scores)) if ok else None,
+    }
+
+
+def analyze_global_robustness(
+    strategy_name: str = DEFAULT_STRATEGY,
+    dimensions: int = 3,
+    step: int = 5,
+    num_pairs: int = 10,
+    workers: Optional[int] = None,
+) -> dict:
+    """Runs (or resumes) the sweep across all valid user vectors and plots it."""
+    records = run_robustness_sweep(strategy_name, dimensions, step, num_pairs, workers)
+    summary = summarize_robustness(records)
+    logger.info(
+        f" Simulation complete: {summary['ok']}/{summary['vectors']} vectors ok, "
+        f"{summary['unsuitable']} unsuitable, median min score "
+        f"{summary['min_score_median']}"
+    )
+    _plot_global_stats(
+        summary["floor_distribution"],
+        summary["ok"],
+        summary["vectors"],
+        filename=f"global_floor_distribution_{strategy_name}_{dimensions}d.png",
+    )
+    return summary
 
 
-def _plot_global_stats(distribution: Counter, total_pairs: int, total_vectors: int):
+def _plot_global_stats(
+    distribution: Counter,
+    total: int,
+    total_vectors: int,
+    filename: str = "global_level_distribution.png",
+):
     OUTPUT_DIR.mkdir(exist_ok=True)
     levels = sorted(distribution.keys())
     counts = [distribution[lev] for lev in levels]
-    percentages = [c / total_pairs * 100 for c in counts]
+    percentages = [c / total * 100 for c in counts]
 
     fig, ax = plt.subplots(figsize=(10, 6))
-    bars = ax.bar(levels, percentages, color="#e74c3c", edgecolor="black")
+    bars = ax.bar(
+        [str(lev) for lev in levels], percentages, color="#e74c3c", edgecolor="black"
+    )
     ax.set_title(f"Global Robustness Analysis ({total_vectors} vectors)")
     ax.set_ylabel("Frequency (%)")
-    ax.set_xlabel("Level")
+    ax.set_xlabel("Relaxed min component")
     for bar in bars:
         ax.text(
             bar.get_x() + bar.get_width() / 2,
@@ -614,7 +799,8 @@ def _plot_global_stats(distribution: Counter, total_pairs: int, total_vectors: i
             va="bottom",
         )
 
-    plt.savefig(OUTPUT_DIR / "global_level_distribution.png", dpi=150)
+    plt.savefig(OUTPUT_DIR / filename, dpi=150)
+    plt.close(fig)
     logger.info("Saved global distribution plot.")
 
 
@@ -623,8 +809,10 @@ if __name__ == "__main__":
     args = _parse_args()
 
     if args.mode == "single":
-        analyze_single_user(tuple(args.user_vector))
+        analyze_single_user(tuple(args.user_vector), args.strategy, args.num_pairs)
     elif args.mode == "logic_check":
-        analyze_logic_comparison(tuple(args.user_vector))
+        analyze_logic_comparison(tuple(args.user_vector), args.strategy, args.num_pairs)
     else:
-        analyze_global_robustness()
+        analyze_global_robustness(
+            args.strategy, args.dimensions, args.step, args.num_pairs, args.workers
+        )
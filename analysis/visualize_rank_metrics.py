@@ -1,43 +1,93 @@
 """
-Enhanced visualization suite for OptimizationMetricsRankStrategy.
+Enhanced visualization suite for the L1 vs Leontief rank strategy
+(GenericRankStrategy, registered as "l1_vs_leontief_rank_comparison").
 
 Provides four types of analysis:
 1. Basic metric space visualization (rank vs min-max normalization)
-2. Pair selection analysis with quality metrics and relaxation effectiveness
+2. Pair selection analysis with quality metrics and floor relaxation
 3. Simplex coverage validation
 4. Multi-vector comparison across different user vector types
 
-PURPOSE: Help determine optimal values for POOL_SIZE, TARGET_PAIRS, and RELAXATION_LEVELS
+PURPOSE: Help tune the grid step, min_component floor and number of pairs
 by analyzing algorithm behavior and pair informativeness.
+
+Metric computation (pool, raw and normalized metrics, pair selection) is
+separate from rendering. The candidate pool is the strategy's deterministic
+simplex grid, so computed metrics are cached in analysis_output/metrics_cache,
+keyed by the user vector and the source of the strategy, the utility models
+and the compute functions: re-rendering after a plotting change skips the
+computation and a strategy tweak recomputes. Figures are rendered in
+parallel worker processes (--workers).
 """
 
 import argparse
+import hashlib
+import inspect
+import json
 import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
 
-from application.services.pair_generation.optimization_metrics_rank import (
-    OptimizationMetricsRankStrategy,
-    rankdata,
+from application.exceptions import UnsuitableForStrategyError
+from application.services.algorithms import math_utils, utility_models
+from application.services.algorithms.math_utils import get_simplex_matrix
+from application.services.algorithms.utility_models import (
+    L1UtilityModel,
+    LeontiefUtilityModel,
+)
+from application.services.pair_generation import (
+    StrategyRegistry,
+    generic_rank_strategy,
+    rank_strategies,
+)
+from application.services.pair_generation.generic_rank_strategy import (
+    GenericRankStrategy,
 )
+from application.services.pair_generation.ranked_pairs_cache import code_version
+from application.services.parallel import resolve_workers
 
 plt.switch_backend("Agg")  # Ensure rendering works in headless Docker envs
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 OUTPUT_DIR = PROJECT_ROOT / "analysis_output"
+METRICS_CACHE_DIR = OUTPUT_DIR / "metrics_cache"
 DEFAULT_USER_VECTOR = (35, 35, 30)  # Must be multiples of 5 and sum to 100
 
+# The audited strategy and the number of pairs it is asked for
+STRATEGY_NAME = "l1_vs_leontief_rank_comparison"
+NUM_PAIRS = 10
+
+# Bump when the layout of cached metrics changes
+METRICS_FORMAT_VERSION = 2
+
+# Raised for a vector the strategy cannot serve
+METRICS_ERRORS = (ValueError, UnsuitableForStrategyError)
+
+# Only include VALID test vectors (>=2 positive dims, multiples of 5)
+COMPARISON_VECTORS = [
+    ((35, 35, 30), "Balanced 3D"),
+    ((40, 30, 30), "Most Frequent OIA 3D"),
+    ((70, 20, 10), "Skewed 3D"),
+    ((60, 30, 10), "Moderately Skewed 3D"),
+    ((40, 30, 30), "Slight Imbalance 3D"),
+    ((50, 25, 25), "2:1:1 Ratio 3D"),
+    ((25, 25, 25, 25), "Balanced 4D"),
+    ((60, 20, 10, 10), "Skewed 4D"),
+    ((45, 25, 20, 10), "Mixed Skew 4D"),
+]
+
 logger = logging.getLogger("vector_pool_visualization")
 
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description=(
-            "Comprehensive visualization suite for " "OptimizationMetricsRankStrategy"
-        )
+        description="Visualization suite for the L1 vs Leontief rank strategy"
     )
     parser.add_argument(
         "--user-vector",
@@ -53,10 +103,16 @@ def _parse_args() -> argparse.Namespace:
         ),
     )
     parser.add_argument(
-        "--seed",
+        "--workers",
         type=int,
         default=None,
-        help="Optional numpy.random seed for reproducible vector pools.",
+        help="Worker processes for computing metrics and rendering figures "
+        "(default: CPU count; 1 runs everything in-process).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute metrics instead of reading analysis_output/metrics_cache.",
     )
     parser.add_argument(
         "--mode",
@@ -79,36 +135,41 @@ def _ensure_output_dir() -> None:
 
 
 def _vector_pool_metrics(
-    strategy: OptimizationMetricsRankStrategy,
-    user_vector: Tuple[int, ...],
-) -> Tuple[np.ndarray, np.ndarray, Sequence[tuple]]:
-    """Generate vector pool and compute metrics."""
-    vector_size = len(user_vector)
-    vector_pool = list(strategy.generate_vector_pool(strategy.POOL_SIZE, vector_size))
-
-    l1_distances = np.array(
-        [strategy._calculate_l1_distance(user_vector, vec) for vec in vector_pool],
-        dtype=float,
+    strategy: GenericRankStrategy, user_vector: Tuple[int, ...], min_component: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The strategy's candidate grid at a given floor, with raw metrics.
+
+    The pool is built exactly like the strategy builds it, so pool row
+    indices match the pair indices of its ranking.
+    """
+    vector_pool = get_simplex_matrix(
+        num_variables=len(user_vector),
+        side_length=100,
+        step=strategy.grid_step,
+        min_value=min_component,
     )
-    leontief_ratios = np.array(
-        [strategy._calculate_leontief_ratio(user_vector, vec) for vec in vector_pool],
-        dtype=float,
+    if len(vector_pool) == 0:
+        raise ValueError("Vector pool is empty; cannot compute ranks.")
+
+    # The L1 model scores negative distances
+    l1_distances = -strategy.utility_model_a.calculate_batch(user_vector, vector_pool)
+    leontief_ratios = strategy.utility_model_b.calculate_batch(user_vector, vector_pool)
+    return (
+        np.asarray(l1_distances, dtype=float),
+        np.asarray(leontief_ratios, dtype=float),
+        vector_pool,
     )
-    return l1_distances, leontief_ratios, vector_pool
 
 
 def _compute_rank_metrics(
-    l1_distances: np.ndarray, leontief_ratios: np.ndarray
+    strategy: GenericRankStrategy,
+    l1_distances: np.ndarray,
+    leontief_ratios: np.ndarray,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-    """Compute rank-normalized metrics and discrepancies."""
-    n = len(l1_distances)
-    if n == 0:
-        raise ValueError("Vector pool is empty; cannot compute ranks.")
-
-    # Match strategy's rank computation exactly
-    l1_raw_ranks = rankdata(l1_distances, method="average")
-    l1_norm = (n - l1_raw_ranks + 1) / n
-    leontief_norm = rankdata(leontief_ratios, method="average") / n
+    """Rank-normalized metrics (higher is better) and their discrepancies."""
+    # The strategy's own normalization, applied to its utility scores
+    l1_norm, leontief_norm = strategy._compute_ranks(-l1_distances, leontief_ratios)
     discrepancies = l1_norm - leontief_norm
 
     return l1_norm, leontief_norm, discrepancies
@@ -135,6 +196,179 @@ def _compute_minmax_metrics(
     return l1_minmax, leo_minmax
 
 
+# ============================================================================
+# METRICS: COMPUTATION AND DISK CACHE
+# ============================================================================
+
+
+def _create_strategy() -> GenericRankStrategy:
+    strategy = StrategyRegistry.get_strategy(STRATEGY_NAME)
+    if not (
+        isinstance(strategy, GenericRankStrategy)
+        and isinstance(strategy.utility_model_a, L1UtilityModel)
+        and isinstance(strategy.utility_model_b, LeontiefUtilityModel)
+    ):
+        raise ValueError(f"Strategy '{STRATEGY_NAME}' is not an L1 vs Leontief rank")
+    return strategy
+
+
+def _relaxation_floors(strategy: GenericRankStrategy) -> List[int]:
+    """min_component floors the strategy may relax through, strictest first."""
+    return list(range(strategy.min_component, -1, -strategy.RELAXATION_STEP))
+
+
+def compute_vector_metrics(user_vector: Tuple[int, ...]) -> Dict[str, Any]:
+    """
+    Compute everything the figures need for one user vector, without plotting.
+
+    Pairs come from the strategy's generate_pairs; the pool and metrics are
+    those of the floor (min_component) the strategy ended up using.
+
+    Returns:
+        Dict with the vector pool (2-D array), raw, rank and min-max metrics,
+        discrepancies, pairs_by_level (keyed by 1-based index into
+        relaxation_levels, the floors from strictest to loosest).
+
+    Raises:
+        ValueError: If the user vector is invalid.
+        UnsuitableForStrategyError: If the strategy finds no pairs for it.
+    """
+    _validate_user_vector(user_vector)
+
+    strategy = _create_strategy()
+    pairs = strategy.generate_pairs(user_vector, NUM_PAIRS, len(user_vector))
+    floor = pairs[0]["__metadata__"]["relaxed_min_component"]
+
+    l1_distances, leontief_ratios, vector_pool = _vector_pool_metrics(
+        strategy, user_vector, floor
+    )
+    l1_norm, leontief_norm, discrepancies = _compute_rank_metrics(
+        strategy, l1_distances, leontief_ratios
+    )
+    l1_minmax, leo_minmax = _compute_minmax_metrics(l1_distances, leontief_ratios)
+
+    floors = _relaxation_floors(strategy)
+    pairs_by_level = {level: [] for level in range(1, len(floors) + 1)}
+    pairs_by_level[floors.index(floor) + 1] = _find_pairs_with_metadata(
+        pairs,
+        vector_pool,
+        l1_distances,
+        leontief_ratios,
+        l1_norm,
+        leontief_norm,
+        discrepancies,
+    )
+
+    return {
+        "user_vector": tuple(user_vector),
+        "grid_step": strategy.grid_step,
+        "relaxation_levels": floors,
+        "vector_pool": vector_pool,
+        "l1_distances": l1_distances,
+        "leontief_ratios": leontief_ratios,
+        "l1_norm": l1_norm,
+        "leontief_norm": leontief_norm,
+        "discrepancies": discrepancies,
+        "l1_minmax": l1_minmax,
+        "leo_minmax": leo_minmax,
+        "pairs_by_level": pairs_by_level,
+    }
+
+
+# Functions whose source determines the cached metrics
+_COMPUTE_FUNCTIONS = (
+    compute_vector_metrics,
+    _create_strategy,
+    _relaxation_floors,
+    _vector_pool_metrics,
+    _compute_rank_metrics,
+    _compute_minmax_metrics,
+)
+
+
+def _metrics_cache_path(user_vector: Tuple[int, ...]) -> Path:
+    compute_source = "".join(
+        inspect.getsource(function)
+        for function in (*_COMPUTE_FUNCTIONS, _find_pairs_with_metadata)
+    )
+    version = code_version(
+        generic_rank_strategy,
+        rank_strategies,
+        utility_models,
+        math_utils,
+        config_version=(
+            f"{METRICS_FORMAT_VERSION}:{STRATEGY_NAME}:{NUM_PAIRS}:{compute_source}"
+        ),
+    )
+    payload = json.dumps([version, [int(v) for v in user_vector]])
+    key = hashlib.sha256(payload.encode()).hexdigest()[:24]
+    return METRICS_CACHE_DIR / f"{key}.npz"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _save_metrics(path: Path, metrics: Dict[str, Any]) -> None:
+    """Write metrics atomically: arrays as npz members, the rest as JSON."""
+    arrays = {k: v for k, v in metrics.items() if isinstance(v, np.ndarray)}
+    extra = {k: v for k, v in metrics.items() if k not in arrays}
+    extra["pairs_by_level"] = {
+        str(level): [list(pair) for pair in pairs]
+        for level, pairs in extra["pairs_by_level"].items()
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".npz.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            meta = json.dumps(extra, default=_json_default)
+            np.savez(f, _meta=np.array(meta), **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _load_metrics(path: Path) -> Dict[str, Any]:
+    with np.load(path, allow_pickle=False) as data:
+        metrics = {name: data[name] for name in data.files if name != "_meta"}
+        extra = json.loads(str(data["_meta"]))
+    extra["user_vector"] = tuple(extra["user_vector"])
+    extra["pairs_by_level"] = {
+        int(level): [tuple(pair) for pair in pairs]
+        for level, pairs in extra["pairs_by_level"].items()
+    }
+    metrics.update(extra)
+    return metrics
+
+
+def load_vector_metrics(
+    user_vector: Tuple[int, ...], use_cache: bool = True
+) -> Dict[str, Any]:
+    """compute_vector_metrics, served from the disk cache when possible."""
+    if not use_cache:
+        return compute_vector_metrics(user_vector)
+
+    path = _metrics_cache_path(user_vector)
+    if path.exists():
+        try:
+            return _load_metrics(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable metrics cache {path}: {e}")
+
+    metrics = compute_vector_metrics(user_vector)
+    try:
+        _save_metrics(path, metrics)
+    except OSError as e:
+        logger.warning(f"Could not cache metrics in {path}: {e}")
+    return metrics
+
+
 # ============================================================================
 # MODE 1: BASIC METRIC SPACE VISUALIZATION (ENHANCED)
 # ============================================================================
@@ -340,33 +574,26 @@ def _plot_normalization_comparison(
 
 
 def visualize_basic_metrics(
-    user_vector: Tuple[int, ...], seed: Optional[int] = None
+    user_vector: Tuple[int, ...], use_cache: bool = True
 ) -> None:
     """Generate basic metric space visualizations."""
-    if seed is not None:
-        np.random.seed(seed)
-
-    _validate_user_vector(user_vector)
-
-    strategy = OptimizationMetricsRankStrategy()
-    strategy._validate_vector(user_vector, len(user_vector))
-
-    l1_distances, leontief_ratios, vector_pool = _vector_pool_metrics(
-        strategy, user_vector
-    )
+    metrics = load_vector_metrics(user_vector, use_cache)
     logger.info(
-        "Vector pool size: %d (requested %d)",
-        len(vector_pool),
-        strategy.POOL_SIZE,
+        "Vector pool size: %d (grid step %d)",
+        len(metrics["vector_pool"]),
+        metrics["grid_step"],
     )
 
     _ensure_output_dir()
-    _plot_absolute_values(l1_distances, leontief_ratios, user_vector)
-
-    l1_norm, leontief_norm, _ = _compute_rank_metrics(l1_distances, leontief_ratios)
-    l1_minmax, leo_minmax = _compute_minmax_metrics(l1_distances, leontief_ratios)
+    _plot_absolute_values(
+        metrics["l1_distances"], metrics["leontief_ratios"], user_vector
+    )
     _plot_normalization_comparison(
-        l1_norm, leontief_norm, l1_minmax, leo_minmax, user_vector
+        metrics["l1_norm"],
+        metrics["leontief_norm"],
+        metrics["l1_minmax"],
+        metrics["leo_minmax"],
+        user_vector,
     )
 
 
@@ -376,63 +603,49 @@ def visualize_basic_metrics(
 
 
 def _find_pairs_with_metadata(
-    strategy: OptimizationMetricsRankStrategy,
-    vector_pool: List[tuple],
+    pairs: List[Dict[str, Any]],
+    vector_pool: np.ndarray,
     l1_distances: np.ndarray,
     leontief_ratios: np.ndarray,
     l1_norm: np.ndarray,
     leontief_norm: np.ndarray,
     discrepancies: np.ndarray,
-) -> Dict[int, List[Tuple[int, int, dict]]]:
-    """Find pairs at each relaxation level and return full metadata."""
-    # DYNAMIC INITIALIZATION: Creates buckets for 1..N levels based on strategy config
-    num_levels = len(strategy.RELAXATION_LEVELS)
-    pairs_by_level = {i: [] for i in range(1, num_levels + 1)}
-
-    used_indices = set()
-
-    for level_idx, (epsilon, balance_tol) in enumerate(strategy.RELAXATION_LEVELS, 1):
-        type_a_indices = np.where(discrepancies > epsilon)[0]
-        type_b_indices = np.where(discrepancies < -epsilon)[0]
-
-        type_a_available = [i for i in type_a_indices if i not in used_indices]
-        type_b_available = [i for i in type_b_indices if i not in used_indices]
-
-        for a_idx in type_a_available:
-            a_disc = discrepancies[a_idx]
-
-            for b_idx in type_b_available:
-                if b_idx in used_indices:
-                    continue
-
-                b_disc = discrepancies[b_idx]
+) -> List[Tuple[int, int, dict]]:
+    """
+    Locate the strategy's pairs in the vector pool and attach quality metadata.
 
-                if abs(b_disc) > 0.001:
-                    ratio = abs(a_disc) / abs(b_disc)
-                else:
-                    ratio = float("inf")
+    Each pair's first vector is the one better on L1 (Type A), the second
+    the one better on Leontief (Type B).
+    """
+    pool_index = {
+        tuple(int(v) for v in row): idx for idx, row in enumerate(vector_pool)
+    }
 
-                if 1 / balance_tol <= ratio <= balance_tol:
-                    # Compute pair quality metrics
-                    l1_sep = abs(l1_distances[a_idx] - l1_distances[b_idx])
-                    leo_sep = abs(leontief_ratios[a_idx] - leontief_ratios[b_idx])
+    result = []
+    for pair in pairs:
+        vector_a, vector_b = (
+            value for key, value in pair.items() if key != "__metadata__"
+        )
+        a_idx = pool_index[tuple(vector_a)]
+        b_idx = pool_index[tuple(vector_b)]
 
-                    metadata = {
-                        "a_idx": a_idx,
-                        "b_idx": b_idx,
-                        "a_disc": a_disc,
-                        "b_disc": b_disc,
-                        "balance_ratio": ratio,
-                        "l1_separation": l1_sep,
-                        "leo_separation": leo_sep,
-                    }
+        # Rank gains of each vector on the model it wins
+        gain_a = l1_norm[a_idx] - l1_norm[b_idx]
+        gain_b = leontief_norm[b_idx] - leontief_norm[a_idx]
 
-                    pairs_by_level[level_idx].append((a_idx, b_idx, metadata))
-                    used_indices.add(a_idx)
-                    used_indices.add(b_idx)
-                    break
+        metadata = {
+            "a_idx": a_idx,
+            "b_idx": b_idx,
+            "score": pair["__metadata__"]["score"],
+            "a_disc": discrepancies[a_idx],
+            "b_disc": discrepancies[b_idx],
+            "balance_ratio": gain_a / gain_b if gain_b > 0 else float("inf"),
+            "l1_separation": abs(l1_distances[a_idx] - l1_distances[b_idx]),
+            "leo_separation": abs(leontief_ratios[a_idx] - leontief_ratios[b_idx]),
+        }
+        result.append((a_idx, b_idx, metadata))
 
-    return pairs_by_level
+    return result
 
 
 def _plot_pair_quality_dashboard(
@@ -440,9 +653,14 @@ def _plot_pair_quality_dashboard(
     l1_norm: np.ndarray,
     leontief_norm: np.ndarray,
     user_vector: Tuple[int, ...],
-    strategy: OptimizationMetricsRankStrategy,
+    relaxation_levels: Sequence[int],
 ) -> None:
-    """Comprehensive pair quality analysis dashboard."""
+    """
+    Comprehensive pair quality analysis dashboard.
+
+    Levels are 1-based indices into relaxation_levels, the min_component
+    floors the strategy tries from strictest to loosest.
+    """
     fig = plt.figure(figsize=(16, 12))
     gs = fig.add_gridspec(3, 3, hspace=0.35, wspace=0.3)
 
@@ -475,11 +693,7 @@ def _plot_pair_quality_dashboard(
         6: "#34495e",  # Extra fallback
     }
     level_names = {
-        1: "Strict",
-        2: "Moderate",
-        3: "Loose",
-        4: "Minimal",
-        5: "Safety Net",
+        level: f"floor {floor}%" for level, floor in enumerate(relaxation_levels, 1)
     }
 
     # PLOT 1: Relaxation Level Usage (TOP LEFT)
@@ -519,23 +733,20 @@ def _plot_pair_quality_dashboard(
     balance_ratios = [m["balance_ratio"] for m in all_metadata]
     ax2.hist(balance_ratios, bins=15, edgecolor="black", alpha=0.7, color="#95a5a6")
 
-    # Add reference lines for tolerance levels
-    for level, (epsilon, tol) in enumerate(strategy.RELAXATION_LEVELS, 1):
-        ax2.axvline(
-            tol,
-            color=colors.get(level, "black"),
-            linestyle="--",
-            linewidth=1.5,
-            alpha=0.7,
-            label=f"L{level} limit: {tol}",
-        )
+    # Reference line for perfectly balanced gains
+    ax2.axvline(
+        1.0,
+        color="black",
+        linestyle="--",
+        linewidth=1.5,
+        alpha=0.7,
+        label="Balanced gains",
+    )
 
-    ax2.set_xlabel("Balance Ratio (|disc_A| / |disc_B|)", fontsize=10)
+    ax2.set_xlabel("Balance Ratio (L1 rank gain / Leontief rank gain)", fontsize=10)
     ax2.set_ylabel("Frequency", fontsize=10)
     ax2.set_title("Balance Ratio Distribution", fontsize=11, fontweight="bold")
-    # Legend might be too crowded if we have 5 levels, simplify if needed
-    if len(present_levels) <= 4:
-        ax2.legend(fontsize=8, loc="upper right")
+    ax2.legend(fontsize=8, loc="upper right")
     ax2.grid(True, alpha=0.3)
 
     # PLOT 3: Metric Separation Scatter (TOP RIGHT)
@@ -577,18 +788,12 @@ def _plot_pair_quality_dashboard(
         row, col = plot_slots[i]
         ax = fig.add_subplot(gs[row, col])
 
-        # Get strategy parameters safely
-        if level <= len(strategy.RELAXATION_LEVELS):
-            epsilon, balance_tol = strategy.RELAXATION_LEVELS[level - 1]
-        else:
-            epsilon, balance_tol = 0.0, 0.0
-
         # Plot all vectors in gray
         ax.scatter(l1_norm, leontief_norm, s=8, alpha=0.15, c="gray", edgecolors="none")
 
-        # Highlight epsilon boundaries
-        type_a_mask = (l1_norm - leontief_norm) > epsilon
-        type_b_mask = (l1_norm - leontief_norm) < -epsilon
+        # Vectors ranked better on L1 than on Leontief, and vice versa
+        type_a_mask = (l1_norm - leontief_norm) > 0
+        type_b_mask = (l1_norm - leontief_norm) < 0
 
         ax.scatter(
             l1_norm[type_a_mask],
@@ -597,7 +802,7 @@ def _plot_pair_quality_dashboard(
             alpha=0.3,
             c="lightblue",
             edgecolors="none",
-            label=f"Type A (disc>{epsilon})",
+            label="Type A (disc>0)",
         )
         ax.scatter(
             l1_norm[type_b_mask],
@@ -606,7 +811,7 @@ def _plot_pair_quality_dashboard(
             alpha=0.3,
             c="lightgreen",
             edgecolors="none",
-            label=f"Type B (disc<-{epsilon})",
+            label="Type B (disc<0)",
         )
 
         # Draw selected pairs for this level
@@ -638,8 +843,8 @@ def _plot_pair_quality_dashboard(
         ax.set_xlabel("L1 rank", fontsize=9)
         ax.set_ylabel("Leontief rank", fontsize=9)
         ax.set_title(
-            f"Level {level}: {level_names.get(level, 'Unknown')}\n"
-            f"ε={epsilon}, tol={balance_tol} | Pairs: {len(level_pairs)}",
+            f"Level {level}: min component {relaxation_levels[level - 1]}%\n"
+            f"Pairs: {len(level_pairs)}",
             fontsize=10,
             fontweight="bold",
         )
@@ -674,7 +879,7 @@ def _plot_pair_quality_dashboard(
     )
 
     if utilization_pct > 50:
-        status = "⚠ HIGH - Consider increasing POOL_SIZE"
+        status = "⚠ HIGH - Consider a finer grid step"
         color_status = "orange"
     elif utilization_pct > 30:
         status = "⚠ MODERATE - Monitor pool size"
@@ -707,33 +912,13 @@ def _plot_pair_quality_dashboard(
 
 
 def visualize_pair_selection(
-    user_vector: Tuple[int, ...], seed: Optional[int] = None
+    user_vector: Tuple[int, ...], use_cache: bool = True
 ) -> None:
     """Generate pair selection analysis with quality metrics."""
-    if seed is not None:
-        np.random.seed(seed)
-
-    _validate_user_vector(user_vector)
-
-    strategy = OptimizationMetricsRankStrategy()
-    strategy._validate_vector(user_vector, len(user_vector))
-
-    l1_distances, leontief_ratios, vector_pool = _vector_pool_metrics(
-        strategy, user_vector
-    )
-    l1_norm, leontief_norm, discrepancies = _compute_rank_metrics(
-        l1_distances, leontief_ratios
-    )
-
-    pairs_by_level = _find_pairs_with_metadata(
-        strategy,
-        list(vector_pool),
-        l1_distances,
-        leontief_ratios,
-        l1_norm,
-        leontief_norm,
-        discrepancies,
-    )
+    metrics = load_vector_metrics(user_vector, use_cache)
+    vector_pool = metrics["vector_pool"]
+    pairs_by_level = metrics["pairs_by_level"]
+    relaxation_levels = metrics["relaxation_levels"]
 
     total_pairs = sum(len(pairs) for pairs in pairs_by_level.values())
     pool_size = len(vector_pool)
@@ -756,7 +941,7 @@ def visualize_pair_selection(
     logger.info(f"Vector utilization: {utilization:.1f}% ({vectors_used}/{pool_size})")
 
     if utilization > 50:
-        logger.warning("⚠ HIGH UTILIZATION - Consider increasing POOL_SIZE")
+        logger.warning("⚠ HIGH UTILIZATION - Consider a finer grid step")
     elif utilization > 30:
         logger.warning("⚠ MODERATE UTILIZATION - Monitor pool size")
     else:
@@ -765,14 +950,13 @@ def visualize_pair_selection(
     logger.info("\nPairs by relaxation level:")
     for level, pairs in pairs_by_level.items():
         pct = len(pairs) / total_pairs * 100 if total_pairs > 0 else 0
-        epsilon, tol = strategy.RELAXATION_LEVELS[level - 1]
         logger.info(
-            f"  Level {level} (ε={epsilon}, tol={tol}): "
+            f"  Level {level} (min component {relaxation_levels[level - 1]}%): "
             f"{len(pairs)} pairs ({pct:.1f}%)"
         )
 
-        if level >= 3 and pct > 40:
-            logger.warning("    ⚠ Heavy reliance on loose constraints!")
+        if level > 1 and pct > 40:
+            logger.warning("    ⚠ Heavy reliance on a relaxed floor!")
 
     # Compute quality metrics
     all_metadata = [m for pairs in pairs_by_level.values() for _, _, m in pairs]
@@ -795,7 +979,11 @@ def visualize_pair_selection(
 
     _ensure_output_dir()
     _plot_pair_quality_dashboard(
-        pairs_by_level, l1_norm, leontief_norm, user_vector, strategy
+        pairs_by_level,
+        metrics["l1_norm"],
+        metrics["leontief_norm"],
+        user_vector,
+        relaxation_levels,
     )
 
 
@@ -892,7 +1080,7 @@ def _plot_simplex_coverage(
     ax4.grid(True, alpha=0.3)
 
     fig.suptitle(
-        f"Simplex Coverage Analysis (Sticks Method Validation)\n"
+        f"Simplex Coverage Analysis (Strategy Grid Validation)\n"
         f"User Vector: {user_vector} | Pool Size: {len(vector_pool)}",
         fontsize=13,
         y=0.995,
@@ -959,21 +1147,13 @@ def _validate_user_vector(user_vector: Tuple[int, ...]) -> None:
 
 
 def visualize_simplex_coverage(
-    user_vector: Tuple[int, ...], seed: Optional[int] = None
+    user_vector: Tuple[int, ...], use_cache: bool = True
 ) -> None:
     """Generate simplex coverage validation plots."""
-    if seed is not None:
-        np.random.seed(seed)
-
-    _validate_user_vector(user_vector)
-
-    strategy = OptimizationMetricsRankStrategy()
-    strategy._validate_vector(user_vector, len(user_vector))
-
-    _, _, vector_pool = _vector_pool_metrics(strategy, user_vector)
+    metrics = load_vector_metrics(user_vector, use_cache)
 
     _ensure_output_dir()
-    _plot_simplex_coverage(vector_pool, user_vector)
+    _plot_simplex_coverage([tuple(v) for v in metrics["vector_pool"]], user_vector)
 
 
 # ============================================================================
@@ -982,23 +1162,23 @@ def visualize_simplex_coverage(
 
 
 def _plot_multi_vector_comparison(
-    test_vectors: List[Tuple[Tuple[int, ...], str]], seed: Optional[int]
+    results: List[Tuple[Tuple[int, ...], str, Any]],
 ) -> None:
-    """Compare metric patterns across different user vector types."""
-    if seed is not None:
-        np.random.seed(seed)
+    """
+    Compare metric patterns across different user vector types.
 
-    n_vectors = len(test_vectors)
+    Args:
+        results: (user_vector, description, metrics) per row, where metrics
+            is the error raised for an invalid or unsuitable vector.
+    """
+    n_vectors = len(results)
     fig, axes = plt.subplots(n_vectors, 2, figsize=(14, 4 * n_vectors), squeeze=False)
 
-    strategy = OptimizationMetricsRankStrategy()
     summary_stats = []
 
-    for idx, (user_vector, description) in enumerate(test_vectors):
-        # Validate vector
-        try:
-            _validate_user_vector(user_vector)
-        except ValueError as e:
+    for idx, (user_vector, description, metrics) in enumerate(results):
+        if isinstance(metrics, METRICS_ERRORS):
+            e = metrics
             logger.warning(f"Skipping invalid vector {user_vector}: {e}")
             # Clear the axes for this row
             for ax in axes[idx]:
@@ -1016,30 +1196,18 @@ def _plot_multi_vector_comparison(
                 ax.set_yticks([])
             continue
 
-        # Use consistent seed for each vector
-        if seed is not None:
-            np.random.seed(seed + idx)
-
-        l1_distances, leontief_ratios, vector_pool = _vector_pool_metrics(
-            strategy, user_vector
-        )
-        l1_norm, leontief_norm, discrepancies = _compute_rank_metrics(
-            l1_distances, leontief_ratios
-        )
+        l1_distances = metrics["l1_distances"]
+        leontief_ratios = metrics["leontief_ratios"]
+        l1_norm = metrics["l1_norm"]
+        leontief_norm = metrics["leontief_norm"]
 
         # Quick pair generation check
-        pairs_by_level = _find_pairs_with_metadata(
-            strategy,
-            list(vector_pool),
-            l1_distances,
-            leontief_ratios,
-            l1_norm,
-            leontief_norm,
-            discrepancies,
-        )
+        pairs_by_level = metrics["pairs_by_level"]
         total_pairs = sum(len(pairs) for pairs in pairs_by_level.values())
-        level_4_pairs = len(pairs_by_level[4])
-        level_4_pct = (level_4_pairs / total_pairs * 100) if total_pairs > 0 else 0
+        relaxed_pairs = sum(
+            len(pairs) for level, pairs in pairs_by_level.items() if level > 1
+        )
+        relaxed_pct = (relaxed_pairs / total_pairs * 100) if total_pairs > 0 else 0
 
         # Absolute space (with negative L1)
         ax_abs = axes[idx, 0]
@@ -1098,8 +1266,8 @@ def _plot_multi_vector_comparison(
             color = "lightcoral"
 
         info_text = f"ρ = {corr:.3f}\n{quality}\n{total_pairs} pairs"
-        if level_4_pct > 40:
-            info_text += f"\n⚠ L4: {level_4_pct:.0f}%"
+        if relaxed_pct > 0:
+            info_text += f"\n⚠ relaxed floor: {relaxed_pct:.0f}%"
             color = "orange"
 
         ax_rank.text(
@@ -1119,13 +1287,13 @@ def _plot_multi_vector_comparison(
                 "correlation": corr,
                 "quality": quality,
                 "total_pairs": total_pairs,
-                "level_4_pct": level_4_pct,
+                "relaxed_pct": relaxed_pct,
             }
         )
 
     fig.suptitle(
         "Multi-Vector Comparison: How User Vector Affects Strategy Performance\n"
-        "(Lower correlation + more Level 1-2 pairs = better)",
+        "(Lower correlation + pairs at the strict floor = better)",
         fontsize=14,
         y=0.998,
     )
@@ -1142,30 +1310,47 @@ def _plot_multi_vector_comparison(
         logger.info(f"\n{stat['description']}: {stat['vector']}")
         logger.info(f"  Correlation: {stat['correlation']:.3f} ({stat['quality']})")
         logger.info(f"  Total pairs: {stat['total_pairs']}")
-        logger.info(f"  Level 4 usage: {stat['level_4_pct']:.1f}%")
+        logger.info(f"  Relaxed floor usage: {stat['relaxed_pct']:.1f}%")
         if stat["correlation"] > 0.85:
             logger.warning("  ⚠ HIGH CORRELATION - Strategy may be ineffective")
-        if stat["level_4_pct"] > 50:
-            logger.warning("  ⚠ HEAVY RELIANCE ON LOOSE CONSTRAINTS")
+        if stat["relaxed_pct"] > 50:
+            logger.warning("  ⚠ HEAVY RELIANCE ON A RELAXED FLOOR")
+
+
+def _try_load_vector_metrics(task: Tuple[Tuple[int, ...], bool]) -> Any:
+    """Worker: metrics of one vector, or the error if it is invalid/unsuitable."""
+    user_vector, use_cache = task
+    try:
+        return load_vector_metrics(user_vector, use_cache)
+    except METRICS_ERRORS as e:
+        return e
 
 
-def visualize_multi_vector_comparison(seed: Optional[int] = None) -> None:
+def _map(function, tasks: list, workers: Optional[int]) -> list:
+    """Map over worker processes (in-process when workers is 1)."""
+    workers = resolve_workers(workers)
+    if workers == 1 or len(tasks) <= 1:
+        return list(map(function, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, tasks))
+
+
+def visualize_multi_vector_comparison(
+    use_cache: bool = True, workers: Optional[int] = 1
+) -> None:
     """Generate comparison across different user vector types."""
-    # Only include VALID test vectors (>=2 positive dims, multiples of 5)
-    test_vectors = [
-        ((35, 35, 30), "Balanced 3D"),
-        ((40, 30, 30), "Most Frequent OIA 3D"),
-        ((70, 20, 10), "Skewed 3D"),
-        ((60, 30, 10), "Moderately Skewed 3D"),
-        ((40, 30, 30), "Slight Imbalance 3D"),
-        ((50, 25, 25), "2:1:1 Ratio 3D"),
-        ((25, 25, 25, 25), "Balanced 4D"),
-        ((60, 20, 10, 10), "Skewed 4D"),
-        ((45, 25, 20, 10), "Mixed Skew 4D"),
-    ]
+    tasks = [(user_vector, use_cache) for user_vector, _ in COMPARISON_VECTORS]
+    all_metrics = _map(_try_load_vector_metrics, tasks, workers)
 
     _ensure_output_dir()
-    _plot_multi_vector_comparison(test_vectors, seed)
+    _plot_multi_vector_comparison(
+        [
+            (user_vector, description, metrics)
+            for (user_vector, description), metrics in zip(
+                COMPARISON_VECTORS, all_metrics
+            )
+        ]
+    )
 
 
 # ============================================================================
@@ -1173,6 +1358,20 @@ def visualize_multi_vector_comparison(seed: Optional[int] = None) -> None:
 # ============================================================================
 
 
+def _render_mode(task: Tuple[str, Tuple[int, ...], bool]) -> str:
+    """Worker: render the figures of one mode from (cached) metrics."""
+    mode, user_vector, use_cache = task
+    if mode == "basic":
+        visualize_basic_metrics(user_vector, use_cache)
+    elif mode == "pairs":
+        visualize_pair_selection(user_vector, use_cache)
+    elif mode == "coverage":
+        visualize_simplex_coverage(user_vector, use_cache)
+    else:
+        visualize_multi_vector_comparison(use_cache)
+    return mode
+
+
 def main() -> None:
     logging.basicConfig(
         level=logging.INFO,
@@ -1180,30 +1379,37 @@ def main() -> None:
     )
     args = _parse_args()
     user_vector = tuple(args.user_vector)
+    use_cache = not args.no_cache
+    modes = (
+        ["basic", "pairs", "coverage", "comparison"]
+        if args.mode == "all"
+        else [args.mode]
+    )
 
     logger.info(f"Running visualization mode: {args.mode}")
     logger.info(f"User vector: {user_vector}")
-    if args.seed is not None:
-        logger.info(f"Random seed: {args.seed}")
 
     try:
-        if args.mode in {"basic", "all"}:
-            logger.info("→ Generating basic metric visualizations")
-            visualize_basic_metrics(user_vector, args.seed)
-
-        if args.mode in {"pairs", "all"}:
-            logger.info("→ Generating pair selection dashboard")
-            visualize_pair_selection(user_vector, args.seed)
-
-        if args.mode in {"coverage", "all"}:
-            logger.info("→ Validating simplex coverage")
-            visualize_simplex_coverage(user_vector, args.seed)
-
-        if args.mode in {"comparison", "all"}:
-            logger.info("→ Running multi-vector comparison")
-            visualize_multi_vector_comparison(args.seed)
-
-    except ValueError as exc:
+        # Compute every needed vector's metrics once (in parallel) so the
+        # render workers read them from the cache instead of recomputing
+        if use_cache:
+            single_vector_modes = set(modes) - {"comparison"}
+            tasks = []
+            if single_vector_modes:
+                tasks.append((user_vector, use_cache))
+            if "comparison" in modes:
+                tasks += [(vector, use_cache) for vector, _ in COMPARISON_VECTORS]
+            logger.info(f"→ Computing metrics for {len(tasks)} vectors")
+            results = _map(_try_load_vector_metrics, tasks, args.workers)
+            if single_vector_modes and isinstance(results[0], METRICS_ERRORS):
+                raise results[0]
+
+        logger.info(f"→ Rendering {', '.join(modes)}")
+        render_tasks = [(mode, user_vector, use_cache) for mode in modes]
+        for mode in _map(_render_mode, render_tasks, args.workers):
+            logger.info(f"✓ Rendered {mode}")
+
+    except METRICS_ERRORS as exc:
         logger.error(f"Visualization failed: {exc}")
         raise
 
@@ -19,6 +19,7 @@ from application.routes.utils import (
     redirect_to_panel4all,
     redirect_to_panel4all_with_pts,
 )
+from application.schemas.survey_bundle import SurveyBundle
 from application.schemas.validators import SurveySubmission
 from application.services.survey_service import SurveyService, SurveySessionData
 from application.translations import get_current_language, get_translation, set_language
@@ -270,6 +271,7 @@ def survey():
             survey_data["subjects"],
             is_demo,
             external_q_argument,
+            bundle=survey_data.get("bundle"),
         )
     elif request.method == "POST":
         return handle_survey_post(
@@ -290,8 +292,14 @@ def handle_survey_get(
     subjects: list[str],
     is_demo: bool,
     external_q_argument: Optional[str] = None,
+    bundle: Optional[SurveyBundle] = None,
 ) -> str:
-    """Handle GET request for survey page."""
+    """
+    Handle GET request for survey page.
+
+    The survey bundle loaded by check_survey_exists is passed on so that pair
+    generation does not query the survey's config and rules again.
+    """
     try:
         # Check if user has already responded to this survey (prevent duplicates)
         # FAIL-SAFE: If we can't verify, block access (don't let them through)
@@ -347,6 +355,7 @@ def handle_survey_get(
             external_survey_id=external_survey_id,
             user_vector=user_vector,
             subjects=subjects,
+            bundle=bundle,
         )
 
         template_data = session_data.to_template_data()
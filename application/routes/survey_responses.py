@@ -3,13 +3,23 @@ Survey responses route module.
 Handles all survey response related endpoints including responses and comments.
 """
 
+import csv
 import io
+import itertools
 import logging
 import math
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-import pandas as pd
-from flask import Blueprint, Response, current_app, render_template, request
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    make_response,
+    render_template,
+    request,
+    stream_with_context,
+)
 
 from analysis.report_service import (
     generate_aggregated_percentile_breakdown,
@@ -22,16 +32,17 @@ from application.exceptions import (
     SurveyNotFoundError,
 )
 from application.services.pair_generation.base import StrategyRegistry
+from application.services.report_cache import REPORT_CACHE, fragment_key
 from application.services.response_formatter import ResponseFormatter
-from application.translations import get_translation
+from application.translations import get_current_language, get_translation
 from database.queries import (
-    get_paginated_user_ids,
     get_survey_description,
     get_survey_pair_generation_config,
-    get_survey_response_counts,
+    get_survey_response_version,
+    get_user_ids_page,
     get_user_participation_overview,
     get_user_survey_performance_data,
-    get_users_from_view,
+    iter_user_survey_choices,
     retrieve_completed_survey_responses,
     retrieve_user_survey_choices,
 )
@@ -95,101 +106,27 @@ def get_user_responses(
         strategy_name = None
         survey_strategies = {}  # Maps survey_id to strategy_name
 
-        # This variable will hold user_ids if a view_filter is active and valid
-        characteristic_user_ids_from_view = None
-
-        if view_filter:
-            # Get all users matching the view's general criteria.
-            temp_user_ids = get_users_from_view(view_filter)
-
-            if not temp_user_ids:
-                log_msg = (
-                    f"No users found matching general criteria of view "
-                    f"'{view_filter}'. No responses will be shown for survey "
-                    f"{survey_id} with this filter."
-                )
-                logger.info(log_msg)
-
-                survey_counts = get_survey_response_counts(survey_id)
-                if survey_counts:
-                    logger.info(
-                        f"Context: Survey {survey_id} has {survey_counts['count']} "
-                        f"responses from {survey_counts['unique_users']} unique users."
-                    )
-                else:
-                    logger.info(
-                        f"Context: Survey {survey_id} has no responses " f"in database."
-                    )
-
-                empty_data = ResponseFormatter.format_response_data([])
-                empty_data["view_filter"] = view_filter
-                empty_data["empty_filter"] = True
-                empty_data["content"] = ""
-                return empty_data
-            else:
-                characteristic_user_ids_from_view = temp_user_ids
-                logger.debug(
-                    f"View filter '{view_filter}' identified "
-                    f"{len(characteristic_user_ids_from_view)} characteristic users."
-                )
-
         if user_choices is None:
-            user_choices = retrieve_user_survey_choices()
-
-            # Apply view filter (characteristic users) if identified
-            if characteristic_user_ids_from_view is not None:
-                original_choice_count = len(user_choices)
-                user_choices = [
-                    choice
-                    for choice in user_choices
-                    if choice["user_id"] in characteristic_user_ids_from_view
-                ]
-                logger.debug(
-                    f"Applied view filter '{view_filter}': "
-                    f"{original_choice_count} initial -> {len(user_choices)} choices."
-                )
-
-            # Filter by the specific survey ID of the request
-            if survey_id is not None:
-                original_count = len(user_choices)
-                user_choices = [
-                    choice
-                    for choice in user_choices
-                    if choice["survey_id"] == survey_id
-                ]
-                logger.debug(
-                    f"Applied survey_id filter {survey_id}: "
-                    f"{original_count} initial choices -> {len(user_choices)} choices."
-                )
-
-            # Apply sorting
-            if sort_by:
-                reverse = sort_order.lower() == "desc"
-                if sort_by == "user_id":
-                    user_choices.sort(key=lambda x: x["user_id"], reverse=reverse)
-                elif sort_by == "created_at":
-                    user_choices.sort(
-                        key=lambda x: x["response_created_at"], reverse=reverse
-                    )
-                elif sort_by == "duration":
-                    # Handle None values by putting them at the end
-                    def get_duration(x):
-                        val = x.get("total_response_time_seconds")
-                        return (
-                            float(val)
-                            if val is not None
-                            else (float("-inf") if reverse else float("inf"))
-                        )
-
-                    user_choices.sort(key=get_duration, reverse=reverse)
+            # Survey, view filter and sorting are all applied in SQL
+            user_choices = retrieve_user_survey_choices(
+                survey_id=survey_id,
+                view_filter=view_filter,
+                sort_by=sort_by,
+                sort_order=sort_order,
+            )
+            logger.debug(
+                f"Retrieved {len(user_choices)} choices for survey {survey_id} "
+                f"(view_filter: '{view_filter or 'None'}')."
+            )
 
             # Handle the case where we have a view filter but no matching
             # choices for the survey
-            if survey_id is not None and not user_choices and view_filter:
+            if not user_choices and view_filter:
                 logger.info(
                     f"No responses found for survey {survey_id} with "
                     f"filter '{view_filter}'. Returning empty filter response."
                 )
+
                 empty_data = ResponseFormatter.format_response_data([])
                 empty_data["view_filter"] = view_filter
                 empty_data["empty_filter"] = True
@@ -197,11 +134,8 @@ def get_user_responses(
                 return empty_data
 
             # Only raise error if no matches found and not using a view filter
-            if survey_id is not None and not user_choices and not view_filter:
-                logger.warning(
-                    f"No responses found for survey {survey_id} after all filters "
-                    f"(view_filter: '{view_filter or 'None'}')."
-                )
+            if survey_id is not None and not user_choices:
+                logger.warning(f"No responses found for survey {survey_id}.")
                 raise SurveyNotFoundError(survey_id)
 
         # Add strategy labels and get strategy name if survey_id is known
@@ -335,11 +269,114 @@ def format_comments_data(responses: List[Dict]) -> List[Dict]:
     return comments_data
 
 
+# Keys of get_user_responses() output used by responses/detail.html
+REPORT_TEMPLATE_DATA_KEYS = (
+    "empty_filter",
+    "overall_stats_html",
+    "combined_html",
+    "breakdown_html",
+    "user_details_html",
+)
+
+
+def _build_survey_report(
+    survey_id: int, sort_by: Optional[str], sort_order: str, view_filter: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Compute the cacheable part of the survey report page: the rendered report
+    fragments and the values shown around them.
+
+    Returns:
+        Dict[str, Any]: JSON-serializable keyword arguments for
+        responses/detail.html (besides survey_id and view_filter).
+
+    Raises:
+        SurveyNotFoundError: If no responses found.
+        ResponseProcessingError: If general processing error.
+    """
+    # Get user responses filtered by survey_id and view_filter
+    data = get_user_responses(
+        survey_id=survey_id,
+        show_tables_only=True,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        view_filter=view_filter,
+    )
+
+    # Calculate average response time
+    avg_response_time = None
+    if data.get("responses"):
+        # We need to get unique users and their response times
+        user_times = {}
+        for response in data["responses"]:
+            user_id = response.get("user_id")
+            time = response.get("total_response_time_seconds")
+            if user_id and time is not None and user_id not in user_times:
+                user_times[user_id] = float(time)
+
+        if user_times:
+            avg_response_time = sum(user_times.values()) / len(user_times)
+
+    # Fetch the survey description
+    survey_description = get_survey_description(survey_id)
+
+    # Get strategy information
+    strategy_name = None
+    strategy_config = get_survey_pair_generation_config(survey_id)
+    if strategy_config:
+        try:
+            strategy = StrategyRegistry.get_strategy(strategy_config["strategy"])
+            strategy_name = strategy.get_strategy_name()
+        except ValueError as e:
+            logger.warning(f"Strategy not found for survey {survey_id}: {e}")
+
+    # Generate aggregated percentile breakdown table for extreme vector surveys
+    percentile_breakdown = ""
+    if strategy_name == "peak_linearity_test":
+        # The responses above are already restricted to this survey (and
+        # view filter) in SQL; only re-query when the filter matched nobody.
+        survey_choices = data.get("responses") or retrieve_user_survey_choices(
+            survey_id=survey_id
+        )
+        logger.info(f"Found {len(survey_choices)} choices for survey {survey_id}")
+
+        percentile_breakdown = generate_aggregated_percentile_breakdown(
+            survey_choices, strategy_name
+        )
+        logger.debug(
+            f"Generated percentile breakdown HTML length: {len(percentile_breakdown)}"
+        )
+
+    return {
+        "data": {key: data[key] for key in REPORT_TEMPLATE_DATA_KEYS if key in data},
+        "survey_description": survey_description,
+        "strategy_name": strategy_name,
+        "percentile_breakdown": percentile_breakdown,
+        "avg_response_time": avg_response_time,
+    }
+
+
+def _set_report_validators(
+    response: Response, etag: str, last_modified: Optional[datetime]
+) -> Response:
+    """Attach ETag/Last-Modified and make browsers revalidate on each visit."""
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
 @responses_routes.route("/<int:survey_id>/responses")
 def get_survey_responses(survey_id: int):
     """
     Get all responses for a specific survey with optional sorting and filtering.
 
+    The rendered report is cached (see application.services.report_cache)
+    until a new response arrives, and conditional requests for an unchanged
+    report are answered with 304 Not Modified without rendering it.
+
     Args:
         survey_id: ID of the survey to get responses for
 
@@ -360,83 +397,46 @@ def get_survey_responses(survey_id: int):
             f"View filter: '{view_filter or 'None'}'"
         )
 
-        # Get user responses filtered by survey_id and view_filter
-        data = get_user_responses(
-            survey_id=survey_id,
-            show_tables_only=True,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            view_filter=view_filter,
-        )
-
-        # Calculate average response time
-        avg_response_time = None
-        if data.get("responses"):
-            # We need to get unique users and their response times
-            user_times = {}
-            for response in data["responses"]:
-                user_id = response.get("user_id")
-                time = response.get("total_response_time_seconds")
-                if user_id and time is not None and user_id not in user_times:
-                    user_times[user_id] = float(time)
+        # Without a version (query failed) the report is computed uncached
+        cache_key = last_modified = report = None
+        version = get_survey_response_version(survey_id)
+        if version is not None:
+            cache_key = fragment_key(
+                survey_id,
+                view_filter,
+                sort_by,
+                sort_order,
+                get_current_language(),
+                version["latest_response_id"],
+                version["response_count"],
+            )
+            last_modified = version.get("latest_created_at")
 
-            if user_times:
-                avg_response_time = sum(user_times.values()) / len(user_times)
+            not_modified = _set_report_validators(
+                make_response(""), cache_key, last_modified
+            ).make_conditional(request)
+            if not_modified.status_code == 304:
+                logger.debug(f"Report of survey {survey_id} not modified")
+                return not_modified
 
-        # Fetch the survey description
-        survey_description = get_survey_description(survey_id)
+            report = REPORT_CACHE.get(cache_key)
 
-        # Get strategy information
-        strategy_name = None
-        strategy_config = get_survey_pair_generation_config(survey_id)
-        if strategy_config:
-            try:
-                strategy = StrategyRegistry.get_strategy(strategy_config["strategy"])
-                strategy_name = strategy.get_strategy_name()
-            except ValueError as e:
-                logger.warning(f"Strategy not found for survey {survey_id}: {e}")
-
-        # Generate aggregated percentile breakdown table for extreme vector surveys
-        percentile_breakdown = ""
-        if strategy_name == "peak_linearity_test":
-            # Get all choices for this survey for aggregated analysis
-            choices = retrieve_user_survey_choices()
-            survey_choices = [c for c in choices if c["survey_id"] == survey_id]
-            logger.info(f"Found {len(survey_choices)} choices for survey {survey_id}")
-
-            # Apply view filter if present
-            if view_filter and data.get("view_filter"):
-                filtered_user_ids = set()
-                for choice in data.get("responses", []):
-                    filtered_user_ids.add(choice.get("user_id"))
-
-                logger.info(f"Applying view filter with {len(filtered_user_ids)} users")
-                if filtered_user_ids:
-                    original_count = len(survey_choices)
-                    survey_choices = [
-                        c for c in survey_choices if c["user_id"] in filtered_user_ids
-                    ]
-                    logger.info(
-                        f"Filtered from {original_count} to {len(survey_choices)} choices"
-                    )
+        if report is None:
+            report = _build_survey_report(survey_id, sort_by, sort_order, view_filter)
+            if cache_key is not None:
+                REPORT_CACHE.put(cache_key, report)
 
-            percentile_breakdown = generate_aggregated_percentile_breakdown(
-                survey_choices, strategy_name
-            )
-            logger.debug(
-                f"Generated percentile breakdown HTML length: {len(percentile_breakdown)}"
+        response = make_response(
+            render_template(
+                "responses/detail.html",
+                survey_id=survey_id,
+                view_filter=view_filter,
+                **report,
             )
-
-        return render_template(
-            "responses/detail.html",
-            data=data,
-            survey_id=survey_id,
-            survey_description=survey_description,
-            strategy_name=strategy_name,
-            view_filter=view_filter,
-            percentile_breakdown=percentile_breakdown,
-            avg_response_time=avg_response_time,
         )
+        if cache_key is not None:
+            _set_report_validators(response, cache_key, last_modified)
+        return response
 
     except SurveyNotFoundError as e:
         logger.warning(str(e))
@@ -460,25 +460,74 @@ def get_survey_responses(survey_id: int):
         )
 
 
+CSV_EXPORT_COLUMNS = [
+    "user_id",
+    "survey_response_id",
+    "response_created_at",
+    "total_response_time_seconds",
+    "optimal_allocation",
+    "pair_number",
+    "pair_score",
+    "option_1",
+    "option_2",
+    "user_choice",
+    "raw_user_choice",
+    "option1_strategy",
+    "option2_strategy",
+]
+
+# Number of CSV rows written between flushes to the client
+CSV_EXPORT_FLUSH_ROWS = 500
+
+# First cell of the row written when a streaming export fails part-way
+CSV_EXPORT_ERROR_MARKER = "#EXPORT_FAILED"
+
+
+def _format_csv_row(choice: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a survey choice into a row of the responses CSV export."""
+    # Extract Pair Score from generation_metadata if available
+    pair_score = None
+    gen_metadata = choice.get("generation_metadata")
+    if isinstance(gen_metadata, dict):
+        pair_score = gen_metadata.get("score")
+
+    return {
+        "user_id": choice.get("user_id"),
+        "survey_response_id": choice.get("survey_response_id"),
+        "response_created_at": choice.get("response_created_at"),
+        "total_response_time_seconds": choice.get("total_response_time_seconds"),
+        "optimal_allocation": str(choice.get("optimal_allocation")),
+        "pair_number": choice.get("pair_number"),
+        "pair_score": pair_score,
+        "option_1": str(choice.get("option_1")),
+        "option_2": str(choice.get("option_2")),
+        "user_choice": choice.get("user_choice"),
+        "raw_user_choice": choice.get("raw_user_choice"),
+        "option1_strategy": choice.get("option1_strategy"),
+        "option2_strategy": choice.get("option2_strategy"),
+    }
+
+
 @responses_routes.route("/<int:survey_id>/responses/download")
 def download_survey_responses_csv(survey_id: int):
     """
-    Generates and serves a CSV file of survey responses,
-    respecting the view_filter query parameter by reusing existing logic.
+    Streams a CSV file of survey responses, respecting the view_filter query
+    parameter.
+
+    Rows are read from a server-side cursor and written out in small batches,
+    so memory use is constant and the download starts as soon as the first
+    rows arrive, however large the survey is. If reading fails after the
+    headers were sent, a CSV_EXPORT_ERROR_MARKER row is written and the
+    error is re-raised, aborting the transfer, so a partial file cannot pass
+    for a complete export.
     """
+    view_filter = request.args.get("view_filter")
     try:
-        # 1. Reuse the existing get_user_responses function to get filtered data
-        # We pass user_choices=None so it fetches from the DB.
-        data_dict = get_user_responses(
-            survey_id=survey_id,
-            user_choices=None,
-            show_tables_only=False,  # Ensure we get the full data structure
-            view_filter=request.args.get("view_filter"),
-        )
+        choices = iter_user_survey_choices(survey_id=survey_id, view_filter=view_filter)
 
-        # 2. Check if the function returned any response data
-        user_choices_from_function = data_dict.get("responses")
-        if not user_choices_from_function:
+        # Peek at the first row so an empty export can still return a 404
+        first_choice = next(choices, None)
+        if first_choice is None:
             return (
                 render_template(
                     "error.html",
@@ -489,50 +538,45 @@ def download_survey_responses_csv(survey_id: int):
                 404,
             )
 
-        # 3. Flatten the detailed data into a list of dicts for the CSV
-        csv_data = []
-        for choice in user_choices_from_function:
-            # Extract Pair Score from generation_metadata if available
-            pair_score = None
-            gen_metadata = choice.get("generation_metadata")
-            if isinstance(gen_metadata, dict):
-                pair_score = gen_metadata.get("score")
-
-            csv_data.append(
-                {
-                    "user_id": choice.get("user_id"),
-                    "survey_response_id": choice.get("survey_response_id"),
-                    "response_created_at": choice.get("response_created_at"),
-                    "total_response_time_seconds": choice.get(
-                        "total_response_time_seconds"
-                    ),
-                    "optimal_allocation": str(choice.get("optimal_allocation")),
-                    "pair_number": choice.get("pair_number"),
-                    "pair_score": pair_score,
-                    "option_1": str(choice.get("option_1")),
-                    "option_2": str(choice.get("option_2")),
-                    "user_choice": choice.get("user_choice"),
-                    "raw_user_choice": choice.get("raw_user_choice"),
-                    "option1_strategy": choice.get("option1_strategy"),
-                    "option2_strategy": choice.get("option2_strategy"),
-                }
-            )
-
-        # 4. Generate CSV using pandas
-        df = pd.DataFrame(csv_data)
-        output = io.StringIO()
-        df.to_csv(output, index=False)
-        csv_string = output.getvalue()
+        def generate_csv():
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=CSV_EXPORT_COLUMNS)
+            writer.writeheader()
+            count = 0
+            try:
+                for count, choice in enumerate(
+                    itertools.chain([first_choice], choices), start=1
+                ):
+                    writer.writerow(_format_csv_row(choice))
+                    if count % CSV_EXPORT_FLUSH_ROWS == 0:
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+            except Exception as e:
+                # Headers are already sent: mark the file as incomplete, then
+                # abort the transfer so the client sees a failed download
+                logger.error(
+                    f"Error streaming CSV for survey {survey_id} after {count} "
+                    f"rows: {e}",
+                    exc_info=True,
+                )
+                writer.writerow(
+                    {
+                        "user_id": CSV_EXPORT_ERROR_MARKER,
+                        "survey_response_id": f"export incomplete after {count} rows",
+                    }
+                )
+                yield buffer.getvalue()
+                raise
+            yield buffer.getvalue()
 
-        # 5. Create the dynamic filename and Flask Response
-        view_filter = request.args.get("view_filter")
         filename = f"survey_{survey_id}_responses"
         if view_filter:
             filename += f"_{view_filter}"
         filename += ".csv"
 
         return Response(
-            csv_string,
+            stream_with_context(generate_csv()),
             mimetype="text/csv",
             headers={"Content-disposition": f"attachment; filename={filename}"},
         )
@@ -579,9 +623,7 @@ def list_all_responses():
 def get_user_responses_detail(user_id: str):
     """Get all responses from a specific user."""
     try:
-        # Get all choices and filter for specific user
-        choices = retrieve_user_survey_choices()
-        user_choices = [c for c in choices if c["user_id"] == user_id]
+        user_choices = retrieve_user_survey_choices(user_ids=[user_id])
 
         if not user_choices:
             logger.warning(f"No responses found for user {user_id}")
@@ -621,13 +663,9 @@ def get_user_responses_detail(user_id: str):
 def get_user_survey_response(survey_id: int, user_id: str):
     """Get specific user's response for a particular survey."""
     try:
-        # Get all choices and filter for specific user and survey
-        choices = retrieve_user_survey_choices()
-        user_survey_choices = [
-            c
-            for c in choices
-            if c["user_id"] == user_id and c["survey_id"] == survey_id
-        ]
+        user_survey_choices = retrieve_user_survey_choices(
+            survey_id=survey_id, user_ids=[user_id]
+        )
 
         if not user_survey_choices:
             logger.warning(
@@ -790,10 +828,16 @@ def get_users_overview():
         if sort_order not in allowed_sort_orders:
             sort_order = "asc"
 
-        # Get paginated user IDs and total count with sorting
-        user_ids, total_users = get_paginated_user_ids(
-            page, per_page, sort_by or "last_activity", sort_order
+        # Get the page of user IDs (keyset cursors from the prev/next links)
+        user_page = get_user_ids_page(
+            per_page,
+            sort_by or "last_activity",
+            sort_order,
+            after=request.args.get("after"),
+            before=request.args.get("before"),
+            page=page,
         )
+        user_ids, total_users = user_page["user_ids"], user_page["total_count"]
 
         if not user_ids:
             # No users found, render empty overview
@@ -841,6 +885,8 @@ def get_users_overview():
             "per_page": per_page,
             "total_users": total_users,
             "total_pages": total_pages,
+            "prev_cursor": user_page["first_cursor"],
+            "next_cursor": user_page["last_cursor"],
         }
 
         logger.info(
@@ -880,8 +926,14 @@ def users_matrix():
         if page < 1:
             page = 1
 
-        # Get paginated user IDs and total count
-        user_ids, total_users = get_paginated_user_ids(page, per_page)
+        # Get the page of user IDs (keyset cursors from the prev/next links)
+        user_page = get_user_ids_page(
+            per_page,
+            after=request.args.get("after"),
+            before=request.args.get("before"),
+            page=page,
+        )
+        user_ids, total_users = user_page["user_ids"], user_page["total_count"]
 
         if not user_ids:
             # No users found, render empty matrix
@@ -905,6 +957,8 @@ def users_matrix():
                 "per_page": per_page,
                 "total_users": total_users,
                 "total_pages": total_pages,
+                "prev_cursor": user_page["first_cursor"],
+                "next_cursor": user_page["last_cursor"],
             }
 
         return render_template(
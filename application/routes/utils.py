@@ -9,7 +9,8 @@ from application.translations import (
     get_translation,
     set_language,
 )
-from database.db import get_db
+from database.db import get_db, get_pool_stats
+from database.queries import get_metadata_cache_stats
 
 util_routes = Blueprint("utils", __name__)
 
@@ -67,6 +68,27 @@ def health_check():
         )
 
 
+@util_routes.route("/health/db-pool")
+def db_pool_stats():
+    """
+    Connection pool statistics for monitoring.
+    Reports the pool of the worker process that served the request.
+    """
+    try:
+        return jsonify(get_pool_stats()), 200
+    except Exception as e:
+        return jsonify({"status": "error", "error": str(e)}), 503
+
+
+@util_routes.route("/health/metadata-cache")
+def metadata_cache_stats():
+    """
+    Survey metadata cache statistics (hit rate, size, evictions).
+    Reports the cache of the worker process that served the request.
+    """
+    return jsonify(get_metadata_cache_stats()), 200
+
+
 @util_routes.route("/get_messages")
 def get_messages():
     """
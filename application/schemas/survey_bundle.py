@@ -0,0 +1,124 @@
+import copy
+import json
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze: fresh, mutable dicts and lists."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return copy.copy(value)
+
+
+def _parse_json(value: Any) -> Any:
+    """Parse a JSON column that the driver may return as str or already decoded."""
+    if value is None or isinstance(value, (dict, list)):
+        return value
+    return json.loads(value) if value else None
+
+
+def _localize(translations: Mapping[str, str], lang: str) -> str:
+    """Current language with Hebrew fallback, as in get_survey_field."""
+    return translations.get(lang, translations.get("he", ""))
+
+
+@dataclass(frozen=True)
+class SurveyBundle:
+    """
+    Everything the survey flow needs about one active survey, loaded with a
+    single query by `database.queries.load_survey_bundle`.
+
+    Instances are immutable: JSON objects are exposed as read-only mappings
+    and arrays as tuples, so one bundle can be shared across a request (and
+    cached) safely. Use `pair_generation_config_dict()` where a plain dict is
+    required.
+    """
+
+    survey_id: int
+    story_code: str
+    title: Mapping[str, str]
+    description: Mapping[str, str]
+    subjects: Tuple[Mapping[str, str], ...]
+    pair_generation_config: Mapping[str, Any]
+    suitability_rules: Optional[Mapping[str, Any]]
+    awareness_pts: Mapping[str, str]
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "SurveyBundle":
+        """
+        Build a bundle from a surveys JOIN stories row.
+
+        Raises:
+            ValueError: If a required JSON column is malformed.
+        """
+        rules = _parse_json(row.get("suitability_rules"))
+        if rules is not None and not isinstance(rules, dict):
+            logger.warning(f"Unexpected type for suitability_rules: {type(rules)}")
+            rules = None
+
+        # Malformed awareness tokens are treated as "not configured"
+        try:
+            pts = _parse_json(row.get("awareness_pts")) or {}
+        except (json.JSONDecodeError, TypeError):
+            logger.warning(f"Malformed awareness_pts for survey {row['survey_id']}")
+            pts = {}
+        if not isinstance(pts, dict):
+            pts = {}
+        tokens = {
+            key: pts[key]
+            for key in ("first", "second")
+            if isinstance(pts.get(key), str) and pts.get(key)
+        }
+
+        return cls(
+            survey_id=row["survey_id"],
+            story_code=row["story_code"],
+            title=_freeze(_parse_json(row.get("title")) or {}),
+            description=_freeze(_parse_json(row.get("description")) or {}),
+            subjects=_freeze(_parse_json(row.get("subjects")) or []),
+            pair_generation_config=_freeze(
+                _parse_json(row.get("pair_generation_config")) or {}
+            ),
+            suitability_rules=_freeze(rules) if rules else None,
+            awareness_pts=MappingProxyType(tokens),
+        )
+
+    @property
+    def strategy_name(self) -> str:
+        return self.pair_generation_config.get("strategy", "")
+
+    def pair_generation_config_dict(self) -> Dict[str, Any]:
+        """A mutable copy of the pair generation config."""
+        return _thaw(self.pair_generation_config)
+
+    def get_name(self, lang: str) -> str:
+        return _localize(self.title, lang)
+
+    def get_description(self, lang: str) -> str:
+        return _localize(self.description, lang)
+
+    def get_subjects(self, lang: str) -> List[str]:
+        return [_localize(subject, lang) for subject in self.subjects]
+
+    def get_pair_instructions(self, lang: str) -> Optional[str]:
+        """Custom pair instructions in `lang` (no fallback), if configured."""
+        instructions = self.pair_generation_config.get("pair_instructions")
+        if not isinstance(instructions, Mapping):
+            return None
+        return instructions.get(lang) or None
@@ -1,9 +1,14 @@
+import logging
 import math
+import os
+import tempfile
 from functools import lru_cache
 from typing import Generator, Tuple
 
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 def _simplex_points(
     num_variables: int,
@@ -16,7 +21,7 @@ def _simplex_points(
 
     PERFORMANCE NOTE:
     This is a generator that calculates points from scratch. For high-volume
-    usage (like N=5, step=5), use `get_cached_simplex_pool` instead to avoid
+    usage (like N=5, step=5), use `get_simplex_matrix` instead to avoid
     re-calculation overhead.
 
     Args:
@@ -62,6 +67,134 @@ def _simplex_points(
     yield from generate(num_variables, total_steps)
 
 
+def _simplex_dtype(side_length: int) -> np.dtype:
+    """Smallest signed integer dtype that can hold coordinates up to side_length."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if side_length <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _build_simplex_matrix(
+    num_variables: int,
+    side_length: int = 100,
+    step: int = 5,
+    min_value: int = 0,
+) -> np.ndarray:
+    """
+    Vectorized equivalent of `_simplex_points`, returned as an integer matrix.
+
+    Rows are in exactly the same (lexicographic) order as the points yielded
+    by `_simplex_points`, so row indices are interchangeable between the two.
+    The matrix is built one coordinate at a time: every partial row is
+    repeated once per value the next coordinate can take.
+    """
+    if num_variables <= 0:
+        raise ValueError("num_variables must be positive")
+    if side_length % step != 0:
+        raise ValueError(
+            f"side_length ({side_length}) must be divisible by step ({step})"
+        )
+
+    dtype = _simplex_dtype(side_length)
+    total_steps = side_length // step
+    min_steps_per_var = math.ceil(min_value / step)
+    free_steps = total_steps - num_variables * min_steps_per_var
+
+    if free_steps < 0:
+        return np.empty((0, num_variables), dtype=dtype)
+
+    # Work in "free steps" above the per-coordinate minimum
+    rows = np.zeros((1, 0), dtype=np.int64)
+    remaining = np.array([free_steps], dtype=np.int64)
+    for _ in range(num_variables - 1):
+        counts = remaining + 1
+        parent = np.repeat(np.arange(len(remaining)), counts)
+        starts = np.cumsum(counts) - counts
+        values = np.arange(parent.size) - np.repeat(starts, counts)
+        rows = np.column_stack([rows[parent], values])
+        remaining = remaining[parent] - values
+    rows = np.column_stack([rows, remaining])
+
+    matrix = (rows + min_steps_per_var) * step
+    return np.ascontiguousarray(matrix, dtype=dtype)
+
+
+def _simplex_cache_path(
+    cache_dir: str, num_variables: int, side_length: int, step: int, min_value: int
+) -> str:
+    return os.path.join(
+        cache_dir,
+        f"simplex_n{num_variables}_s{side_length}_st{step}_m{min_value}.npy",
+    )
+
+
+def _load_or_build_simplex_matrix(
+    num_variables: int, side_length: int, step: int, min_value: int
+) -> np.ndarray:
+    """
+    Return the simplex matrix, memory-mapping it from SIMPLEX_POOL_CACHE_DIR
+    when configured so that all worker processes share one page-cache copy.
+    """
+    cache_dir = os.getenv("SIMPLEX_POOL_CACHE_DIR")
+    if not cache_dir:
+        return _build_simplex_matrix(num_variables, side_length, step, min_value)
+
+    path = _simplex_cache_path(cache_dir, num_variables, side_length, step, min_value)
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+
+    matrix = _build_simplex_matrix(num_variables, side_length, step, min_value)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a private temp file and rename, so concurrent workers
+        # never map a partially written file.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".npy.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, path)
+        return np.load(path, mmap_mode="r")
+    except OSError as e:
+        logger.warning(f"Could not persist simplex pool to {path}: {e}")
+        return matrix
+
+
+@lru_cache(maxsize=32)
+def get_simplex_matrix(
+    num_variables: int,
+    side_length: int = 100,
+    step: int = 5,
+    min_value: int = 0,
+) -> np.ndarray:
+    """
+    Lattice points of the discrete simplex grid as a read-only integer matrix.
+
+    The matrix has shape (n_points, num_variables), a compact dtype (int8 for
+    side_length=100) and rows in the same order as `_simplex_points`. It is
+    cached per process; if the SIMPLEX_POOL_CACHE_DIR environment variable is
+    set it is also persisted there as a .npy file and memory-mapped, so all
+    gunicorn workers share a single copy.
+
+    The returned array is shared, so it is marked read-only. Callers get a
+    zero-copy view and must copy it before modifying it.
+
+    Args:
+        num_variables: Number of coordinates per vector.
+        side_length: The total sum required across all coordinates.
+        step: The increment between allowed values.
+        min_value: Minimum allowed value per coordinate (rounded up to step).
+
+    Returns:
+        np.ndarray: Read-only matrix of simplex points.
+    """
+    matrix = _load_or_build_simplex_matrix(num_variables, side_length, step, min_value)
+    view = matrix.view()
+    view.flags.writeable = False
+    return view
+
+
 @lru_cache(maxsize=32)
 def get_cached_simplex_pool(
     num_variables: int,
@@ -70,19 +203,18 @@ def get_cached_simplex_pool(
     min_value: int = 0,
 ) -> Tuple[Tuple[int, ...], ...]:
     """
-    Cached wrapper around `_simplex_points`.
+    Cached tuple-of-tuples form of `get_simplex_matrix`.
 
-    Returns an immutable tuple-of-tuples so it can be safely cached via
-    `lru_cache`.
+    Kept for callers that need hashable vectors (e.g. building sets); numeric
+    code should use `get_simplex_matrix` directly.
     """
-    return tuple(
-        _simplex_points(
-            num_variables=num_variables,
-            side_length=side_length,
-            step=step,
-            min_value=min_value,
-        )
+    matrix = get_simplex_matrix(
+        num_variables=num_variables,
+        side_length=side_length,
+        step=step,
+        min_value=min_value,
     )
+    return tuple(map(tuple, matrix.tolist()))
 
 
 def rankdata(a: np.ndarray, method: str = "average") -> np.ndarray:
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Sequence, Tuple, Union
+
+import numpy as np
 
 
 class UtilityModel(ABC):
@@ -41,3 +43,28 @@ class UtilityModel(ABC):
             A float score where higher is better.
         """
         pass
+
+    def calculate_batch(
+        self,
+        user_vec: Tuple[float, ...],
+        pool_matrix: Union[np.ndarray, Sequence[Tuple[float, ...]]],
+    ) -> np.ndarray:
+        """
+        Calculate the scores of many candidate vectors at once.
+
+        Equivalent to calling `calculate(user_vec, row)` for every row of
+        `pool_matrix`. The default implementation does exactly that;
+        subclasses should override it with a vectorized version, since this
+        is the hot path of rank-based pair generation.
+
+        Args:
+            user_vec: The user's ideal budget allocation.
+            pool_matrix: Candidate allocations, shape (n_candidates, n_dims).
+
+        Returns:
+            A float array of shape (n_candidates,) where higher is better.
+        """
+        return np.array(
+            [self.calculate(user_vec, tuple(row)) for row in pool_matrix],
+            dtype=float,
+        )
@@ -1,9 +1,22 @@
-from typing import Tuple
+from typing import Sequence, Tuple, Union
 
 import numpy as np
 
 from application.services.algorithms.utility_model_base import UtilityModel
 
+PoolMatrix = Union[np.ndarray, Sequence[Tuple[float, ...]]]
+
+
+def _as_arrays(
+    user_vec: Tuple[float, ...], pool_matrix: PoolMatrix
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert a user vector and a candidate pool into float arrays."""
+    user_arr = np.asarray(user_vec, dtype=float)
+    pool_arr = np.asarray(pool_matrix, dtype=float)
+    if pool_arr.ndim == 1:
+        pool_arr = pool_arr.reshape(-1, user_arr.shape[0])
+    return user_arr, pool_arr
+
 
 class L1UtilityModel(UtilityModel):
     """
@@ -42,6 +55,12 @@ class L1UtilityModel(UtilityModel):
         diff = np.abs(user_arr - comp_arr)
         return -float(np.sum(diff))
 
+    def calculate_batch(
+        self, user_vec: Tuple[float, ...], pool_matrix: PoolMatrix
+    ) -> np.ndarray:
+        user_arr, pool_arr = _as_arrays(user_vec, pool_matrix)
+        return -np.abs(pool_arr - user_arr).sum(axis=1)
+
 
 class L2UtilityModel(UtilityModel):
     """
@@ -79,6 +98,12 @@ class L2UtilityModel(UtilityModel):
         dist = np.sqrt(np.sum((user_arr - comp_arr) ** 2))
         return -float(dist)
 
+    def calculate_batch(
+        self, user_vec: Tuple[float, ...], pool_matrix: PoolMatrix
+    ) -> np.ndarray:
+        user_arr, pool_arr = _as_arrays(user_vec, pool_matrix)
+        return -np.sqrt(((user_arr - pool_arr) ** 2).sum(axis=1))
+
 
 class CosineSimilarityUtilityModel(UtilityModel):
     """
@@ -111,6 +136,21 @@ class CosineSimilarityUtilityModel(UtilityModel):
 
         return float(np.dot(user_arr, comp_arr) / denominator)
 
+    def calculate_batch(
+        self, user_vec: Tuple[float, ...], pool_matrix: PoolMatrix
+    ) -> np.ndarray:
+        user_arr, pool_arr = _as_arrays(user_vec, pool_matrix)
+
+        denominator = np.linalg.norm(user_arr) * np.sqrt(
+            (pool_arr * pool_arr).sum(axis=1)
+        )
+        dots = pool_arr @ user_arr
+
+        scores = np.zeros(pool_arr.shape[0])
+        valid = denominator != 0
+        scores[valid] = dots[valid] / denominator[valid]
+        return scores
+
 
 class LeontiefUtilityModel(UtilityModel):
     """
@@ -161,6 +201,18 @@ class LeontiefUtilityModel(UtilityModel):
         ratios = comp_arr[non_zero_mask] / user_arr[non_zero_mask]
         return float(np.min(ratios))
 
+    def calculate_batch(
+        self, user_vec: Tuple[float, ...], pool_matrix: PoolMatrix
+    ) -> np.ndarray:
+        user_arr, pool_arr = _as_arrays(user_vec, pool_matrix)
+
+        non_zero_mask = user_arr > 0
+        if not np.any(non_zero_mask):
+            return np.zeros(pool_arr.shape[0])
+
+        ratios = pool_arr[:, non_zero_mask] / user_arr[non_zero_mask]
+        return ratios.min(axis=1)
+
 
 class AntiLeontiefUtilityModel(UtilityModel):
     """
@@ -199,6 +251,18 @@ class AntiLeontiefUtilityModel(UtilityModel):
         ratios = comp_arr[non_zero_mask] / user_arr[non_zero_mask]
         return -float(np.max(ratios))
 
+    def calculate_batch(
+        self, user_vec: Tuple[float, ...], pool_matrix: PoolMatrix
+    ) -> np.ndarray:
+        user_arr, pool_arr = _as_arrays(user_vec, pool_matrix)
+
+        non_zero_mask = user_arr > 0
+        if not np.any(non_zero_mask):
+            return np.zeros(pool_arr.shape[0])
+
+        ratios = pool_arr[:, non_zero_mask] / user_arr[non_zero_mask]
+        return -ratios.max(axis=1)
+
 
 class KLUtilityModel(UtilityModel):
     """
@@ -255,3 +319,28 @@ class KLUtilityModel(UtilityModel):
         )
 
         return -float(divergence)
+
+    def calculate_batch(
+        self, user_vec: Tuple[float, ...], pool_matrix: PoolMatrix
+    ) -> np.ndarray:
+        p, q = _as_arrays(user_vec, pool_matrix)
+
+        p_sum = np.sum(p)
+        q_sum = q.sum(axis=1)
+        scores = np.zeros(q.shape[0])
+        if p_sum == 0:
+            return scores
+
+        valid = q_sum != 0
+        p_norm = p / p_sum
+        q_norm = q[valid] / q_sum[valid, np.newaxis]
+
+        epsilon = 1e-10
+        mask = p_norm > 0
+        p_masked = p_norm[mask]
+        divergence = (p_masked * np.log(p_masked / (q_norm[:, mask] + epsilon))).sum(
+            axis=1
+        )
+
+        scores[valid] = -divergence
+        return scores
@@ -1,12 +1,7 @@
 import logging
 from typing import Any, Dict, List
 
-from database.queries import (
-    get_blacklisted_users,
-    get_surveys_for_dashboard,
-    get_user_participation_overview,
-    retrieve_completed_survey_responses,
-)
+from database.queries import get_dashboard_counts, get_surveys_for_dashboard
 
 logger = logging.getLogger(__name__)
 
@@ -59,29 +54,25 @@ def process_survey_data(surveys: List[Dict]) -> List[Dict]:
 
 
 def get_dashboard_metrics() -> Dict[str, Any]:
-    """Calculate basic metrics for the dashboard."""
+    """
+    Calculate basic metrics for the dashboard.
+
+    Counts come from aggregate queries and, like the survey list, are cached
+    per worker until the next submission, so the cost does not grow with the
+    number of stored responses.
+    """
     try:
         # Get and process all surveys for dashboard visibility.
         dashboard_surveys = get_surveys_for_dashboard()
         processed_surveys = process_survey_data(dashboard_surveys)
 
-        # Get completed responses
-        completed_responses = retrieve_completed_survey_responses()
-        unique_participants = len(set(r["user_id"] for r in completed_responses))
-
-        # Get unaware users count (blacklisted users)
-        unaware_users = get_blacklisted_users()
-        unaware_users_count = len(unaware_users)
-
-        # Get users with surveys count
-        user_participation_data = get_user_participation_overview()
-        users_with_surveys_count = len(user_participation_data)
+        counts = get_dashboard_counts() or {}
 
         return {
             "total_surveys": len(processed_surveys),
-            "total_participants": unique_participants,
-            "unaware_users_count": unaware_users_count,
-            "users_with_surveys": users_with_surveys_count,
+            "total_participants": counts.get("total_participants", 0),
+            "unaware_users_count": counts.get("unaware_users_count", 0),
+            "users_with_surveys": counts.get("users_with_surveys", 0),
             "surveys": processed_surveys,
         }
 
@@ -5,19 +5,31 @@
     For specific instantiations, see rank_strategies.py.
 """
 
-import functools
 import logging
+import sys
 from typing import Dict, List, Optional, Set, Tuple, Type
 
 import numpy as np
 
+from application.services.algorithms import (
+    math_utils,
+    utility_model_base,
+    utility_models,
+)
 from application.services.algorithms.math_utils import (
     get_cached_simplex_pool,
+    get_simplex_matrix,
     min_max_scale,
     rankdata,
 )
 from application.services.algorithms.utility_model_base import UtilityModel
+from application.services.pair_generation import ranked_pairs_cache
 from application.services.pair_generation.base import PairGenerationStrategy
+from application.services.pair_generation.ranked_pairs_cache import (
+    RankedPairsCache,
+    cached_ranked_pairs,
+    create_persistent_store_from_env,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +77,21 @@ def _compute_pair_scores(
         )
 
 
-@functools.lru_cache(maxsize=1024)
+# Byte-bounded, per-process cache of ranked pair results
+RANKED_PAIRS_CACHE = RankedPairsCache()
+
+# Optional on-disk cache shared by all workers (enabled by PAIR_CACHE_DB_PATH).
+# Versioned by the source of every module that affects the results.
+RANKED_PAIRS_STORE = create_persistent_store_from_env(
+    sys.modules[__name__],
+    math_utils,
+    utility_model_base,
+    utility_models,
+    ranked_pairs_cache,
+)
+
+
+@cached_ranked_pairs(RANKED_PAIRS_CACHE, RANKED_PAIRS_STORE)
 def _compute_all_ranked_pairs(
     user_vector: Tuple[int, ...],
     vector_size: int,
@@ -77,6 +103,7 @@ def _compute_all_ranked_pairs(
     strategy_name: str,
     scoring_method: str = "max_min",
     scoring_lambda: float = 0.1,
+    top_k: Optional[int] = None,
 ) -> List[Tuple[int, int, float]]:
     """
     Perform the heavy pure-math computation for pair generation.
@@ -93,6 +120,9 @@ def _compute_all_ranked_pairs(
         strategy_name: Unique identifier for this strategy (part of cache key).
         scoring_method: Method to score pairs ('max_min', 'weighted_cc', 'harmonic_mean').
         scoring_lambda: Lambda parameter for 'weighted_cc'.
+        top_k: If given, only the best top_k pairs are returned. This is
+            identical to slicing the full result, but avoids scoring pairs
+            that cannot make the cut.
 
     Returns:
         List of (index_a, index_b, score) tuples, sorted by score descending.
@@ -101,27 +131,20 @@ def _compute_all_ranked_pairs(
     model_a = utility_model_a_class()
     model_b = utility_model_b_class()
 
-    # 2. Generate Pool
-    pool = list(
-        get_cached_simplex_pool(
-            num_variables=vector_size,
-            side_length=100,
-            step=grid_step,
-            min_value=current_floor,
-        )
+    # 2. Generate Pool (shared read-only matrix, no per-call copy)
+    pool_matrix = get_simplex_matrix(
+        num_variables=vector_size,
+        side_length=100,
+        step=grid_step,
+        min_value=current_floor,
     )
-    n_pool = len(pool)
+    n_pool = len(pool_matrix)
     if n_pool < 2:
         return []
 
-    # 3. Calculate Utility Scores
-    # Use list comprehension for speed and then convert to numpy
-    scores_a = np.array(
-        [model_a.calculate(user_vector, candidate) for candidate in pool]
-    )
-    scores_b = np.array(
-        [model_b.calculate(user_vector, candidate) for candidate in pool]
-    )
+    # 3. Calculate Utility Scores (vectorized over the whole pool)
+    scores_a = model_a.calculate_batch(user_vector, pool_matrix)
+    scores_b = model_b.calculate_batch(user_vector, pool_matrix)
 
     # 4. Compute Ranks (Normalized 0-1)
     if normalization_method == "ordinal":
@@ -146,12 +169,44 @@ def _compute_all_ranked_pairs(
         # Fallback for unexpected method
         raise RuntimeError(f"unexpected normalization_method {normalization_method}")
 
-    # 5. Compute all valid pairs (MaxMin Logic)
+    # 5. Select pairs (MaxMin Logic)
     # ----------------------------------------
     # Convert to float32 to reduce memory bandwidth and improve speed.
     ranks_a_f32 = np.asarray(ranks_a, dtype=np.float32)
     ranks_b_f32 = np.asarray(ranks_b, dtype=np.float32)
 
+    if top_k is not None:
+        return _select_top_k_pairs(
+            ranks_a_f32, ranks_b_f32, top_k, scoring_method, scoring_lambda
+        )
+    return _select_all_pairs(ranks_a_f32, ranks_b_f32, scoring_method, scoring_lambda)
+
+
+def _select_all_pairs(
+    ranks_a: np.ndarray,
+    ranks_b: np.ndarray,
+    scoring_method: str,
+    scoring_lambda: float,
+) -> List[Tuple[int, int, float]]:
+    """
+    Score every valid pair and return them all, best first.
+
+    A pair (i, j) is valid when the two utility models disagree on which of
+    the two vectors is better. Ties in score keep generation order: anchor i
+    ascending, then pairs where i wins on model A, then pairs where the other
+    vector wins on model A, each by the other index ascending.
+
+    Args:
+        ranks_a: Normalized (float32) ranks of the pool on Utility Model A.
+        ranks_b: Normalized (float32) ranks of the pool on Utility Model B.
+        scoring_method: Method to score pairs.
+        scoring_lambda: Lambda parameter for 'weighted_cc'.
+
+    Returns:
+        List of (index_a, index_b, score) tuples, sorted by score descending.
+    """
+    n_pool = len(ranks_a)
+
     # Collect valid candidates
     all_idx_a = []
     all_idx_b = []
@@ -159,14 +214,14 @@ def _compute_all_ranked_pairs(
 
     for i in range(n_pool - 1):
         # Slice ranks for all remaining candidates (indices > i)
-        ranks_a_rest = ranks_a_f32[i + 1 :]
-        ranks_b_rest = ranks_b_f32[i + 1 :]
+        ranks_a_rest = ranks_a[i + 1 :]
+        ranks_b_rest = ranks_b[i + 1 :]
 
         # gains_a: Advantage of 'i' over the 'rest' on Utility Model A
-        gains_a = ranks_a_f32[i] - ranks_a_rest
+        gains_a = ranks_a[i] - ranks_a_rest
 
         # gains_b: Advantage of the 'rest' over 'i' on Utility Model B
-        gains_b = ranks_b_rest - ranks_b_f32[i]
+        gains_b = ranks_b_rest - ranks_b[i]
 
         # Case 1: 'i' is better on Utility Model A, Candidate is better on Utility Model B
         mask_i_better_on_a = (gains_a > 0) & (gains_b > 0)
@@ -206,8 +261,8 @@ def _compute_all_ranked_pairs(
     final_idx_b = np.concatenate(all_idx_b)
     final_scores = np.concatenate(all_scores)
 
-    # Sort by score descending
-    sort_indices = np.argsort(final_scores)[::-1]
+    # Sort by score descending (stable, so ties keep generation order)
+    sort_indices = np.argsort(-final_scores, kind="stable")
 
     # Return as list of (idx_a, idx_b, score) tuples
     return [
@@ -216,6 +271,165 @@ def _compute_all_ranked_pairs(
     ]
 
 
+def _pair_score_upper_bounds(
+    ranks_a: np.ndarray,
+    ranks_b: np.ndarray,
+    scoring_method: str,
+    scoring_lambda: float,
+) -> np.ndarray:
+    """
+    Upper bound on the score of any valid pair anchored at each index i
+    (i.e. paired with some j > i).
+
+    Gains are bounded using suffix minima/maxima of the ranks over j > i.
+    All scoring methods are non-decreasing in both gains (for lambda in
+    [0, 1]), so scoring the bounding gains bounds every pair score.
+
+    Returns:
+        float64 array of bounds; -inf for anchors without partners.
+    """
+    n_pool = len(ranks_a)
+    bounds = np.full(n_pool, -np.inf)
+    if n_pool < 2:
+        return bounds
+
+    if scoring_method == SCORING_WEIGHTED_CC and not (0 <= scoring_lambda <= 1):
+        # Not monotone, so nothing can be pruned
+        bounds[:-1] = np.inf
+        return bounds
+
+    ra = ranks_a.astype(np.float64)
+    rb = ranks_b.astype(np.float64)
+
+    # Suffix extrema over j > i
+    suffix_min_a = np.minimum.accumulate(ra[::-1])[::-1][1:]
+    suffix_max_a = np.maximum.accumulate(ra[::-1])[::-1][1:]
+    suffix_min_b = np.minimum.accumulate(rb[::-1])[::-1][1:]
+    suffix_max_b = np.maximum.accumulate(rb[::-1])[::-1][1:]
+    ra_i, rb_i = ra[:-1], rb[:-1]
+
+    # Case 1: i wins on A, j wins on B. Case 2: the reverse.
+    # (Zero gains make harmonic_mean divide 0/0 inside np.where; harmless.)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        bound_1 = _compute_pair_scores(
+            np.maximum(ra_i - suffix_min_a, 0.0),
+            np.maximum(suffix_max_b - rb_i, 0.0),
+            scoring_method,
+            scoring_lambda,
+        )
+        bound_2 = _compute_pair_scores(
+            np.maximum(suffix_max_a - ra_i, 0.0),
+            np.maximum(rb_i - suffix_min_b, 0.0),
+            scoring_method,
+            scoring_lambda,
+        )
+    # Small slack so float32 rounding of the real scores can never exceed
+    # the bound computed in float64.
+    bounds[:-1] = np.maximum(bound_1, bound_2) + 1e-6
+    return bounds
+
+
+def _select_top_k_pairs(
+    ranks_a: np.ndarray,
+    ranks_b: np.ndarray,
+    k: int,
+    scoring_method: str,
+    scoring_lambda: float,
+    block_elements: int = 2_000_000,
+) -> List[Tuple[int, int, float]]:
+    """
+    Return exactly `_select_all_pairs(...)[:k]` without scoring every pair.
+
+    Anchors are visited in blocks, in descending order of their score upper
+    bound. A running top-k (score descending, generation order ascending)
+    is kept, and the scan stops as soon as no remaining anchor can reach the
+    current k-th score.
+
+    Args:
+        ranks_a: Normalized (float32) ranks of the pool on Utility Model A.
+        ranks_b: Normalized (float32) ranks of the pool on Utility Model B.
+        k: Number of pairs to return.
+        scoring_method: Method to score pairs.
+        scoring_lambda: Lambda parameter for 'weighted_cc'.
+        block_elements: Approximate number of (anchor, candidate) cells
+            evaluated per block; bounds peak memory.
+
+    Returns:
+        Up to k (index_a, index_b, score) tuples, sorted by score descending.
+    """
+    n_pool = len(ranks_a)
+    if k <= 0 or n_pool < 2:
+        return []
+
+    bounds = _pair_score_upper_bounds(ranks_a, ranks_b, scoring_method, scoring_lambda)
+    anchor_order = np.argsort(-bounds, kind="stable")
+    anchor_order = anchor_order[bounds[anchor_order] > -np.inf]
+    block_size = max(1, block_elements // n_pool)
+    columns = np.arange(n_pool)
+
+    # Running top-k. Keys encode generation order: (i, case, j).
+    best_scores = np.empty(0, dtype=np.float32)
+    best_keys = np.empty(0, dtype=np.int64)
+
+    for start in range(0, len(anchor_order), block_size):
+        anchors = anchor_order[start : start + block_size]
+        if len(best_scores) >= k:
+            threshold = best_scores[-1]
+            # Anchors are sorted by bound, so the rest cannot compete either
+            if bounds[anchors[0]] < threshold:
+                break
+            anchors = anchors[bounds[anchors] >= threshold]
+
+        gains_a = ranks_a[anchors, np.newaxis] - ranks_a[np.newaxis, :]
+        gains_b = ranks_b[np.newaxis, :] - ranks_b[anchors, np.newaxis]
+        later = columns[np.newaxis, :] > anchors[:, np.newaxis]
+
+        block_scores = []
+        block_keys = []
+        for case, sign in ((0, 1), (1, -1)):
+            if case == 0:
+                mask = later & (gains_a > 0) & (gains_b > 0)
+            else:
+                mask = later & (gains_a < 0) & (gains_b < 0)
+            rows, cols = np.nonzero(mask)
+            if len(rows) == 0:
+                continue
+            scores = _compute_pair_scores(
+                sign * gains_a[rows, cols],
+                sign * gains_b[rows, cols],
+                scoring_method,
+                scoring_lambda,
+            )
+            anchor_idx = anchors[rows].astype(np.int64)
+            block_scores.append(scores)
+            block_keys.append(anchor_idx * (2 * n_pool) + case * n_pool + cols)
+
+        if not block_scores:
+            continue
+
+        cand_scores = np.concatenate([best_scores] + block_scores)
+        cand_keys = np.concatenate([best_keys] + block_keys)
+
+        if len(cand_scores) > k:
+            # Keep everything tied with the k-th best score, then order exactly
+            kth = np.partition(cand_scores, len(cand_scores) - k)[len(cand_scores) - k]
+            keep = cand_scores >= kth
+            cand_scores, cand_keys = cand_scores[keep], cand_keys[keep]
+
+        order = np.lexsort((cand_keys, -cand_scores))[:k]
+        best_scores, best_keys = cand_scores[order], cand_keys[order]
+
+    result = []
+    for score, key in zip(best_scores.tolist(), best_keys.tolist()):
+        i, rest = divmod(key, 2 * n_pool)
+        case, j = divmod(rest, n_pool)
+        if case == 0:
+            result.append((int(i), int(j), float(score)))
+        else:
+            result.append((int(j), int(i), float(score)))
+    return result
+
+
 class GenericRankStrategy(PairGenerationStrategy):
     """
     A generic engine that generates pairs by comparing two utility models.
@@ -392,6 +606,7 @@ class GenericRankStrategy(PairGenerationStrategy):
                     strategy_name=self.get_strategy_name(),
                     scoring_method=self.scoring_method,
                     scoring_lambda=self.scoring_lambda,
+                    top_k=n,
                 )
 
                 if len(ranked_pairs) >= n:
@@ -439,33 +654,37 @@ class GenericRankStrategy(PairGenerationStrategy):
                 )
 
         # Format output using the successful top_n
-        pool_list = list(
-            get_cached_simplex_pool(
-                num_variables=vector_size,
-                side_length=100,
-                step=self.grid_step,
-                min_value=current_min,
-            )
+        pool_matrix = get_simplex_matrix(
+            num_variables=vector_size,
+            side_length=100,
+            step=self.grid_step,
+            min_value=current_min,
         )
 
-        # Recalculate raw scores for formatting (numpy vectorized)
-        scores_a = np.array(
-            [self.utility_model_a.calculate(user_vector_tuple, v) for v in pool_list]
+        # Recalculate raw scores for formatting, only for the selected vectors
+        selected = np.array(
+            [idx for idx_a, idx_b, _ in top_n for idx in (idx_a, idx_b)], dtype=np.intp
+        )
+        selected_vectors = pool_matrix[selected]
+        scores_a = self.utility_model_a.calculate_batch(
+            user_vector_tuple, selected_vectors
         )
-        scores_b = np.array(
-            [self.utility_model_b.calculate(user_vector_tuple, v) for v in pool_list]
+        scores_b = self.utility_model_b.calculate_batch(
+            user_vector_tuple, selected_vectors
         )
+        vectors = [tuple(row) for row in selected_vectors.tolist()]
 
         result_pairs = []
-        for idx_a, idx_b, score in top_n:
+        for k, (idx_a, idx_b, score) in enumerate(top_n):
+            pos_a, pos_b = 2 * k, 2 * k + 1
             pair = self._create_pair_output(
-                pool_list[idx_a],
-                pool_list[idx_b],
+                vectors[pos_a],
+                vectors[pos_b],
                 score,
-                scores_a[idx_a],
-                scores_a[idx_b],
-                scores_b[idx_a],
-                scores_b[idx_b],
+                scores_a[pos_a],
+                scores_a[pos_b],
+                scores_b[pos_a],
+                scores_b[pos_b],
                 True,  # idx_a is always better for model A in _compute_all_ranked_pairs
             )
 
@@ -711,14 +930,14 @@ class GenericRankStrategy(PairGenerationStrategy):
         # Convert set to list for stable ordering and indexing
         pool_list = list(vector_pool)
 
-        scores_a = []
-        scores_b = []
+        if not pool_list:
+            return np.array([]), np.array([]), pool_list
 
-        for candidate in pool_list:
-            scores_a.append(self.utility_model_a.calculate(user_vector, candidate))
-            scores_b.append(self.utility_model_b.calculate(user_vector, candidate))
+        pool_matrix = np.asarray(pool_list, dtype=float)
+        scores_a = self.utility_model_a.calculate_batch(user_vector, pool_matrix)
+        scores_b = self.utility_model_b.calculate_batch(user_vector, pool_matrix)
 
-        return np.array(scores_a), np.array(scores_b), pool_list
+        return scores_a, scores_b, pool_list
 
     def _compute_ranks(
         self, scores_a: np.ndarray, scores_b: np.ndarray
@@ -791,6 +1010,19 @@ class GenericRankStrategy(PairGenerationStrategy):
         """
         return f"{self.utility_model_a.name}_vs_{self.utility_model_b.name}_rank_comparison"
 
+    def clear_cache(self) -> int:
+        """
+        Drop this strategy's cached ranked pair results, in memory and in the
+        persistent store if one is configured.
+
+        Returns:
+            int: Number of in-memory cache entries removed.
+        """
+        strategy_name = self.get_strategy_name()
+        if RANKED_PAIRS_STORE is not None:
+            RANKED_PAIRS_STORE.clear(strategy_name)
+        return _compute_all_ranked_pairs.cache_clear(strategy_name)
+
     def get_option_labels(self) -> Tuple[str, str]:
         """
         Return human-readable labels for the two options being compared in the 'Survey Summary' Table.
@@ -0,0 +1,556 @@
+"""
+Caches for ranked pair computations.
+
+`_compute_all_ranked_pairs` results can hold millions of (i, j, score)
+tuples for 5-D pools. RankedPairsCache stores them as compact numpy arrays
+(int32 indices + float32 scores, ~12 bytes per pair instead of ~150 for a
+tuple of Python objects), evicts least-recently-used entries once a byte
+budget is exceeded, and keeps counters for monitoring.
+
+PersistentPairStore keeps the same compact entries in a SQLite file, so all
+worker processes share results: ideal vectors lie on a finite grid and
+repeat across respondents.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Default byte budget per worker process (override with env var)
+DEFAULT_MAX_BYTES = int(os.getenv("RANKED_PAIRS_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+# Same shape as functools.lru_cache().cache_info() for drop-in compatibility
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+RankedPairs = List[Tuple[int, int, float]]
+
+
+class _Entry:
+    """Compact storage for one ranked pair list."""
+
+    __slots__ = ("indices", "scores", "top_k", "strategy_name")
+
+    def __init__(
+        self,
+        indices: np.ndarray,
+        scores: np.ndarray,
+        top_k: Optional[int],
+        strategy_name: Optional[str],
+    ):
+        self.indices = indices
+        self.scores = scores
+        self.top_k = top_k
+        self.strategy_name = strategy_name
+
+    @classmethod
+    def from_pairs(
+        cls, pairs: RankedPairs, top_k: Optional[int], strategy_name: Optional[str]
+    ) -> "_Entry":
+        if pairs:
+            table = np.array(pairs, dtype=np.float64)
+            indices = table[:, :2].astype(np.int32)
+            # Scores are float32 values to begin with, so this is lossless
+            scores = table[:, 2].astype(np.float32)
+        else:
+            indices = np.empty((0, 2), dtype=np.int32)
+            scores = np.empty(0, dtype=np.float32)
+        return cls(indices, scores, top_k, strategy_name)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        payload: bytes,
+        n_pairs: int,
+        top_k: Optional[int],
+        strategy_name: Optional[str],
+    ) -> "_Entry":
+        split = n_pairs * 2 * np.dtype(np.int32).itemsize
+        indices = np.frombuffer(payload[:split], dtype=np.int32).reshape(n_pairs, 2)
+        scores = np.frombuffer(payload[split:], dtype=np.float32)
+        return cls(indices, scores, top_k, strategy_name)
+
+    def to_bytes(self) -> bytes:
+        return self.indices.tobytes() + self.scores.tobytes()
+
+    @property
+    def nbytes(self) -> int:
+        return self.indices.nbytes + self.scores.nbytes
+
+    def covers(self, top_k: Optional[int]) -> bool:
+        """Whether this entry can answer a request for the best `top_k` pairs."""
+        if self.top_k is None:
+            return True
+        if len(self.scores) < self.top_k:
+            # Fewer pairs than requested exist at all, so the list is complete
+            return True
+        return top_k is not None and top_k <= self.top_k
+
+    def to_pairs(self, top_k: Optional[int]) -> RankedPairs:
+        end = len(self.scores) if top_k is None else min(top_k, len(self.scores))
+        indices = self.indices[:end].tolist()
+        scores = self.scores[:end].tolist()
+        return [(a, b, s) for (a, b), s in zip(indices, scores)]
+
+
+class RankedPairsCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its stored arrays.
+
+    Results computed with a `top_k` limit are stored truncated; a cached
+    entry also serves any later request for fewer pairs (or, when the full
+    list was cached, any request at all).
+
+    Args:
+        max_bytes: Maximum total size of cached arrays. Results larger than
+            this on their own are returned but not cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Any, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Any, top_k: Optional[int] = None) -> Optional[RankedPairs]:
+        """Return cached pairs for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.covers(top_k):
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return entry.to_pairs(top_k)
+
+    def put(
+        self,
+        key: Any,
+        pairs: RankedPairs,
+        top_k: Optional[int] = None,
+        strategy_name: Optional[str] = None,
+    ) -> None:
+        """Store pairs under key, evicting least-recently-used entries as needed."""
+        self.put_entry(key, _Entry.from_pairs(pairs, top_k, strategy_name))
+
+    def put_entry(self, key: Any, entry: _Entry) -> None:
+        """Store an already-compacted entry (see `put`)."""
+        if entry.nbytes > self.max_bytes:
+            logger.debug(
+                f"Ranked pairs result of {entry.nbytes} bytes exceeds cache "
+                f"budget of {self.max_bytes} bytes; not caching."
+            )
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._evictions += 1
+
+    def clear(self, strategy_name: Optional[str] = None) -> int:
+        """
+        Remove cached entries.
+
+        Args:
+            strategy_name: If given, only entries computed for this strategy
+                are removed; counters are kept. Otherwise everything is
+                removed and counters are reset.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock:
+            if strategy_name is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                self._hits = self._misses = self._evictions = 0
+                return removed
+
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if entry.strategy_name == strategy_name
+            ]
+            for key in keys:
+                self._bytes -= self._entries.pop(key).nbytes
+            return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache counters and occupancy."""
+        with self._lock:
+            per_strategy: Dict[str, int] = {}
+            for entry in self._entries.values():
+                name = entry.strategy_name or "unknown"
+                per_strategy[name] = per_strategy.get(name, 0) + 1
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "entries_per_strategy": per_strategy,
+            }
+
+    def cache_info(self) -> CacheInfo:
+        """lru_cache-compatible summary (maxsize is in bytes)."""
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self.max_bytes, len(self._entries)
+            )
+
+
+class PersistentPairStore:
+    """
+    SQLite-backed ranked pair store shared by all processes on a host.
+
+    Each process (and thread) opens its own connection lazily, so a store
+    created before gunicorn forks is safe to use in the workers. Rows are
+    keyed by (cache_key, version) and only rows of the store's own version
+    are read, so changing the algorithm code or the configured cache
+    version invalidates everything written before. Rows of other versions
+    are left alone, so processes running different versions side by side
+    (e.g. during a rolling deploy) never wipe each other's results; they
+    are removed by prune(), explicitly or, with `max_age_seconds`, once
+    they were written that long ago when a process first connects. Reads
+    do not refresh an entry's age.
+
+    All failures are logged and treated as cache misses: the store can only
+    make pair generation faster, never break it.
+
+    Args:
+        path: Path of the SQLite database file (created if missing).
+        version: Version tag of the code/config producing the results.
+        max_age_seconds: Prune rows of other versions older than this on
+            each process's first connection (None: only prune explicitly).
+    """
+
+    def __init__(
+        self, path: str, version: str, max_age_seconds: Optional[float] = None
+    ):
+        self.path = path
+        self.version = version
+        self.max_age_seconds = max_age_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._errors = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ranked_pairs (
+                cache_key TEXT NOT NULL,
+                version TEXT NOT NULL,
+                strategy_name TEXT,
+                top_k INTEGER,
+                n_pairs INTEGER NOT NULL,
+                payload BLOB NOT NULL,
+                written_at REAL NOT NULL,
+                PRIMARY KEY (cache_key, version)
+            )
+            """
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        if self.max_age_seconds is not None:
+            self.prune(self.max_age_seconds)
+        return conn
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_entry(self, key: str, top_k: Optional[int] = None) -> Optional[_Entry]:
+        """Return the stored entry for key if it covers `top_k`, else None."""
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT strategy_name, top_k, n_pairs, payload FROM ranked_pairs "
+                    "WHERE cache_key = ? AND version = ?",
+                    (key, self.version),
+                )
+                .fetchone()
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Pair cache lookup failed ({self.path}): {e}")
+            self._count("_errors")
+            return None
+
+        entry = None
+        if row is not None:
+            strategy_name, stored_top_k, n_pairs, payload = row
+            entry = _Entry.from_bytes(payload, n_pairs, stored_top_k, strategy_name)
+            if not entry.covers(top_k):
+                entry = None
+
+        self._count("_hits" if entry is not None else "_misses")
+        return entry
+
+    def put_entry(self, key: str, entry: _Entry) -> None:
+        """Store an entry unless a more complete one is already stored."""
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    """
+                    INSERT INTO ranked_pairs
+                        (cache_key, version, strategy_name, top_k, n_pairs,
+                         payload, written_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(cache_key, version) DO UPDATE SET
+                        strategy_name = excluded.strategy_name,
+                        top_k = excluded.top_k,
+                        n_pairs = excluded.n_pairs,
+                        payload = excluded.payload,
+                        written_at = excluded.written_at
+                    WHERE ranked_pairs.top_k IS NOT NULL
+                        AND (excluded.top_k IS NULL
+                             OR excluded.top_k > ranked_pairs.top_k)
+                    """,
+                    (
+                        key,
+                        self.version,
+                        entry.strategy_name,
+                        entry.top_k,
+                        len(entry.scores),
+                        entry.to_bytes(),
+                        time.time(),
+                    ),
+                )
+            self._count("_writes")
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Pair cache write failed ({self.path}): {e}")
+            self._count("_errors")
+
+    def clear(self, strategy_name: Optional[str] = None) -> int:
+        """Delete stored entries (optionally only for one strategy)."""
+        try:
+            conn = self._connection()
+            with conn:
+                if strategy_name is None:
+                    cursor = conn.execute("DELETE FROM ranked_pairs")
+                else:
+                    cursor = conn.execute(
+                        "DELETE FROM ranked_pairs WHERE strategy_name = ?",
+                        (strategy_name,),
+                    )
+            return cursor.rowcount
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Pair cache clear failed ({self.path}): {e}")
+            return 0
+
+    def prune(self, max_age_seconds: Optional[float] = None) -> int:
+        """
+        Delete entries written under other versions.
+
+        Entries are aged by when they were written, not when they were last
+        read: a version still being served by other processes loses entries
+        they have not rewritten since.
+
+        Args:
+            max_age_seconds: Only delete those written at least this long ago
+                (None: all of them). Entries of this store's version are kept.
+
+        Returns:
+            int: Number of deleted entries (0 on error).
+        """
+        query = "DELETE FROM ranked_pairs WHERE version != ?"
+        params: Tuple = (self.version,)
+        if max_age_seconds is not None:
+            query += " AND written_at <= ?"
+            params += (time.time() - max_age_seconds,)
+        try:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(query, params)
+            if cursor.rowcount:
+                logger.info(
+                    f"Pruned {cursor.rowcount} pair cache entries of other versions"
+                )
+            return cursor.rowcount
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Pair cache prune failed ({self.path}): {e}")
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process plus the number of stored entries."""
+        try:
+            entries = (
+                self._connection()
+                .execute(
+                    "SELECT COUNT(*) FROM ranked_pairs WHERE version = ?",
+                    (self.version,),
+                )
+                .fetchone()[0]
+            )
+        except (sqlite3.Error, OSError):
+            entries = None
+        with self._lock:
+            return {
+                "path": self.path,
+                "version": self.version,
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "errors": self._errors,
+                "entries": entries,
+            }
+
+
+def code_version(*modules: Any, config_version: str = "") -> str:
+    """
+    Version tag derived from the source of the given modules and a config
+    version string; changes whenever any of them changes.
+    """
+    digest = hashlib.sha256(config_version.encode())
+    for module in modules:
+        with open(inspect.getsourcefile(module), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def create_persistent_store_from_env(*modules: Any) -> Optional[PersistentPairStore]:
+    """
+    Create the shared store if PAIR_CACHE_DB_PATH is set, else return None.
+
+    The store version combines PAIR_CACHE_VERSION (bump it after changing
+    strategy configuration semantics) with a hash of the given modules'
+    source, so deploying new algorithm code invalidates old results. Entries
+    of other versions are pruned once written PAIR_CACHE_MAX_AGE_DAYS ago
+    (default 7; empty disables age-based pruning).
+    """
+    path = os.getenv("PAIR_CACHE_DB_PATH")
+    if not path:
+        return None
+    version = code_version(
+        *modules, config_version=os.getenv("PAIR_CACHE_VERSION", "1")
+    )
+    max_age_days = os.getenv("PAIR_CACHE_MAX_AGE_DAYS", "7")
+    max_age_seconds = float(max_age_days) * 86400 if max_age_days else None
+    logger.info(f"Using persistent pair cache at {path} (version {version})")
+    return PersistentPairStore(path, version, max_age_seconds)
+
+
+def _persistent_key(arguments: Dict[str, Any]) -> str:
+    """
+    Stable text key for the persistent store (classes by dotted name, numpy
+    scalars and arrays as plain numbers and lists).
+    """
+
+    def encode(value: Any) -> Any:
+        if isinstance(value, type):
+            return f"{value.__module__}.{value.__qualname__}"
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return encode(value.tolist())
+        if isinstance(value, (tuple, list)):
+            return [encode(v) for v in value]
+        if isinstance(value, dict):
+            return {str(k): encode(v) for k, v in value.items()}
+        return value
+
+    return json.dumps({name: encode(value) for name, value in arguments.items()})
+
+
+def cached_ranked_pairs(
+    cache: RankedPairsCache,
+    store: Optional[PersistentPairStore] = None,
+) -> Callable[[Callable[..., RankedPairs]], Callable[..., RankedPairs]]:
+    """
+    Decorator caching a ranked-pairs function in `cache`, and optionally in
+    a persistent `store` shared across processes.
+
+    Lookups go to the in-memory cache first, then the store; computed
+    results are written to both. The wrapped function must accept
+    `strategy_name` and `top_k` arguments. All other arguments form the
+    cache key. The wrapper keeps the `cache_clear()` / `cache_info()`
+    interface of functools.lru_cache, and adds `cache_stats()` and `cache`
+    for introspection. `cache_clear()` leaves the persistent store alone;
+    use `store.clear()` for that.
+    """
+
+    def decorator(func: Callable[..., RankedPairs]) -> Callable[..., RankedPairs]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> RankedPairs:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            top_k = arguments["top_k"]
+            strategy_name = arguments.get("strategy_name")
+            key_arguments = {
+                name: value for name, value in arguments.items() if name != "top_k"
+            }
+            key = tuple(key_arguments.items())
+
+            pairs = cache.get(key, top_k)
+            if pairs is not None:
+                return pairs
+
+            store_key = _persistent_key(key_arguments) if store is not None else None
+            if store is not None:
+                entry = store.get_entry(store_key, top_k)
+                if entry is not None:
+                    cache.put_entry(key, entry)
+                    return entry.to_pairs(top_k)
+
+            pairs = func(*args, **kwargs)
+            entry = _Entry.from_pairs(pairs, top_k, strategy_name)
+            cache.put_entry(key, entry)
+            if store is not None:
+                store.put_entry(store_key, entry)
+            return pairs
+
+        def cache_stats() -> Dict[str, Any]:
+            stats = cache.stats()
+            if store is not None:
+                stats["persistent"] = store.stats()
+            return stats
+
+        wrapper.cache = cache
+        wrapper.store = store
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_info = cache.cache_info
+        wrapper.cache_stats = cache_stats
+        return wrapper
+
+    return decorator
@@ -0,0 +1,25 @@
+"""
+Helpers for the process pools used by pair precomputation and the analysis
+batch scripts.
+"""
+
+import os
+from typing import Optional
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """
+    Number of worker processes to use.
+
+    Args:
+        workers: Requested count; None (or 0) means one per CPU.
+
+    Returns:
+        int: At least 1. A result of 1 means "run in-process".
+    """
+    return workers or os.cpu_count() or 1
+
+
+def map_chunksize(num_tasks: int, workers: int) -> int:
+    """Executor.map chunk size giving each worker about 8 chunks."""
+    return max(1, num_tasks // (workers * 8))
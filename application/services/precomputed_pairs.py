@@ -0,0 +1,386 @@
+"""
+Precomputed comparison pairs for rank-based surveys.
+
+Ideal vectors lie on a 5-step grid, so for a deterministic (rank-based)
+strategy every possible pair set can be generated before a survey launches.
+`precompute_survey_pairs` does that with a process pool and writes a
+compact SQLite artifact (one zlib-compressed JSON row per ideal vector);
+`load_precomputed_pairs` is consulted by `SurveyService.generate_survey_pairs`
+before computing pairs live.
+
+Artifacts live in PRECOMPUTED_PAIRS_DIR and are tied to the survey's pair
+generation config and to the pair-generation source code: if either changes,
+the artifact is ignored and pairs are computed live again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from application.exceptions import UnsuitableForStrategyError
+from application.services.algorithms import (
+    math_utils,
+    utility_model_base,
+    utility_models,
+)
+from application.services.algorithms.math_utils import get_simplex_matrix
+from application.services.pair_generation import (
+    StrategyRegistry,
+    generic_rank_strategy,
+    rank_strategies,
+)
+from application.services.pair_generation.generic_rank_strategy import (
+    GenericRankStrategy,
+)
+from application.services.pair_generation.ranked_pairs_cache import code_version
+from application.services.parallel import map_chunksize, resolve_workers
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout changes
+ARTIFACT_FORMAT_VERSION = 1
+
+# Ideal vectors are entered in steps of 5 with no category above 95
+# (see SurveyService.validate_vector)
+IDEAL_VECTOR_STEP = 5
+IDEAL_VECTOR_MAX_VALUE = 95
+
+_PAIR_CODE_VERSION = code_version(
+    generic_rank_strategy,
+    rank_strategies,
+    math_utils,
+    utility_model_base,
+    utility_models,
+    config_version=str(ARTIFACT_FORMAT_VERSION),
+)
+
+
+def get_artifact_dir() -> Optional[str]:
+    """Directory holding precomputed pair artifacts, or None if disabled."""
+    return os.getenv("PRECOMPUTED_PAIRS_DIR") or None
+
+
+def artifact_path(survey_id: int, directory: Optional[str] = None) -> Optional[str]:
+    """Path of the artifact for a survey (None if no directory is configured)."""
+    directory = directory or get_artifact_dir()
+    if not directory:
+        return None
+    return os.path.join(directory, f"survey_{survey_id}_pairs.sqlite")
+
+
+def config_fingerprint(config: Dict[str, Any], num_subjects: int) -> str:
+    """
+    Identify everything that determines a survey's pairs: its pair generation
+    config, number of subjects and the pair-generation code version.
+    """
+    payload = json.dumps(
+        {"config": config, "num_subjects": num_subjects}, sort_keys=True
+    )
+    digest = hashlib.sha256(payload.encode())
+    digest.update(_PAIR_CODE_VERSION.encode())
+    return digest.hexdigest()
+
+
+def enumerate_ideal_vectors(num_subjects: int) -> List[Tuple[int, ...]]:
+    """
+    All ideal vectors a respondent can submit for a survey.
+
+    Args:
+        num_subjects: Number of budget subjects.
+
+    Returns:
+        List of vectors on the 5-step simplex grid with no value above 95.
+    """
+    matrix = get_simplex_matrix(
+        num_variables=num_subjects, side_length=100, step=IDEAL_VECTOR_STEP
+    )
+    matrix = matrix[matrix.max(axis=1) <= IDEAL_VECTOR_MAX_VALUE]
+    return [tuple(row) for row in matrix.tolist()]
+
+
+def _vector_key(user_vector: Sequence[int]) -> str:
+    return ",".join(str(int(v)) for v in user_vector)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _encode_pairs(pairs: List[Dict]) -> bytes:
+    return zlib.compress(json.dumps(pairs, default=_json_default).encode("utf-8"))
+
+
+def _decode_pairs(blob: bytes) -> List[Dict]:
+    pairs = json.loads(zlib.decompress(blob).decode("utf-8"))
+    # Vectors are tuples in live-generated pairs; JSON turned them into lists
+    return [
+        {
+            key: tuple(value) if key != "__metadata__" else value
+            for key, value in pair.items()
+        }
+        for pair in pairs
+    ]
+
+
+def write_artifact(
+    path: str,
+    survey_id: int,
+    fingerprint: str,
+    strategy_name: str,
+    results: Iterable[Tuple[Tuple[int, ...], List[Dict]]],
+) -> int:
+    """
+    Write precomputed pairs to `path`, replacing any existing artifact
+    atomically.
+
+    Args:
+        path: Destination artifact path.
+        survey_id: Survey the pairs belong to.
+        fingerprint: `config_fingerprint` of the survey configuration.
+        strategy_name: Name of the strategy that generated the pairs.
+        results: (user_vector, pairs) tuples.
+
+    Returns:
+        int: Number of vectors written.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".sqlite.tmp")
+    os.close(fd)
+
+    count = 0
+    try:
+        conn = sqlite3.connect(tmp_path)
+        with conn:
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                "CREATE TABLE pairs (user_vector TEXT PRIMARY KEY, payload BLOB)"
+            )
+            for user_vector, pairs in results:
+                conn.execute(
+                    "INSERT INTO pairs VALUES (?, ?)",
+                    (_vector_key(user_vector), _encode_pairs(pairs)),
+                )
+                count += 1
+            conn.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("survey_id", str(survey_id)),
+                    ("fingerprint", fingerprint),
+                    ("strategy", strategy_name),
+                    ("vectors", str(count)),
+                    ("created_at", str(int(time.time()))),
+                ],
+            )
+        conn.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+class _ArtifactReader:
+    """Per-process cache of open artifacts, reopened when the file changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._artifacts: Dict[str, Tuple[float, Optional[sqlite3.Connection], str]] = {}
+
+    def _open(self, path: str) -> Tuple[Optional[sqlite3.Connection], str]:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None, ""
+
+        with self._lock:
+            cached = self._artifacts.get(path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1], cached[2]
+
+            try:
+                conn = sqlite3.connect(
+                    f"file:{path}?mode=ro", uri=True, check_same_thread=False
+                )
+                row = conn.execute(
+                    "SELECT value FROM meta WHERE key = 'fingerprint'"
+                ).fetchone()
+                fingerprint = row[0] if row else ""
+            except sqlite3.Error as e:
+                logger.warning(f"Cannot open precomputed pairs artifact {path}: {e}")
+                conn, fingerprint = None, ""
+
+            if cached is not None and cached[1] is not None:
+                cached[1].close()
+            self._artifacts[path] = (mtime, conn, fingerprint)
+            return conn, fingerprint
+
+    def get(self, path: str, fingerprint: str, user_vector: Sequence[int]):
+        conn, stored_fingerprint = self._open(path)
+        if conn is None:
+            return None
+        if stored_fingerprint != fingerprint:
+            logger.debug(f"Ignoring stale precomputed pairs artifact {path}")
+            return None
+        with self._lock:
+            row = conn.execute(
+                "SELECT payload FROM pairs WHERE user_vector = ?",
+                (_vector_key(user_vector),),
+            ).fetchone()
+        return _decode_pairs(row[0]) if row else None
+
+
+_reader = _ArtifactReader()
+
+
+def load_precomputed_pairs(
+    survey_id: int,
+    user_vector: Sequence[int],
+    config: Dict[str, Any],
+    num_subjects: int,
+) -> Optional[List[Dict]]:
+    """
+    Look up precomputed pairs for a user vector.
+
+    Args:
+        survey_id: The internal survey identifier.
+        user_vector: The user's ideal budget allocation.
+        config: The survey's current pair generation config.
+        num_subjects: Number of budget subjects.
+
+    Returns:
+        Optional[List[Dict]]: The pairs, or None if there is no usable
+        artifact or the vector is not in it.
+    """
+    path = artifact_path(survey_id)
+    if path is None:
+        return None
+    try:
+        return _reader.get(path, config_fingerprint(config, num_subjects), user_vector)
+    except (sqlite3.Error, zlib.error, ValueError) as e:
+        logger.warning(f"Error reading precomputed pairs for survey {survey_id}: {e}")
+        return None
+
+
+def _generation_kwargs(config: Dict[str, Any], num_subjects: int) -> Dict[str, Any]:
+    """Arguments for generate_pairs, mirroring SurveyService.generate_survey_pairs."""
+    kwargs = {
+        "n": config.get("params", {}).get("num_pairs", 10),
+        "vector_size": num_subjects,
+    }
+    if "min_score_threshold" in config:
+        kwargs["min_score_threshold"] = config["min_score_threshold"]
+    return kwargs
+
+
+def _generate_for_vector(
+    task: Tuple[str, Dict[str, Any], Tuple[int, ...]],
+) -> Tuple[Tuple[int, ...], Optional[List[Dict]]]:
+    """Worker: generate pairs for one vector (None if the vector is unsuitable)."""
+    strategy_name, kwargs, user_vector = task
+    strategy = StrategyRegistry.get_strategy(strategy_name)
+    try:
+        return user_vector, strategy.generate_pairs(user_vector=user_vector, **kwargs)
+    except (UnsuitableForStrategyError, ValueError):
+        return user_vector, None
+
+
+def precompute_survey_pairs(
+    survey_id: int,
+    config: Dict[str, Any],
+    num_subjects: int,
+    output_path: str,
+    workers: Optional[int] = None,
+    vectors: Optional[List[Tuple[int, ...]]] = None,
+) -> Dict[str, Any]:
+    """
+    Generate pairs for every ideal vector of a survey and write the artifact.
+
+    Args:
+        survey_id: The internal survey identifier.
+        config: The survey's pair generation config.
+        num_subjects: Number of budget subjects.
+        output_path: Where to write the artifact.
+        workers: Number of worker processes (defaults to the CPU count).
+            Use 1 to run in-process.
+        vectors: Optional subset of ideal vectors (defaults to all of them).
+
+    Returns:
+        Dict[str, Any]: Summary with counts of written and skipped vectors.
+
+    Raises:
+        ValueError: If the survey's strategy is not rank-based. Other
+            strategies are randomized, so their pairs cannot be precomputed.
+    """
+    strategy_name = config.get("strategy")
+    strategy = StrategyRegistry.get_strategy(strategy_name)
+    if not isinstance(strategy, GenericRankStrategy):
+        raise ValueError(
+            f"Strategy '{strategy_name}' is not rank-based; "
+            "only deterministic rank strategies can be precomputed."
+        )
+
+    if vectors is None:
+        vectors = enumerate_ideal_vectors(num_subjects)
+    kwargs = _generation_kwargs(config, num_subjects)
+    tasks = [(strategy_name, kwargs, tuple(vector)) for vector in vectors]
+    skipped = []
+    workers = resolve_workers(workers)
+
+    def results() -> Iterable[Tuple[Tuple[int, ...], List[Dict]]]:
+        if workers == 1:
+            outputs = map(_generate_for_vector, tasks)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            chunksize = map_chunksize(len(tasks), workers)
+            outputs = executor.map(_generate_for_vector, tasks, chunksize=chunksize)
+        try:
+            for i, (vector, pairs) in enumerate(outputs, start=1):
+                if i % 500 == 0:
+                    logger.info(f"Precomputed {i}/{len(tasks)} vectors...")
+                if pairs is None:
+                    skipped.append(vector)
+                    continue
+                yield vector, pairs
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    start = time.perf_counter()
+    written = write_artifact(
+        output_path,
+        survey_id,
+        config_fingerprint(config, num_subjects),
+        strategy_name,
+        results(),
+    )
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"Precomputed pairs for {written} vectors of survey {survey_id} "
+        f"({len(skipped)} unsuitable) in {elapsed:.1f}s -> {output_path}"
+    )
+    return {
+        "survey_id": survey_id,
+        "strategy": strategy_name,
+        "vectors": len(tasks),
+        "written": written,
+        "skipped": len(skipped),
+        "seconds": round(elapsed, 2),
+        "path": output_path,
+    }
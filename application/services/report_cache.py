@@ -0,0 +1,156 @@
+"""
+Cache of rendered survey report fragments.
+
+The survey report page (`/surveys/<id>/responses`) renders its tables with
+analysis.report_service and analysis.presentation.html_renderers, which is
+expensive and only changes when a response arrives. Fragments are keyed by
+the request (survey, view filter, sort, language), by the survey's response
+version (latest response id and count) and by a hash of the rendering code,
+so a new response or a deploy makes old entries unreachable instead of
+requiring explicit invalidation.
+
+Every worker keeps an in-process TTL/LRU cache. If REPORT_CACHE_DIR is set,
+fragments are also stored there as JSON files and shared by all workers.
+The key doubles as the page's ETag.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from analysis import report_service
+from analysis.presentation import html_renderers
+from application.services.pair_generation.ranked_pairs_cache import code_version
+from database.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached fragment layout changes
+FRAGMENT_FORMAT_VERSION = 1
+
+_RENDER_CODE_VERSION = code_version(
+    report_service,
+    html_renderers,
+    config_version=str(FRAGMENT_FORMAT_VERSION),
+)
+
+
+def fragment_key(*parts: Any) -> str:
+    """Stable hex digest of the key parts and the rendering code version."""
+    payload = json.dumps([_RENDER_CODE_VERSION, *parts], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+class ReportFragmentCache:
+    """
+    Two-level cache of JSON-serializable report fragments.
+
+    Lookups go to the in-process cache first, then to `directory` (if set);
+    disk hits are promoted to memory. Disk errors are logged and treated as
+    misses, so a broken cache directory never breaks the report page.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl_seconds: float = 600.0,
+        max_entries: int = 64,
+    ):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._disk_hits = 0
+        self._disk_writes = 0
+        self._errors = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the fragment stored under `key`, or None on a miss."""
+        fragment = self.memory.get(key)
+        if fragment is not None or not self.directory:
+            return fragment
+
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path, encoding="utf-8") as f:
+                fragment = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Report cache read failed ({path}): {e}")
+            self._count("_errors")
+            return None
+
+        self._count("_disk_hits")
+        self.memory.put(key, fragment)
+        return fragment
+
+    def put(self, key: str, fragment: Dict[str, Any]) -> None:
+        """Store a fragment in memory and, if configured, on disk."""
+        self.memory.put(key, fragment)
+        if not self.directory or not self.memory.enabled:
+            return
+
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".json.tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(fragment, f)
+            # Atomic, so concurrent readers never see a partial file
+            os.replace(tmp_path, self._path(key))
+            self._count("_disk_writes")
+            self._prune()
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Report cache write failed ({self.directory}): {e}")
+            self._count("_errors")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _prune(self) -> None:
+        """Delete expired fragment files (they can no longer be served)."""
+        cutoff = time.time() - self.ttl_seconds
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+
+    def clear(self) -> None:
+        """Drop all fragments held in memory (disk files expire on their own)."""
+        self.memory.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        """Memory cache counters plus disk hits, writes and errors."""
+        stats = self.memory.stats()
+        with self._lock:
+            stats.update(
+                directory=self.directory,
+                disk_hits=self._disk_hits,
+                disk_writes=self._disk_writes,
+                errors=self._errors,
+            )
+        return stats
+
+
+REPORT_CACHE = ReportFragmentCache(
+    directory=os.getenv("REPORT_CACHE_DIR") or None,
+    ttl_seconds=float(os.getenv("REPORT_CACHE_TTL_SECONDS", "600")),
+    max_entries=int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "64")),
+)
@@ -4,23 +4,22 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
 from application.exceptions import UnsuitableForStrategyError
+from application.schemas.survey_bundle import SurveyBundle
 from application.schemas.validators import SurveySubmission
 from application.services.pair_generation import StrategyRegistry
-from application.translations import get_translation
+from application.services.precomputed_pairs import load_precomputed_pairs
+from application.translations import get_current_language, get_translation
 from database.queries import (
     check_user_participation,
-    create_comparison_pair,
+    create_completed_survey_submission,
     create_early_awareness_failure,
     create_survey_response,
     create_user,
-    get_subjects,
-    get_survey_awareness_pts,
-    get_survey_description,
-    get_survey_name,
     get_survey_pair_generation_config,
     get_survey_suitability_rules,
     is_user_blacklisted,
-    mark_survey_as_completed,
+    load_survey_bundle,
+    refresh_response_summaries,
     user_already_responded_to_survey,
     user_exists,
 )
@@ -208,25 +207,28 @@ class SurveyService:
                 - subjects: List[str]: Survey subjects
                 - survey_id: int: The survey ID
                 - strategy_name: str: The strategy name for this survey
+                - bundle: SurveyBundle: The survey loaded with a single
+                  query, to pass on to later calls for the same request
         """
-        survey_name = get_survey_name(survey_id)
+        bundle = load_survey_bundle(survey_id)
+        if bundle is None:
+            return False, ("survey_not_found", {"survey_id": survey_id}), None
+
+        current_lang = get_current_language()
+        survey_name = bundle.get_name(current_lang)
         if not survey_name:
             return False, ("survey_not_found", {"survey_id": survey_id}), None
 
-        survey_description = get_survey_description(survey_id)
+        survey_description = bundle.get_description(current_lang)
         if not survey_description:
             logger.info(f"No description found for survey: {survey_id}, using default")
             # Using empty string instead of failure, since description is optional
             survey_description = ""
 
-        subjects = get_subjects(survey_id)
+        subjects = bundle.get_subjects(current_lang)
         if not subjects:
             return False, ("survey_not_found", {"survey_id": survey_id}), None
 
-        # Get strategy name
-        config = get_survey_pair_generation_config(survey_id)
-        strategy_name = config.get("strategy", "") if config else ""
-
         return (
             True,
             None,
@@ -235,7 +237,8 @@ class SurveyService:
                 "description": survey_description,
                 "subjects": subjects,
                 "survey_id": survey_id,
-                "strategy_name": strategy_name,
+                "strategy_name": bundle.strategy_name,
+                "bundle": bundle,
             },
         )
 
@@ -291,7 +294,9 @@ class SurveyService:
         )
 
     @staticmethod
-    def _validate_vector_suitability(user_vector: List[int], survey_id: int) -> None:
+    def _validate_vector_suitability(
+        user_vector: List[int], survey_id: int, bundle: Optional[SurveyBundle] = None
+    ) -> None:
         """
         Validate user's budget allocation vector against dynamic suitability rules.
 
@@ -305,11 +310,15 @@ class SurveyService:
         Args:
             user_vector: User's ideal budget allocation
             survey_id: The internal survey identifier
+            bundle: Already loaded survey, to avoid querying the rules again
 
         Raises:
             UnsuitableForStrategyError: If the vector violates any suitability rules
         """
-        rules = get_survey_suitability_rules(survey_id)
+        if bundle is not None:
+            rules = bundle.suitability_rules
+        else:
+            rules = get_survey_suitability_rules(survey_id)
         if not rules:
             return
 
@@ -367,9 +376,21 @@ class SurveyService:
                     )
                 raise UnsuitableForStrategyError(error_msg)
 
+    @staticmethod
+    def _get_pair_generation_config(
+        survey_id: int, bundle: Optional[SurveyBundle] = None
+    ) -> Optional[Dict]:
+        """Pair generation config from the bundle if given, else from the database."""
+        if bundle is not None:
+            return bundle.pair_generation_config_dict()
+        return get_survey_pair_generation_config(survey_id)
+
     @staticmethod
     def generate_survey_pairs(
-        user_vector: List[int], num_subjects: int, survey_id: int
+        user_vector: List[int],
+        num_subjects: int,
+        survey_id: int,
+        bundle: Optional[SurveyBundle] = None,
     ) -> Tuple[List[Dict], List[Dict]]:
         """
         Generate survey pairs and awareness questions.
@@ -378,6 +399,7 @@ class SurveyService:
             user_vector: User's ideal budget allocation
             num_subjects: Number of budget subjects
             survey_id: The internal survey identifier
+            bundle: Already loaded survey (saves the metadata queries)
 
         Returns:
             Tuple of (comparison_pairs, awareness_questions)
@@ -388,10 +410,10 @@ class SurveyService:
         logger.debug(f"Generating pairs for survey {survey_id}")
 
         # Validate suitability against dynamic rules
-        SurveyService._validate_vector_suitability(user_vector, survey_id)
+        SurveyService._validate_vector_suitability(user_vector, survey_id, bundle)
 
         # Get strategy configuration
-        config = get_survey_pair_generation_config(survey_id)
+        config = SurveyService._get_pair_generation_config(survey_id, bundle)
         if not config:
             logger.warning(f"No configuration found for survey {survey_id}")
             raise ValueError(get_translation("survey_not_found", "messages"))
@@ -418,7 +440,12 @@ class SurveyService:
             if "min_score_threshold" in config:
                 generation_kwargs["min_score_threshold"] = config["min_score_threshold"]
 
-            comparison_pairs = strategy.generate_pairs(**generation_kwargs)
+            # Rank-based surveys may have every vector's pairs precomputed
+            comparison_pairs = load_precomputed_pairs(
+                survey_id, user_vector, config, num_subjects
+            )
+            if comparison_pairs is None:
+                comparison_pairs = strategy.generate_pairs(**generation_kwargs)
             first_metadata = (
                 comparison_pairs[0].get("__metadata__") if comparison_pairs else None
             )
@@ -450,7 +477,10 @@ class SurveyService:
 
     @staticmethod
     def generate_ranking_questions(
-        user_vector: List[int], num_subjects: int, survey_id: int
+        user_vector: List[int],
+        num_subjects: int,
+        survey_id: int,
+        bundle: Optional[SurveyBundle] = None,
     ) -> List[Dict]:
         """
         Generate ranking questions for ranking-based strategies.
@@ -459,6 +489,7 @@ class SurveyService:
             user_vector: User's ideal budget allocation
             num_subjects: Number of budget subjects
             survey_id: The internal survey identifier
+            bundle: Already loaded survey (saves the metadata queries)
 
         Returns:
             List of ranking questions with options A, B, C
@@ -469,10 +500,10 @@ class SurveyService:
         logger.debug(f"Generating ranking questions for survey {survey_id}")
 
         # Validate suitability against dynamic rules
-        SurveyService._validate_vector_suitability(user_vector, survey_id)
+        SurveyService._validate_vector_suitability(user_vector, survey_id, bundle)
 
         # Get strategy configuration
-        config = get_survey_pair_generation_config(survey_id)
+        config = SurveyService._get_pair_generation_config(survey_id, bundle)
         if not config:
             logger.warning(f"No configuration found for survey {survey_id}")
             raise ValueError(get_translation("survey_not_found", "messages"))
@@ -511,7 +542,8 @@ class SurveyService:
     ) -> None:
         """
         Process and store a survey submission.
-        Creates user if needed, stores responses, and marks survey as complete.
+        Creates user if needed, stores responses, and marks survey as complete,
+        all in a single database transaction.
 
         Note: Early awareness failures and unsuitability rejections do not reach this logic,
         so their total_response_time_seconds will correctly remain NULL in the database.
@@ -524,59 +556,49 @@ class SurveyService:
             Exception: If database operations fail
         """
         try:
-            # Ensure user exists
-            if not user_exists(submission.user_id):
-                create_user(submission.user_id)
-                logger.info(f"Created new user: {submission.user_id}")
-
-            # Create survey response with attention check status
-            survey_response_id = create_survey_response(
-                submission.user_id,
-                submission.survey_id,
-                submission.user_vector,
-                submission.user_comment,
-                attention_check_failed,
-                unsuitable_for_strategy=False,
+            pairs = [
+                {
+                    # Use original_pair_number if available (for interleaved
+                    # strategies), otherwise use enumeration index for
+                    # backward compatibility
+                    "pair_number": pair.original_pair_number or idx,
+                    "option_1": pair.option_1,
+                    "option_2": pair.option_2,
+                    "user_choice": pair.user_choice,
+                    "raw_user_choice": pair.raw_user_choice,
+                    "option1_strategy": pair.option1_strategy,
+                    "option2_strategy": pair.option2_strategy,
+                    "option1_differences": pair.option1_differences,
+                    "option2_differences": pair.option2_differences,
+                    "generation_metadata": pair.generation_metadata,
+                }
+                for idx, pair in enumerate(submission.comparison_pairs, 1)
+            ]
+
+            # User, completed response and all pairs in one transaction
+            survey_response_id = create_completed_survey_submission(
+                user_id=submission.user_id,
+                survey_id=submission.survey_id,
+                optimal_allocation=submission.user_vector,
+                user_comment=submission.user_comment,
+                comparison_pairs=pairs,
+                attention_check_failed=attention_check_failed,
                 total_response_time_seconds=submission.total_response_time_seconds,
             )
+            if survey_response_id is None:
+                raise RuntimeError("Survey submission could not be stored")
+
             logger.info(
-                f"Created survey response: {survey_response_id} "
+                f"Stored completed survey response {survey_response_id} with "
+                f"{len(pairs)} comparison pairs for survey {submission.survey_id}, "
+                f"user {submission.user_id} "
                 f"(attention_check_failed={attention_check_failed})"
             )
 
-            # Store comparison pairs
-            for idx, pair in enumerate(submission.comparison_pairs, 1):
-                # Use original_pair_number if available (for interleaved strategies),
-                # otherwise use enumeration index for backward compatibility
-                pair_number = (
-                    pair.original_pair_number if pair.original_pair_number else idx
-                )
-
-                comparison_pair_id = create_comparison_pair(
-                    survey_response_id=survey_response_id,
-                    pair_number=pair_number,
-                    option_1=pair.option_1,
-                    option_2=pair.option_2,
-                    user_choice=pair.user_choice,
-                    raw_user_choice=pair.raw_user_choice,
-                    option1_strategy=pair.option1_strategy,
-                    option2_strategy=pair.option2_strategy,
-                    option1_differences=pair.option1_differences,
-                    option2_differences=pair.option2_differences,
-                    generation_metadata=pair.generation_metadata,
-                )
-                logger.debug(
-                    f"Created comparison pair {idx}/{len(submission.comparison_pairs)}: "
-                    f"{comparison_pair_id} (raw_choice={pair.raw_user_choice}, "
-                    f"adjusted_choice={pair.user_choice})"
-                )
-
-            # Mark survey as complete
-            mark_survey_as_completed(survey_response_id)
-            logger.info(
-                f"Marked survey {submission.survey_id} as completed for user "
-                f"{submission.user_id}"
-            )
+            # Precompute the matrix metrics; a failure here leaves the
+            # response to be summarized on read or by the backfill script
+            if not attention_check_failed:
+                refresh_response_summaries([survey_response_id])
 
         except Exception as e:
             logger.error(
@@ -661,9 +683,10 @@ class SurveyService:
         Returns:
             Optional[str]: Token string if configured, otherwise None.
         """
-        tokens = get_survey_awareness_pts(survey_id)
-        if tokens is None:
+        bundle = load_survey_bundle(survey_id)
+        if bundle is None:
             return None
+        tokens = bundle.awareness_pts
 
         if not isinstance(question_index, int):
             return None
@@ -728,12 +751,14 @@ class SurveySessionData:
         external_survey_id: int,
         user_vector: List[int],
         subjects: List[str],
+        bundle: Optional[SurveyBundle] = None,
     ):
         self.user_id = user_id
         self.internal_survey_id = internal_survey_id
         self.external_survey_id = external_survey_id
         self.user_vector = user_vector
         self.subjects = subjects
+        self.bundle = bundle
         self.timestamp = datetime.now()
 
     def _randomize_pair_options(
@@ -909,7 +934,10 @@ class SurveySessionData:
         from application.services.pair_generation import StrategyRegistry
         from database.queries import get_survey_pair_generation_config
 
-        config = get_survey_pair_generation_config(self.internal_survey_id)
+        if self.bundle is not None:
+            config = self.bundle.pair_generation_config_dict()
+        else:
+            config = get_survey_pair_generation_config(self.internal_survey_id)
         strategy_name = config.get("strategy") if config else None
         is_ranking_strategy = False
 
@@ -923,7 +951,10 @@ class SurveySessionData:
         if is_ranking_strategy:
             # Generate ranking questions for ranking-based strategies
             ranking_questions = SurveyService.generate_ranking_questions(
-                self.user_vector, len(self.subjects), self.internal_survey_id
+                self.user_vector,
+                len(self.subjects),
+                self.internal_survey_id,
+                self.bundle,
             )
 
             # Generate single ranking awareness question
@@ -956,7 +987,10 @@ class SurveySessionData:
         else:
             # Generate pairs for traditional strategies
             original_pairs, awareness_questions = SurveyService.generate_survey_pairs(
-                self.user_vector, len(self.subjects), self.internal_survey_id
+                self.user_vector,
+                len(self.subjects),
+                self.internal_survey_id,
+                self.bundle,
             )
             # Combine pair data with its presentation state
             presentation_pairs = []
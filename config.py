@@ -15,6 +15,21 @@ class Config:
     MYSQL_USER: str = os.getenv("MYSQL_USER", "survey")
     MYSQL_PASSWORD: str = os.getenv("MYSQL_PASSWORD")
 
+    # Connection pool settings (per worker process)
+    MYSQL_POOL_SIZE: int = int(os.getenv("MYSQL_POOL_SIZE", "5"))
+    MYSQL_POOL_MAX_OVERFLOW: int = int(os.getenv("MYSQL_POOL_MAX_OVERFLOW", "10"))
+    MYSQL_POOL_RECYCLE_SECONDS: int = int(
+        os.getenv("MYSQL_POOL_RECYCLE_SECONDS", "3600")
+    )
+    MYSQL_POOL_PRE_PING: bool = os.getenv("MYSQL_POOL_PRE_PING", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    MYSQL_POOL_TIMEOUT_SECONDS: float = float(
+        os.getenv("MYSQL_POOL_TIMEOUT_SECONDS", "30")
+    )
+
     # Application settings
     SURVEY_ID = int(os.getenv("SURVEY_ID", 1))
     PORT = 5001
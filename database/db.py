@@ -1,35 +1,56 @@
 import logging
-from typing import Any, Dict, List, Optional, Union
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import mysql.connector
 from flask import current_app as app
 from flask import g  # Flask's application context global
 from mysql.connector import Error
 
+from .pool import ConnectionPool, create_pool_from_config
+
 logger = logging.getLogger(__name__)
 
 # --- Connection Management using Flask's 'g' object ---
 
+POOL_EXTENSION_KEY = "mysql_pool"
+
+# Statements that return a result set instead of modifying data
+READ_STATEMENTS = ("SELECT", "SHOW", "EXPLAIN", "ANALYZE", "DESCRIBE")
+
+
+def get_pool(flask_app=None) -> ConnectionPool:
+    """
+    Returns the connection pool for the given (or current) Flask app,
+    creating it lazily from the app configuration on first use.
+    """
+    flask_app = flask_app or app._get_current_object()
+    pool = flask_app.extensions.get(POOL_EXTENSION_KEY)
+    if pool is None:
+        pool = create_pool_from_config(flask_app.config)
+        flask_app.extensions[POOL_EXTENSION_KEY] = pool
+    return pool
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Returns connection pool statistics for the current app (checked-out
+    connections, waits, wait time, etc.) for monitoring endpoints.
+    """
+    return get_pool().stats()
+
 
 def get_db() -> Optional[mysql.connector.MySQLConnection]:
     """
-    Opens a new database connection if there is none yet for the
-    current application context ('g'). Adds the 'charset' parameter
-    to ensure UTF-8 communication.
+    Checks out a pooled database connection if there is none yet for the
+    current application context ('g'). Connections are opened with the
+    'charset' parameter to ensure UTF-8 communication.
     """
     if "db" not in g:
         # First connection for this request
         try:
-            g.db = mysql.connector.connect(
-                host=app.config["MYSQL_HOST"],
-                port=app.config["MYSQL_PORT"],
-                database=app.config["MYSQL_DATABASE"],
-                user=app.config["MYSQL_USER"],
-                password=app.config["MYSQL_PASSWORD"],
-                charset="utf8mb4",
-                collation="utf8mb4_unicode_ci",
-            )
-            logger.debug("Database connection established for this request.")
+            g.db = get_pool().acquire()
+            logger.debug("Database connection checked out for this request.")
         except Error as e:
             logger.error(f"Error connecting to MySQL database: {e}")
             g.db = None  # Store None in 'g' if connection failed
@@ -38,16 +59,16 @@ def get_db() -> Optional[mysql.connector.MySQLConnection]:
 
 def close_db(e: Optional[Exception] = None) -> None:
     """
-    Closes the database connection at the end of the request.
+    Returns the database connection to the pool at the end of the request.
     This function is registered to run automatically by Flask.
     """
     db = g.pop(
         "db", None
     )  # Get connection from 'g' and removes the key or returns None if not exists
 
-    if db is not None and db.is_connected():
-        db.close()
-        logger.debug("Database connection closed for this request.")
+    if db is not None:
+        get_pool().release(db)
+        logger.debug("Database connection returned to pool for this request.")
 
 
 def init_app(flask_app) -> None:
@@ -55,6 +76,10 @@ def init_app(flask_app) -> None:
     Register database functions with the Flask app.
     This is called from the Flask app factory.
     """
+    # Connections are opened lazily, so creating the pool here is cheap and
+    # safe even when the app is imported before gunicorn forks its workers.
+    flask_app.extensions[POOL_EXTENSION_KEY] = create_pool_from_config(flask_app.config)
+
     # Tells Flask to call 'close_db' when cleaning up after returning the response
     flask_app.teardown_appcontext(close_db)
     logger.info("Database teardown function registered.")
@@ -76,7 +101,8 @@ def execute_query(
 
     Returns:
         Optional[Union[Dict, List[Dict], int]]:
-            - For SELECT: A single dict (fetch_one=True) or a list of dicts.
+            - For SELECT/SHOW/EXPLAIN/ANALYZE: A single dict (fetch_one=True)
+              or a list of dicts.
             - For INSERT: The last inserted row ID (int).
             - For UPDATE/DELETE: The number of affected rows (int).
             - None if an error occurs or the connection failed.
@@ -97,8 +123,8 @@ def execute_query(
             # to reliably check if it's a SELECT, INSERT, etc.
             query_upper = query.strip().upper()
 
-            # Handle SELECT queries
-            if query_upper.startswith("SELECT") or query_upper.startswith("SHOW"):
+            # Handle SELECT queries (and other statements returning rows)
+            if query_upper.startswith(READ_STATEMENTS):
                 if fetch_one:
                     result = cursor.fetchone()
                     logger.debug(f"Query result (one): {result}")
@@ -121,3 +147,94 @@ def execute_query(
     except Error as e:
         logger.error(f"Error executing query: {e}")
         return None
+
+
+def iter_query(
+    query: str, params: Optional[tuple] = None, chunk_size: int = 1000
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the rows of a SELECT query from an unbuffered (server-side) cursor.
+
+    Rows are fetched from the server `chunk_size` at a time, so memory use
+    stays constant regardless of the size of the result set. The connection
+    is busy until the iterator is exhausted or closed, so no other query may
+    run on it in the meantime. If the iterator is closed before the end, the
+    connection is shut down and dropped from the pool rather than drained.
+
+    Args:
+        query (str): The SELECT query string.
+        params (tuple, optional): Parameters to bind to the query.
+        chunk_size (int, optional): Number of rows fetched per round trip.
+
+    Yields:
+        Dict[str, Any]: One result row at a time.
+
+    Raises:
+        mysql.connector.Error: If there is no connection or the query fails.
+    """
+    connection = get_db()
+    if not connection:
+        raise Error(msg="Cannot stream query, no database connection available.")
+
+    logger.debug(f"Streaming query: {query} | PARAMS: {params}")
+
+    cursor = connection.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute(query, params if params else ())
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        if connection.unread_result:
+            # Stopped early (e.g. client disconnected mid-export). Reading the
+            # rest of the result to reuse the connection would cost as much as
+            # finishing the query, so close the socket and let the pool drop it.
+            logger.info("Streaming query closed early; discarding its connection.")
+            connection.shutdown()
+            get_pool().invalidate(connection)
+        else:
+            try:
+                cursor.close()
+            except Error as e:
+                logger.warning(f"Error closing streaming cursor: {e}")
+
+
+@contextmanager
+def transaction() -> Iterator[mysql.connector.cursor.MySQLCursor]:
+    """
+    Runs several statements on the request-scoped connection as a single
+    transaction with one commit.
+
+    The yielded cursor is used directly (`execute`/`executemany`). The
+    transaction is committed when the block exits normally and rolled back
+    if it raises; the exception is re-raised either way.
+
+    Raises:
+        mysql.connector.Error: If there is no connection, a statement fails
+            or the commit fails.
+
+    Example:
+        >>> with transaction() as cursor:
+        ...     cursor.execute("INSERT INTO users (id) VALUES (%s)", ("u1",))
+        ...     cursor.executemany(pair_query, pair_rows)
+    """
+    connection = get_db()
+    if not connection:
+        raise Error(msg="Cannot start transaction, no database connection available.")
+
+    cursor = connection.cursor()
+    try:
+        yield cursor
+        connection.commit()
+        logger.debug("Transaction committed.")
+    except BaseException:
+        try:
+            connection.rollback()
+            logger.debug("Transaction rolled back.")
+        except Error as e:
+            logger.error(f"Error rolling back transaction: {e}")
+        raise
+    finally:
+        cursor.close()
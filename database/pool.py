@@ -0,0 +1,339 @@
+"""
+MySQL connection pool used behind `database.db.get_db()`.
+
+Keeps a bounded set of open connections per worker process so that requests
+reuse an authenticated connection instead of paying a TCP + auth handshake
+each time. The pool is fork-aware: a process that inherits a pool from its
+parent (e.g. a gunicorn worker forked after `app:app` was imported) drops the
+inherited connections and starts a fresh pool of its own.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Set, Tuple
+
+from mysql.connector import Error
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Error):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe connection pool with overflow, recycling and pre-ping.
+
+    Up to `pool_size` idle connections are kept open between requests. When
+    all of them are checked out, up to `max_overflow` additional connections
+    may be opened; these are closed instead of being returned to the pool.
+    Once `pool_size + max_overflow` connections are in use, callers wait up to
+    `timeout` seconds for a connection to be released.
+
+    Args:
+        connect: Zero-argument callable that opens a new DB-API connection.
+        pool_size: Number of idle connections to keep open.
+        max_overflow: Extra connections allowed beyond pool_size under load.
+        recycle_seconds: Connections older than this are reopened on checkout.
+            Use 0 or a negative value to disable recycling.
+        pre_ping: Whether to ping idle connections before handing them out.
+        timeout: Seconds to wait for a free connection before giving up.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        recycle_seconds: int = 3600,
+        pre_ping: bool = True,
+        timeout: float = 30.0,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        if max_overflow < 0:
+            raise ValueError("max_overflow must be non-negative")
+
+        self._connect = connect
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.recycle_seconds = recycle_seconds
+        self.pre_ping = pre_ping
+        self.timeout = timeout
+
+        self._cond = threading.Condition(threading.Lock())
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        """Initialise (or re-initialise after fork) all per-process state."""
+        self._pid = os.getpid()
+        # Idle connections as (connection, created_at) tuples, most recent last
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        # Creation time of every checked-out connection, keyed by id()
+        self._checked_out: Dict[int, float] = {}
+        # Checked-out connections marked by invalidate(), keyed by id()
+        self._invalid: Set[int] = set()
+        self._stats = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_seconds": 0.0,
+            "timeouts": 0,
+            "recycled": 0,
+            "invalidated": 0,
+        }
+
+    def _check_fork(self) -> None:
+        """Discard inherited state when running in a forked child process."""
+        if self._pid != os.getpid():
+            # Sockets are shared with the parent, so closing them here would
+            # tear down the parent's sessions. Just forget about them.
+            logger.info(
+                "Process fork detected (pid %s -> %s); resetting connection pool.",
+                self._pid,
+                os.getpid(),
+            )
+            self._cond = threading.Condition(threading.Lock())
+            self._reset_state()
+
+    @property
+    def _total(self) -> int:
+        return len(self._idle) + len(self._checked_out)
+
+    def _open(self) -> Tuple[Any, float]:
+        connection = self._connect()
+        with self._cond:
+            self._stats["connections_created"] += 1
+        return connection, time.monotonic()
+
+    def _close(self, connection: Any) -> None:
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+        with self._cond:
+            self._stats["connections_closed"] += 1
+
+    def _is_usable(self, connection: Any, created_at: float) -> bool:
+        """Apply recycle and pre-ping checks to an idle connection."""
+        if (
+            self.recycle_seconds > 0
+            and time.monotonic() - created_at > self.recycle_seconds
+        ):
+            with self._cond:
+                self._stats["recycled"] += 1
+            return False
+
+        if self.pre_ping:
+            try:
+                connection.ping(reconnect=False)
+            except Exception as e:
+                logger.info(f"Pooled connection failed pre-ping, replacing: {e}")
+                with self._cond:
+                    self._stats["invalidated"] += 1
+                return False
+
+        return True
+
+    def acquire(self) -> Any:
+        """
+        Check out a connection, opening a new one if needed.
+
+        Returns:
+            An open connection.
+
+        Raises:
+            PoolTimeoutError: If the pool is exhausted for longer than `timeout`.
+            mysql.connector.Error: If a new connection cannot be opened.
+        """
+        self._check_fork()
+        limit = self.pool_size + self.max_overflow
+
+        with self._cond:
+            if not self._idle and self._total >= limit:
+                self._stats["waits"] += 1
+                wait_started = time.monotonic()
+                deadline = wait_started + self.timeout
+                while not self._idle and self._total >= limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["wait_time_seconds"] += (
+                            time.monotonic() - wait_started
+                        )
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeoutError(
+                            msg=(
+                                f"Connection pool exhausted: {limit} connections "
+                                f"in use after waiting {self.timeout}s"
+                            )
+                        )
+                    self._cond.wait(remaining)
+                self._stats["wait_time_seconds"] += time.monotonic() - wait_started
+
+            idle = self._idle.pop() if self._idle else None
+            # Reserve the slot before doing any network I/O outside the lock
+            reservation = object()
+            self._checked_out[id(reservation)] = 0.0
+
+        try:
+            connection = None
+            if idle is not None:
+                candidate, created_at = idle
+                if self._is_usable(candidate, created_at):
+                    connection = candidate
+                else:
+                    self._close(candidate)
+
+            if connection is None:
+                connection, created_at = self._open()
+        except Exception:
+            with self._cond:
+                self._checked_out.pop(id(reservation), None)
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._checked_out.pop(id(reservation), None)
+            self._checked_out[id(connection)] = created_at
+            self._stats["checkouts"] += 1
+
+        return connection
+
+    def invalidate(self, connection: Any) -> None:
+        """
+        Mark a checked-out connection as unusable.
+
+        The connection stays checked out until it is released, and is then
+        closed instead of being rolled back and returned to the pool. Use it
+        for connections left in a state that is expensive to recover from,
+        such as an unread server-side result.
+        """
+        with self._cond:
+            if id(connection) in self._checked_out:
+                self._invalid.add(id(connection))
+                self._stats["invalidated"] += 1
+
+    def release(self, connection: Any) -> None:
+        """
+        Return a connection to the pool.
+
+        Any open transaction is rolled back so the next request starts from a
+        fresh snapshot. Broken connections and connections beyond pool_size
+        are closed instead of being kept.
+        """
+        if self._pid != os.getpid():
+            # Connection belongs to a pool from before a fork; never reuse it.
+            return
+
+        with self._cond:
+            created_at = self._checked_out.pop(id(connection), None)
+            reusable = id(connection) not in self._invalid
+            self._invalid.discard(id(connection))
+
+        if created_at is None:
+            logger.warning("Released a connection that was not checked out.")
+            self._close(connection)
+            return
+
+        if reusable:
+            try:
+                connection.rollback()
+            except Exception as e:
+                logger.info(
+                    f"Discarding connection that failed rollback on release: {e}"
+                )
+                reusable = False
+
+        with self._cond:
+            if reusable and len(self._idle) < self.pool_size:
+                self._idle.append((connection, created_at))
+                connection = None
+            self._cond.notify()
+
+        if connection is not None:
+            self._close(connection)
+
+    def dispose(self) -> None:
+        """Close all idle connections. Checked-out connections are unaffected."""
+        self._check_fork()
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+        for connection, _ in idle:
+            self._close(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of pool counters for monitoring.
+
+        Returns:
+            Dict with configuration, current occupancy (checked_out, idle,
+            overflow) and cumulative counters (checkouts, waits,
+            wait_time_seconds, timeouts, connections_created, ...).
+        """
+        self._check_fork()
+        with self._cond:
+            checked_out = len(self._checked_out)
+            idle = len(self._idle)
+            snapshot = dict(self._stats)
+
+        snapshot["wait_time_seconds"] = round(snapshot["wait_time_seconds"], 6)
+        snapshot.update(
+            {
+                "pid": self._pid,
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "checked_out": checked_out,
+                "idle": idle,
+                "overflow": max(0, checked_out + idle - self.pool_size),
+                "avg_wait_seconds": (
+                    round(snapshot["wait_time_seconds"] / snapshot["waits"], 6)
+                    if snapshot["waits"]
+                    else 0.0
+                ),
+            }
+        )
+        return snapshot
+
+
+def create_pool_from_config(
+    config: Dict[str, Any], connect: Optional[Callable[[], Any]] = None
+) -> ConnectionPool:
+    """
+    Build a ConnectionPool from a Flask config mapping.
+
+    Args:
+        config: Mapping with the MYSQL_* and MYSQL_POOL_* settings.
+        connect: Optional connection factory (defaults to mysql.connector.connect
+                 with the configured credentials).
+
+    Returns:
+        ConnectionPool: A pool that opens connections lazily.
+    """
+    if connect is None:
+        import mysql.connector
+
+        def connect():
+            return mysql.connector.connect(
+                host=config["MYSQL_HOST"],
+                port=config["MYSQL_PORT"],
+                database=config["MYSQL_DATABASE"],
+                user=config["MYSQL_USER"],
+                password=config["MYSQL_PASSWORD"],
+                charset="utf8mb4",
+                collation="utf8mb4_unicode_ci",
+            )
+
+    return ConnectionPool(
+        connect,
+        pool_size=config.get("MYSQL_POOL_SIZE", 5),
+        max_overflow=config.get("MYSQL_POOL_MAX_OVERFLOW", 10),
+        recycle_seconds=config.get("MYSQL_POOL_RECYCLE_SECONDS", 3600),
+        pre_ping=config.get("MYSQL_POOL_PRE_PING", True),
+        timeout=config.get("MYSQL_POOL_TIMEOUT_SECONDS", 30),
+    )
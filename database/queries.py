@@ -1,16 +1,99 @@
+import base64
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+from application.schemas.survey_bundle import SurveyBundle
 from application.translations import get_current_language
 from logging_config import setup_logging
 
-from .db import execute_query
+from .cache import TTLCache
+from .db import execute_query, iter_query, transaction
 
 setup_logging()
 
 logger = logging.getLogger(__name__)
 
+# Survey metadata rows (configs, rules, story texts) are read-mostly, so each
+# worker caches them; see database/cache.py.
+METADATA_CACHE = TTLCache(
+    ttl_seconds=float(os.getenv("METADATA_CACHE_TTL_SECONDS", "300")),
+    max_entries=int(os.getenv("METADATA_CACHE_MAX_ENTRIES", "1024")),
+)
+
+# Dashboard aggregates only change when a survey is submitted or created or
+# a user is blacklisted; those writes invalidate them, the TTL bounds how
+# long other workers' writes take to show up.
+DASHBOARD_CACHE = TTLCache(
+    ttl_seconds=float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60")),
+    max_entries=8,
+)
+
+# Bump when the metrics stored in response_summaries change; older rows are
+# then recomputed on read and picked up by the backfill script.
+#
+# response_summaries is read through get_user_survey_performance_data, which
+# serves the users matrix and the report pages (analysis.report_service). The
+# dashboard and the users overview show only counts from survey_responses and
+# never derive per-response metrics, so they have nothing to read from it;
+# the per-user and per-survey response pages render every pair and compute
+# strategy-aware statistics from them, which the stored rows do not hold.
+RESPONSE_SUMMARY_VERSION = 1
+
+
+def _fetch_metadata_row(query: str, survey_id: int) -> Optional[Dict]:
+    """
+    Fetches a single survey metadata row through METADATA_CACHE.
+
+    Only rows that were found are cached: a missing survey or a failed query
+    (both None) is looked up again next time.
+
+    Args:
+        query (str): SELECT query with the survey ID as its only parameter.
+        survey_id (int): The ID of the survey.
+
+    Returns:
+        Optional[Dict]: The row, or None if not found or an error occurs.
+    """
+    key = (survey_id, query)
+    row = METADATA_CACHE.get(key)
+    if row is None:
+        row = execute_query(query, (survey_id,), fetch_one=True)
+        if row is not None:
+            METADATA_CACHE.put(key, row)
+    return row
+
+
+def invalidate_survey_metadata_cache(survey_id: Optional[int] = None) -> int:
+    """
+    Drops cached metadata for one survey, or for all surveys if None.
+
+    Returns:
+        int: Number of cache entries dropped.
+    """
+    if survey_id is None:
+        return METADATA_CACHE.invalidate()
+    return METADATA_CACHE.invalidate(lambda key: key[0] == survey_id)
+
+
+def get_metadata_cache_stats() -> Dict:
+    """Hit-rate counters of the survey metadata cache in this worker."""
+    return METADATA_CACHE.stats()
+
+
+def invalidate_dashboard_cache() -> int:
+    """
+    Drops the cached dashboard counts and survey list of this worker.
+
+    Returns:
+        int: Number of cache entries dropped.
+    """
+    return DASHBOARD_CACHE.invalidate()
+
 
 def create_user(user_id: str) -> str:
     """
@@ -158,6 +241,63 @@ def create_early_awareness_failure(
         return None
 
 
+# Keeps users.last_activity (the latest valid completed response, used to
+# page the users list) current; run whenever a response becomes completed
+USER_LAST_ACTIVITY_QUERY = """
+    UPDATE users u
+    JOIN survey_responses sr ON sr.user_id = u.id
+    SET u.last_activity = GREATEST(
+        COALESCE(u.last_activity, sr.created_at), sr.created_at
+    )
+    WHERE sr.id = %s
+    AND sr.completed = TRUE
+    AND sr.attention_check_failed = FALSE
+"""
+
+
+COMPARISON_PAIR_INSERT_QUERY = """
+    INSERT INTO comparison_pairs (
+        survey_response_id, pair_number, option_1, option_2,
+        user_choice, raw_user_choice, option1_strategy, option2_strategy,
+        option1_differences, option2_differences, generation_metadata
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def _comparison_pair_params(
+    survey_response_id: int,
+    pair_number: int,
+    option_1: list,
+    option_2: list,
+    user_choice: int,
+    raw_user_choice: int,
+    option1_strategy: str,
+    option2_strategy: str,
+    option1_differences: list = None,
+    option2_differences: list = None,
+    generation_metadata: dict = None,
+) -> tuple:
+    """Bind parameters of COMPARISON_PAIR_INSERT_QUERY for one pair."""
+
+    def to_json(value):
+        return json.dumps(value) if value is not None else None
+
+    return (
+        survey_response_id,
+        pair_number,
+        json.dumps(option_1),
+        json.dumps(option_2),
+        user_choice,
+        raw_user_choice,
+        option1_strategy,
+        option2_strategy,
+        to_json(option1_differences),
+        to_json(option2_differences),
+        to_json(generation_metadata),
+    )
+
+
 def create_comparison_pair(
     survey_response_id: int,
     pair_number: int,
@@ -193,41 +333,21 @@ def create_comparison_pair(
     Returns:
         int: The ID of the newly created comparison pair, or None if an error occurs
     """
-    query = """
-        INSERT INTO comparison_pairs (
-            survey_response_id, pair_number, option_1, option_2, 
-            user_choice, raw_user_choice, option1_strategy, option2_strategy,
-            option1_differences, option2_differences, generation_metadata
-        )
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
     try:
-        option_1_json = json.dumps(option_1)
-        option_2_json = json.dumps(option_2)
-        option1_differences_json = (
-            json.dumps(option1_differences) if option1_differences is not None else None
-        )
-        option2_differences_json = (
-            json.dumps(option2_differences) if option2_differences is not None else None
-        )
-        generation_metadata_json = (
-            json.dumps(generation_metadata) if generation_metadata is not None else None
-        )
-
         return execute_query(
-            query,
-            (
-                survey_response_id,
-                pair_number,
-                option_1_json,
-                option_2_json,
-                user_choice,
-                raw_user_choice,
-                option1_strategy,
-                option2_strategy,
-                option1_differences_json,
-                option2_differences_json,
-                generation_metadata_json,
+            COMPARISON_PAIR_INSERT_QUERY,
+            _comparison_pair_params(
+                survey_response_id=survey_response_id,
+                pair_number=pair_number,
+                option_1=option_1,
+                option_2=option_2,
+                user_choice=user_choice,
+                raw_user_choice=raw_user_choice,
+                option1_strategy=option1_strategy,
+                option2_strategy=option2_strategy,
+                option1_differences=option1_differences,
+                option2_differences=option2_differences,
+                generation_metadata=generation_metadata,
             ),
         )
     except Exception as e:
@@ -235,9 +355,86 @@ def create_comparison_pair(
         return None
 
 
+def create_completed_survey_submission(
+    user_id: str,
+    survey_id: int,
+    optimal_allocation: list,
+    user_comment: str,
+    comparison_pairs: List[Dict],
+    attention_check_failed: bool = False,
+    total_response_time_seconds: Optional[float] = None,
+) -> Optional[int]:
+    """
+    Stores a complete survey submission in a single transaction: the user
+    (if new), the completed survey response and all its comparison pairs.
+
+    Equivalent to create_user + create_survey_response +
+    create_comparison_pair (per pair) + mark_survey_as_completed, but with
+    one commit and three statements instead of one commit per row. Either
+    everything is stored or nothing is.
+
+    Args:
+        user_id (str): The ID of the user submitting the survey.
+        survey_id (int): The ID of the survey.
+        optimal_allocation (list): The user's optimal allocation.
+        user_comment (str): The user's comment on the survey.
+        comparison_pairs (List[Dict]): Keyword arguments of
+            create_comparison_pair for each pair, without survey_response_id.
+        attention_check_failed (bool): Whether the user failed the attention check.
+        total_response_time_seconds (Optional[float]): Total time spent on the survey page.
+
+    Returns:
+        Optional[int]: The ID of the new survey response, or None if an error
+        occurs (in which case nothing was stored).
+    """
+    user_query = "INSERT INTO users (id) VALUES (%s) ON DUPLICATE KEY UPDATE id = id"
+    response_query = """
+        INSERT INTO survey_responses
+        (user_id, survey_id, optimal_allocation, user_comment, completed,
+         attention_check_failed, unsuitable_for_strategy, total_response_time_seconds)
+        VALUES (%s, %s, %s, %s, TRUE, %s, FALSE, %s)
+    """
+    logger.debug(
+        f"Inserting completed submission for user_id: {user_id}, "
+        f"survey_id: {survey_id}, pairs: {len(comparison_pairs)}"
+    )
+
+    try:
+        with transaction() as cursor:
+            cursor.execute(user_query, (user_id,))
+            cursor.execute(
+                response_query,
+                (
+                    user_id,
+                    survey_id,
+                    json.dumps(optimal_allocation),
+                    user_comment,
+                    attention_check_failed,
+                    total_response_time_seconds,
+                ),
+            )
+            survey_response_id = cursor.lastrowid
+            if comparison_pairs:
+                # Sent as a single multi-row INSERT by the connector
+                cursor.executemany(
+                    COMPARISON_PAIR_INSERT_QUERY,
+                    [
+                        _comparison_pair_params(survey_response_id, **pair)
+                        for pair in comparison_pairs
+                    ],
+                )
+            cursor.execute(USER_LAST_ACTIVITY_QUERY, (survey_response_id,))
+        invalidate_dashboard_cache()
+        return survey_response_id
+    except Exception as e:
+        logger.error(f"Error inserting survey submission: {str(e)}")
+        return None
+
+
 def mark_survey_as_completed(survey_response_id: int) -> int:
     """
-    Marks a survey response as completed in the database.
+    Marks a survey response as completed in the database, and updates the
+    user's last activity in the same transaction.
 
     Args:
         survey_response_id (int): The ID of the survey response to mark as completed.
@@ -255,7 +452,12 @@ def mark_survey_as_completed(survey_response_id: int) -> int:
     )
 
     try:
-        return execute_query(query, (survey_response_id,))
+        with transaction() as cursor:
+            cursor.execute(query, (survey_response_id,))
+            result = cursor.rowcount
+            cursor.execute(USER_LAST_ACTIVITY_QUERY, (survey_response_id,))
+        invalidate_dashboard_cache()
+        return result
     except Exception as e:
         logger.error("Error marking survey as completed: %s", str(e))
         return 0  # Return 0 to indicate no rows affected
@@ -302,7 +504,7 @@ def get_survey_field(survey_id: int, field_name: str) -> str:
     logger.debug(f"Retrieving {field_name} for survey_id: {survey_id}")
 
     try:
-        result = execute_query(query, (survey_id,), fetch_one=True)
+        result = _fetch_metadata_row(query, survey_id)
         if not result:
             logger.info(f"No active survey found with id: {survey_id}")
             return None
@@ -325,6 +527,46 @@ def get_survey_field(survey_id: int, field_name: str) -> str:
         return None
 
 
+def load_survey_bundle(survey_id: int) -> Optional[SurveyBundle]:
+    """
+    Loads everything the survey flow needs about an active survey (story
+    texts, subjects, pair generation config, suitability rules and awareness
+    tokens) with a single query.
+
+    The row goes through the metadata cache, so a warm lookup costs no
+    query at all.
+
+    Args:
+        survey_id (int): The ID of the survey.
+
+    Returns:
+        Optional[SurveyBundle]: The survey, or None if it doesn't exist, is
+        inactive, or an error occurs.
+    """
+    query = """
+        SELECT s.id AS survey_id, s.story_code, s.pair_generation_config,
+               s.suitability_rules, s.awareness_pts,
+               st.title, st.description, st.subjects
+        FROM surveys s
+        JOIN stories st ON s.story_code = st.code
+        WHERE s.id = %s AND s.active = TRUE
+    """
+    logger.debug(f"Loading survey bundle for survey_id: {survey_id}")
+
+    try:
+        result = _fetch_metadata_row(query, survey_id)
+        if not result:
+            logger.info(f"No active survey found with id: {survey_id}")
+            return None
+        return SurveyBundle.from_row(result)
+    except (ValueError, TypeError, KeyError) as e:
+        logger.error(f"Error decoding survey bundle for survey {survey_id}: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"Error loading survey bundle for survey {survey_id}: {str(e)}")
+        return None
+
+
 def get_survey_name(survey_id: int) -> str:
     """
     Retrieves the name of an active survey in the current language.
@@ -368,7 +610,7 @@ def get_subjects(survey_id: int) -> List[str]:
     logger.debug("Retrieving subjects for survey_id: %s", survey_id)
 
     try:
-        result = execute_query(query, (survey_id,), fetch_one=True)
+        result = _fetch_metadata_row(query, survey_id)
         if not result:
             logger.info("No active survey found with id: %s", survey_id)
             return []
@@ -413,7 +655,7 @@ def get_survey_awareness_pts(survey_id: int) -> Optional[Dict[str, str]]:
     logger.debug("Retrieving awareness PTS tokens for survey_id: %s", survey_id)
 
     try:
-        result = execute_query(query, (survey_id,), fetch_one=True)
+        result = _fetch_metadata_row(query, survey_id)
         if not result:
             logger.info("No active survey found with id: %s", survey_id)
             return None
@@ -484,11 +726,17 @@ def check_user_participation(user_id: str, survey_id: int) -> bool:
         return False
 
 
-def retrieve_completed_survey_responses() -> List[Dict]:
+def retrieve_completed_survey_responses(
+    after_response_id: Optional[int] = None,
+) -> List[Dict]:
     """
     Retrieves all successfully completed survey responses.
     Excludes responses where attention checks failed.
 
+    Args:
+        after_response_id (Optional[int]): Only include responses with a
+            larger ID (used for incremental analysis refreshes).
+
     Returns:
         list: A list of dictionaries containing raw survey response data.
               Only includes responses where attention checks were passed.
@@ -517,13 +765,23 @@ def retrieve_completed_survey_responses() -> List[Dict]:
         sr.completed = TRUE
         AND sr.attention_check_failed = FALSE
         AND sr.unsuitable_for_strategy = FALSE
+        {after_filter}
     ORDER BY
         sr.id, cp.pair_number
     """
-    logger.debug("Retrieving all successfully completed survey responses")
+    params = None
+    after_filter = ""
+    if after_response_id is not None:
+        after_filter = "AND sr.id > %s"
+        params = (after_response_id,)
+    query = query.format(after_filter=after_filter)
+    logger.debug(
+        "Retrieving successfully completed survey responses "
+        f"(after response {after_response_id})"
+    )
 
     try:
-        results = execute_query(query)
+        results = execute_query(query, params)
         if results:
             # Additional data cleaning at Python level
             for row in results:
@@ -585,17 +843,244 @@ def get_latest_survey_timestamp() -> float:
         return 0
 
 
-def retrieve_user_survey_choices() -> List[Dict]:
+def get_survey_response_version(survey_id: int) -> Optional[Dict]:
     """
-    Retrieves survey choices data organized by user and survey.
-    Only includes choices from successfully completed surveys where attention checks passed.
+    Freshness marker of a survey's report: the newest successfully completed
+    response and how many there are. Any new (or deleted) response changes it.
+
+    Args:
+        survey_id (int): The ID of the survey.
 
     Returns:
-        List[Dict]: List of dictionaries containing survey choice data.
-                   Each dictionary contains user_id, survey_id, and choice details.
-                   Only includes data from surveys where attention checks were passed.
+        Optional[Dict]: latest_response_id and response_count (None and 0 if the
+        survey has no responses) and latest_created_at, or None if an error occurs.
+    """
+    query = """
+        SELECT
+            MAX(id) AS latest_response_id,
+            COUNT(*) AS response_count,
+            MAX(created_at) AS latest_created_at
+        FROM survey_responses
+        WHERE completed = TRUE
+        AND attention_check_failed = FALSE
+        AND survey_id = %s
+    """
+    logger.debug(f"Retrieving response version of survey {survey_id}")
+
+    result = execute_query(query, (survey_id,), fetch_one=True)
+    if result is None:
+        logger.error(f"Error retrieving response version of survey {survey_id}")
+    return result
+
+
+def get_latest_completed_response_id() -> int:
+    """
+    Retrieves the ID of the newest response included by
+    retrieve_completed_survey_responses (the analysis high-water mark).
+
+    Returns:
+        int: The response ID, or 0 if there are none or an error occurs.
     """
     query = """
+        SELECT COALESCE(MAX(id), 0) AS latest_id
+        FROM survey_responses
+        WHERE completed = TRUE
+        AND attention_check_failed = FALSE
+        AND unsuitable_for_strategy = FALSE
+    """
+    logger.debug("Retrieving ID of the latest completed survey response")
+
+    result = execute_query(query, fetch_one=True)
+    if result is None:
+        logger.error("Error retrieving latest completed response ID")
+        return 0
+    return int(result["latest_id"])
+
+
+# Views that may be used to filter users; validated to prevent SQL injection
+ALLOWED_USER_VIEWS = (
+    "v_users_preferring_weighted_vectors",
+    "v_users_preferring_rounded_weighted_vectors",
+    "v_users_preferring_any_weighted_vectors",
+)
+
+# ORDER BY clauses for survey choices. The trailing keys reproduce the default
+# (user_id, survey_id, pair_number) order within ties, so pairs of a response
+# always stay together and in order.
+_CHOICE_SORT_COLUMNS = {
+    "user_id": "sr.user_id {order}, sr.survey_id, cp.pair_number",
+    "created_at": "sr.created_at {order}, sr.user_id, sr.survey_id, cp.pair_number",
+    # Responses without a recorded duration always go last
+    "duration": (
+        "sr.total_response_time_seconds IS NULL, "
+        "sr.total_response_time_seconds {order}, "
+        "sr.user_id, sr.survey_id, cp.pair_number"
+    ),
+}
+
+
+def _parse_survey_choice_rows(results: List[Dict]) -> List[Dict]:
+    """
+    Parse JSON fields of raw survey choice rows and enrich them with strategy
+    metadata (pair_type, magnitude, target_category) for
+    asymmetric_loss_distribution rendering.
+
+    Args:
+        results: Rows returned by the survey choices query (modified in place).
+
+    Returns:
+        List[Dict]: The same rows, parsed and enriched.
+    """
+    import re
+
+    type_re = re.compile(r"Type\s*([AB])", re.IGNORECASE)
+    mag_re = re.compile(r"\((\d+)\s*,\s*Type\s*[AB]\)")
+
+    for result in results:
+        # Parse differences if present
+        if result.get("option1_differences"):
+            try:
+                result["option1_differences"] = json.loads(
+                    result["option1_differences"]
+                )
+            except (json.JSONDecodeError, TypeError):
+                result["option1_differences"] = None
+
+        if result.get("option2_differences"):
+            try:
+                result["option2_differences"] = json.loads(
+                    result["option2_differences"]
+                )
+            except (json.JSONDecodeError, TypeError):
+                result["option2_differences"] = None
+
+        # Parse generation_metadata if present
+        if result.get("generation_metadata"):
+            try:
+                result["generation_metadata"] = json.loads(
+                    result["generation_metadata"]
+                )
+            except (json.JSONDecodeError, TypeError):
+                result["generation_metadata"] = None
+
+        # Try to enrich with pair_type, magnitude, target_category
+        try:
+            opt_alloc = json.loads(result.get("optimal_allocation", "[]"))
+        except (json.JSONDecodeError, TypeError):
+            opt_alloc = []
+
+        try:
+            v1 = json.loads(result.get("option_1", "[]"))
+        except (json.JSONDecodeError, TypeError):
+            v1 = []
+        try:
+            v2 = json.loads(result.get("option_2", "[]"))
+        except (json.JSONDecodeError, TypeError):
+            v2 = []
+
+        s1 = str(result.get("option1_strategy", ""))
+        s2 = str(result.get("option2_strategy", ""))
+
+        m = mag_re.search(s1) or mag_re.search(s2)
+        t = type_re.search(s1) or type_re.search(s2)
+
+        if m:
+            try:
+                result["magnitude"] = int(m.group(1))
+            except Exception:
+                pass
+        if t:
+            result["pair_type"] = t.group(1).upper()
+
+        # Infer target index from vectors when possible
+        if opt_alloc and v1 and v2 and len(opt_alloc) >= 3:
+            try:
+                d1 = [a - b for a, b in zip(v1, opt_alloc)]
+                d2 = [a - b for a, b in zip(v2, opt_alloc)]
+
+                # Choose the index with the largest total movement
+                # relative to the ideal allocation. For Type A pairs
+                # the target index changes by 2x while the others by x,
+                # so argmax(abs(d1)+abs(d2)) reliably identifies target.
+                inferred = max(
+                    range(len(opt_alloc)),
+                    key=lambda i: abs(d1[i]) + abs(d2[i]),
+                )
+                result["target_category"] = int(inferred)
+            except Exception:
+                pass
+
+    return results
+
+
+def _build_survey_choices_query(
+    survey_id: Optional[int] = None,
+    user_ids: Optional[List[str]] = None,
+    view_filter: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_order: str = "asc",
+    limit: Optional[int] = None,
+    offset: int = 0,
+    survey_response_ids: Optional[List[int]] = None,
+) -> Optional[Tuple[str, tuple]]:
+    """
+    Builds the survey choices query for retrieve_user_survey_choices and
+    iter_user_survey_choices (see there for the arguments).
+
+    Returns:
+        Optional[Tuple[str, tuple]]: The query and its parameters, or None if
+        the filters cannot match any row (empty user list or unknown view).
+    """
+    conditions = ["sr.completed = TRUE", "sr.attention_check_failed = FALSE"]
+    params: List = []
+
+    if survey_id is not None:
+        conditions.append("sr.survey_id = %s")
+        params.append(survey_id)
+
+    if user_ids is not None:
+        if not user_ids:
+            return None
+        placeholders = ", ".join(["%s"] * len(user_ids))
+        conditions.append(f"sr.user_id IN ({placeholders})")
+        params.extend(user_ids)
+
+    if survey_response_ids is not None:
+        if not survey_response_ids:
+            return None
+        placeholders = ", ".join(["%s"] * len(survey_response_ids))
+        conditions.append(f"sr.id IN ({placeholders})")
+        params.extend(survey_response_ids)
+
+    if view_filter is not None:
+        if view_filter not in ALLOWED_USER_VIEWS:
+            logger.warning(f"Invalid view name requested: {view_filter}")
+            return None
+        conditions.append(f"sr.user_id IN (SELECT user_id FROM {view_filter})")
+
+    order = "DESC" if str(sort_order).lower() == "desc" else "ASC"
+    order_by = _CHOICE_SORT_COLUMNS.get(
+        sort_by, "sr.user_id, sr.survey_id, cp.pair_number"
+    ).format(order=order)
+    where_clause = " AND ".join(conditions)
+
+    page_join = ""
+    page_params: List = []
+    if limit is not None:
+        # Select the page of response ids first, then join their pairs.
+        # Response-level ordering is the choice ordering minus pair_number.
+        response_order_by = order_by.replace(", cp.pair_number", "")
+        page_join = f"""
+    JOIN (
+        SELECT sr.id
+        FROM survey_responses sr
+        WHERE {where_clause}
+        ORDER BY {response_order_by}, sr.id
+        LIMIT %s OFFSET %s
+    ) page ON page.id = sr.id"""
+        page_params = params + [int(limit), int(offset or 0)]
+
+    query = f"""
     SELECT
         sr.user_id,
         sr.survey_id,
@@ -616,100 +1101,83 @@ def retrieve_user_survey_choices() -> List[Dict]:
     FROM
         survey_responses sr
     JOIN
-        comparison_pairs cp ON sr.id = cp.survey_response_id
+        comparison_pairs cp ON sr.id = cp.survey_response_id{page_join}
     WHERE
-        sr.completed = TRUE
-        AND sr.attention_check_failed = FALSE
+        {where_clause}
     ORDER BY
-        sr.user_id,
-        sr.survey_id,
-        cp.pair_number
+        {order_by}
     """
+    return query, tuple(page_params + params)
 
-    try:
-        results = execute_query(query)
-        if results:
-            # Parse JSON fields and enrich with strategy metadata for
-            # asymmetric_loss_distribution rendering
-            import re
 
-            type_re = re.compile(r"Type\s*([AB])", re.IGNORECASE)
-            mag_re = re.compile(r"\((\d+)\s*,\s*Type\s*[AB]\)")
+def retrieve_user_survey_choices(
+    survey_id: Optional[int] = None,
+    user_ids: Optional[Iterable[str]] = None,
+    view_filter: Optional[str] = None,
+    sort_by: Optional[str] = None,
+    sort_order: str = "asc",
+    limit: Optional[int] = None,
+    offset: int = 0,
+    survey_response_ids: Optional[Iterable[int]] = None,
+) -> List[Dict]:
+    """
+    Retrieves survey choices data organized by user and survey.
+    Only includes choices from successfully completed surveys where attention checks passed.
 
-            for result in results:
-                # Parse differences if present
-                if result.get("option1_differences"):
-                    try:
-                        result["option1_differences"] = json.loads(
-                            result["option1_differences"]
-                        )
-                    except (json.JSONDecodeError, TypeError):
-                        result["option1_differences"] = None
+    All filters are applied in SQL, so the cost scales with the matching
+    responses rather than with every response ever collected. Called without
+    arguments it returns every choice, ordered by user, survey and pair.
 
-                if result.get("option2_differences"):
-                    try:
-                        result["option2_differences"] = json.loads(
-                            result["option2_differences"]
-                        )
-                    except (json.JSONDecodeError, TypeError):
-                        result["option2_differences"] = None
+    Args:
+        survey_id (Optional[int]): Only include responses to this survey.
+        user_ids (Optional[Iterable[str]]): Only include responses from these users.
+            An empty collection matches nothing.
+        view_filter (Optional[str]): Only include users present in this view
+            (one of ALLOWED_USER_VIEWS). An unknown view matches nothing.
+        sort_by (Optional[str]): 'user_id', 'created_at' or 'duration'.
+            Defaults to (user_id, survey_id, pair_number) ordering.
+        sort_order (str): 'asc' (default) or 'desc'.
+        limit (Optional[int]): Maximum number of survey responses to include.
+            Applied per response, so a response's pairs are never split.
+        offset (int): Number of survey responses to skip (used with limit).
+        survey_response_ids (Optional[Iterable[int]]): Only include these
+            survey responses. An empty collection matches nothing.
 
-                # Parse generation_metadata if present
-                if result.get("generation_metadata"):
-                    try:
-                        result["generation_metadata"] = json.loads(
-                            result["generation_metadata"]
-                        )
-                    except (json.JSONDecodeError, TypeError):
-                        result["generation_metadata"] = None
-
-                # Try to enrich with pair_type, magnitude, target_category
-                try:
-                    opt_alloc = json.loads(result.get("optimal_allocation", "[]"))
-                except (json.JSONDecodeError, TypeError):
-                    opt_alloc = []
-
-                try:
-                    v1 = json.loads(result.get("option_1", "[]"))
-                except (json.JSONDecodeError, TypeError):
-                    v1 = []
-                try:
-                    v2 = json.loads(result.get("option_2", "[]"))
-                except (json.JSONDecodeError, TypeError):
-                    v2 = []
-
-                s1 = str(result.get("option1_strategy", ""))
-                s2 = str(result.get("option2_strategy", ""))
-
-                m = mag_re.search(s1) or mag_re.search(s2)
-                t = type_re.search(s1) or type_re.search(s2)
-
-                if m:
-                    try:
-                        result["magnitude"] = int(m.group(1))
-                    except Exception:
-                        pass
-                if t:
-                    result["pair_type"] = t.group(1).upper()
-
-                # Infer target index from vectors when possible
-                if opt_alloc and v1 and v2 and len(opt_alloc) >= 3:
-                    try:
-                        d1 = [a - b for a, b in zip(v1, opt_alloc)]
-                        d2 = [a - b for a, b in zip(v2, opt_alloc)]
-
-                        # Choose the index with the largest total movement
-                        # relative to the ideal allocation. For Type A pairs
-                        # the target index changes by 2x while the others by x,
-                        # so argmax(abs(d1)+abs(d2)) reliably identifies target.
-                        inferred = max(
-                            range(len(opt_alloc)),
-                            key=lambda i: abs(d1[i]) + abs(d2[i]),
-                        )
-                        result["target_category"] = int(inferred)
-                    except Exception:
-                        pass
+    Returns:
+        List[Dict]: List of dictionaries containing survey choice data.
+                   Each dictionary contains user_id, survey_id, and choice details.
+                   Only includes data from surveys where attention checks were passed.
+    """
+    if user_ids is not None:
+        user_ids = list(dict.fromkeys(user_ids))
+    if survey_response_ids is not None:
+        survey_response_ids = list(dict.fromkeys(survey_response_ids))
+
+    built = _build_survey_choices_query(
+        survey_id,
+        user_ids,
+        view_filter,
+        sort_by,
+        sort_order,
+        limit,
+        offset,
+        survey_response_ids,
+    )
+    if built is None:
+        return []
+    query, params = built
+
+    logger.debug(
+        f"Retrieving survey choices (survey_id={survey_id}, "
+        f"users={len(user_ids) if user_ids is not None else 'all'}, "
+        f"view_filter={view_filter}, sort={sort_by} {sort_order}, "
+        f"limit={limit}, offset={offset})"
+    )
 
+    try:
+        results = execute_query(query, params)
+        if results:
+            _parse_survey_choice_rows(results)
             logger.debug(f"Retrieved choices data for {len(results)} comparison pairs")
             return results
         logger.info("No survey choices data found")
@@ -719,6 +1187,41 @@ def retrieve_user_survey_choices() -> List[Dict]:
         return []
 
 
+def iter_user_survey_choices(
+    survey_id: Optional[int] = None,
+    view_filter: Optional[str] = None,
+    chunk_size: int = 1000,
+) -> Iterator[Dict]:
+    """
+    Streams survey choices one row at a time from a server-side cursor.
+
+    Same rows and ordering as retrieve_user_survey_choices(survey_id=...,
+    view_filter=...), but memory use does not grow with the number of
+    responses. Intended for exports that write rows out as they arrive.
+
+    Args:
+        survey_id (Optional[int]): Only include responses to this survey.
+        view_filter (Optional[str]): Only include users present in this view.
+        chunk_size (int): Number of rows fetched from the server at a time.
+
+    Yields:
+        Dict: Parsed and enriched survey choice rows.
+
+    Raises:
+        mysql.connector.Error: If the query cannot be executed.
+    """
+    built = _build_survey_choices_query(survey_id=survey_id, view_filter=view_filter)
+    if built is None:
+        return
+    query, params = built
+
+    logger.debug(
+        f"Streaming survey choices (survey_id={survey_id}, view_filter={view_filter})"
+    )
+    for row in iter_query(query, params, chunk_size=chunk_size):
+        yield _parse_survey_choice_rows([row])[0]
+
+
 def get_survey_pair_generation_config(survey_id: int) -> Optional[dict]:
     """
     Get pair generation configuration for a survey.
@@ -733,7 +1236,7 @@ def get_survey_pair_generation_config(survey_id: int) -> Optional[dict]:
     logger.debug(f"Retrieving pair generation config for survey: {survey_id}")
 
     try:
-        result = execute_query(query, (survey_id,), fetch_one=True)
+        result = _fetch_metadata_row(query, survey_id)
         if not result:
             logger.info(f"No configuration found for survey: {survey_id}")
             return None
@@ -770,7 +1273,7 @@ def get_survey_suitability_rules(survey_id: int) -> Optional[dict]:
     logger.debug(f"Retrieving suitability rules for survey: {survey_id}")
 
     try:
-        result = execute_query(query, (survey_id,), fetch_one=True)
+        result = _fetch_metadata_row(query, survey_id)
         if not result:
             return None
 
@@ -860,9 +1363,15 @@ def get_surveys_for_dashboard() -> List[Dict]:
     Retrieve all surveys (active and inactive) with story metadata
     and participant volume for dashboard rendering.
 
+    Results are cached in DASHBOARD_CACHE until the next submission or
+    survey creation.
+
     Returns:
         List[Dict]: Survey rows with parsed JSON fields and participant counts.
     """
+    cached = DASHBOARD_CACHE.get("surveys")
+    if cached is not None:
+        return cached
 
     def parse_json_field(value, default):
         """
@@ -948,73 +1457,86 @@ def get_surveys_for_dashboard() -> List[Dict]:
             )
 
         logger.info("Retrieved %s surveys for dashboard", len(processed_results))
+        DASHBOARD_CACHE.put("surveys", processed_results)
         return processed_results
     except Exception as e:
         logger.error("Error retrieving surveys for dashboard: %s", str(e))
         return []
 
 
-def get_survey_instructions(survey_id: int) -> Optional[str]:
+def get_dashboard_counts() -> Optional[Dict[str, int]]:
     """
-    Get custom pair instructions for a survey from pair_generation_config.
-
-    Args:
-        survey_id: ID of the survey
+    Participant and user counts shown on the dashboard, computed with a single
+    aggregate query (no rows are transferred) and cached in DASHBOARD_CACHE.
 
     Returns:
-        Custom instructions text in current language, or None if not found
+        Optional[Dict[str, int]]: total_participants (users with a successful
+        response), unaware_users_count (blacklisted users) and
+        users_with_surveys (users with any completed response), or None if an
+        error occurs.
     """
-    from application.translations import get_current_language
+    cached = DASHBOARD_CACHE.get("counts")
+    if cached is not None:
+        return cached
 
-    query = "SELECT pair_generation_config FROM surveys WHERE id = %s AND active = TRUE"
-    logger.debug(f"Retrieving pair instructions for survey: {survey_id}")
+    query = """
+        SELECT
+            (
+                SELECT COUNT(DISTINCT sr.user_id)
+                FROM survey_responses sr
+                WHERE sr.completed = TRUE
+                AND sr.attention_check_failed = FALSE
+                AND sr.unsuitable_for_strategy = FALSE
+                AND EXISTS (
+                    SELECT 1 FROM comparison_pairs cp
+                    WHERE cp.survey_response_id = sr.id
+                )
+            ) AS total_participants,
+            (
+                SELECT COUNT(*) FROM users WHERE blacklisted = TRUE
+            ) AS unaware_users_count,
+            (
+                SELECT COUNT(DISTINCT user_id)
+                FROM survey_responses
+                WHERE completed = TRUE
+            ) AS users_with_surveys
+    """
+    logger.debug("Counting dashboard participants")
 
-    try:
-        result = execute_query(query, (survey_id,), fetch_one=True)
-        if not result or not result.get("pair_generation_config"):
-            logger.debug(f"No pair generation config found for survey: {survey_id}")
-            return None
+    result = execute_query(query, fetch_one=True)
+    if result is None:
+        logger.error("Error counting dashboard participants")
+        return None
 
-        config_json = result.get("pair_generation_config")
-        if not config_json:
-            return None
+    counts = {key: int(value or 0) for key, value in result.items()}
+    DASHBOARD_CACHE.put("counts", counts)
+    return counts
 
-        # Parse JSON config and extract pair_instructions
-        try:
-            config = json.loads(config_json)
-            instructions = config.get("pair_instructions")
 
-            if not instructions:
-                logger.debug(
-                    f"No pair_instructions found in config for survey {survey_id}"
-                )
-                return None
+def get_survey_instructions(survey_id: int) -> Optional[str]:
+    """
+    Get custom pair instructions for a survey from pair_generation_config.
 
-            current_lang = get_current_language()
-            custom_instruction = instructions.get(current_lang)
+    Called on every template render, so it reads the (cached) survey bundle
+    instead of issuing its own query.
 
-            if custom_instruction:
-                logger.debug(
-                    f"Found custom instruction for survey {survey_id} in {current_lang}"
-                )
-                return custom_instruction
-            else:
-                logger.debug(
-                    f"No instruction found for language {current_lang} in survey {survey_id}"
-                )
-                return None
+    Args:
+        survey_id: ID of the survey
 
-        except json.JSONDecodeError as e:
-            logger.error(
-                f"Error parsing pair generation config JSON for survey {survey_id}: {str(e)}"
-            )
-            return None
+    Returns:
+        Custom instructions text in current language, or None if not found
+    """
+    bundle = load_survey_bundle(survey_id)
+    if bundle is None:
+        return None
 
-    except Exception as e:
-        logger.error(
-            f"Error retrieving pair instructions for survey {survey_id}: {str(e)}"
+    current_lang = get_current_language()
+    custom_instruction = bundle.get_pair_instructions(current_lang)
+    if not custom_instruction:
+        logger.debug(
+            f"No instruction found for language {current_lang} in survey {survey_id}"
         )
-        return None
+    return custom_instruction
 
 
 def get_story(code: str) -> Optional[Dict]:
@@ -1103,7 +1625,11 @@ def create_story(
         description_json = json.dumps(description)
         subjects_json = json.dumps(subjects)
 
-        return execute_query(query, (code, title_json, description_json, subjects_json))
+        new_id = execute_query(
+            query, (code, title_json, description_json, subjects_json)
+        )
+        invalidate_survey_metadata_cache()
+        return new_id
     except Exception as e:
         logger.error(f"Error creating story: {str(e)}")
         return None
@@ -1133,7 +1659,10 @@ def create_survey(
         # Convert Python dict to JSON string for storage
         config_json = json.dumps(pair_generation_config)
 
-        return execute_query(query, (story_code, config_json, active))
+        new_id = execute_query(query, (story_code, config_json, active))
+        invalidate_survey_metadata_cache()
+        invalidate_dashboard_cache()
+        return new_id
     except Exception as e:
         logger.error(f"Error creating survey: {str(e)}")
         return None
@@ -1163,6 +1692,7 @@ def blacklist_user(user_id: str, survey_id: int) -> bool:
 
     try:
         result = execute_query(query, (survey_id, user_id))
+        invalidate_dashboard_cache()
         return result > 0
     except Exception as e:
         logger.error(f"Error blacklisting user {user_id}: {str(e)}")
@@ -1252,13 +1782,7 @@ def get_users_from_view(view_name: str, survey_id: Optional[int] = None) -> List
         List[str]: List of user IDs found in the view
     """
     # Validate view name against allowed patterns to prevent SQL injection
-    allowed_views = [
-        "v_users_preferring_weighted_vectors",
-        "v_users_preferring_rounded_weighted_vectors",
-        "v_users_preferring_any_weighted_vectors",
-    ]
-
-    if view_name not in allowed_views:
+    if view_name not in ALLOWED_USER_VIEWS:
         logger.warning(f"Invalid view name requested: {view_name}")
         return []
 
@@ -1433,12 +1957,254 @@ def get_user_participation_overview(user_ids: Optional[List[str]] = None) -> Lis
         return []
 
 
+# Completed users counted by get_completed_user_count, refreshed incrementally
+_COMPLETED_USER_COUNT_TTL_SECONDS = float(
+    os.getenv("COMPLETED_USER_COUNT_TTL_SECONDS", "300")
+)
+_completed_user_count_lock = threading.Lock()
+_completed_user_count_state: Dict[str, Optional[float]] = {
+    "count": None,
+    "max_response_id": None,
+    "recounted_at": None,
+}
+
+
+def get_completed_user_count() -> int:
+    """
+    Number of distinct users with at least one completed, attention-passing
+    survey response, as shown by the paginated user views.
+
+    The count is cached per worker together with the highest survey_responses
+    id it covers. Later calls only count users whose first qualifying response
+    is newer than that id, so a page view costs one primary-key lookup when
+    nothing changed. A full recount runs every
+    COMPLETED_USER_COUNT_TTL_SECONDS to pick up updates and deletions of older
+    rows.
+
+    Returns:
+        int: The number of users, or 0 if an error occurs.
+    """
+    max_id_query = "SELECT COALESCE(MAX(id), 0) AS max_id FROM survey_responses"
+    full_query = """
+        SELECT COUNT(DISTINCT user_id) AS total_count
+        FROM survey_responses
+        WHERE completed = TRUE AND attention_check_failed = FALSE
+          AND id <= %s
+    """
+    delta_query = """
+        SELECT COUNT(DISTINCT sr.user_id) AS new_users
+        FROM survey_responses sr
+        WHERE sr.id > %s AND sr.id <= %s
+          AND sr.completed = TRUE AND sr.attention_check_failed = FALSE
+          AND NOT EXISTS (
+              SELECT 1 FROM survey_responses prev
+              WHERE prev.user_id = sr.user_id AND prev.id <= %s
+                AND prev.completed = TRUE AND prev.attention_check_failed = FALSE
+          )
+    """
+    state = _completed_user_count_state
+
+    try:
+        with _completed_user_count_lock:
+            max_id_result = execute_query(max_id_query, fetch_one=True)
+            if max_id_result is None:
+                return state["count"] or 0
+            max_id = max_id_result["max_id"]
+
+            now = time.monotonic()
+            stale = (
+                state["count"] is None
+                or now - state["recounted_at"] >= _COMPLETED_USER_COUNT_TTL_SECONDS
+                or max_id < state["max_response_id"]
+            )
+            if stale:
+                result = execute_query(full_query, (max_id,), fetch_one=True)
+                if result is None:
+                    return state["count"] or 0
+                state["count"] = result["total_count"]
+                state["recounted_at"] = now
+            elif max_id > state["max_response_id"]:
+                last_id = state["max_response_id"]
+                result = execute_query(
+                    delta_query, (last_id, max_id, last_id), fetch_one=True
+                )
+                if result is None:
+                    return state["count"]
+                state["count"] += result["new_users"]
+            state["max_response_id"] = max_id
+            return state["count"]
+    except Exception as e:
+        logger.error(f"Error counting completed users: {str(e)}")
+        return 0
+
+
+def reset_completed_user_count() -> None:
+    """Forget the cached completed-user count (the next call recounts)."""
+    with _completed_user_count_lock:
+        _completed_user_count_state.update(
+            count=None, max_response_id=None, recounted_at=None
+        )
+
+
+def encode_user_cursor(last_activity, user_id: str) -> str:
+    """
+    Encode a keyset pagination position (a row's last activity and user ID)
+    as an opaque, URL-safe token. Datetimes keep their full precision
+    (fractional seconds included), so no row is skipped or repeated.
+    """
+    if isinstance(last_activity, datetime):
+        last_activity = last_activity.isoformat(sep=" ")
+    payload = json.dumps([last_activity, user_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_user_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Decode a token from encode_user_cursor.
+
+    Returns:
+        Optional[Tuple[str, str]]: (last_activity, user_id), or None if the
+        token is missing or malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        last_activity, user_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        )
+        if not isinstance(last_activity, str) or not isinstance(user_id, str):
+            return None
+        return last_activity, user_id
+    except (ValueError, TypeError, UnicodeError):
+        logger.warning(f"Ignoring malformed pagination cursor: {cursor!r}")
+        return None
+
+
+def get_user_ids_page(
+    per_page: int,
+    sort_by: str = "last_activity",
+    sort_order: str = "desc",
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    page: int = 1,
+) -> Dict:
+    """
+    Get one page of user IDs who have completed surveys, using keyset
+    pagination on (last_activity, user_id).
+
+    Reads the users table, whose last_activity column holds each user's
+    latest valid completed response (NULL for users without one), so pages
+    are index range scans on (last_activity, id) or the primary key instead
+    of a grouping of every response. With a cursor, the page starts right
+    after (or ends right before) the given position, so every page costs the
+    same as the first one. Without a cursor, `page` is used as an offset (for
+    direct links to a page number).
+
+    Args:
+        per_page (int): Number of users per page
+        sort_by (str): Field to sort by ('user_id' or 'last_activity')
+        sort_order (str): Sort order ('asc' or 'desc')
+        after (Optional[str]): Cursor of the last row of the previous page
+        before (Optional[str]): Cursor of the first row of the next page
+        page (int): Page number (1-based), used only without a cursor
+
+    Returns:
+        Dict: {
+            'user_ids': List[str],
+            'total_count': int,
+            'first_cursor': Optional[str],  # pass as `before` for the previous page
+            'last_cursor': Optional[str],  # pass as `after` for the next page
+        }
+    """
+    empty = {
+        "user_ids": [],
+        "total_count": 0,
+        "first_cursor": None,
+        "last_cursor": None,
+    }
+
+    total_count = get_completed_user_count()
+    if total_count == 0:
+        logger.info("No completed survey responses found for pagination")
+        return empty
+
+    sort_by = sort_by if sort_by in ("user_id", "last_activity") else "last_activity"
+    descending = sort_order.upper() != "ASC"
+
+    after_key = decode_user_cursor(after)
+    before_key = decode_user_cursor(before) if after_key is None else None
+    # Walking backwards: fetch in reverse order, then flip the page
+    reverse = before_key is not None
+    cursor_key = before_key if reverse else after_key
+    scan_descending = descending != reverse
+    direction = "DESC" if scan_descending else "ASC"
+    comparison = "<" if scan_descending else ">"
+
+    seek_clause = ""
+    params: list = []
+    if sort_by == "user_id":
+        order_clause = f"id {direction}"
+        if cursor_key:
+            seek_clause = f"AND id {comparison} %s"
+            params.append(cursor_key[1])
+    else:
+        order_clause = f"last_activity {direction}, id {direction}"
+        if cursor_key:
+            seek_clause = (
+                f"AND (last_activity {comparison} %s "
+                f"OR (last_activity = %s AND id {comparison} %s))"
+            )
+            params.extend([cursor_key[0], cursor_key[0], cursor_key[1]])
+
+    query = f"""
+        SELECT id AS user_id, last_activity
+        FROM users
+        WHERE last_activity IS NOT NULL
+        {seek_clause}
+        ORDER BY {order_clause}
+        LIMIT %s
+    """
+    params.append(per_page)
+    if cursor_key is None:
+        query += " OFFSET %s"
+        params.append(max(page - 1, 0) * per_page)
+
+    try:
+        rows = execute_query(query, tuple(params)) or []
+        if reverse:
+            rows = rows[::-1]
+
+        logger.debug(
+            f"Retrieved {len(rows)} user IDs "
+            f"(total: {total_count}, sort: {sort_by} {sort_order}, "
+            f"keyset: {cursor_key is not None})"
+        )
+        if not rows:
+            return {**empty, "total_count": total_count}
+        return {
+            "user_ids": [row["user_id"] for row in rows],
+            "total_count": total_count,
+            "first_cursor": encode_user_cursor(
+                rows[0]["last_activity"], rows[0]["user_id"]
+            ),
+            "last_cursor": encode_user_cursor(
+                rows[-1]["last_activity"], rows[-1]["user_id"]
+            ),
+        }
+
+    except Exception as e:
+        logger.error(f"Error retrieving paginated user IDs: {str(e)}")
+        return empty
+
+
 def get_paginated_user_ids(
     page: int, per_page: int, sort_by: str = "last_activity", sort_order: str = "desc"
 ) -> Tuple[List[str], int]:
     """
     Get paginated list of user IDs who have completed surveys, with configurable sorting.
 
+    Offset-based; see get_user_ids_page for cursor-based navigation.
+
     Args:
         page (int): Page number (1-based)
         per_page (int): Number of users per page
@@ -1448,62 +2214,266 @@ def get_paginated_user_ids(
     Returns:
         Tuple[List[str], int]: (list of user IDs for current page, total user count)
     """
-    # First get the total count of distinct users
-    count_query = """
-        SELECT COUNT(DISTINCT user_id) as total_count
-        FROM survey_responses 
-        WHERE completed = TRUE AND attention_check_failed = FALSE
+    result = get_user_ids_page(per_page, sort_by, sort_order, page=page)
+    return result["user_ids"], result["total_count"]
+
+
+def _get_survey_strategy_info(survey_id: int) -> Dict:
     """
+    Strategy name and table columns of a survey's pair generation strategy.
 
-    try:
-        count_result = execute_query(count_query, fetch_one=True)
-        total_count = count_result["total_count"] if count_result else 0
+    Returns:
+        Dict: {"strategy_name", "strategy_columns"}; "unknown" and {} if the
+        survey has no config or its strategy is not registered.
+    """
+    config = get_survey_pair_generation_config(survey_id)
+    if config:
+        try:
+            from application.services.pair_generation.base import StrategyRegistry
 
-        # If no users found, return empty result
-        if total_count == 0:
-            logger.info("No completed survey responses found for pagination")
-            return [], 0
+            strategy = StrategyRegistry.get_strategy(config["strategy"])
+            return {
+                "strategy_name": strategy.get_strategy_name(),
+                "strategy_columns": strategy.get_table_columns(),
+            }
+        except ValueError:
+            pass
+    return {"strategy_name": "unknown", "strategy_columns": {}}
 
-        # Calculate offset for pagination (page is 1-based)
-        offset = (page - 1) * per_page
 
-        # Whitelist of allowed sort columns and their corresponding SQL expressions
-        allowed_sort_columns = {
-            "user_id": "user_id",
-            "last_activity": "MAX(created_at)",
-        }
-        sort_column = allowed_sort_columns.get(
-            sort_by, "MAX(created_at)"
-        )  # Default to last_activity
-
-        # Sanitize sort order
-        if sort_order.upper() not in ["ASC", "DESC"]:
-            sort_order = "DESC"
-
-        # Build the final paginated query using the safe, dynamic values
-        paginated_query = f"""
-            SELECT DISTINCT user_id
-            FROM survey_responses 
-            WHERE completed = TRUE AND attention_check_failed = FALSE
-            GROUP BY user_id
-            ORDER BY {sort_column} {sort_order.upper()}
-            LIMIT %s OFFSET %s
-        """
+def _calculate_response_metrics(
+    choices: List[Dict], strategy_name: str, strategy_columns: Dict
+) -> Tuple[Dict, Dict]:
+    """
+    Derive the matrix metrics of one survey response from its choices.
 
-        paginated_result = execute_query(paginated_query, (per_page, offset))
-        user_ids = (
-            [row["user_id"] for row in paginated_result] if paginated_result else []
-        )
+    Args:
+        choices (List[Dict]): The response's rows from retrieve_user_survey_choices.
+        strategy_name (str): Name of the survey's pair generation strategy.
+        strategy_columns (Dict): The strategy's table columns.
 
-        logger.debug(
-            f"Retrieved {len(user_ids)} user IDs for page {page} "
-            f"(total: {total_count}, sort: {sort_by} {sort_order})"
+    Returns:
+        Tuple[Dict, Dict]: (basic_stats, strategy_metrics)
+    """
+    from analysis.logic.stats_calculators import calculate_choice_statistics
+
+    # Calculate basic choice statistics
+    basic_stats = calculate_choice_statistics(choices)
+
+    # Calculate strategy-specific metrics
+    strategy_metrics = {}
+
+    if "consistency" in strategy_columns:
+        # Handle peak_linearity_test strategy
+        from analysis.logic.stats_calculators import (
+            extract_extreme_vector_preferences,
         )
-        return user_ids, total_count
 
+        try:
+            _, processed_pairs, _, consistency_info, _ = (
+                extract_extreme_vector_preferences(choices)
+            )
+            if processed_pairs > 0 and consistency_info:
+                total_matches = sum(matches for matches, total, _ in consistency_info)
+                total_pairs = sum(total for _, total, _ in consistency_info)
+                overall_consistency = (
+                    int(round(100 * total_matches / total_pairs))
+                    if total_pairs > 0
+                    else 0
+                )
+                strategy_metrics["consistency"] = overall_consistency
+            else:
+                strategy_metrics["consistency"] = 0
+        except Exception:
+            strategy_metrics["consistency"] = 0
+
+    elif (
+        "group_consistency" in strategy_columns
+        or "linear_consistency" in strategy_columns
+    ):
+        # Handle component_symmetry_test and sign_symmetry_test strategies
+        try:
+            if strategy_name == "component_symmetry_test":
+                from analysis.logic.stats_calculators import (
+                    calculate_cyclic_shift_group_consistency,
+                )
+
+                consistencies = calculate_cyclic_shift_group_consistency(choices)
+            elif strategy_name == "sign_symmetry_test":
+                from analysis.logic.stats_calculators import (
+                    calculate_linear_symmetry_group_consistency,
+                )
+
+                consistencies = calculate_linear_symmetry_group_consistency(choices)
+            else:
+                consistencies = {"overall": 0.0}
+
+            overall_consistency = consistencies.get("overall", 0.0)
+            strategy_metrics["group_consistency"] = overall_consistency
+        except Exception:
+            strategy_metrics["group_consistency"] = 0.0
+
+    elif "sum" in strategy_columns and "ratio" in strategy_columns:
+        # Handle l1_vs_leontief_comparison and similar strategies
+        strategy_metrics["sum_percent"] = basic_stats["sum_percent"]
+        strategy_metrics["ratio_percent"] = basic_stats["ratio_percent"]
+
+    elif "rss" in strategy_columns:
+        # Handle root sum squared strategies
+        if "sum" in strategy_columns:  # l1_vs_l2_comparison
+            rss_percent = 100 - basic_stats["sum_percent"]
+            strategy_metrics["rss_percent"] = rss_percent
+            strategy_metrics["sum_percent"] = basic_stats["sum_percent"]
+        elif "ratio" in strategy_columns:  # l2_vs_leontief_comparison
+            rss_percent = 100 - basic_stats["ratio_percent"]
+            strategy_metrics["rss_percent"] = rss_percent
+            strategy_metrics["ratio_percent"] = basic_stats["ratio_percent"]
+
+    elif (
+        "concentrated_changes" in strategy_columns
+        and "distributed_changes" in strategy_columns
+    ):
+        # Handle asymmetric_loss_distribution strategy
+        # Use option1_percent for concentrated changes,
+        # option2_percent for distributed changes
+        strategy_metrics["concentrated_changes_percent"] = basic_stats[
+            "option1_percent"
+        ]
+        strategy_metrics["distributed_changes_percent"] = basic_stats["option2_percent"]
+
+    else:
+        # Default: use option percentages
+        strategy_metrics["option1_percent"] = basic_stats["option1_percent"]
+        strategy_metrics["option2_percent"] = basic_stats["option2_percent"]
+
+    return basic_stats, strategy_metrics
+
+
+def _format_ideal_budget(optimal_allocation) -> str:
+    """Render a stored optimal_allocation for the matrix ("N/A" if unreadable)."""
+    try:
+        return str(json.loads(optimal_allocation))
+    except (json.JSONDecodeError, TypeError):
+        return "N/A"
+
+
+def _parse_json_column(value) -> Dict:
+    """Parse a JSON column the driver may return as str or already decoded."""
+    if isinstance(value, dict):
+        return value
+    try:
+        return json.loads(value) if value else {}
+    except (json.JSONDecodeError, TypeError):
+        return {}
+
+
+RESPONSE_SUMMARY_UPSERT_QUERY = """
+    INSERT INTO response_summaries (
+        survey_response_id, user_id, survey_id, strategy_name,
+        total_choices, basic_stats, strategy_metrics, summary_version
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        strategy_name = VALUES(strategy_name),
+        total_choices = VALUES(total_choices),
+        basic_stats = VALUES(basic_stats),
+        strategy_metrics = VALUES(strategy_metrics),
+        summary_version = VALUES(summary_version),
+        computed_at = CURRENT_TIMESTAMP
+"""
+
+
+def refresh_response_summaries(survey_response_ids: Iterable[int]) -> int:
+    """
+    (Re)compute and store the response_summaries rows of the given responses.
+
+    Only completed responses that passed the attention check are summarized,
+    matching what the matrix displays. Called after a submission commits and
+    by scripts/backfill_response_summaries.py.
+
+    Args:
+        survey_response_ids (Iterable[int]): IDs of the survey responses.
+
+    Returns:
+        int: Number of summaries written (0 on error).
+    """
+    survey_response_ids = list(dict.fromkeys(survey_response_ids))
+    if not survey_response_ids:
+        return 0
+
+    try:
+        choices = retrieve_user_survey_choices(survey_response_ids=survey_response_ids)
+        grouped: Dict[int, List[Dict]] = {}
+        for choice in choices:
+            grouped.setdefault(choice["survey_response_id"], []).append(choice)
+
+        strategies: Dict[int, Dict] = {}
+        rows = []
+        for survey_response_id, response_choices in grouped.items():
+            first = response_choices[0]
+            survey_id = first["survey_id"]
+            if survey_id not in strategies:
+                strategies[survey_id] = _get_survey_strategy_info(survey_id)
+            info = strategies[survey_id]
+            basic_stats, strategy_metrics = _calculate_response_metrics(
+                response_choices, info["strategy_name"], info["strategy_columns"]
+            )
+            rows.append(
+                (
+                    survey_response_id,
+                    first["user_id"],
+                    survey_id,
+                    info["strategy_name"],
+                    len(response_choices),
+                    json.dumps(basic_stats),
+                    json.dumps(strategy_metrics),
+                    RESPONSE_SUMMARY_VERSION,
+                )
+            )
+
+        if rows:
+            with transaction() as cursor:
+                cursor.executemany(RESPONSE_SUMMARY_UPSERT_QUERY, rows)
+        logger.debug(f"Stored {len(rows)} response summaries")
+        return len(rows)
     except Exception as e:
-        logger.error(f"Error retrieving paginated user IDs: {str(e)}")
-        return [], 0
+        logger.error(f"Error refreshing response summaries: {str(e)}")
+        return 0
+
+
+def get_response_ids_missing_summaries(limit: Optional[int] = None) -> List[int]:
+    """
+    IDs of summarizable responses with no current response_summaries row
+    (absent or written by an older RESPONSE_SUMMARY_VERSION).
+
+    Args:
+        limit (Optional[int]): Maximum number of IDs to return.
+
+    Returns:
+        List[int]: Survey response IDs in ascending order.
+    """
+    query = """
+        SELECT sr.id AS survey_response_id
+        FROM survey_responses sr
+        LEFT JOIN response_summaries rs ON rs.survey_response_id = sr.id
+        WHERE sr.completed = TRUE
+        AND sr.attention_check_failed = FALSE
+        AND (rs.survey_response_id IS NULL OR rs.summary_version < %s)
+        AND EXISTS (
+            SELECT 1 FROM comparison_pairs cp WHERE cp.survey_response_id = sr.id
+        )
+        ORDER BY sr.id
+    """
+    params: List = [RESPONSE_SUMMARY_VERSION]
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(int(limit))
+
+    results = execute_query(query, tuple(params))
+    if results is None:
+        logger.error("Error retrieving responses missing summaries")
+        return []
+    return [row["survey_response_id"] for row in results]
 
 
 def get_user_survey_performance_data(
@@ -1512,6 +2482,11 @@ def get_user_survey_performance_data(
     """
     Get comprehensive user performance data across all surveys for matrix display.
 
+    Metrics are read from the response_summaries table. Responses without a
+    current summary (not backfilled yet, or summarized under a different
+    strategy or RESPONSE_SUMMARY_VERSION) are computed from their pairs.
+    Used by the users matrix and, for strategy metrics, by the report pages.
+
     Args:
         user_ids (Optional[List[str]]): If provided, filter results to these users only
 
@@ -1520,204 +2495,103 @@ def get_user_survey_performance_data(
                    Each dict contains: user_id, survey_id, strategy_name, strategy_columns,
                    basic_stats, strategy_metrics, ideal_budget, response_created_at
     """
-    try:
-        # Get all user choices data
-        user_choices = retrieve_user_survey_choices()
+    conditions = ["sr.completed = TRUE", "sr.attention_check_failed = FALSE"]
+    params: List = []
+    # Restrict the query to the requested users (e.g. one matrix page), so
+    # the cost scales with the page size rather than the database size
+    if user_ids is not None:
+        user_ids = list(dict.fromkeys(user_ids))  # Drop duplicates, keep order
+        if not user_ids:
+            return []
+        placeholders = ", ".join(["%s"] * len(user_ids))
+        conditions.append(f"sr.user_id IN ({placeholders})")
+        params.extend(user_ids)
 
-        if not user_choices:
+    query = f"""
+        SELECT
+            sr.id AS survey_response_id,
+            sr.user_id,
+            sr.survey_id,
+            sr.optimal_allocation,
+            sr.created_at AS response_created_at,
+            rs.strategy_name AS summary_strategy_name,
+            rs.basic_stats,
+            rs.strategy_metrics,
+            rs.summary_version
+        FROM survey_responses sr
+        LEFT JOIN response_summaries rs ON rs.survey_response_id = sr.id
+        WHERE {" AND ".join(conditions)}
+        AND EXISTS (
+            SELECT 1 FROM comparison_pairs cp WHERE cp.survey_response_id = sr.id
+        )
+        ORDER BY sr.user_id, sr.survey_id
+    """
+
+    try:
+        responses = execute_query(query, tuple(params))
+        if not responses:
             logger.info("No user choices data found")
             return []
 
-        # Filter by user_ids if provided
-        if user_ids is not None:
-            original_count = len(user_choices)
-            user_choices = [
-                choice for choice in user_choices if choice["user_id"] in user_ids
-            ]
-            logger.debug(
-                f"Filtered user choices from {original_count} to {len(user_choices)} based on user_ids filter"
-            )
-
-        # Group choices by user and survey
-        grouped_choices = {}
         survey_strategies = {}  # Cache strategy info
+        metrics = {}  # survey_response_id -> (basic_stats, strategy_metrics)
+        stale = []
 
-        for choice in user_choices:
-            user_id = choice["user_id"]
-            survey_id = choice["survey_id"]
-
-            if user_id not in grouped_choices:
-                grouped_choices[user_id] = {}
-            if survey_id not in grouped_choices[user_id]:
-                grouped_choices[user_id][survey_id] = []
-
-            grouped_choices[user_id][survey_id].append(choice)
-
-            # Cache survey strategy info
+        for response in responses:
+            survey_id = response["survey_id"]
             if survey_id not in survey_strategies:
-                config = get_survey_pair_generation_config(survey_id)
-                if config:
-                    try:
-                        from application.services.pair_generation.base import (
-                            StrategyRegistry,
-                        )
-
-                        strategy = StrategyRegistry.get_strategy(config["strategy"])
-                        survey_strategies[survey_id] = {
-                            "strategy_name": strategy.get_strategy_name(),
-                            "strategy_columns": strategy.get_table_columns(),
-                        }
-                    except ValueError:
-                        survey_strategies[survey_id] = {
-                            "strategy_name": "unknown",
-                            "strategy_columns": {},
-                        }
-                else:
-                    survey_strategies[survey_id] = {
-                        "strategy_name": "unknown",
-                        "strategy_columns": {},
-                    }
+                survey_strategies[survey_id] = _get_survey_strategy_info(survey_id)
+            strategy_name = survey_strategies[survey_id]["strategy_name"]
+
+            if (
+                response.get("summary_version") == RESPONSE_SUMMARY_VERSION
+                and response.get("summary_strategy_name") == strategy_name
+            ):
+                metrics[response["survey_response_id"]] = (
+                    _parse_json_column(response["basic_stats"]),
+                    _parse_json_column(response["strategy_metrics"]),
+                )
+            else:
+                stale.append(response["survey_response_id"])
+
+        if stale:
+            logger.debug(f"Computing metrics for {len(stale)} unsummarized responses")
+            grouped: Dict[int, List[Dict]] = {}
+            for choice in retrieve_user_survey_choices(survey_response_ids=stale):
+                grouped.setdefault(choice["survey_response_id"], []).append(choice)
+            for survey_response_id, choices in grouped.items():
+                info = survey_strategies[choices[0]["survey_id"]]
+                metrics[survey_response_id] = _calculate_response_metrics(
+                    choices, info["strategy_name"], info["strategy_columns"]
+                )
 
         # Generate performance data for each user-survey combination
         performance_data = []
 
-        for user_id, user_surveys in grouped_choices.items():
-            for survey_id, choices in user_surveys.items():
-                strategy_info = survey_strategies.get(survey_id, {})
-                strategy_name = strategy_info.get("strategy_name", "unknown")
-                strategy_columns = strategy_info.get("strategy_columns", {})
-
-                # Calculate basic choice statistics
-                from analysis.logic.stats_calculators import (
-                    calculate_choice_statistics,
-                )
-
-                basic_stats = calculate_choice_statistics(choices)
-
-                # Calculate strategy-specific metrics
-                strategy_metrics = {}
+        for response in responses:
+            if response["survey_response_id"] not in metrics:
+                continue
+            basic_stats, strategy_metrics = metrics[response["survey_response_id"]]
+            strategy_info = survey_strategies[response["survey_id"]]
 
-                if "consistency" in strategy_columns:
-                    # Handle peak_linearity_test strategy
-                    from analysis.logic.stats_calculators import (
-                        extract_extreme_vector_preferences,
-                    )
-
-                    try:
-                        _, processed_pairs, _, consistency_info, _ = (
-                            extract_extreme_vector_preferences(choices)
-                        )
-                        if processed_pairs > 0 and consistency_info:
-                            total_matches = sum(
-                                matches for matches, total, _ in consistency_info
-                            )
-                            total_pairs = sum(total for _, total, _ in consistency_info)
-                            overall_consistency = (
-                                int(round(100 * total_matches / total_pairs))
-                                if total_pairs > 0
-                                else 0
-                            )
-                            strategy_metrics["consistency"] = overall_consistency
-                        else:
-                            strategy_metrics["consistency"] = 0
-                    except Exception:
-                        strategy_metrics["consistency"] = 0
-
-                elif (
-                    "group_consistency" in strategy_columns
-                    or "linear_consistency" in strategy_columns
-                ):
-                    # Handle component_symmetry_test and sign_symmetry_test strategies
-                    try:
-                        if strategy_name == "component_symmetry_test":
-                            from analysis.logic.stats_calculators import (
-                                calculate_cyclic_shift_group_consistency,
-                            )
-
-                            consistencies = calculate_cyclic_shift_group_consistency(
-                                choices
-                            )
-                        elif strategy_name == "sign_symmetry_test":
-                            from analysis.logic.stats_calculators import (
-                                calculate_linear_symmetry_group_consistency,
-                            )
-
-                            consistencies = calculate_linear_symmetry_group_consistency(
-                                choices
-                            )
-                        else:
-                            consistencies = {"overall": 0.0}
-
-                        overall_consistency = consistencies.get("overall", 0.0)
-                        strategy_metrics["group_consistency"] = overall_consistency
-                    except Exception:
-                        strategy_metrics["group_consistency"] = 0.0
-
-                elif "sum" in strategy_columns and "ratio" in strategy_columns:
-                    # Handle l1_vs_leontief_comparison and similar strategies
-                    strategy_metrics["sum_percent"] = basic_stats["sum_percent"]
-                    strategy_metrics["ratio_percent"] = basic_stats["ratio_percent"]
-
-                elif "rss" in strategy_columns:
-                    # Handle root sum squared strategies
-                    if "sum" in strategy_columns:  # l1_vs_l2_comparison
-                        rss_percent = 100 - basic_stats["sum_percent"]
-                        strategy_metrics["rss_percent"] = rss_percent
-                        strategy_metrics["sum_percent"] = basic_stats["sum_percent"]
-                    elif "ratio" in strategy_columns:  # l2_vs_leontief_comparison
-                        rss_percent = 100 - basic_stats["ratio_percent"]
-                        strategy_metrics["rss_percent"] = rss_percent
-                        strategy_metrics["ratio_percent"] = basic_stats["ratio_percent"]
-
-                elif (
-                    "concentrated_changes" in strategy_columns
-                    and "distributed_changes" in strategy_columns
-                ):
-                    # Handle asymmetric_loss_distribution strategy
-                    # Use option1_percent for concentrated changes,
-                    # option2_percent for distributed changes
-                    strategy_metrics["concentrated_changes_percent"] = basic_stats[
-                        "option1_percent"
-                    ]
-                    strategy_metrics["distributed_changes_percent"] = basic_stats[
-                        "option2_percent"
-                    ]
-
-                else:
-                    # Default: use option percentages
-                    strategy_metrics["option1_percent"] = basic_stats["option1_percent"]
-                    strategy_metrics["option2_percent"] = basic_stats["option2_percent"]
-
-                # Extract ideal budget
-                ideal_budget = "N/A"
-                if choices:
-                    try:
-                        import json
-
-                        optimal_allocation = json.loads(
-                            choices[0]["optimal_allocation"]
-                        )
-                        ideal_budget = str(optimal_allocation)
-                    except (json.JSONDecodeError, KeyError, IndexError):
-                        pass
-
-                performance_record = {
-                    "user_id": user_id,
-                    "survey_id": survey_id,
-                    "strategy_name": strategy_name,
-                    "strategy_columns": strategy_columns,
+            performance_data.append(
+                {
+                    "user_id": response["user_id"],
+                    "survey_id": response["survey_id"],
+                    "strategy_name": strategy_info["strategy_name"],
+                    "strategy_columns": strategy_info["strategy_columns"],
                     "basic_stats": basic_stats,
                     "strategy_metrics": strategy_metrics,
-                    "ideal_budget": ideal_budget,
-                    "response_created_at": (
-                        choices[0].get("response_created_at") if choices else None
+                    "ideal_budget": _format_ideal_budget(
+                        response["optimal_allocation"]
                     ),
+                    "response_created_at": response.get("response_created_at"),
                 }
-
-                performance_data.append(performance_record)
+            )
 
         logger.info(
-            f"Generated performance data for {len(performance_data)} user-survey combinations"
+            f"Generated performance data for {len(performance_data)} user-survey "
+            f"combinations ({len(stale)} computed from pairs)"
         )
         return performance_data
 
@@ -1,8 +1,9 @@
 -- Database Schema for budget-survey
--- Reflects state AFTER migration 20251226_add_unsuitable_for_strategy_column.sql
+-- Reflects state AFTER migration 20261016_add_user_last_activity.sql
 
 -- WARNING! Running this script will DROP existing tables
--- (users, stories, surveys, survey_responses, comparison_pairs)
+-- (users, stories, surveys, survey_responses, comparison_pairs,
+-- response_summaries)
 -- and ALL their data before recreating the schema.
 -- DO NOT run this on a production database or any database
 -- with data you want to keep. Use primarily for initial
@@ -21,7 +22,9 @@ CREATE TABLE `users` (
   `blacklisted` BOOLEAN DEFAULT FALSE,
   `blacklisted_at` TIMESTAMP NULL,
   `failed_survey_id` INT NULL,
-  INDEX `idx_blacklisted` (`blacklisted`)
+  `last_activity` TIMESTAMP NULL DEFAULT NULL COMMENT 'Latest valid completed survey response (see migration 20261016_add_user_last_activity)',
+  INDEX `idx_blacklisted` (`blacklisted`),
+  INDEX `idx_users_last_activity` (`last_activity`, `id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 
@@ -74,6 +77,11 @@ CREATE TABLE `survey_responses` (
   INDEX (`user_id`), -- Index for potential joins/lookups
   INDEX (`survey_id`), -- Index for potential joins/lookups
   INDEX `idx_unsuitable_strategy` (`unsuitable_for_strategy`),
+  -- Composite/covering indexes for report queries (see migration 20261016)
+  INDEX `idx_sr_report_users` (`completed`, `attention_check_failed`, `user_id`, `survey_id`, `created_at`),
+  INDEX `idx_sr_report_survey` (`completed`, `attention_check_failed`, `survey_id`, `user_id`),
+  INDEX `idx_sr_participation` (`completed`, `user_id`, `attention_check_failed`, `survey_id`, `created_at`),
+  INDEX `idx_sr_completed_created` (`completed`, `created_at`),
   UNIQUE KEY `unique_user_survey` (`user_id`, `survey_id`),
   FOREIGN KEY (`user_id`) REFERENCES `users` (`id`) ON DELETE RESTRICT,
   FOREIGN KEY (`survey_id`) REFERENCES `surveys` (`id`) ON DELETE RESTRICT
@@ -96,6 +104,24 @@ CREATE TABLE `comparison_pairs` (
   `raw_user_choice` INT DEFAULT NULL,
   `generation_metadata` JSON DEFAULT NULL,
   `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  INDEX `idx_cp_response_pair` (`survey_response_id`, `pair_number`),
+  FOREIGN KEY (`survey_response_id`) REFERENCES `survey_responses` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+
+-- --------- Response Summaries Table ---------
+DROP TABLE IF EXISTS `response_summaries`;
+CREATE TABLE `response_summaries` (
+  `survey_response_id` INT NOT NULL PRIMARY KEY, -- FK to survey_responses.id
+  `user_id` VARCHAR(128) NOT NULL,
+  `survey_id` INT NOT NULL,
+  `strategy_name` VARCHAR(100) NOT NULL COMMENT 'Strategy the metrics were computed for',
+  `total_choices` INT NOT NULL,
+  `basic_stats` JSON NOT NULL COMMENT 'Output of calculate_choice_statistics',
+  `strategy_metrics` JSON NOT NULL COMMENT 'Strategy-specific matrix metrics',
+  `summary_version` INT NOT NULL DEFAULT 1 COMMENT 'RESPONSE_SUMMARY_VERSION the row was computed with',
+  `computed_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  INDEX `idx_user_survey` (`user_id`, `survey_id`),
   FOREIGN KEY (`survey_response_id`) REFERENCES `survey_responses` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -1,8 +1,9 @@
 # https://equalshares.net/implementation/computation/
-import copy
+import itertools
 import logging
 import time
 import matplotlib.pyplot as plt
+import numpy as np
 
 logger = logging.getLogger("equal_shares_logger")
 
@@ -111,57 +112,115 @@ def min_max_equal_shares(voters:list, projects: list, cost_min_max: dict, bids:
     return equal_shares(voters, projects, cost, approvers, budget, bids, budget_increment_per_project)
 
 
-def equal_shares(voters: list, projects: list, cost: dict, approvers: dict, budget: int, bids: dict, budget_increment_per_project: int):
+def equal_shares(voters: list, projects: list, cost: dict, approvers: dict, budget: int, bids: dict, budget_increment_per_project: int, completion: str = "search"):
+
+    """
+    Method of equal shares with "add 1" completion.
+
+    The completion raises every voter's budget by 1 (the total by len(voters)) as long as the
+    outcome is not exhaustive and still fits the real budget.
+    completion="linear" tries those increments one by one, like the reference implementation.
+    completion="search" (default) finds the same stopping point with an exponential search
+    followed by a binary search, assuming that a larger per-voter budget never lowers the total
+    cost of the outcome. Runs are memoized and share the preprocessed instance, so each
+    per-voter budget is evaluated at most once.
+    The assumption does not hold on every instance. When the runs the search evaluated show it
+    failing (a total cost that drops as the budget grows, or an increment below the result at
+    which the linear loop would already have stopped), a warning is logged: the search may then
+    stop at a different budget than completion="linear".
+    """
+
+    if completion not in ("linear", "search"):
+        raise ValueError(f"Unknown completion {completion!r}, expected 'linear' or 'search'")
 
     max_cost_for_project = find_max(bids)
-    chosen_project, chosen_project_cost, update_cost,budget_per_voter = equal_shares_fixed_budget(voters, projects, cost, approvers, budget, bids, budget_increment_per_project,max_cost_for_project)
+    instance = _prepare_instance(voters, projects, cost, approvers, bids)
 
     # add 1 completion
     # start with integral per-voter voters_budget
-    voters_budget = int(budget / len(voters)) * len(voters)
-    total_chosen_project_cost = sum(chosen_project_cost[c] for c in chosen_project_cost)
+    base_voters_budget = int(budget / len(voters)) * len(voters)
+
+    # beyond this increment every voter can pay for everything alone, so the outcome stops changing
+    spending_cap = sum(max_cost_for_project.values()) + sum(cost.values())
+    max_increment = max(1, -(-(spending_cap * len(voters) - base_voters_budget) // len(voters)))
+
+    runs = {}
+
+    def run(increment: int):
+        # increment 0 is the plain run with the real budget
+        if increment not in runs:
+            voters_budget = budget if increment == 0 else base_voters_budget + increment * len(voters)
+            logger.info("  call fix voters_budget   = %s B= %s", voters_budget, budget)
+            result = _equal_shares_fixed_budget(instance, voters_budget, budget_increment_per_project, max_cost_for_project)
+            total_chosen_project_cost = sum(result[1].values())
+            runs[increment] = (result, total_chosen_project_cost)
+        return runs[increment]
+
+    def fits(increment: int):
+        return increment == 0 or run(increment)[1] <= budget
+
+    def can_grow(increment: int):
+        # the outcome fits the budget but is not exhaustive, so the completion tries the next increment
+        return fits(increment) and not is_exhaustive(projects, cost, budget, max_cost_for_project, *run(increment))
+
+    if completion == "linear":
+        increment = 0
+        while can_grow(increment) and fits(increment + 1):
+            increment += 1
+    elif not can_grow(0):
+        increment = 0
+    else:
+        # exponential search for an increment that cannot grow, then binary search below it
+        low, high = 0, 1
+        while high < max_increment and can_grow(high):
+            low, high = high, min(2 * high, max_increment)
+        if high == max_increment and can_grow(high):
+            logger.warning("Outcome is not exhaustive at the spending cap, stopping the completion")
+            low = high
+        while high - low > 1:
+            middle = (low + high) // 2
+            if can_grow(middle):
+                low = middle
+            else:
+                high = middle
+        increment = low + 1 if low < high and fits(low + 1) else low
+        _warn_if_not_monotone(runs, increment, can_grow, fits)
 
-    while True:
-        # is current outcome exhaustive?
-        is_exhaustive = True
-        for project in projects:
-            max_value_project = max_cost_for_project[project]
-            project_cost = update_cost[project]
+    (chosen_project, chosen_project_cost, _, budget_per_voter), _ = run(increment)
+    plot_graph(chosen_project_cost)
+
+    return chosen_project, chosen_project_cost,budget_per_voter
 
 
+def _warn_if_not_monotone(runs: dict, increment: int, can_grow, fits):
+    # only increments the search already ran are checked, so this costs no extra runs
+    evaluated = sorted(i for i in runs if i > 0)
+    totals = [runs[i][1] for i in evaluated]
+    cost_drops = any(later < earlier for earlier, later in zip(totals, totals[1:]))
+    # the linear loop stops at the first increment that cannot grow or whose successor does not fit
+    linear_stops_earlier = [i for i in sorted(runs) if i < increment and (not can_grow(i) or (i + 1 in runs and not fits(i + 1)))]
+    if cost_drops or linear_stops_earlier:
+        logger.warning(
+            "Outcome cost is not monotone in the per-voter budget (increments %s, total costs %s); "
+            "the completion search stopped at increment %s and completion='linear' may stop elsewhere",
+            evaluated, totals, increment)
 
-            # chack if total cost of chosen project + current project  <= budget, if true have more project to chack
-            # check if total cost of chosen project + project_cost   <= budget
-            # and total project_cost + curr project_cost <= max value for curr project, if true thr price of the project can be increased
 
-            if (project not in chosen_project and total_chosen_project_cost + cost[project] <= budget) or \
-                    (project in chosen_project and total_chosen_project_cost + project_cost <= budget and
-                     chosen_project_cost[project] + project_cost <= max_value_project):
-                is_exhaustive = False
+def is_exhaustive(projects: list, cost: dict, budget: int, max_cost_for_project: dict, result: tuple, total_chosen_project_cost: int):
+    chosen_project, chosen_project_cost, update_cost, _ = result
+    for project in projects:
+        max_value_project = max_cost_for_project[project]
+        project_cost = update_cost[project]
 
-                break
-        # if so, stop
-        if is_exhaustive:
-            break
-        # would the next highest voters_budget work?
-        update_voters_budget = voters_budget + len(voters)  # Add 1 to each voter's voters_budget
-        logger.info("  call fix voters_budget   = %s B= %s, %s", total_chosen_project_cost, budget, update_voters_budget)
-        update_chosen_project, update_chosen_project_cost, update_cost, update_budget_per_voter = equal_shares_fixed_budget(voters, projects, cost, approvers, update_voters_budget, bids, budget_increment_per_project,max_cost_for_project)
-        total_chosen_project_cost = sum(update_chosen_project_cost[c] for c in update_chosen_project_cost)
-
-        if total_chosen_project_cost <= budget:
-            # yes, so continue with that voters_budget
-            voters_budget = update_voters_budget
-            chosen_project = update_chosen_project
-            chosen_project_cost = update_chosen_project_cost
-            budget_per_voter = update_budget_per_voter
-        else:
-            # logger.info("  break total_chosen_project_cost  = %s B= %s", total_chosen_project_cost, B)
-            # no, so stop
-            break
-    plot_graph(chosen_project_cost)
+        # chack if total cost of chosen project + current project  <= budget, if true have more project to chack
+        # check if total cost of chosen project + project_cost   <= budget
+        # and total project_cost + curr project_cost <= max value for curr project, if true thr price of the project can be increased
 
-    return chosen_project, chosen_project_cost,budget_per_voter
+        if (project not in chosen_project and total_chosen_project_cost + cost[project] <= budget) or \
+                (project in chosen_project and total_chosen_project_cost + project_cost <= budget and
+                 chosen_project_cost[project] + project_cost <= max_value_project):
+            return False
+    return True
 
 
 def break_ties(cost: dict, approvers: dict, bids: list):
@@ -175,29 +234,68 @@ def break_ties(cost: dict, approvers: dict, bids: list):
 
 
 def equal_shares_fixed_budget(voters: list, projects: list, cost: dict, approvers: dict, budget: int, bids: dict, budget_increment_per_project:int,max_cost_for_project:dict):
+    instance = _prepare_instance(voters, projects, cost, approvers, bids)
+    return _equal_shares_fixed_budget(instance, budget, budget_increment_per_project, max_cost_for_project)
+
+
+def _prepare_instance(voters: list, projects: list, cost: dict, approvers: dict, bids: dict):
+
+    """
+    Preprocess the parts of an instance that do not depend on the budget.
+
+    Voter budgets live in a numpy array, so approvers are stored as index arrays into it.
+    The result is shared by every run of the completion and is never modified.
+    """
+
+    voter_index = {voter: index for index, voter in enumerate(voters)}
+    return {
+        "voters": voters,
+        "projects": projects,
+        "cost": cost,
+        "approvers": approvers,
+        "bids": bids,
+        "voter_index": voter_index,
+        "approver_index": {c: np.array([voter_index[i] for i in approvers[c]], dtype=np.intp) for c in projects},
+        # candidates in their original order, with their initial vote count
+        "remaining": {c: len(approvers[c]) for c in projects if cost[c] > 0 and len(approvers[c]) > 0},
+    }
+
+
+def _effective_vote_count(project_cost: float, approver_budgets: np.ndarray):
+    # approvers pay equally, those who cannot afford their share pay their entire budget instead
+    approver_budgets = np.sort(approver_budgets)
+    paid_so_far = np.concatenate(([0.0], np.cumsum(approver_budgets)[:-1]))
+    max_payment = (project_cost - paid_so_far) / np.arange(len(approver_budgets), 0, -1)
+    affordable = np.flatnonzero(max_payment <= approver_budgets)
+    if len(affordable) == 0:
+        return None
+    return float(project_cost / max_payment[affordable[0]])
+
+
+def _equal_shares_fixed_budget(instance: dict, budget: int, budget_increment_per_project: int, max_cost_for_project: dict):
 
     # logger.info("Equal shares with fixed voters_budget: voters=%s, candidates=%s, cost=%s, approvers=%s, voters_budget=%s", N, C,
     #             cost, approvers, B)
-    voters_budget = {i: budget / len(voters) for i in voters}
+    voters, projects, bids = instance["voters"], instance["projects"], instance["bids"]
+    voter_index = instance["voter_index"]
+    voters_budget = np.full(len(voters), budget / len(voters))
 
-    remaining = {}  # remaining candidate -> previous effective vote count
+    remaining = dict(instance["remaining"])  # remaining candidate -> previous effective vote count
 
     budget_per_voter = {}
     for outer_key, inner_dict in bids.items():
         # Initialize the inner dictionary with values set to 0
         budget_per_voter[outer_key] = {inner_key: 0 for inner_key in inner_dict.keys()}
 
-    for c in projects:
-        if cost[c] > 0 and len(approvers[c]) > 0:
-            remaining[c] = len(approvers[c])
-
     # logger.info("Remaining --> the number of relevant vote for any project remaining=%s", remaining)
 
     winners = []
 
-    update_bids = copy.deepcopy(bids)
-    update_approvers = copy.deepcopy(approvers)
-    update_cost = copy.deepcopy(cost)
+    # only the entries of chosen projects change, so copy them lazily in filter_bids
+    update_bids = dict(bids)
+    update_approvers = dict(instance["approvers"])
+    update_cost = dict(instance["cost"])
+    approver_index = dict(instance["approver_index"])
     winners_total_cost = {key: 0 for key in projects}
 
     while True:
@@ -215,34 +313,23 @@ def equal_shares_fixed_budget(voters: list, projects: list, cost: dict, approver
                 # logger.info("c cannot be better than the best so far c=%s", c)
 
                 break
-            money_behind_now = sum(voters_budget[i] for i in update_approvers[c])
+            approver_budgets = voters_budget[approver_index[c]]
+            money_behind_now = approver_budgets.sum()
             if money_behind_now < update_cost[c]:
                 # c is not affordable
                 del remaining[c]
                 # logger.info("c is not affordable c=%s, update_cost for c=%s ", update_cost[c])
                 continue
             # calculate the effective vote count of c
-            update_approvers[c].sort(key=lambda i: voters_budget[i])
-            paid_so_far = 0
-            denominator = len(update_approvers[c])
-            for i in update_approvers[c]:
-                # compute payment if remaining approvers pay equally
-                max_payment = (update_cost[c] - paid_so_far) / denominator
-                eff_vote_count = update_cost[c] / max_payment
-                if max_payment > voters_budget[i]:
-                    # i cannot afford the payment, so pays entire remaining voters_budget
-                    paid_so_far += voters_budget[i]
-                    denominator -= 1
-                else:
-                    # i (and all later approvers) can afford the payment; stop here
-                    remaining[c] = int(eff_vote_count)
-                    if eff_vote_count > best_eff_vote_count:
-                        best_eff_vote_count = eff_vote_count
-                        best = [c]
-                    elif eff_vote_count == best_eff_vote_count:
-                        best.append(c)
-
-                    break
+            eff_vote_count = _effective_vote_count(update_cost[c], approver_budgets)
+            if eff_vote_count is None:
+                continue
+            remaining[c] = int(eff_vote_count)
+            if eff_vote_count > best_eff_vote_count:
+                best_eff_vote_count = eff_vote_count
+                best = [c]
+            elif eff_vote_count == best_eff_vote_count:
+                best.append(c)
         if not best:
             # logger.info(" no remaining candidates are affordable ,best = %s", best)
 
@@ -284,20 +371,22 @@ def equal_shares_fixed_budget(voters: list, projects: list, cost: dict, approver
 
         best_max_payment = curr_project_cost / best_eff_vote_count
 
-
-        for i in update_bids[curr_project_id].keys():
-            if voters_budget[i] > best_max_payment:
-                voters_budget[i] -= best_max_payment
-                budget_per_voter[curr_project_id][i] = budget_per_voter[curr_project_id][i] + best_max_payment
-            else:
-                voters_budget[i] = 0
+        payers = list(update_bids[curr_project_id].keys())
+        payer_index = np.array([voter_index[i] for i in payers], dtype=np.intp)
+        can_pay = voters_budget[payer_index] > best_max_payment
+        voters_budget[payer_index[can_pay]] -= best_max_payment
+        voters_budget[payer_index[~can_pay]] = 0
+        for i in itertools.compress(payers, can_pay):
+            budget_per_voter[curr_project_id][i] = budget_per_voter[curr_project_id][i] + best_max_payment
 
         # chack if the curr cost + total update codt <= max value for this projec
         # logger.info(" total project price   = %s", winners_total_cost[curr_project_id])
 
         if winners_total_cost[curr_project_id] + curr_project_cost <= max_value_project:
 
+            update_bids[curr_project_id] = dict(update_bids[curr_project_id])
             filter_bids(update_bids, update_approvers, curr_project_id, curr_project_cost, budget_increment_per_project, update_cost)
+            approver_index[curr_project_id] = np.array([voter_index[i] for i in update_approvers[curr_project_id]], dtype=np.intp)
 
             winners_total_cost[curr_project_id] = winners_total_cost[curr_project_id] + curr_project_cost
 
@@ -0,0 +1,30 @@
+-- Migration: Add composite and covering indexes for report queries
+-- Description: Report and user-list queries filter survey_responses on
+-- (completed, attention_check_failed[, survey_id]) and order by
+-- (user_id, survey_id, pair_number). These indexes let
+-- retrieve_user_survey_choices, get_paginated_user_ids/get_user_ids_page,
+-- get_user_participation_overview and get_latest_survey_timestamp use index
+-- range scans instead of full table scans.
+
+-- retrieve_user_survey_choices (all users or a page of users) and the
+-- users list: covers the filter, the (user_id, survey_id) ordering and
+-- MAX(created_at) per user
+ALTER TABLE `survey_responses`
+ADD INDEX `idx_sr_report_users` (`completed`, `attention_check_failed`, `user_id`, `survey_id`, `created_at`);
+
+-- retrieve_user_survey_choices(survey_id=...)
+ALTER TABLE `survey_responses`
+ADD INDEX `idx_sr_report_survey` (`completed`, `attention_check_failed`, `survey_id`, `user_id`);
+
+-- get_user_participation_overview: completed responses grouped by user, with
+-- every column the aggregates read
+ALTER TABLE `survey_responses`
+ADD INDEX `idx_sr_participation` (`completed`, `user_id`, `attention_check_failed`, `survey_id`, `created_at`);
+
+-- get_latest_survey_timestamp: MAX(created_at) resolved from the index
+ALTER TABLE `survey_responses`
+ADD INDEX `idx_sr_completed_created` (`completed`, `created_at`);
+
+-- Pairs of a response, already in pair_number order
+ALTER TABLE `comparison_pairs`
+ADD INDEX `idx_cp_response_pair` (`survey_response_id`, `pair_number`);
@@ -0,0 +1,19 @@
+-- Migration: Add response_summaries table
+-- Description: Stores the per-response metrics shown in the users matrix (choice
+-- statistics and strategy-specific metrics), written when a survey is submitted,
+-- so read paths do not re-derive them from comparison_pairs on every request.
+-- Existing responses are filled by scripts/backfill_response_summaries.py.
+
+CREATE TABLE IF NOT EXISTS `response_summaries` (
+  `survey_response_id` INT NOT NULL PRIMARY KEY,
+  `user_id` VARCHAR(128) NOT NULL,
+  `survey_id` INT NOT NULL,
+  `strategy_name` VARCHAR(100) NOT NULL COMMENT 'Strategy the metrics were computed for',
+  `total_choices` INT NOT NULL,
+  `basic_stats` JSON NOT NULL COMMENT 'Output of calculate_choice_statistics',
+  `strategy_metrics` JSON NOT NULL COMMENT 'Strategy-specific matrix metrics',
+  `summary_version` INT NOT NULL DEFAULT 1 COMMENT 'RESPONSE_SUMMARY_VERSION the row was computed with',
+  `computed_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  INDEX `idx_user_survey` (`user_id`, `survey_id`),
+  FOREIGN KEY (`survey_response_id`) REFERENCES `survey_responses` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,20 @@
+-- Migration: Add users.last_activity for keyset pagination of the users list
+-- Description: get_user_ids_page ordered users by MAX(survey_responses.created_at),
+-- so every page grouped all completed responses before seeking past the cursor.
+-- last_activity stores that maximum (valid completed responses only; NULL for
+-- users without one). It is kept current by create_completed_survey_submission
+-- and mark_survey_as_completed, and the index turns each page into a range scan.
+
+ALTER TABLE `users`
+ADD COLUMN `last_activity` TIMESTAMP NULL DEFAULT NULL COMMENT 'Latest valid completed survey response',
+ADD INDEX `idx_users_last_activity` (`last_activity`, `id`);
+
+-- Backfill from existing responses
+UPDATE `users` u
+JOIN (
+    SELECT user_id, MAX(created_at) AS last_activity
+    FROM survey_responses
+    WHERE completed = TRUE AND attention_check_failed = FALSE
+    GROUP BY user_id
+) activity ON activity.user_id = u.id
+SET u.last_activity = activity.last_activity;
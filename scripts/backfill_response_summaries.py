@@ -0,0 +1,74 @@
+"""
+Fill the response_summaries table for existing survey responses.
+
+New submissions are summarized as they are stored; run this once after the
+20261016_add_response_summaries migration, and again after bumping
+RESPONSE_SUMMARY_VERSION. Only responses without a current summary are
+processed, so the script can be interrupted and re-run safely.
+
+Usage:
+    python scripts/backfill_response_summaries.py
+    python scripts/backfill_response_summaries.py --batch-size 200 --limit 1000
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app import create_app  # noqa: E402
+from database.queries import (  # noqa: E402
+    get_response_ids_missing_summaries,
+    refresh_response_summaries,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Responses summarized per transaction (default: 500)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Stop after this many responses (default: all)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = _parse_args()
+    if args.batch_size < 1:
+        logger.error("--batch-size must be positive")
+        return 1
+
+    app = create_app()
+    written = 0
+    with app.test_request_context():
+        response_ids = get_response_ids_missing_summaries(limit=args.limit)
+        logger.info(f"{len(response_ids)} responses need a summary")
+
+        for start in range(0, len(response_ids), args.batch_size):
+            batch = response_ids[start : start + args.batch_size]
+            stored = refresh_response_summaries(batch)
+            if stored == 0:
+                logger.error(f"Batch starting at response {batch[0]} failed")
+                return 1
+            written += stored
+            logger.info(f"Summarized {written} of {len(response_ids)} responses")
+
+    logger.info(f"Done: {written} response summaries written")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Precompute comparison pairs for every ideal vector of a survey.
+
+Only rank-based surveys (deterministic strategies) can be precomputed. The
+artifact is written to PRECOMPUTED_PAIRS_DIR (or --output) and is picked up
+by the app without a restart; it is ignored automatically if the survey's
+pair generation config or the pair generation code changes.
+
+Usage:
+    python scripts/precompute_pairs.py --survey-id 12
+    python scripts/precompute_pairs.py --survey-id 12 --workers 8 --output /srv/pairs
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app import create_app  # noqa: E402
+from application.services.precomputed_pairs import (  # noqa: E402
+    artifact_path,
+    precompute_survey_pairs,
+)
+from database.queries import (  # noqa: E402
+    get_subjects,
+    get_survey_pair_generation_config,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--survey-id", type=int, required=True)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: number of CPUs; 1 runs in-process)",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Artifact directory (default: PRECOMPUTED_PAIRS_DIR)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = _parse_args()
+
+    output_path = artifact_path(args.survey_id, args.output)
+    if output_path is None:
+        logger.error("Set PRECOMPUTED_PAIRS_DIR or pass --output")
+        return 1
+
+    app = create_app()
+    with app.test_request_context():
+        config = get_survey_pair_generation_config(args.survey_id)
+        num_subjects = len(get_subjects(args.survey_id))
+
+    if not config or not num_subjects:
+        logger.error(f"Survey {args.survey_id} not found or inactive")
+        return 1
+
+    try:
+        summary = precompute_survey_pairs(
+            args.survey_id,
+            config,
+            num_subjects,
+            output_path,
+            workers=args.workers,
+        )
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+
+    logger.info(
+        f"Wrote {summary['written']} of {summary['vectors']} vectors "
+        f"to {summary['path']} in {summary['seconds']}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
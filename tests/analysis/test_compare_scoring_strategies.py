@@ -0,0 +1,38 @@
+import contextlib
+import csv
+import io
+from unittest.mock import patch
+
+from analysis import compare_scoring_strategies as scoring
+from application.services.algorithms.utility_models import (
+    L1UtilityModel,
+    LeontiefUtilityModel,
+)
+
+MODEL_PAIRS = [(L1UtilityModel, LeontiefUtilityModel, "L1 vs Leontief", 10)]
+
+
+def test_batch_matches_single_comparison(tmp_path):
+    """Batch rows agree with run_comparison and share one ranking per case."""
+    vectors = [(50, 30, 20), (25, 25, 25, 25)]
+    output = tmp_path / "results.csv"
+
+    with patch.object(
+        scoring,
+        "_compute_valid_pair_arrays",
+        wraps=scoring._compute_valid_pair_arrays,
+    ) as compute:
+        rows = scoring.run_batch(vectors, MODEL_PAIRS, str(output), workers=1)
+
+    assert compute.call_count == len(vectors)
+    for vector, row in zip(vectors, rows):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = scoring.run_comparison(vector, *MODEL_PAIRS[0])
+        assert row["n_valid"] == expected["n_valid"]
+        assert row["min_jaccard"] == expected["min_jaccard"]
+        assert row["verdict"] == expected["verdict"]
+
+    with open(output, newline="", encoding="utf-8") as f:
+        table = list(csv.DictReader(f))
+    assert [r["vector"] for r in table] == [str(v) for v in vectors]
+    assert list(table[0]) == scoring.BATCH_COLUMNS
@@ -4,14 +4,18 @@ from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
+import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from analysis.survey_analysis import (
     generate_survey_optimization_stats,
     summarize_stats_by_survey,
+    update_incremental,
+    write_columnar_exports,
 )
-from analysis.utils import get_all_completed_survey_responses
+from analysis.utils import get_all_completed_survey_responses, load_columnar
+from analysis.utils.columnar_utils import columnar_dataset_path
 
 
 @patch("analysis.utils.analysis_utils.process_survey_responses")
@@ -79,13 +83,14 @@ def test_summarize_stats_by_survey():
     assert summary_row["equal_percentage"] == 0.0
 
 
+@patch("analysis.survey_analysis.write_watermark")
 @patch("analysis.survey_analysis.get_all_completed_survey_responses")
 @patch("analysis.survey_analysis.generate_survey_optimization_stats")
 @patch("analysis.survey_analysis.summarize_stats_by_survey")
 @patch("analysis.survey_analysis.save_dataframe_to_csv")
-def test_main(mock_save, mock_summarize, mock_generate, mock_get):
+def test_main(mock_save, mock_summarize, mock_generate, mock_get, mock_watermark):
     """Test that the main function calls all expected functions and saves three DataFrames."""
-    mock_get.return_value = pd.DataFrame({"dummy": [1, 2, 3]})
+    mock_get.return_value = pd.DataFrame({"survey_response_id": [1, 2, 3]})
     mock_generate.return_value = pd.DataFrame({"stats": [4, 5, 6]})
     mock_summarize.return_value = pd.DataFrame({"summary": [7, 8, 9]})
 
@@ -99,3 +104,149 @@ def test_main(mock_save, mock_summarize, mock_generate, mock_get):
     assert (
         mock_save.call_count == 3
     )  # Called three times for three different DataFrames
+    mock_watermark.assert_called_once_with(3)
+
+
+STATS = pd.DataFrame(
+    {
+        "survey_id": [1, 1, 2, 2],
+        "user_id": [101, 102, 103, 104],
+        "num_of_answers": [10, 10, 10, 10],
+        "sum_optimized": [6, 5, 7, 5],
+        "ratio_optimized": [4, 5, 3, 5],
+        "result": ["sum", "ratio", "sum", "equal"],
+    }
+)
+
+
+@pytest.fixture
+def analysis_csvs(tmp_path):
+    """Analysis CSVs holding the first two responses, at watermark 2."""
+    paths = {
+        name: str(tmp_path / f"{name}.csv")
+        for name in ("RESPONSES_CSV", "OPTIMIZATION_STATS_CSV", "SUMMARY_CSV")
+    }
+    pd.DataFrame({"survey_response_id": [1, 2], "survey_id": [1, 1]}).to_csv(
+        paths["RESPONSES_CSV"], index=False
+    )
+    STATS.iloc[:2].to_csv(paths["OPTIMIZATION_STATS_CSV"], index=False)
+    summarize_stats_by_survey(STATS.iloc[:2]).to_csv(paths["SUMMARY_CSV"], index=False)
+    with patch.multiple("analysis.survey_analysis", **paths):
+        yield paths
+
+
+def _run_incremental(fetched_ids, watermark=2):
+    """Run update_incremental against responses `fetched_ids` from the DB."""
+    fetched = pd.DataFrame(
+        {"survey_response_id": fetched_ids, "survey_id": [2] * len(fetched_ids)}
+    )
+    with (
+        patch("analysis.survey_analysis.read_watermark", return_value=watermark),
+        patch("analysis.survey_analysis.write_watermark") as mock_watermark,
+        patch(
+            "analysis.survey_analysis.get_all_completed_survey_responses",
+            return_value=fetched,
+        ) as mock_get,
+        patch(
+            "analysis.survey_analysis.generate_survey_optimization_stats",
+            side_effect=lambda df: STATS.iloc[2 : 2 + len(df)].reset_index(drop=True),
+        ),
+    ):
+        added = update_incremental()
+    return added, mock_get, mock_watermark
+
+
+def test_update_incremental_fetches_only_new_responses(analysis_csvs):
+    added, mock_get, mock_watermark = _run_incremental([3, 4])
+
+    assert added == 2
+    mock_get.assert_called_once_with(None, after_response_id=0)
+    mock_watermark.assert_called_once_with(4)
+    assert len(pd.read_csv(analysis_csvs["RESPONSES_CSV"])) == 4
+    assert len(pd.read_csv(analysis_csvs["OPTIMIZATION_STATS_CSV"])) == 4
+    summary = pd.read_csv(analysis_csvs["SUMMARY_CSV"])
+    assert summary.iloc[-1]["total_survey_responses"] == 4
+
+
+def test_update_incremental_is_idempotent(analysis_csvs):
+    """A run interrupted before the watermark can be repeated safely, and
+    responses already in the CSVs are not added again."""
+    with (
+        patch(
+            "analysis.survey_analysis.append_dataframe_to_csv",
+            side_effect=OSError("disk full"),
+        ),
+        pytest.raises(OSError),
+    ):
+        _run_incremental([3, 4])
+
+    # The retry also sees a response that committed late, below the watermark
+    added, _, mock_watermark = _run_incremental([1, 2, 3, 4], watermark=2)
+    assert added == 2
+    mock_watermark.assert_called_once_with(4)
+
+    added, _, mock_watermark = _run_incremental([1, 2, 3, 4], watermark=4)
+    assert added == 0
+    mock_watermark.assert_not_called()
+
+    responses = pd.read_csv(analysis_csvs["RESPONSES_CSV"])
+    assert responses["survey_response_id"].tolist() == [1, 2, 3, 4]
+    assert len(pd.read_csv(analysis_csvs["OPTIMIZATION_STATS_CSV"])) == 4
+    summary = pd.read_csv(analysis_csvs["SUMMARY_CSV"])
+    assert summary.iloc[-1]["total_answers"] == 40
+
+
+@patch("analysis.survey_analysis.write_watermark")
+@patch("analysis.survey_analysis.save_dataframe_to_csv")
+@patch("analysis.survey_analysis.get_all_completed_survey_responses")
+def test_main_without_responses_records_watermark(mock_get, mock_save, mock_watermark):
+    mock_get.return_value = pd.DataFrame()
+
+    from analysis.survey_analysis import main
+
+    main()
+
+    mock_save.assert_not_called()
+    mock_watermark.assert_called_once_with(0)
+
+
+def test_columnar_export_failure_keeps_csv_state(tmp_path):
+    """A failing columnar export is logged and removes the partial datasets."""
+    responses = pd.DataFrame(
+        {
+            "survey_response_id": [1, 2],
+            "user_id": ["u1", "u2"],
+            "survey_id": [1, 2],
+            "optimal_allocation": [[50, 30, 20], [40, 30, 20, 10]],
+            "comparisons": [
+                [
+                    {
+                        "pair_number": 1,
+                        "user_choice": 1,
+                        "option_1": [40, 40, 20],
+                        "option_2": [60, 20, 20],
+                    }
+                ],
+                [
+                    {
+                        "pair_number": 1,
+                        "user_choice": 2,
+                        "option_1": [25, 25, 25, 25],
+                        "option_2": [40, 20, 20, 20],
+                    }
+                ],
+            ],
+        }
+    )
+    directory = str(tmp_path)
+
+    # Surveys with different subject counts are stored together
+    write_columnar_exports(responses, STATS, STATS, directory=directory)
+    pairs = load_columnar(columnar_dataset_path(directory, "pairs"))
+    assert pairs["option_1"].tolist() == [[40, 40, 20], [25, 25, 25, 25]]
+
+    with patch(
+        "analysis.survey_analysis.write_columnar", side_effect=OSError("disk full")
+    ):
+        write_columnar_exports(responses, STATS, STATS, directory=directory)
+    assert not os.path.exists(os.path.join(directory, "columnar"))
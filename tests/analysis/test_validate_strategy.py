@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+import pytest
+
+from analysis import validate_strategy
+from analysis.validate_strategy import (
+    generate_all_valid_user_vectors,
+    run_robustness_sweep,
+    summarize_robustness,
+)
+
+STRATEGY = "l1_vs_leontief_rank_comparison"
+
+
+def test_generate_all_valid_user_vectors():
+    vectors = generate_all_valid_user_vectors(3)
+
+    assert len(vectors) == 228
+    assert (100, 0, 0) not in vectors
+    assert all(sum(v) == 100 for v in generate_all_valid_user_vectors(5, step=25))
+
+
+def test_robustness_sweep_streams_and_resumes(tmp_path):
+    """Finished vectors are read back from the results file, not recomputed."""
+    output = tmp_path / "sweep.jsonl"
+    vectors = [(50, 30, 20), (0, 10, 90)]
+
+    records = run_robustness_sweep(
+        STRATEGY, workers=1, output_path=output, vectors=vectors
+    )
+    assert [tuple(r["vector"]) for r in records] == vectors
+    assert all(r["status"] == "ok" and r["pairs"] == 10 for r in records)
+
+    # Simulate an interrupted write of a third vector
+    with open(output, "a", encoding="utf-8") as f:
+        f.write('{"vector": [10, 10')
+
+    with patch.object(
+        validate_strategy,
+        "_evaluate_user_vector",
+        wraps=validate_strategy._evaluate_user_vector,
+    ) as evaluate:
+        records = run_robustness_sweep(
+            STRATEGY, workers=1, output_path=output, vectors=vectors + [(10, 10, 80)]
+        )
+
+    assert evaluate.call_count == 1
+    assert len(records) == 3
+    assert len(output.read_text().splitlines()) == 3
+    assert summarize_robustness(records)["ok"] == 3
+
+
+def test_robustness_sweep_requires_rank_strategy(tmp_path):
+    with pytest.raises(ValueError):
+        run_robustness_sweep(
+            "l1_vs_leontief_comparison", workers=1, output_path=tmp_path / "x.jsonl"
+        )
+
+
+def test_rank_space_locates_strategy_pairs():
+    pool, _, _, ranks_a, ranks_b, pairs = validate_strategy._rank_space(
+        STRATEGY, (50, 30, 20), 10
+    )
+
+    assert len(pairs) == 10
+    assert len(ranks_a) == len(ranks_b) == len(pool)
+    for a, b in pairs:
+        assert ranks_a[a] > ranks_a[b]
+        assert ranks_b[b] > ranks_b[a]
+
+
+@pytest.mark.parametrize(
+    "analyze, figure",
+    [
+        (validate_strategy.analyze_single_user, "selection_logic_comparison.png"),
+        (validate_strategy.analyze_logic_comparison, "logic_comparison.png"),
+    ],
+)
+def test_single_vector_modes_render(tmp_path, analyze, figure):
+    with patch.object(validate_strategy, "OUTPUT_DIR", tmp_path):
+        analyze((50, 30, 20), STRATEGY, 10)
+
+    assert (tmp_path / figure).exists()
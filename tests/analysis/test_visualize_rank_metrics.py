@@ -0,0 +1,96 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from analysis import visualize_rank_metrics as viz
+from application.services.pair_generation import StrategyRegistry
+
+
+def _pair_vectors(pair):
+    return tuple(tuple(value) for key, value in pair.items() if key != "__metadata__")
+
+
+def test_metrics_round_trip_through_cache(tmp_path):
+    """Metrics are computed by the registered strategy once, then read back."""
+    user_vector = (60, 30, 10)
+
+    with (
+        patch.object(viz, "METRICS_CACHE_DIR", tmp_path),
+        patch.object(
+            viz, "compute_vector_metrics", wraps=viz.compute_vector_metrics
+        ) as compute,
+    ):
+        first = viz.load_vector_metrics(user_vector)
+        second = viz.load_vector_metrics(user_vector)
+
+    assert compute.call_count == 1
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    np.testing.assert_array_equal(second["vector_pool"], first["vector_pool"])
+    np.testing.assert_allclose(second["l1_norm"], first["l1_norm"])
+    np.testing.assert_allclose(second["discrepancies"], first["discrepancies"])
+    assert second["user_vector"] == user_vector
+    assert second["relaxation_levels"] == first["relaxation_levels"]
+    assert second["pairs_by_level"] == first["pairs_by_level"]
+
+    # The cached pairs are the strategy's own pairs, located in the pool
+    strategy = StrategyRegistry.get_strategy(viz.STRATEGY_NAME)
+    expected = [
+        _pair_vectors(pair)
+        for pair in strategy.generate_pairs(user_vector, viz.NUM_PAIRS, 3)
+    ]
+    pool = second["vector_pool"]
+    cached = [
+        (tuple(int(v) for v in pool[a]), tuple(int(v) for v in pool[b]))
+        for pairs in second["pairs_by_level"].values()
+        for a, b, _ in pairs
+    ]
+    assert cached == expected
+    assert len(cached) == viz.NUM_PAIRS
+
+    # Type A vectors rank better on L1, Type B on Leontief
+    for a, b, metadata in second["pairs_by_level"][1]:
+        assert second["l1_norm"][a] > second["l1_norm"][b]
+        assert second["leontief_norm"][b] > second["leontief_norm"][a]
+        assert metadata["balance_ratio"] > 0
+
+
+def test_strategy_change_invalidates_cache(tmp_path):
+    with patch.object(viz, "METRICS_CACHE_DIR", tmp_path):
+        before = viz._metrics_cache_path((60, 30, 10))
+        with patch.object(viz, "NUM_PAIRS", viz.NUM_PAIRS + 1):
+            after = viz._metrics_cache_path((60, 30, 10))
+
+    assert before != after
+
+
+def test_invalid_vector_is_rejected():
+    with pytest.raises(ValueError, match="sum to 100"):
+        viz.compute_vector_metrics((50, 30, 10))
+
+
+def test_render_modes_from_computed_metrics(tmp_path):
+    """Every mode renders from metrics computed by the real strategy."""
+    with (
+        patch.object(viz, "OUTPUT_DIR", tmp_path),
+        patch.object(viz, "METRICS_CACHE_DIR", tmp_path / "metrics_cache"),
+    ):
+        rendered = viz._map(
+            viz._render_mode,
+            [
+                ("basic", (60, 30, 10), True),
+                ("pairs", (60, 30, 10), True),
+                ("coverage", (60, 30, 10), True),
+                ("comparison", (60, 30, 10), True),
+            ],
+            workers=1,
+        )
+
+    assert rendered == ["basic", "pairs", "coverage", "comparison"]
+    for figure in (
+        "03_pair_quality_dashboard.png",
+        "04_simplex_coverage_validation.png",
+        "05_multi_vector_comparison.png",
+    ):
+        assert (tmp_path / figure).exists()
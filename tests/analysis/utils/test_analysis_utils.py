@@ -5,6 +5,7 @@ import pytest
 
 from analysis.utils.analysis_utils import (
     calculate_optimization_stats,
+    calculate_optimization_stats_frame,
     is_sum_optimized,
     process_survey_responses,
 )
@@ -165,3 +166,35 @@ def test_calculate_optimization_stats():
     assert result2["sum_optimized"] == 0
     assert result2["ratio_optimized"] == 2
     assert result2["result"] == "ratio"
+
+
+def test_calculate_optimization_stats_frame_matches_row_wise():
+    """The vectorized stats agree with calculate_optimization_stats per row."""
+
+    def pair(option_1, option_2, user_choice):
+        return {"option_1": option_1, "option_2": option_2, "user_choice": user_choice}
+
+    df = pd.DataFrame(
+        {
+            "optimal_allocation": [[50, 30, 20], [60, 40], [50, 30, 20]],
+            "comparisons": [
+                [
+                    pair([45, 30, 25], [40, 35, 25], 1),
+                    pair([20, 50, 30], [45, 35, 20], 1),
+                ],
+                [pair([50, 50], [70, 30], 2)],
+                [pair([40, 30, 30], [60, 30, 10], 1)],
+            ],
+        },
+        index=[10, 11, 12],
+    )
+
+    expected = df.apply(calculate_optimization_stats, axis=1)
+    result = calculate_optimization_stats_frame(df)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result["result"].tolist() == ["equal", "sum", "ratio"]
+
+    df.loc[12, "comparisons"][0]["user_choice"] = 3
+    with pytest.raises(ValueError):
+        calculate_optimization_stats_frame(df)
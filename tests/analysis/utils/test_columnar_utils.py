@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.utils.analysis_utils import load_data
+from analysis.utils.columnar_utils import (
+    columnar_dataset_path,
+    flatten_survey_responses,
+    load_columnar,
+    read_columns,
+    write_columnar,
+)
+
+
+@pytest.fixture
+def pairs_df():
+    return pd.DataFrame(
+        {
+            "survey_response_id": [3, 1, 2, 4],
+            "user_id": ["u3", "u1", "u2", None],
+            "survey_id": [2, 1, 1, 2],
+            "user_choice": [1, 2, 1, 2],
+            "option_1": [[10, 90], [50, 50], [30, 70], [0, 100]],
+        }
+    )
+
+
+def test_write_and_read_roundtrip(tmp_path, pairs_df):
+    """Vectors become narrow integer matrices, rows are grouped by survey."""
+    path = str(tmp_path / "pairs")
+    write_columnar(pairs_df, path)
+
+    arrays = read_columns(path)
+
+    assert arrays["option_1"].shape == (4, 2)
+    assert arrays["option_1"].dtype == np.int8
+    assert isinstance(arrays["option_1"], np.memmap)
+    assert arrays["survey_id"].tolist() == [1, 1, 2, 2]
+    assert arrays["survey_response_id"].tolist() == [1, 2, 3, 4]
+    assert arrays["user_id"].tolist() == ["u1", "u2", "u3", ""]
+
+
+def test_read_selected_columns_and_surveys(tmp_path, pairs_df):
+    path = str(tmp_path / "pairs")
+    write_columnar(pairs_df, path)
+
+    arrays = read_columns(path, columns=["option_1"], survey_ids=[2], mmap=False)
+
+    assert list(arrays) == ["option_1"]
+    assert arrays["option_1"].tolist() == [[10, 90], [0, 100]]
+    assert read_columns(path, ["option_1"], survey_ids=[99])["option_1"].shape == (
+        0,
+        2,
+    )
+    with pytest.raises(ValueError):
+        read_columns(path, columns=["missing"])
+
+
+def test_append_adds_part(tmp_path, pairs_df):
+    path = str(tmp_path / "pairs")
+    write_columnar(pairs_df.iloc[:2], path)
+    write_columnar(pairs_df.iloc[2:], path, append=True)
+
+    df = load_columnar(path, survey_ids=[1])
+
+    assert df["survey_response_id"].tolist() == [1, 2]
+    assert df["option_1"].tolist() == [[50, 50], [30, 70]]
+    assert len(load_columnar(path)) == 4
+
+    # A plain write replaces every part
+    write_columnar(pairs_df.iloc[:1], path)
+    assert len(load_columnar(path)) == 1
+
+
+def test_write_rejects_nested_and_missing_vectors(tmp_path):
+    with pytest.raises(ValueError):
+        write_columnar(
+            pd.DataFrame({"survey_id": [1], "comparisons": [[{"pair": 1}]]}),
+            str(tmp_path / "nested"),
+        )
+    with pytest.raises(ValueError):
+        write_columnar(
+            pd.DataFrame({"survey_id": [1, 1], "v": [[1, 2], None]}),
+            str(tmp_path / "missing"),
+        )
+
+
+def test_flatten_and_load_data(tmp_path):
+    """load_data reads the columnar datasets, filtered by survey."""
+    responses = pd.DataFrame(
+        {
+            "survey_response_id": [1, 2],
+            "user_id": ["u1", "u2"],
+            "survey_id": [1, 2],
+            "response_created_at": pd.to_datetime(["2025-01-01", "2025-01-02"]),
+            "optimal_allocation": [[50, 50], [20, 80]],
+            "comparisons": [
+                [
+                    {
+                        "pair_number": 1,
+                        "user_choice": 1,
+                        "option_1": [40, 60],
+                        "option_2": [60, 40],
+                    }
+                ],
+                [
+                    {
+                        "pair_number": 1,
+                        "user_choice": 2,
+                        "option_1": [10, 90],
+                        "option_2": [30, 70],
+                    },
+                    {
+                        "pair_number": 2,
+                        "user_choice": 1,
+                        "option_1": [20, 80],
+                        "option_2": [0, 100],
+                    },
+                ],
+            ],
+        }
+    )
+    directory = str(tmp_path)
+    write_columnar(
+        flatten_survey_responses(responses), columnar_dataset_path(directory, "pairs")
+    )
+    write_columnar(
+        pd.DataFrame({"survey_id": [1, 2], "user_id": ["u1", "u2"]}),
+        columnar_dataset_path(directory, "optimization"),
+    )
+    write_columnar(
+        pd.DataFrame({"survey_id": [1, 2, "Total"], "unique_users": [1, 1, 2]}),
+        columnar_dataset_path(directory, "summary"),
+    )
+
+    data = load_data(
+        directory,
+        fmt="columnar",
+        columns={"pairs": ["pair_number", "optimal_allocation"]},
+        survey_ids=[2],
+    )
+
+    assert data["pairs"]["pair_number"].tolist() == [1, 2]
+    assert data["pairs"]["optimal_allocation"].tolist() == [[20, 80], [20, 80]]
+    assert data["optimization"]["user_id"].tolist() == ["u2"]
+    assert data["summary"]["unique_users"].tolist() == [1]
+
+
+def test_vectors_of_different_dimensions(tmp_path):
+    """Surveys with different subject counts are padded and trimmed back."""
+    path = str(tmp_path / "pairs")
+    mixed = pd.DataFrame(
+        {"survey_id": [1, 2], "option_1": [[50, 30, 20], [40, 30, 20, 10]]}
+    )
+    write_columnar(mixed, path)
+    write_columnar(
+        pd.DataFrame({"survey_id": [3], "option_1": [[60, 40]]}), path, append=True
+    )
+
+    arrays = read_columns(path, ["option_1"])
+
+    assert arrays["option_1"].shape == (3, 4)
+    assert arrays["option_1_length"].tolist() == [3, 4, 2]
+    assert read_columns(path, ["option_1"], survey_ids=[2])["option_1"].shape == (
+        1,
+        4,
+    )
+    assert load_columnar(path)["option_1"].tolist() == [
+        [50, 30, 20],
+        [40, 30, 20, 10],
+        [60, 40],
+    ]
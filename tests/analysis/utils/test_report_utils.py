@@ -1,9 +1,15 @@
-from datetime import datetime
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
 from flask import Flask
 
+from analysis.utils import report_utils
+from analysis.utils.report_utils import (
+    ensure_fresh_csvs,
+    read_watermark,
+    write_watermark,
+)
+
 # Create a test Flask app and context
 app = Flask(__name__)
 
@@ -15,58 +21,71 @@ def app_context():
         yield
 
 
-# Mock the entire survey_analysis module
-mock_survey_analysis = Mock()
-mock_survey_analysis.main = Mock()
+@pytest.fixture
+def state(tmp_path):
+    """Keep CSVs and the watermark file in a temporary directory."""
+    csv_path = tmp_path / "test.csv"
+    with (
+        patch.object(report_utils, "CSV_PATHS", [str(csv_path)]),
+        patch.object(report_utils, "ANALYSIS_STATE_PATH", str(tmp_path / "state.json")),
+    ):
+        yield csv_path
+
+
+def test_watermark_round_trip(state):
+    assert read_watermark() is None
+    write_watermark(42)
+    assert read_watermark() == 42
 
 
-@patch.dict("sys.modules", {"analysis.survey_analysis": mock_survey_analysis})
-def test_ensure_fresh_csvs_with_no_files(app_context):
-    """Test when no CSV files exist."""
+def test_ensure_fresh_csvs_without_watermark_rebuilds(app_context, state):
+    """Missing CSVs or watermark trigger the full pipeline."""
     with (
-        patch("analysis.utils.report_utils.CSV_PATHS", ["test.csv"]),
-        patch("os.path.exists", return_value=False),
-        patch(
-            "database.queries.execute_query", return_value=[{"latest": datetime.now()}]
-        ),
+        patch("database.queries.execute_query", return_value={"latest_id": 7}),
+        patch("analysis.survey_analysis.main") as mock_main,
+        patch("analysis.survey_analysis.update_incremental") as mock_update,
     ):
-        from analysis.utils.report_utils import ensure_fresh_csvs
+        assert ensure_fresh_csvs() is True
 
-        result = ensure_fresh_csvs()
-        assert result is True
-        mock_survey_analysis.main.assert_called_once()
+    mock_main.assert_called_once()
+    mock_update.assert_not_called()
 
 
-def test_ensure_fresh_csvs_with_outdated_files(app_context):
-    """Test when CSV files exist but are outdated."""
-    now = datetime.now()
+def test_ensure_fresh_csvs_with_new_responses_updates_incrementally(app_context, state):
+    state.write_text("x\n")
+    write_watermark(5)
     with (
-        patch("analysis.utils.report_utils.CSV_PATHS", ["test.csv"]),
-        patch("os.path.exists", return_value=True),
-        patch("os.path.getmtime", return_value=50),
-        patch("database.queries.execute_query", return_value=[{"latest": now}]),
+        patch("database.queries.execute_query", return_value={"latest_id": 7}),
         patch("analysis.survey_analysis.main") as mock_main,
+        patch("analysis.survey_analysis.update_incremental") as mock_update,
     ):
-        from analysis.utils.report_utils import ensure_fresh_csvs
+        assert ensure_fresh_csvs() is True
 
-        result = ensure_fresh_csvs()
-        assert result is True
-        mock_main.assert_called_once()
+    mock_update.assert_called_once()
+    mock_main.assert_not_called()
 
 
-def test_ensure_fresh_csvs_with_up_to_date_files(app_context):
-    """Test when CSV files exist and are up to date."""
-    old_time = datetime.fromtimestamp(50)
+def test_ensure_fresh_csvs_at_watermark_does_nothing(app_context, state):
+    state.write_text("x\n")
+    write_watermark(7)
     with (
-        patch("analysis.utils.report_utils.CSV_PATHS", ["test.csv"]),
-        patch("os.path.exists", return_value=True),
-        patch("os.path.getmtime", return_value=100),
-        patch("database.queries.execute_query", return_value=[{"latest": old_time}]),
+        patch("database.queries.execute_query", return_value={"latest_id": 7}),
         patch("analysis.survey_analysis.main") as mock_main,
+        patch("analysis.survey_analysis.update_incremental") as mock_update,
     ):
-        from analysis.utils.report_utils import ensure_fresh_csvs
+        assert ensure_fresh_csvs() is False
+
+    mock_main.assert_not_called()
+    mock_update.assert_not_called()
+
 
-        result = ensure_fresh_csvs()
-        assert result is False
-        mock_main.assert_not_called()
+def test_ensure_fresh_csvs_without_responses_does_nothing(app_context, state):
+    """An analysis of zero responses (watermark 0) is not rebuilt each time."""
+    write_watermark(0)
+    with (
+        patch("database.queries.execute_query", return_value={"latest_id": 0}),
+        patch("analysis.survey_analysis.main") as mock_main,
+    ):
+        assert ensure_fresh_csvs() is False
 
+    mock_main.assert_not_called()
@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_index_route(client, sample_user_id, sample_survey_id, monkeypatch):
     """Tests the index route with valid parameters and English language."""
 
@@ -252,26 +255,26 @@ def test_download_survey_responses_csv_success(client, mocker):
     """
     Test successful CSV download for a survey with responses.
     """
-    # 1. Mock the function that gets the data to return a predictable structure
-    mock_data = {
-        "responses": [
-            {
-                "user_id": "test_user_1",
-                "survey_response_id": 101,
-                "response_created_at": "2025-09-21 12:00:00",
-                "optimal_allocation": "[50, 50]",
-                "pair_number": 1,
-                "option_1": "[45, 55]",
-                "option_2": "[55, 45]",
-                "user_choice": 1,
-                "raw_user_choice": 1,
-                "option1_strategy": "test",
-                "option2_strategy": "test",
-            }
-        ]
-    }
-    mocker.patch(
-        "application.routes.survey_responses.get_user_responses", return_value=mock_data
+    # 1. Mock the streaming query to yield a predictable row
+    rows = [
+        {
+            "user_id": "test_user_1",
+            "survey_response_id": 101,
+            "response_created_at": "2025-09-21 12:00:00",
+            "optimal_allocation": "[50, 50]",
+            "pair_number": 1,
+            "option_1": "[45, 55]",
+            "option_2": "[55, 45]",
+            "user_choice": 1,
+            "raw_user_choice": 1,
+            "option1_strategy": "test",
+            "option2_strategy": "test",
+            "generation_metadata": {"score": 12.5},
+        }
+    ]
+    mock_iter = mocker.patch(
+        "application.routes.survey_responses.iter_user_survey_choices",
+        return_value=iter(rows),
     )
 
     # 2. Make a request to the new endpoint
@@ -280,25 +283,57 @@ def test_download_survey_responses_csv_success(client, mocker):
     # 3. Assert the response is correct
     assert response.status_code == 200
     assert response.mimetype == "text/csv"
+    assert response.is_streamed
     assert (
         "attachment; filename=survey_1_responses.csv"
         in response.headers["Content-disposition"]
     )
+    mock_iter.assert_called_once_with(survey_id=1, view_filter=None)
 
     # 4. Check the content of the CSV
     csv_content = response.data.decode("utf-8")
     assert "user_id,survey_response_id,response_created_at" in csv_content
     assert "test_user_1,101,2025-09-21 12:00:00" in csv_content
+    assert ",12.5," in csv_content
+
+
+def test_download_survey_responses_csv_marks_and_aborts_failed_export(client, mocker):
+    """
+    An error while streaming writes a marker row and aborts the download.
+    """
+
+    def rows():
+        yield {"user_id": "test_user_1", "survey_response_id": 101}
+        raise RuntimeError("connection lost")
+
+    mocker.patch(
+        "application.routes.survey_responses.iter_user_survey_choices",
+        return_value=rows(),
+    )
+
+    response = client.get("/surveys/1/responses/download", buffered=False)
+    chunks = []
+    with pytest.raises(RuntimeError, match="connection lost"):
+        for chunk in response.response:
+            chunks.append(chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk)
+
+    csv_content = "".join(chunks)
+    assert "test_user_1,101" in csv_content
+    assert (
+        csv_content.rstrip()
+        .splitlines()[-1]
+        .startswith("#EXPORT_FAILED,export incomplete after 1 rows")
+    )
 
 
 def test_download_survey_responses_csv_no_data(client, mocker):
     """
     Test CSV download attempt for a survey with no responses (404).
     """
-    # 1. Mock the data-fetching function to return an empty structure
+    # 1. Mock the streaming query to yield nothing
     mocker.patch(
-        "application.routes.survey_responses.get_user_responses",
-        return_value={"responses": []},
+        "application.routes.survey_responses.iter_user_survey_choices",
+        return_value=iter([]),
     )
 
     # 2. Make the request
@@ -4,6 +4,24 @@ from test_setup import setup_test_environment
 create_app = setup_test_environment()
 
 
+@pytest.fixture(autouse=True)
+def clear_query_caches():
+    """Some query results are cached per process; start every test cold."""
+    from application.services.report_cache import REPORT_CACHE
+    from database.queries import (
+        DASHBOARD_CACHE,
+        METADATA_CACHE,
+        reset_completed_user_count,
+    )
+
+    METADATA_CACHE.invalidate()
+    DASHBOARD_CACHE.invalidate()
+    REPORT_CACHE.clear()
+    METADATA_CACHE.reset_stats()
+    reset_completed_user_count()
+    yield
+
+
 @pytest.fixture
 def app():
     """Creates test Flask app instance with application context"""
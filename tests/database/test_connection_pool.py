@@ -0,0 +1,175 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from database.pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    """Minimal stand-in for a MySQL connection."""
+
+    def __init__(self):
+        self.closed = False
+        self.rollbacks = 0
+        self.fail_ping = False
+        self.fail_rollback = False
+
+    def ping(self, reconnect=False):
+        if self.fail_ping:
+            raise ConnectionError("server has gone away")
+
+    def rollback(self):
+        if self.fail_rollback:
+            raise ConnectionError("lost connection")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def opened():
+    """Records every connection created by the pool's factory."""
+    return []
+
+
+@pytest.fixture
+def make_pool(opened):
+    def _make(**kwargs):
+        def connect():
+            conn = FakeConnection()
+            opened.append(conn)
+            return conn
+
+        return ConnectionPool(connect, **kwargs)
+
+    return _make
+
+
+def test_connection_is_reused_after_release(make_pool, opened):
+    pool = make_pool(pool_size=2, max_overflow=0)
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first
+    assert len(opened) == 1
+    # Transaction state is reset on release
+    assert first.rollbacks == 1
+
+
+def test_overflow_connections_are_closed_on_release(make_pool, opened):
+    pool = make_pool(pool_size=1, max_overflow=1)
+
+    a = pool.acquire()
+    b = pool.acquire()
+    assert pool.stats()["overflow"] == 1
+
+    pool.release(a)
+    pool.release(b)
+
+    stats = pool.stats()
+    assert stats["idle"] == 1
+    assert stats["checked_out"] == 0
+    assert sum(conn.closed for conn in opened) == 1
+
+
+def test_exhausted_pool_times_out(make_pool):
+    pool = make_pool(pool_size=1, max_overflow=0, timeout=0.05)
+    pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    stats = pool.stats()
+    assert stats["waits"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_time_seconds"] > 0
+
+
+def test_waiter_receives_released_connection(make_pool):
+    pool = make_pool(pool_size=1, max_overflow=0, timeout=2)
+    held = pool.acquire()
+    result = {}
+
+    def worker():
+        result["conn"] = pool.acquire()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.05)
+    pool.release(held)
+    thread.join(timeout=2)
+
+    assert result["conn"] is held
+    assert pool.stats()["waits"] == 1
+
+
+def test_failed_pre_ping_replaces_connection(make_pool, opened):
+    pool = make_pool(pool_size=1, pre_ping=True)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.fail_ping = True
+
+    replacement = pool.acquire()
+
+    assert replacement is not conn
+    assert conn.closed
+    assert pool.stats()["invalidated"] == 1
+
+
+def test_old_connections_are_recycled(make_pool, opened):
+    pool = make_pool(pool_size=1, recycle_seconds=10)
+    conn = pool.acquire()
+    pool.release(conn)
+
+    with patch("database.pool.time.monotonic", return_value=time.monotonic() + 60):
+        replacement = pool.acquire()
+
+    assert replacement is not conn
+    assert conn.closed
+    assert pool.stats()["recycled"] == 1
+
+
+def test_broken_connection_is_discarded_on_release(make_pool):
+    pool = make_pool(pool_size=1)
+    conn = pool.acquire()
+    conn.fail_rollback = True
+
+    pool.release(conn)
+
+    assert conn.closed
+    assert pool.stats()["idle"] == 0
+
+
+def test_invalidated_connection_is_closed_on_release(make_pool):
+    pool = make_pool(pool_size=1)
+    conn = pool.acquire()
+
+    pool.invalidate(conn)
+    pool.release(conn)
+
+    assert conn.closed
+    assert conn.rollbacks == 0
+    assert pool.stats()["idle"] == 0
+    assert pool.stats()["invalidated"] == 1
+    assert pool.acquire() is not conn
+
+
+def test_pool_resets_after_fork(make_pool, opened):
+    pool = make_pool(pool_size=2)
+    conn = pool.acquire()
+    pool.release(conn)
+
+    with patch("database.pool.os.getpid", return_value=pool.stats()["pid"] + 1):
+        child_conn = pool.acquire()
+        stats = pool.stats()
+
+    # The inherited connection must not be reused or closed by the child
+    assert child_conn is not conn
+    assert not conn.closed
+    assert stats["connections_created"] == 1
+    assert stats["checked_out"] == 1
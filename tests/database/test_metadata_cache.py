@@ -0,0 +1,99 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from database.cache import TTLCache
+from database.queries import (
+    METADATA_CACHE,
+    create_survey,
+    get_metadata_cache_stats,
+    get_survey_instructions,
+    get_survey_pair_generation_config,
+    get_survey_suitability_rules,
+    invalidate_survey_metadata_cache,
+)
+
+CONFIG = {
+    "strategy": "l1_vs_l2_rank_comparison",
+    "pair_instructions": {"en": "Hi", "he": "Hi"},
+}
+
+
+@pytest.fixture
+def mock_execute():
+    def respond(query, params=None, fetch_one=False):
+        if "AS survey_id" in query:
+            return {
+                "survey_id": params[0],
+                "story_code": "story",
+                "pair_generation_config": json.dumps(CONFIG),
+                "suitability_rules": None,
+                "awareness_pts": None,
+                "title": json.dumps({"he": "Title"}),
+                "description": json.dumps({"he": "Description"}),
+                "subjects": json.dumps([{"he": "A"}, {"he": "B"}]),
+            }
+        if "pair_generation_config" in query:
+            return {"pair_generation_config": json.dumps(CONFIG)}
+        if "suitability_rules" in query:
+            return {"suitability_rules": None}
+        return 1
+
+    with patch("database.queries.execute_query", side_effect=respond) as mock:
+        yield mock
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    now = [0.0]
+    cache = TTLCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    now[0] = 11
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cached_values_are_copies():
+    cache = TTLCache()
+    cache.put("k", {"rules": [1]})
+    cache.get("k")["rules"].append(2)
+
+    assert cache.get("k") == {"rules": [1]}
+
+
+def test_warm_lookups_make_no_queries(mock_execute, test_request_context):
+    assert get_survey_pair_generation_config(4) == CONFIG
+    assert get_survey_pair_generation_config(4) == CONFIG
+    # Instructions are read from the survey bundle row
+    assert get_survey_instructions(4) == "Hi"
+    assert get_survey_instructions(4) == "Hi"
+
+    assert mock_execute.call_count == 2
+    assert get_metadata_cache_stats()["hits"] == 2
+
+
+def test_missing_rows_are_not_cached(mock_execute):
+    mock_execute.side_effect = None
+    mock_execute.return_value = None
+
+    get_survey_suitability_rules(4)
+    get_survey_suitability_rules(4)
+
+    assert mock_execute.call_count == 2
+
+
+def test_create_survey_invalidates(mock_execute):
+    get_survey_pair_generation_config(4)
+    get_survey_pair_generation_config(5)
+    assert invalidate_survey_metadata_cache(4) == 1
+
+    create_survey("story", CONFIG)
+
+    assert METADATA_CACHE.stats()["size"] == 0
@@ -0,0 +1,118 @@
+"""
+EXPLAIN-based regression tests for the hot report queries.
+
+The SQL is captured from the real query functions and explained against the
+test database, so a query change (or a missing index migration) that makes
+MySQL scan survey_responses or comparison_pairs in full fails here. Requires
+the test database; skipped when it is unreachable.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from database import queries
+from database.db import execute_query
+
+# Tables whose full scans we guard against, by name and by query alias
+GUARDED_TABLES = {"survey_responses", "sr", "comparison_pairs", "cp"}
+
+HOT_QUERIES = {
+    "choices_all": lambda: queries.retrieve_user_survey_choices(),
+    "choices_survey": lambda: queries.retrieve_user_survey_choices(survey_id=1),
+    "choices_users": lambda: queries.retrieve_user_survey_choices(
+        user_ids=["u1", "u2"]
+    ),
+    "choices_page": lambda: queries.retrieve_user_survey_choices(limit=20, offset=40),
+    "user_ids_by_activity": lambda: queries.get_paginated_user_ids(2, 20),
+    "user_ids_by_id": lambda: queries.get_paginated_user_ids(
+        1, 20, sort_by="user_id", sort_order="asc"
+    ),
+    "user_ids_after_cursor": lambda: queries.get_user_ids_page(
+        20, after=queries.encode_user_cursor("2025-01-01 00:00:00", "u1")
+    ),
+    "participation_overview": lambda: queries.get_user_participation_overview(),
+    "participation_users": lambda: queries.get_user_participation_overview(
+        ["u1", "u2"]
+    ),
+    "latest_timestamp": lambda: queries.get_latest_survey_timestamp(),
+    "report_version": lambda: queries.get_survey_response_version(1),
+}
+
+
+# EXPLAIN access types that read every row: a table scan or a full index scan
+FULL_SCAN_TYPES = {"ALL", "index"}
+
+
+def _full_scans(plan):
+    """Tables of an EXPLAIN result that are read with a full table or index scan."""
+    return [
+        row["table"]
+        for row in plan
+        if row.get("table") in GUARDED_TABLES and row.get("type") in FULL_SCAN_TYPES
+    ]
+
+
+def _capture_queries(call):
+    """SELECT statements (with params) issued by `call`, without running them."""
+    captured = []
+
+    def record(query, params=None, fetch_one=False):
+        captured.append((query, params))
+        # Single-row answers let the user count succeed so paging continues
+        return {"max_id": 1, "total_count": 1, "new_users": 0} if fetch_one else []
+
+    with patch("database.queries.execute_query", side_effect=record):
+        call()
+    return [(q, p) for q, p in captured if q.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.fixture(scope="module")
+def db_app():
+    from app import create_app
+    from config import TestConfig
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        if execute_query("SELECT 1 AS ok") is None:
+            pytest.skip("Test database is not available")
+        for table in ("survey_responses", "comparison_pairs"):
+            execute_query(f"ANALYZE TABLE {table}")
+        yield app
+
+
+def test_full_scan_detection():
+    plan = [
+        {"table": "<derived2>", "type": "ALL"},
+        {"table": "sr", "type": "ref", "key": "idx_sr_report_users"},
+        {"table": "cp", "type": "ALL", "key": None},
+        {"table": "survey_responses", "type": "index", "key": "PRIMARY"},
+    ]
+
+    assert _full_scans(plan) == ["cp", "survey_responses"]
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_indexes(db_app, name):
+    statements = _capture_queries(HOT_QUERIES[name])
+    assert statements, f"{name} issued no query"
+
+    for query, params in statements:
+        plan = execute_query(f"EXPLAIN {query}", params)
+        assert plan is not None, f"EXPLAIN failed for {name}"
+        assert _full_scans(plan) == [], f"{name} falls back to a full scan: {plan}"
+
+
+def test_explain_and_analyze_return_rows():
+    """EXPLAIN/ANALYZE are fetched like SELECT instead of being committed."""
+    connection = MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    cursor.fetchall.return_value = [{"table": "sr", "type": "ref"}]
+
+    with patch("database.db.get_db", return_value=connection):
+        assert execute_query("EXPLAIN SELECT 1") == [{"table": "sr", "type": "ref"}]
+        assert execute_query("ANALYZE TABLE survey_responses") == [
+            {"table": "sr", "type": "ref"}
+        ]
+
+    connection.commit.assert_not_called()
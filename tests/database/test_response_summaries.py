@@ -0,0 +1,116 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from database.queries import (
+    RESPONSE_SUMMARY_VERSION,
+    get_user_survey_performance_data,
+    refresh_response_summaries,
+)
+
+CONFIG = {"strategy": "l1_vs_l2_comparison"}
+
+
+def _choice(survey_response_id, pair_number, user_choice):
+    return {
+        "survey_response_id": survey_response_id,
+        "user_id": f"u{survey_response_id}",
+        "survey_id": 1,
+        "optimal_allocation": json.dumps([50, 30, 20]),
+        "pair_number": pair_number,
+        "option_1": json.dumps([60, 20, 20]),
+        "option_2": json.dumps([40, 40, 20]),
+        "user_choice": user_choice,
+        "option1_strategy": "sum",
+        "option2_strategy": "root_sum_squared",
+    }
+
+
+def _response(survey_response_id, summary=None):
+    row = {
+        "survey_response_id": survey_response_id,
+        "user_id": f"u{survey_response_id}",
+        "survey_id": 1,
+        "optimal_allocation": json.dumps([50, 30, 20]),
+        "response_created_at": None,
+        "summary_strategy_name": None,
+        "basic_stats": None,
+        "strategy_metrics": None,
+        "summary_version": None,
+    }
+    if summary:
+        row.update(
+            summary_strategy_name="l1_vs_l2_comparison",
+            basic_stats=json.dumps(summary[0]),
+            strategy_metrics=json.dumps(summary[1]),
+            summary_version=RESPONSE_SUMMARY_VERSION,
+        )
+    return row
+
+
+@pytest.fixture
+def config():
+    with patch(
+        "database.queries.get_survey_pair_generation_config", return_value=CONFIG
+    ):
+        yield
+
+
+def test_refresh_upserts_one_row_per_response(config):
+    connection = MagicMock()
+    choices = [_choice(7, 1, 1), _choice(7, 2, 2), _choice(8, 1, 1)]
+
+    with (
+        patch(
+            "database.queries.retrieve_user_survey_choices", return_value=choices
+        ) as mock_retrieve,
+        patch("database.db.get_db", return_value=connection),
+    ):
+        assert refresh_response_summaries([7, 8, 7]) == 2
+
+    mock_retrieve.assert_called_once_with(survey_response_ids=[7, 8])
+    query, rows = connection.cursor.return_value.executemany.call_args[0]
+    assert "ON DUPLICATE KEY UPDATE" in query
+    assert [row[:5] for row in rows] == [
+        (7, "u7", 1, "l1_vs_l2_comparison", 2),
+        (8, "u8", 1, "l1_vs_l2_comparison", 1),
+    ]
+    assert set(json.loads(rows[0][6])) == {"rss_percent", "sum_percent"}
+    connection.commit.assert_called_once()
+
+
+def test_performance_data_reads_summaries_and_computes_the_rest(config):
+    stored = ({"sum_percent": 75.0}, {"sum_percent": 75.0, "rss_percent": 25.0})
+    responses = [_response(7, stored), _response(8)]
+
+    with (
+        patch("database.queries.execute_query", return_value=responses),
+        patch(
+            "database.queries.retrieve_user_survey_choices",
+            return_value=[_choice(8, 1, 1)],
+        ) as mock_retrieve,
+    ):
+        data = get_user_survey_performance_data(["u7", "u8"])
+
+    mock_retrieve.assert_called_once_with(survey_response_ids=[8])
+    assert [record["user_id"] for record in data] == ["u7", "u8"]
+    assert data[0]["strategy_metrics"] == stored[1]
+    assert data[0]["ideal_budget"] == "[50, 30, 20]"
+    assert set(data[1]["strategy_metrics"]) == {"rss_percent", "sum_percent"}
+
+
+def test_summary_for_another_strategy_is_recomputed(config):
+    response = _response(7, ({}, {"option1_percent": 100.0}))
+    response["summary_strategy_name"] = "weighted_average_vector"
+
+    with (
+        patch("database.queries.execute_query", return_value=[response]),
+        patch(
+            "database.queries.retrieve_user_survey_choices",
+            return_value=[_choice(7, 1, 1)],
+        ),
+    ):
+        (record,) = get_user_survey_performance_data()
+
+    assert "option1_percent" not in record["strategy_metrics"]
@@ -0,0 +1,122 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mysql.connector import Error
+
+from application.schemas.validators import ComparisonPair, SurveySubmission
+from application.services.survey_service import SurveyService
+from database.db import transaction
+from database.queries import (
+    USER_LAST_ACTIVITY_QUERY,
+    create_completed_survey_submission,
+)
+
+
+def _pair(pair_number, **overrides):
+    pair = {
+        "pair_number": pair_number,
+        "option_1": [60, 20, 20],
+        "option_2": [40, 40, 20],
+        "user_choice": 1,
+        "raw_user_choice": 2,
+        "option1_strategy": "l1",
+        "option2_strategy": "l2",
+    }
+    pair.update(overrides)
+    return pair
+
+
+@pytest.fixture
+def connection():
+    connection = MagicMock()
+    connection.cursor.return_value.lastrowid = 42
+    with patch("database.db.get_db", return_value=connection):
+        yield connection
+
+
+def test_transaction_commits_once_on_success(connection):
+    with transaction() as cursor:
+        cursor.execute("INSERT INTO users (id) VALUES (%s)", ("u1",))
+
+    connection.commit.assert_called_once()
+    connection.rollback.assert_not_called()
+    cursor.close.assert_called_once()
+
+
+def test_transaction_rolls_back_and_reraises(connection):
+    with pytest.raises(Error):
+        with transaction() as cursor:
+            cursor.execute.side_effect = Error(msg="duplicate entry")
+            cursor.execute("INSERT INTO users (id) VALUES (%s)", ("u1",))
+
+    connection.commit.assert_not_called()
+    connection.rollback.assert_called_once()
+
+
+def test_submission_is_written_with_one_commit(connection):
+    pairs = [_pair(1), _pair(2, generation_metadata={"score": 0.5})]
+
+    response_id = create_completed_survey_submission(
+        "u1", 3, [50, 30, 20], "ok", pairs, total_response_time_seconds=12.5
+    )
+
+    cursor = connection.cursor.return_value
+    assert response_id == 42
+    assert cursor.execute.call_count == 3
+    assert "TRUE" in cursor.execute.call_args_list[1][0][0]
+    # The user's last activity is updated in the same transaction
+    assert cursor.execute.call_args_list[2][0] == (USER_LAST_ACTIVITY_QUERY, (42,))
+    query, rows = cursor.executemany.call_args[0]
+    assert "INSERT INTO comparison_pairs" in query
+    assert [row[:2] for row in rows] == [(42, 1), (42, 2)]
+    assert rows[1][-1] == json.dumps({"score": 0.5})
+    assert rows[0][-1] is None
+    connection.commit.assert_called_once()
+
+
+def test_failed_submission_stores_nothing(connection):
+    connection.cursor.return_value.executemany.side_effect = Error(msg="lock wait")
+
+    response_id = create_completed_survey_submission(
+        "u1", 3, [50, 30, 20], "", [_pair(1)]
+    )
+
+    assert response_id is None
+    connection.commit.assert_not_called()
+    connection.rollback.assert_called_once()
+
+
+def test_process_submission_uses_single_bulk_write():
+    submission = SurveySubmission(
+        user_id="u1",
+        survey_id=3,
+        user_vector=[50, 30, 20],
+        comparison_pairs=[
+            ComparisonPair([60, 20, 20], [40, 40, 20], 1, 1, original_pair_number=4),
+            ComparisonPair([70, 10, 20], [40, 40, 20], 2, 2),
+        ],
+    )
+
+    with (
+        patch(
+            "application.services.survey_service.create_completed_survey_submission",
+            return_value=7,
+        ) as mock_write,
+        patch(
+            "application.services.survey_service.refresh_response_summaries"
+        ) as mock_summarize,
+    ):
+        SurveyService.process_survey_submission(submission)
+
+    pairs = mock_write.call_args.kwargs["comparison_pairs"]
+    assert mock_write.call_count == 1
+    assert [p["pair_number"] for p in pairs] == [4, 2]
+    mock_summarize.assert_called_once_with([7])
+
+    with patch(
+        "application.services.survey_service.create_completed_survey_submission",
+        return_value=None,
+    ):
+        with pytest.raises(RuntimeError):
+            SurveyService.process_survey_submission(submission)
@@ -0,0 +1,75 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from application.schemas.survey_bundle import SurveyBundle
+from application.services.survey_service import SurveyService
+from database.queries import load_survey_bundle
+
+ROW = {
+    "survey_id": 3,
+    "story_code": "budget",
+    "pair_generation_config": json.dumps(
+        {"strategy": "l1_vs_l2_rank_comparison", "params": {"num_pairs": 4}}
+    ),
+    "suitability_rules": json.dumps({"max_zero_values": 0}),
+    "awareness_pts": json.dumps({"first": "PTS1", "second": 5}),
+    "title": json.dumps({"he": "כותרת", "en": "Title"}),
+    "description": json.dumps({"he": "תיאור"}),
+    "subjects": json.dumps(
+        [{"he": "א", "en": "A"}, {"he": "ב", "en": "B"}, {"he": "ג"}]
+    ),
+}
+
+
+@pytest.fixture
+def mock_execute():
+    with patch("database.queries.execute_query", return_value=dict(ROW)) as mock:
+        yield mock
+
+
+def test_bundle_is_loaded_with_one_query(mock_execute):
+    bundle = load_survey_bundle(3)
+
+    assert mock_execute.call_count == 1
+    assert bundle.strategy_name == "l1_vs_l2_rank_comparison"
+    assert bundle.get_name("en") == "Title"
+    assert bundle.get_description("en") == "תיאור"
+    assert bundle.get_subjects("en") == ["A", "B", "ג"]
+    assert dict(bundle.awareness_pts) == {"first": "PTS1"}
+    assert bundle.suitability_rules["max_zero_values"] == 0
+
+
+def test_bundle_is_immutable(mock_execute):
+    bundle = load_survey_bundle(3)
+
+    with pytest.raises(Exception):
+        bundle.survey_id = 4
+    with pytest.raises(TypeError):
+        bundle.pair_generation_config["params"]["num_pairs"] = 20
+
+    config = bundle.pair_generation_config_dict()
+    config["params"]["num_pairs"] = 20
+    assert bundle.pair_generation_config["params"]["num_pairs"] == 4
+
+
+def test_missing_survey_gives_none(mock_execute):
+    mock_execute.return_value = None
+
+    assert load_survey_bundle(3) is None
+
+
+def test_survey_page_metadata_costs_one_query(mock_execute, test_request_context):
+    exists, _, data = SurveyService.check_survey_exists(3)
+
+    assert exists
+    assert isinstance(data["bundle"], SurveyBundle)
+    assert data["strategy_name"] == "l1_vs_l2_rank_comparison"
+
+    pairs, _ = SurveyService.generate_survey_pairs(
+        [40, 30, 30], len(data["subjects"]), 3, data["bundle"]
+    )
+
+    assert len(pairs) == 4
+    assert mock_execute.call_count == 1
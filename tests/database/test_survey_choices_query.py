@@ -0,0 +1,149 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from database.db import iter_query
+from database.queries import (
+    get_user_survey_performance_data,
+    retrieve_user_survey_choices,
+)
+
+
+def _row(**overrides):
+    row = {
+        "user_id": "u1",
+        "survey_id": 1,
+        "optimal_allocation": json.dumps([50, 30, 20]),
+        "pair_number": 1,
+        "option_1": json.dumps([60, 20, 20]),
+        "option_2": json.dumps([40, 40, 20]),
+        "option1_strategy": "Type A (10, Type A)",
+        "option2_strategy": "",
+        "option1_differences": json.dumps([10, -10, 0]),
+        "option2_differences": None,
+        "generation_metadata": None,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def mock_execute():
+    with patch("database.queries.execute_query", return_value=[]) as mock:
+        yield mock
+
+
+def test_no_arguments_returns_all_choices(mock_execute):
+    retrieve_user_survey_choices()
+
+    query, params = mock_execute.call_args[0]
+    assert "sr.survey_id = %s" not in query
+    assert "IN (" not in query
+    assert query.strip().endswith("sr.user_id, sr.survey_id, cp.pair_number")
+    assert params == ()
+
+
+def test_filters_are_applied_in_sql(mock_execute):
+    retrieve_user_survey_choices(
+        survey_id=7,
+        user_ids=["a", "b", "a"],
+        view_filter="v_users_preferring_weighted_vectors",
+    )
+
+    query, params = mock_execute.call_args[0]
+    assert "sr.survey_id = %s" in query
+    assert "sr.user_id IN (%s, %s)" in query
+    assert "SELECT user_id FROM v_users_preferring_weighted_vectors" in query
+    assert params == (7, "a", "b")
+
+
+def test_invalid_view_or_empty_users_skip_query(mock_execute):
+    assert retrieve_user_survey_choices(view_filter="users; DROP TABLE x") == []
+    assert retrieve_user_survey_choices(user_ids=[]) == []
+    mock_execute.assert_not_called()
+
+
+def test_duration_sort_puts_missing_durations_last(mock_execute):
+    retrieve_user_survey_choices(sort_by="duration", sort_order="desc")
+
+    query, _ = mock_execute.call_args[0]
+    order_by = query.split("ORDER BY")[-1]
+    assert order_by.index("total_response_time_seconds IS NULL") < order_by.index(
+        "total_response_time_seconds DESC"
+    )
+    assert order_by.strip().endswith("cp.pair_number")
+
+
+def test_limit_pages_whole_responses(mock_execute):
+    retrieve_user_survey_choices(survey_id=3, limit=10, offset=20)
+
+    query, params = mock_execute.call_args[0]
+    assert "LIMIT %s OFFSET %s" in query
+    assert "page ON page.id = sr.id" in query
+    # Page subquery parameters come first, then the outer WHERE parameters
+    assert params == (3, 10, 20, 3)
+
+
+def test_rows_are_parsed_and_enriched(mock_execute):
+    mock_execute.return_value = [_row()]
+
+    (choice,) = retrieve_user_survey_choices(survey_id=1)
+
+    assert choice["option1_differences"] == [10, -10, 0]
+    assert choice["magnitude"] == 10
+    assert choice["pair_type"] == "A"
+    assert choice["target_category"] == 0
+
+
+def test_iter_query_streams_in_chunks():
+    connection = MagicMock()
+    cursor = connection.cursor.return_value
+    cursor.fetchmany.side_effect = [[{"id": 1}, {"id": 2}], [{"id": 3}], []]
+    connection.unread_result = False
+
+    with (
+        patch("database.db.get_db", return_value=connection),
+        patch("database.db.get_pool") as get_pool,
+    ):
+        rows = list(iter_query("SELECT id FROM t", chunk_size=2))
+
+    assert rows == [{"id": 1}, {"id": 2}, {"id": 3}]
+    connection.cursor.assert_called_once_with(dictionary=True, buffered=False)
+    cursor.close.assert_called_once()
+    get_pool.return_value.invalidate.assert_not_called()
+
+
+def test_iter_query_closed_early_discards_connection_without_draining():
+    connection = MagicMock()
+    cursor = connection.cursor.return_value
+    cursor.fetchmany.side_effect = [[{"id": 1}, {"id": 2}], [{"id": 3}], []]
+    connection.unread_result = True
+
+    with (
+        patch("database.db.get_db", return_value=connection),
+        patch("database.db.get_pool") as get_pool,
+    ):
+        rows = iter_query("SELECT id FROM t", chunk_size=2)
+        assert next(rows) == {"id": 1}
+        rows.close()
+
+    # Nothing past the first chunk is read from the server
+    cursor.fetchmany.assert_called_once_with(2)
+    connection.consume_results.assert_not_called()
+    cursor.close.assert_not_called()
+    connection.shutdown.assert_called_once()
+    get_pool.return_value.invalidate.assert_called_once_with(connection)
+
+
+def test_performance_data_queries_only_requested_users(mock_execute):
+    get_user_survey_performance_data(["u1", "u2", "u1"])
+
+    query, params = mock_execute.call_args[0]
+    assert "sr.user_id IN (%s, %s)" in query
+    assert params == ("u1", "u2")
+
+
+def test_performance_data_for_empty_page_skips_query(mock_execute):
+    assert get_user_survey_performance_data([]) == []
+    mock_execute.assert_not_called()
@@ -0,0 +1,134 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from database.queries import (
+    USER_LAST_ACTIVITY_QUERY,
+    decode_user_cursor,
+    encode_user_cursor,
+    get_completed_user_count,
+    get_paginated_user_ids,
+    get_user_ids_page,
+    mark_survey_as_completed,
+)
+
+ROWS = [
+    {"user_id": "u3", "last_activity": datetime(2025, 1, 3, 9, 0, 0)},
+    {"user_id": "u2", "last_activity": datetime(2025, 1, 2, 9, 0, 0)},
+]
+
+
+class FakeDatabase:
+    """Answers the count and page queries; records every query."""
+
+    def __init__(self, max_id=10, total=25, new_users=0, rows=ROWS):
+        self.max_id = max_id
+        self.total = total
+        self.new_users = new_users
+        self.rows = rows
+        self.queries = []
+
+    def __call__(self, query, params=None, fetch_one=False):
+        self.queries.append((" ".join(query.split()), params))
+        if "MAX(id)" in query:
+            return {"max_id": self.max_id}
+        if "new_users" in query:
+            return {"new_users": self.new_users}
+        if "total_count" in query:
+            return {"total_count": self.total}
+        return list(self.rows)
+
+
+@pytest.fixture
+def db():
+    fake = FakeDatabase()
+    with patch("database.queries.execute_query", side_effect=fake):
+        yield fake
+
+
+def test_count_is_cached_and_updated_incrementally(db):
+    assert get_completed_user_count() == 25
+    assert get_completed_user_count() == 25
+    db.max_id, db.new_users = 14, 2
+    assert get_completed_user_count() == 27
+
+    full = [q for q, _ in db.queries if "total_count" in q]
+    delta = [p for q, p in db.queries if "new_users" in q]
+    assert len(full) == 1
+    assert delta == [(10, 14, 10)]
+
+
+def test_cursor_round_trip_and_malformed_cursor():
+    cursor = encode_user_cursor(datetime(2025, 1, 2, 9, 0, 0), "u2")
+    precise = encode_user_cursor(datetime(2025, 1, 2, 9, 0, 0, 250000), "u2")
+
+    assert decode_user_cursor(cursor) == ("2025-01-02 09:00:00", "u2")
+    assert decode_user_cursor(precise) == ("2025-01-02 09:00:00.250000", "u2")
+    assert decode_user_cursor("not-a-cursor") is None
+    assert decode_user_cursor(None) is None
+
+
+def test_first_page_uses_offset_and_returns_cursors(db):
+    result = get_user_ids_page(2, page=1)
+
+    query, params = db.queries[-1]
+    assert "OFFSET" in query and "GROUP BY" not in query
+    assert "FROM users WHERE last_activity IS NOT NULL" in query
+    assert params == (2, 0)
+    assert result["user_ids"] == ["u3", "u2"]
+    assert decode_user_cursor(result["last_cursor"]) == ("2025-01-02 09:00:00", "u2")
+
+
+def test_next_page_seeks_past_cursor(db):
+    after = encode_user_cursor("2025-01-02 09:00:00", "u2")
+
+    get_user_ids_page(2, sort_order="desc", after=after, page=2)
+
+    query, params = db.queries[-1]
+    assert "OFFSET" not in query
+    assert "AND (last_activity < %s OR (last_activity = %s AND id < %s))" in query
+    assert "ORDER BY last_activity DESC, id DESC" in query
+    assert params == ("2025-01-02 09:00:00", "2025-01-02 09:00:00", "u2", 2)
+
+
+def test_previous_page_scans_backwards_and_restores_order(db):
+    db.rows = ROWS[::-1]
+    before = encode_user_cursor("2025-01-04 09:00:00", "u4")
+
+    result = get_user_ids_page(2, sort_order="desc", before=before, page=1)
+
+    query, _ = db.queries[-1]
+    assert "ORDER BY last_activity ASC, id ASC" in query
+    assert result["user_ids"] == ["u3", "u2"]
+
+
+def test_user_id_sort_seeks_primary_key(db):
+    after = encode_user_cursor("2025-01-02 09:00:00", "u2")
+
+    get_user_ids_page(2, sort_by="user_id", sort_order="asc", after=after)
+
+    query, params = db.queries[-1]
+    assert "AND id > %s ORDER BY id ASC" in query
+    assert params == ("u2", 2)
+
+
+def test_offset_wrapper_keeps_signature(db):
+    assert get_paginated_user_ids(3, 2) == (["u3", "u2"], 25)
+    assert db.queries[-1][1] == (2, 4)
+
+
+def test_completion_updates_last_activity():
+    connection = MagicMock()
+    cursor = connection.cursor.return_value
+    cursor.rowcount = 1
+
+    with (
+        patch("database.db.get_db", return_value=connection),
+        patch("database.queries.invalidate_dashboard_cache"),
+    ):
+        assert mark_survey_as_completed(7) == 1
+
+    statements = [call.args for call in cursor.execute.call_args_list]
+    assert statements[-1] == (USER_LAST_ACTIVITY_QUERY, (7,))
+    connection.commit.assert_called_once()
@@ -0,0 +1,131 @@
+"""
+Tests for math/equalshares.py.
+
+The `math` directory is not a package (and its name is taken by the standard
+library), so the module is loaded from its file.
+"""
+
+import copy
+import importlib.util
+import logging
+import random
+from pathlib import Path
+from unittest.mock import patch
+
+import matplotlib
+import pytest
+
+matplotlib.use("Agg")
+
+MODULE_PATH = Path(__file__).resolve().parents[2] / "math" / "equalshares.py"
+
+
+@pytest.fixture(scope="module")
+def equalshares():
+    spec = importlib.util.spec_from_file_location("equalshares", MODULE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # Every run logs at INFO; keep only the warnings the test looks for
+    module.logger.setLevel(logging.WARNING)
+    with patch.object(module, "plot_graph"):
+        yield module
+
+
+def _random_instance(rng):
+    voters = list(range(1, rng.randint(2, 5) + 1))
+    projects = list(range(1, rng.randint(2, 6) + 1))
+    cost, bids = {}, {}
+    for project in projects:
+        cost[project] = rng.randrange(50, 300, 10)
+        supporters = rng.sample(voters, rng.randint(1, len(voters)))
+        bids[project] = {
+            voter: cost[project] + rng.randrange(0, 200, 10) for voter in supporters
+        }
+    approvers = {project: list(bids[project]) for project in projects}
+    budget = rng.randrange(100, 1500, 10)
+    return voters, projects, cost, approvers, budget, bids, 10
+
+
+def _reference_equal_shares(
+    module, voters, projects, cost, approvers, budget, bids, step
+):
+    """The original "add 1" completion loop, one increment at a time."""
+    max_cost = module.find_max(bids)
+    chosen, chosen_cost, update_cost, per_voter = module.equal_shares_fixed_budget(
+        voters, projects, cost, approvers, budget, bids, step, max_cost
+    )
+    voters_budget = int(budget / len(voters)) * len(voters)
+    total = sum(chosen_cost.values())
+
+    while True:
+        exhaustive = True
+        for project in projects:
+            if (project not in chosen and total + cost[project] <= budget) or (
+                project in chosen
+                and total + update_cost[project] <= budget
+                and chosen_cost[project] + update_cost[project] <= max_cost[project]
+            ):
+                exhaustive = False
+                break
+        if exhaustive:
+            break
+        voters_budget += len(voters)
+        result = module.equal_shares_fixed_budget(
+            voters, projects, cost, approvers, voters_budget, bids, step, max_cost
+        )
+        total = sum(result[1].values())
+        if total > budget:
+            break
+        chosen, chosen_cost, update_cost, per_voter = result
+
+    return chosen, chosen_cost, per_voter
+
+
+def _run(function, *instance, **kwargs):
+    return function(*copy.deepcopy(instance), **kwargs)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_completion_modes_match_reference_loop(equalshares, caplog, seed):
+    instance = _random_instance(random.Random(seed))
+    expected = _reference_equal_shares(equalshares, *copy.deepcopy(instance))
+
+    linear = _run(equalshares.equal_shares, *instance, completion="linear")
+    with caplog.at_level(logging.WARNING, logger="equal_shares_logger"):
+        search = _run(equalshares.equal_shares, *instance, completion="search")
+
+    assert linear[:2] == expected[:2]
+    # The search may only differ from the reference when it reports that its
+    # monotonicity assumption failed
+    if "not monotone" not in caplog.text:
+        assert search[:2] == expected[:2]
+
+
+def test_non_monotone_runs_are_reported(equalshares, caplog):
+    # Total cost drops from increment 1 to 2, so the search's assumption failed
+    runs = {0: (None, 100), 1: (None, 300), 2: (None, 200), 4: (None, 400)}
+
+    with caplog.at_level(logging.WARNING, logger="equal_shares_logger"):
+        equalshares._warn_if_not_monotone(
+            runs, 4, can_grow=lambda i: True, fits=lambda i: True
+        )
+        assert "not monotone" in caplog.text
+
+        caplog.clear()
+        runs[2] = (None, 350)
+        equalshares._warn_if_not_monotone(
+            runs, 4, can_grow=lambda i: True, fits=lambda i: True
+        )
+        assert caplog.text == ""
+
+        # The linear loop would stop at increment 1, before the search's result
+        equalshares._warn_if_not_monotone(
+            runs, 4, can_grow=lambda i: i != 1, fits=lambda i: True
+        )
+        assert "not monotone" in caplog.text
+
+
+def test_unknown_completion_is_rejected(equalshares):
+    instance = _random_instance(random.Random(0))
+    with pytest.raises(ValueError, match="Unknown completion"):
+        _run(equalshares.equal_shares, *instance, completion="bisect")
@@ -0,0 +1,77 @@
+"""Tests for caching and conditional requests of /surveys/<id>/responses."""
+
+from datetime import datetime
+
+import pytest
+
+from application.services.report_cache import ReportFragmentCache
+
+VERSION = {
+    "latest_response_id": 41,
+    "response_count": 3,
+    "latest_created_at": datetime(2026, 1, 5, 12, 0, 0),
+}
+
+
+@pytest.fixture
+def report(mocker):
+    mocker.patch(
+        "application.routes.survey_responses.get_survey_response_version",
+        return_value=dict(VERSION),
+    )
+    return mocker.patch(
+        "application.routes.survey_responses._build_survey_report",
+        return_value={
+            "data": {"overall_stats_html": "<table>stats</table>"},
+            "survey_description": "",
+            "strategy_name": None,
+            "percentile_breakdown": "",
+            "avg_response_time": 12.0,
+        },
+    )
+
+
+def test_report_is_rendered_once_per_version(client, report):
+    first = client.get("/surveys/4/responses")
+    second = client.get("/surveys/4/responses")
+
+    assert first.status_code == 200
+    assert b"<table>stats</table>" in second.data
+    assert first.headers["ETag"].startswith('W/"')
+    assert first.headers["Last-Modified"] == "Mon, 05 Jan 2026 12:00:00 GMT"
+    assert report.call_count == 1
+
+
+def test_unchanged_report_answers_304(client, report):
+    etag = client.get("/surveys/4/responses").headers["ETag"]
+
+    response = client.get("/surveys/4/responses", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert report.call_count == 1
+
+
+def test_new_response_changes_etag(client, report, mocker):
+    etag = client.get("/surveys/4/responses").headers["ETag"]
+    mocker.patch(
+        "application.routes.survey_responses.get_survey_response_version",
+        return_value=dict(VERSION, latest_response_id=42, response_count=4),
+    )
+
+    response = client.get("/surveys/4/responses", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert report.call_count == 2
+
+
+def test_fragments_are_shared_through_the_cache_dir(tmp_path):
+    writer = ReportFragmentCache(directory=str(tmp_path))
+    reader = ReportFragmentCache(directory=str(tmp_path))
+
+    writer.put("abc", {"data": {"combined_html": "<p>x</p>"}})
+
+    assert reader.get("abc") == {"data": {"combined_html": "<p>x</p>"}}
+    assert reader.get("missing") is None
+    assert reader.stats()["disk_hits"] == 1
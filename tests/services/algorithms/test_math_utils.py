@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from application.services.algorithms.math_utils import (
+    _build_simplex_matrix,
+    _load_or_build_simplex_matrix,
+    _simplex_points,
+    get_cached_simplex_pool,
+    get_simplex_matrix,
+)
+
+
+@pytest.mark.parametrize(
+    "num_variables,step,min_value",
+    [(1, 5, 0), (3, 5, 0), (3, 10, 15), (4, 5, 10), (5, 10, 0), (4, 25, 30)],
+)
+def test_simplex_matrix_matches_generator_order(num_variables, step, min_value):
+    expected = list(_simplex_points(num_variables, 100, step, min_value))
+    matrix = _build_simplex_matrix(num_variables, 100, step, min_value)
+
+    assert matrix.shape == (len(expected), num_variables)
+    assert [tuple(row) for row in matrix.tolist()] == expected
+
+
+def test_simplex_matrix_is_compact_and_read_only():
+    matrix = get_simplex_matrix(num_variables=5, side_length=100, step=5)
+
+    assert matrix.dtype == np.int8
+    assert matrix.flags.c_contiguous
+    assert not matrix.flags.writeable
+    assert np.all(matrix.sum(axis=1, dtype=np.int32) == 100)
+    with pytest.raises(ValueError):
+        matrix[0, 0] = 1
+
+
+def test_cached_pool_is_tuple_view_of_matrix():
+    pool = get_cached_simplex_pool(num_variables=3, side_length=100, step=10)
+    matrix = get_simplex_matrix(num_variables=3, side_length=100, step=10)
+
+    assert pool == tuple(tuple(row) for row in matrix.tolist())
+    assert all(isinstance(value, int) for value in pool[0])
+
+
+def test_simplex_matrix_is_persisted_and_memory_mapped(tmp_path, monkeypatch):
+    monkeypatch.setenv("SIMPLEX_POOL_CACHE_DIR", str(tmp_path))
+
+    first = _load_or_build_simplex_matrix(4, 100, 5, 0)
+    files = list(tmp_path.glob("*.npy"))
+    second = _load_or_build_simplex_matrix(4, 100, 5, 0)
+
+    assert len(files) == 1
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, _build_simplex_matrix(4, 100, 5, 0))
+    np.testing.assert_array_equal(second, first)
+
+
+def test_infeasible_floor_gives_empty_matrix():
+    matrix = _build_simplex_matrix(5, 100, 5, 25)
+
+    assert matrix.shape == (0, 5)
@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+from application.services.algorithms.math_utils import get_cached_simplex_pool
 from application.services.algorithms.utility_models import (
     AntiLeontiefUtilityModel,
     CosineSimilarityUtilityModel,
@@ -205,3 +206,39 @@ def test_kl_utility_model_calculation():
     epsilon = 1e-10
     expected_divergence = 0.5 * np.log(0.5) + 0.5 * np.log(0.5 / epsilon)
     assert pytest.approx(score) == -expected_divergence
+
+
+@pytest.mark.parametrize(
+    "model_class",
+    [
+        L1UtilityModel,
+        L2UtilityModel,
+        CosineSimilarityUtilityModel,
+        LeontiefUtilityModel,
+        AntiLeontiefUtilityModel,
+        KLUtilityModel,
+    ],
+)
+@pytest.mark.parametrize(
+    "user_vec", [(20, 30, 50, 0), (100, 0, 0, 0), (0, 0, 0, 0), (25, 25, 25, 25)]
+)
+def test_calculate_batch_matches_calculate(model_class, user_vec):
+    """The vectorized path must give exactly the same scores as calculate()."""
+    utility_model = model_class()
+    pool = get_cached_simplex_pool(num_variables=4, side_length=100, step=10)
+
+    expected = np.array([utility_model.calculate(user_vec, c) for c in pool])
+    batch = utility_model.calculate_batch(user_vec, np.asarray(pool, dtype=float))
+
+    assert batch.shape == (len(pool),)
+    np.testing.assert_array_equal(batch, expected)
+
+
+def test_calculate_batch_handles_zero_candidates():
+    pool = [(0, 0), (50, 50)]
+
+    assert list(CosineSimilarityUtilityModel().calculate_batch((50, 50), pool)) == [
+        0.0,
+        1.0,
+    ]
+    assert KLUtilityModel().calculate_batch((50, 50), pool)[0] == 0.0
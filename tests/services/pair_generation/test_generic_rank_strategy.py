@@ -6,6 +6,7 @@ import pytest
 from application.exceptions import UnsuitableForStrategyError
 from application.services.algorithms.utility_models import (
     L1UtilityModel,
+    L2UtilityModel,
     LeontiefUtilityModel,
 )
 from application.services.pair_generation.generic_rank_strategy import (
@@ -288,6 +289,39 @@ def test_compute_all_ranked_pairs_cache_hit():
     assert info.misses == 1
 
 
+@pytest.mark.parametrize(
+    "scoring_method,normalization_method",
+    [
+        ("max_min", "ordinal"),
+        ("weighted_cc", "linear"),
+        ("harmonic_mean", "ordinal"),
+    ],
+)
+def test_compute_all_ranked_pairs_top_k_matches_full_ranking(
+    scoring_method, normalization_method
+):
+    """
+    Test that the pruned top-k selection returns exactly the head of the
+    full ranking, including the order of tied scores.
+    """
+    args = {
+        "user_vector": (60, 20, 10, 10),
+        "vector_size": 4,
+        "grid_step": 10,
+        "current_floor": 0,
+        "utility_model_a_class": L1UtilityModel,
+        "utility_model_b_class": LeontiefUtilityModel,
+        "normalization_method": normalization_method,
+        "strategy_name": "test_strategy",
+        "scoring_method": scoring_method,
+        "scoring_lambda": 0.3,
+    }
+    full = _compute_all_ranked_pairs(**args)
+
+    for k in (1, 10, 50, len(full) + 1):
+        assert _compute_all_ranked_pairs(top_k=k, **args) == full[:k]
+
+
 def test_generate_pairs_threshold_rejection():
     """
     Test that generate_pairs raises UnsuitableForStrategyError if n-th pair is below threshold.
@@ -334,8 +368,8 @@ def test_generate_pairs_threshold_pass():
             return_value=mock_pairs,
         ),
         patch(
-            "application.services.pair_generation.generic_rank_strategy.get_cached_simplex_pool",
-            return_value=[(50, 25, 25)] * 10,
+            "application.services.pair_generation.generic_rank_strategy.get_simplex_matrix",
+            return_value=np.array([(50, 25, 25)] * 10),
         ),
     ):
         # Should not raise
@@ -343,3 +377,27 @@ def test_generate_pairs_threshold_pass():
             user_vector, n=n, vector_size=3, min_score_threshold=threshold
         )
         assert len(results) == n
+
+
+def test_ranked_pairs_cache_serves_smaller_top_k_and_clears_per_strategy():
+    """
+    Test that a cached top-k result answers smaller requests and that
+    clearing one strategy leaves the others cached.
+    """
+    _compute_all_ranked_pairs.cache_clear()
+    l1_leontief = GenericRankStrategy(L1UtilityModel, LeontiefUtilityModel)
+    l2_leontief = GenericRankStrategy(L2UtilityModel, LeontiefUtilityModel)
+
+    for strategy in (l1_leontief, l2_leontief):
+        strategy.generate_pairs((50, 25, 25), n=5, vector_size=3)
+    l1_leontief.generate_pairs((50, 25, 25), n=3, vector_size=3)
+
+    stats = _compute_all_ranked_pairs.cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["entries"] == 2
+    assert 0 < stats["bytes"] <= stats["max_bytes"]
+
+    assert l1_leontief.clear_cache() == 1
+    stats = _compute_all_ranked_pairs.cache_stats()
+    assert stats["entries_per_strategy"] == {l2_leontief.get_strategy_name(): 1}
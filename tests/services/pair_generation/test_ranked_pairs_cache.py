@@ -0,0 +1,135 @@
+import numpy as np
+
+from application.services.pair_generation.ranked_pairs_cache import (
+    PersistentPairStore,
+    RankedPairsCache,
+    _Entry,
+    _persistent_key,
+    cached_ranked_pairs,
+)
+
+PAIRS = [(3, 1, 0.75), (0, 2, 0.5), (4, 1, 0.25)]
+
+
+def test_entries_are_stored_compactly_and_round_trip():
+    cache = RankedPairsCache(max_bytes=1024)
+    cache.put("key", PAIRS, strategy_name="s")
+
+    assert cache.get("key") == PAIRS
+    assert cache.get("key", top_k=2) == PAIRS[:2]
+    # 2 x int32 indices + 1 x float32 score per pair
+    assert cache.stats()["bytes"] == 12 * len(PAIRS)
+
+
+def test_truncated_entry_only_serves_smaller_requests():
+    cache = RankedPairsCache(max_bytes=1024)
+    cache.put("key", PAIRS[:2], top_k=2)
+
+    assert cache.get("key", top_k=1) == PAIRS[:1]
+    assert cache.get("key", top_k=3) is None
+    assert cache.get("key") is None
+
+    # A top-k result shorter than k is complete and serves everything
+    cache.put("short", PAIRS, top_k=10)
+    assert cache.get("short") == PAIRS
+
+
+def test_lru_eviction_by_bytes():
+    cache = RankedPairsCache(max_bytes=12 * 5)
+    cache.put("a", PAIRS)
+    cache.put("b", PAIRS[:2])
+    cache.get("a")
+    cache.put("c", PAIRS[:1])
+
+    stats = cache.stats()
+    assert cache.get("b") is None
+    assert cache.get("a") == PAIRS
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+def test_oversized_results_are_not_cached():
+    cache = RankedPairsCache(max_bytes=10)
+    cache.put("key", PAIRS)
+
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_persistent_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "pairs.db")
+    writer = PersistentPairStore(path, version="v1")
+    writer.put_entry("key", _Entry.from_pairs(PAIRS, None, "s"))
+
+    # A second instance stands in for another worker process
+    reader = PersistentPairStore(path, version="v1")
+    assert reader.get_entry("key").to_pairs(2) == PAIRS[:2]
+    assert reader.stats()["hits"] == 1
+
+
+def test_persistent_store_keeps_most_complete_entry(tmp_path):
+    store = PersistentPairStore(str(tmp_path / "pairs.db"), version="v1")
+    store.put_entry("key", _Entry.from_pairs(PAIRS, None, "s"))
+    store.put_entry("key", _Entry.from_pairs(PAIRS[:1], 1, "s"))
+
+    assert store.get_entry("key").to_pairs(None) == PAIRS
+
+
+def test_persistent_store_keeps_versions_apart(tmp_path):
+    path = str(tmp_path / "pairs.db")
+    old = PersistentPairStore(path, version="v1")
+    old.put_entry("key", _Entry.from_pairs(PAIRS, None, "s"))
+
+    # A process on the new version neither reads nor deletes the old rows
+    upgraded = PersistentPairStore(path, version="v2")
+    assert upgraded.get_entry("key") is None
+    upgraded.put_entry("key", _Entry.from_pairs(PAIRS[:1], 1, "s"))
+
+    assert old.get_entry("key").to_pairs(None) == PAIRS
+    assert upgraded.get_entry("key", 1).to_pairs(1) == PAIRS[:1]
+
+
+def test_persistent_store_prunes_other_versions(tmp_path):
+    path = str(tmp_path / "pairs.db")
+    PersistentPairStore(path, version="v1").put_entry(
+        "key", _Entry.from_pairs(PAIRS, None, "s")
+    )
+    upgraded = PersistentPairStore(path, version="v2")
+    upgraded.put_entry("key", _Entry.from_pairs(PAIRS, None, "s"))
+
+    assert upgraded.prune(max_age_seconds=3600) == 0  # too recent
+    assert upgraded.prune() == 1
+    assert upgraded.stats()["entries"] == 1
+
+    # Age-based pruning on first connection
+    PersistentPairStore(path, version="v1").put_entry(
+        "key", _Entry.from_pairs(PAIRS, None, "s")
+    )
+    PersistentPairStore(path, version="v2", max_age_seconds=0).stats()
+    assert PersistentPairStore(path, version="v1").get_entry("key") is None
+
+
+def test_persistent_key_accepts_numpy_values():
+    key = _persistent_key(
+        {"user_vector": (np.int64(50), np.int64(50)), "step": np.int32(5)}
+    )
+
+    assert key == _persistent_key({"user_vector": (50, 50), "step": 5})
+
+
+def test_decorator_reads_through_to_persistent_store(tmp_path):
+    calls = []
+
+    def compute(user_vector, strategy_name, top_k=None):
+        calls.append(user_vector)
+        return PAIRS[:top_k]
+
+    store = PersistentPairStore(str(tmp_path / "pairs.db"), version="v1")
+    first = cached_ranked_pairs(RankedPairsCache(), store)(compute)
+    second = cached_ranked_pairs(RankedPairsCache(), store)(compute)
+
+    assert first((50, 50), "s", top_k=2) == PAIRS[:2]
+    assert second((50, 50), "s", top_k=2) == PAIRS[:2]
+    assert second((50, 50), "s", top_k=1) == PAIRS[:1]
+    assert calls == [(50, 50)]
+    assert second.cache_stats()["persistent"]["hits"] == 1
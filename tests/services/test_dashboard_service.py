@@ -0,0 +1,49 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from application.services.dashboard_service import get_dashboard_metrics
+from database.queries import create_completed_survey_submission, get_dashboard_counts
+
+COUNTS = {"total_participants": 5, "unaware_users_count": 2, "users_with_surveys": 6}
+
+
+@pytest.fixture
+def mock_execute():
+    def respond(query, params=None, fetch_one=False):
+        return dict(COUNTS) if fetch_one else []
+
+    with patch("database.queries.execute_query", side_effect=respond) as mock:
+        yield mock
+
+
+def test_counts_use_one_aggregate_query_and_are_cached(mock_execute):
+    assert get_dashboard_counts() == COUNTS
+    assert get_dashboard_counts() == COUNTS
+
+    query = mock_execute.call_args[0][0]
+    assert mock_execute.call_count == 1
+    assert "COUNT(DISTINCT sr.user_id)" in query
+
+
+def test_submission_invalidates_cached_counts(mock_execute):
+    get_dashboard_counts()
+    with patch("database.db.get_db", return_value=MagicMock()):
+        create_completed_survey_submission("u1", 1, [50, 30, 20], "", [])
+    get_dashboard_counts()
+
+    assert mock_execute.call_count == 2
+
+
+def test_dashboard_metrics_do_not_load_responses(mock_execute):
+    with patch(
+        "application.services.dashboard_service.get_surveys_for_dashboard",
+        return_value=[{"id": 1, "pair_generation_config": {"strategy": "x"}}],
+    ):
+        metrics = get_dashboard_metrics()
+
+    assert metrics["total_surveys"] == 1
+    assert metrics["total_participants"] == 5
+    assert metrics["unaware_users_count"] == 2
+    assert metrics["users_with_surveys"] == 6
+    assert mock_execute.call_count == 1
@@ -0,0 +1,18 @@
+from unittest.mock import patch
+
+from application.services.parallel import map_chunksize, resolve_workers
+
+
+def test_resolve_workers_defaults_to_cpu_count():
+    with patch("application.services.parallel.os.cpu_count", return_value=6):
+        assert resolve_workers(None) == 6
+        assert resolve_workers(0) == 6
+        assert resolve_workers(2) == 2
+
+    with patch("application.services.parallel.os.cpu_count", return_value=None):
+        assert resolve_workers(None) == 1
+
+
+def test_map_chunksize_gives_each_worker_several_chunks():
+    assert map_chunksize(1000, 4) == 31
+    assert map_chunksize(3, 4) == 1
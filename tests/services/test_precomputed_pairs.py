@@ -0,0 +1,76 @@
+"""Tests for offline precomputed comparison pairs."""
+
+from unittest.mock import patch
+
+import pytest
+
+from application.services.pair_generation import StrategyRegistry
+from application.services.precomputed_pairs import (
+    artifact_path,
+    enumerate_ideal_vectors,
+    load_precomputed_pairs,
+    precompute_survey_pairs,
+)
+from application.services.survey_service import SurveyService
+
+CONFIG = {"strategy": "l1_vs_l2_rank_comparison", "params": {"num_pairs": 4}}
+VECTORS = [(50, 30, 20), (60, 20, 20), (35, 35, 30)]
+
+
+@pytest.fixture
+def artifact(tmp_path, monkeypatch):
+    monkeypatch.setenv("PRECOMPUTED_PAIRS_DIR", str(tmp_path))
+    path = artifact_path(7)
+    summary = precompute_survey_pairs(7, CONFIG, 3, path, workers=1, vectors=VECTORS)
+    return path, summary
+
+
+def test_enumerate_ideal_vectors_matches_survey_validation():
+    vectors = enumerate_ideal_vectors(3)
+
+    assert len(vectors) == len(set(vectors))
+    assert (100, 0, 0) not in vectors
+    assert all(SurveyService.validate_vector(list(v), 3) for v in vectors)
+
+
+def test_precomputed_pairs_match_live_generation(artifact):
+    _, summary = artifact
+    strategy = StrategyRegistry.get_strategy(CONFIG["strategy"])
+
+    assert summary["written"] == len(VECTORS)
+    for vector in VECTORS:
+        live = strategy.generate_pairs(vector, n=4, vector_size=3)
+        assert load_precomputed_pairs(7, list(vector), CONFIG, 3) == live
+
+
+def test_lookup_misses_on_config_change_or_unknown_vector(artifact):
+    changed = {**CONFIG, "params": {"num_pairs": 6}}
+
+    assert load_precomputed_pairs(7, [50, 30, 20], changed, 3) is None
+    assert load_precomputed_pairs(7, [40, 40, 20], CONFIG, 3) is None
+    assert load_precomputed_pairs(8, [50, 30, 20], CONFIG, 3) is None
+
+
+def test_randomized_strategy_cannot_be_precomputed(tmp_path):
+    config = {"strategy": "asymmetric_loss_distribution", "params": {}}
+
+    with pytest.raises(ValueError, match="not rank-based"):
+        precompute_survey_pairs(1, config, 3, str(tmp_path / "a.sqlite"), workers=1)
+
+
+def test_survey_service_uses_precomputed_pairs(artifact):
+    with (
+        patch(
+            "application.services.survey_service.get_survey_suitability_rules",
+            return_value=[],
+        ),
+        patch(
+            "application.services.survey_service.get_survey_pair_generation_config",
+            return_value=CONFIG,
+        ),
+        patch("application.services.survey_service.StrategyRegistry") as registry,
+    ):
+        pairs, _ = SurveyService.generate_survey_pairs([50, 30, 20], 3, 7)
+
+    registry.get_strategy.return_value.generate_pairs.assert_not_called()
+    assert pairs == load_precomputed_pairs(7, [50, 30, 20], CONFIG, 3)